@@ -5,10 +5,17 @@ from typing import Generator, Optional
 from datetime import datetime, timedelta
 
 from app.db.database import SessionLocal
+from app.db.repositories.async_repositories import (
+    AsyncDeckRepository,
+    AsyncFlashcardRepository,
+    current_deck_repository,
+    current_flashcard_repository,
+)
 from app.core.security import verify_password
 from app.schemas.token import TokenPayload
 from app.models.user import User
 from app.config import settings
+from app.services.search_service import SearchService, current_search_service
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
@@ -19,10 +26,33 @@ def get_db() -> Generator:
     finally:
         db.close()
 
-async def get_current_user(
+def get_flashcard_repository() -> AsyncFlashcardRepository:
+    repository = current_flashcard_repository()
+    if repository is None:
+        raise HTTPException(status_code=500, detail="Flashcard repository is not initialized")
+    return repository
+
+def get_deck_repository() -> AsyncDeckRepository:
+    repository = current_deck_repository()
+    if repository is None:
+        raise HTTPException(status_code=500, detail="Deck repository is not initialized")
+    return repository
+
+def get_search_service() -> SearchService:
+    search_service = current_search_service()
+    if search_service is None:
+        raise HTTPException(
+            status_code=500,
+            detail="Search functionality is not configured. Please set OPENAI_API_KEY and SERPAPI_KEY environment variables."
+        )
+    return search_service
+
+def get_current_user(
     db = Depends(get_db),
     token: str = Depends(oauth2_scheme)
 ) -> User:
+    # Sync on purpose: FastAPI runs it in the threadpool, off the event loop,
+    # since the user lookup is a blocking query
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -0,0 +1,29 @@
+import json
+from typing import Any, Dict, List, Optional, Union
+
+from fastapi import Response
+
+from app.db.pagination import next_cursor
+
+def page_json(items: List[Any], cursor: Optional[str]) -> bytes:
+    """
+    A {"items", "next_cursor"} page of schema models serialized straight to
+    JSON, encoded the way FastAPI's JSONResponse encodes a validated page.
+    """
+    return json.dumps(
+        {"items": [item.model_dump(mode="json") for item in items], "next_cursor": cursor},
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+def page_response(items: List[Any], limit: int, lean: bool = False) -> Union[Dict[str, Any], Response]:
+    """
+    A list page for a route with a page response_model. With `lean`, the
+    items are already response schema models (the MongoDB repositories with
+    MONGO_LEAN_READS), so the page is sent as JSON without FastAPI validating
+    and encoding it again; otherwise the route's response_model does that.
+    """
+    cursor = next_cursor(items, limit)
+    if lean:
+        return Response(content=page_json(items, cursor), media_type="application/json")
+    return {"items": items, "next_cursor": cursor}
@@ -1 +1 @@
-from . import auth, users, flashcards, decks, search
+from . import auth, users, flashcards, decks, search, jobs
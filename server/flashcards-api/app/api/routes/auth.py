@@ -1,6 +1,8 @@
 from fastapi import APIRouter, Depends
 from app.schemas.user import UserCreate, UserLogin
-from app.core.security import authenticate_user, create_access_token
+from app.api import deps
+from app.core.security import create_access_token
+from app.db.repositories import user_repository
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
@@ -10,10 +12,9 @@ async def register_user(user: UserCreate):
     return {"message": "User registered successfully", "user": user}
 
 @router.post("/login", summary="Login a user")
-async def login_user(user: UserLogin):
-    # Placeholder: Add logic for user authentication
-    user_authenticated = authenticate_user(user.email, user.password)
+def login_user(user: UserLogin, db=Depends(deps.get_db)):
+    user_authenticated = user_repository.authenticate(db, email=user.email, password=user.password)
     if not user_authenticated:
         return {"error": "Invalid credentials"}
-    access_token = create_access_token(user.email)
+    access_token = create_access_token(user_authenticated.id)
     return {"access_token": access_token, "token_type": "bearer"}
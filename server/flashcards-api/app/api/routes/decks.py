@@ -1,8 +1,85 @@
-from fastapi import APIRouter, Depends
-from app.schemas.deck import DeckCreate, DeckUpdate
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional
+
+from app.api import deps
+from app.api.pages import page_response
+from app.config import settings
+from app.db.pagination import InvalidCursor, next_cursor
+from app.db.repositories.async_repositories import AsyncDeckRepository
+from app.models.user import User
+from app.schemas.deck import DeckCreate, DeckUpdate, DeckPage, DeckWithFlashcardsPage
 
 router = APIRouter(prefix="/decks", tags=["Decks"])
 
+@router.get("/", response_model=DeckPage, summary="List the current user's decks")
+async def list_decks(
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    deck_repository: AsyncDeckRepository = Depends(deps.get_deck_repository),
+    current_user: User = Depends(deps.get_current_active_user),
+):
+    """Newest first; pass `next_cursor` back as `cursor` for the next page."""
+    try:
+        decks = await deck_repository.get_by_user(user_id=current_user.id, limit=limit, cursor=cursor)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return page_response(decks, limit, lean=deck_repository.lean_responses)
+
+@router.get("/public", response_model=DeckPage, summary="List public decks")
+async def list_public_decks(
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    deck_repository: AsyncDeckRepository = Depends(deps.get_deck_repository),
+    current_user: User = Depends(deps.get_current_active_user),
+):
+    """Newest first; pass `next_cursor` back as `cursor` for the next page."""
+    try:
+        decks = await deck_repository.get_public_decks(limit=limit, cursor=cursor)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return page_response(decks, limit, lean=deck_repository.lean_responses)
+
+@router.get("/with-flashcards", response_model=DeckWithFlashcardsPage, summary="List the current user's decks with cards")
+async def list_decks_with_flashcards(
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    cards_per_deck: Optional[int] = Query(None, ge=0, le=settings.DECK_PREVIEW_MAX_CARDS),
+    deck_repository: AsyncDeckRepository = Depends(deps.get_deck_repository),
+    current_user: User = Depends(deps.get_current_active_user),
+):
+    """
+    Like `GET /decks/`, with each deck's newest `cards_per_deck` flashcards
+    (default DECK_PREVIEW_CARDS) and its card count, loaded in one query
+    (one JOIN on SQLite, one $lookup aggregation on MongoDB).
+    """
+    try:
+        decks = await deck_repository.get_by_user_with_flashcards(
+            user_id=current_user.id, limit=limit, cursor=cursor, cards_per_deck=cards_per_deck
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"items": decks, "next_cursor": next_cursor(decks, limit)}
+
+@router.get("/public/with-flashcards", response_model=DeckWithFlashcardsPage, summary="List public decks with cards")
+async def list_public_decks_with_flashcards(
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    cards_per_deck: Optional[int] = Query(None, ge=0, le=settings.DECK_PREVIEW_MAX_CARDS),
+    deck_repository: AsyncDeckRepository = Depends(deps.get_deck_repository),
+    current_user: User = Depends(deps.get_current_active_user),
+):
+    """
+    Like `GET /decks/public`, with each deck's newest `cards_per_deck`
+    flashcards (default DECK_PREVIEW_CARDS) and its card count, loaded in one query.
+    """
+    try:
+        decks = await deck_repository.get_public_with_flashcards(
+            limit=limit, cursor=cursor, cards_per_deck=cards_per_deck
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"items": decks, "next_cursor": next_cursor(decks, limit)}
+
 @router.post("/", summary="Create a new deck")
 async def create_deck(deck: DeckCreate):
     # Placeholder: Add logic to create a deck in MongoDB
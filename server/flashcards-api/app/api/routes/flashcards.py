@@ -1,8 +1,41 @@
-from fastapi import APIRouter, Depends
-from app.schemas.flashcard import FlashcardCreate, FlashcardUpdate
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional
+
+from app.api import deps
+from app.api.pages import page_response
+from app.db.pagination import InvalidCursor
+from app.db.repositories.async_repositories import AsyncDeckRepository, AsyncFlashcardRepository
+from app.models.user import User
+from app.schemas.flashcard import FlashcardCreate, FlashcardUpdate, FlashcardPage
+from app.schemas.ids import EntityId
 
 router = APIRouter(prefix="/flashcards", tags=["Flashcards"])
 
+@router.get("/", response_model=FlashcardPage, summary="List flashcards")
+async def list_flashcards(
+    deck_id: Optional[EntityId] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    flashcard_repository: AsyncFlashcardRepository = Depends(deps.get_flashcard_repository),
+    deck_repository: AsyncDeckRepository = Depends(deps.get_deck_repository),
+    current_user: User = Depends(deps.get_current_active_user),
+):
+    """
+    The current user's flashcards, or those of one deck they own or that is
+    public, newest first; pass `next_cursor` back as `cursor` for the next page.
+    """
+    try:
+        if deck_id is None:
+            flashcards = await flashcard_repository.get_by_user(user_id=current_user.id, limit=limit, cursor=cursor)
+        else:
+            deck = await deck_repository.get(deck_id)
+            if not deck or (str(deck.user_id) != str(current_user.id) and not deck.is_public):
+                raise HTTPException(status_code=404, detail="Deck not found")
+            flashcards = await flashcard_repository.get_by_deck(deck_id=deck_id, limit=limit, cursor=cursor)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return page_response(flashcards, limit, lean=flashcard_repository.lean_responses)
+
 @router.post("/", summary="Create a new flashcard")
 async def create_flashcard(flashcard: FlashcardCreate):
     # Placeholder: Add logic to create a flashcard in MongoDB
@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, HTTPException
+from typing import Any
+
+from app import schemas
+from app.api import deps
+from app.models.user import User
+from app.config import settings
+from app.services.job_queue import get_job_queue
+
+router = APIRouter(prefix=f"{settings.API_V1_STR}/jobs", tags=["jobs"])
+
+@router.get("/stats", response_model=schemas.JobQueueStats)
+async def job_queue_stats(
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Queue depth and worker utilisation of the generation job queue.
+    """
+    return get_job_queue().stats()
+
+@router.get("/{job_id}", response_model=schemas.Job)
+async def get_job(
+    job_id: str,
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Get the status, and once finished the result, of a generation job.
+    """
+    job = await get_job_queue().get(job_id)
+    if not job or job["user_id"] != str(current_user.id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {**job, "count": len(job["flashcards"])}
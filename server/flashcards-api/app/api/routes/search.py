@@ -1,73 +1,180 @@
-from fastapi import APIRouter, Depends, Query, HTTPException
-from sqlalchemy.orm import Session
-from typing import Any, Optional
+import json
+from fastapi import APIRouter, Depends, Query, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from typing import Any, AsyncIterator, Optional, Union
 from uuid import UUID
 
 from app import schemas
 from app.api import deps
-from app.db.repositories import user_repository, flashcard_repository, deck_repository
+from app.db.fts import fts5_enabled
+from app.db.pagination import InvalidCursor, decode_cursor, encode_cursor, keyset_position, next_cursor, rank_offset
+from app.db.repositories import user_repository
+from app.db.repositories.async_repositories import AsyncDeckRepository, AsyncFlashcardRepository
 from app.models.user import User
 from app.config import settings
 from app.services.search_service import SearchService
+from app.services.batch_pipeline import BatchGenerationPipeline
+from app.services.job_queue import JobQueueFull, get_job_queue
+from app.services.governor import ProviderUnavailable
+from app.services.near_duplicates import deck_duplicate_index, deck_duplicate_indexes
+from app.services.fuzzy_index import fuzzy_index, fuzzy_search_enabled
+from app.services.search_cache import search_cache_enabled, search_result_cache
+from app.services.search_fanout import in_worker_session, run_sub_searches
+from app.services.search_index import search_index_enabled
+from app.services.suggest_index import suggest_index, suggest_index_enabled
 
 router = APIRouter(prefix=f"{settings.API_V1_STR}/search", tags=["search"])
 
 @router.get("", response_model=schemas.SearchResults)
-def search(
+async def search(
     *,
-    db: Session = Depends(deps.get_db),
     query: str = Query(..., min_length=1),
     include_users: bool = True,
     include_decks: bool = True,
     include_flashcards: bool = True,
     limit: int = 10,
+    cursor: Optional[str] = None,
+    fuzzy: bool = False,
+    flashcard_repository: AsyncFlashcardRepository = Depends(deps.get_flashcard_repository),
+    deck_repository: AsyncDeckRepository = Depends(deps.get_deck_repository),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Search across flashcards, decks, and users.
+    
+    With `fuzzy=true`, flashcards and decks are matched through the trigram
+    index, tolerating typos (one edit in short words, two in longer ones);
+    the lookup is capped at FUZZY_BUDGET_MS and returns the best matches
+    found by then.
+    
+    The sub-searches run concurrently on the async repositories, each limited
+    to SEARCH_SUB_QUERY_TIMEOUT_SECONDS; one that times out or fails leaves
+    its list empty and sets `partial`. `timings` reports each sub-search.
+    
+    Pass `next_cursor` back as `cursor` for the next page of flashcards and
+    decks; a type that has no more results is left out of the next page.
+    
+    Complete responses are cached per user until a write touches the user's
+    flashcards or decks (or any public deck), or SEARCH_CACHE_TTL_SECONDS pass.
     """
-    results = schemas.SearchResults()
+    if fuzzy and not fuzzy_search_enabled():
+        raise HTTPException(status_code=400, detail="Fuzzy search is disabled")
+    # Relevance-ranked backends page by rank position, the ilike scan by (created_at, id)
+    ranked = fuzzy or search_index_enabled() or fts5_enabled()
+    try:
+        cursors = decode_cursor(cursor)
+        # Validate up front so a bad cursor is a 400 rather than a failed sub-search
+        for sub_cursor in cursors.values():
+            if ranked:
+                rank_offset(sub_cursor)
+            else:
+                keyset_position(sub_cursor)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if cursors:
+        include_users = False
+        include_flashcards = include_flashcards and "flashcards" in cursors
+        include_decks = include_decks and "decks" in cursors
+    
+    user_id = current_user.id
+    if search_cache_enabled():
+        cache_key = search_result_cache.make_key(
+            user_id, query, include_users, include_decks, include_flashcards, fuzzy, limit, cursor
+        )
+        cached, cache_token = search_result_cache.get(cache_key)
+        if cached is not None:
+            return cached
+    searches = {}
     
     if include_flashcards:
-        results.flashcards = flashcard_repository.search(
-            db, query=query, user_id=current_user.id, limit=limit
+        searches["flashcards"] = lambda: flashcard_repository.search(
+            query=query, user_id=user_id, limit=limit, cursor=cursors.get("flashcards"), fuzzy=fuzzy
         )
     
     if include_decks:
-        results.decks = deck_repository.search(
-            db, query=query, user_id=current_user.id, limit=limit
+        searches["decks"] = lambda: deck_repository.search(
+            query=query, user_id=user_id, limit=limit, cursor=cursors.get("decks"), fuzzy=fuzzy
         )
     
     # For users search, we only search if there's an admin flag on the current user
     # This is a simplified approach - you might want to implement proper roles
     if include_users and hasattr(current_user, "is_admin") and current_user.is_admin:
         # This is a simplified search - in real app you'd implement more complex logic
-        users = db.query(User).filter(
+        searches["users"] = lambda: in_worker_session(lambda db: db.query(User).filter(
             (User.username.ilike(f"%{query}%")) | 
             (User.email.ilike(f"%{query}%"))
-        ).limit(limit).all()
-        results.users = users
+        ).limit(limit).all())
+    
+    outcomes = await run_sub_searches(searches, timeout=settings.SEARCH_SUB_QUERY_TIMEOUT_SECONDS)
+    
+    results = schemas.SearchResults()
+    next_cursors = {}
+    for name, outcome in outcomes.items():
+        if outcome.status == "ok":
+            setattr(results, name, outcome.value)
+            if name in ("flashcards", "decks"):
+                position = next_cursor(outcome.value, limit, cursors.get(name), ranked=ranked)
+                if position is not None:
+                    next_cursors[name] = position
+        else:
+            results.partial = True
+        results.timings[name] = schemas.SubSearchTiming(
+            status=outcome.status, elapsed_ms=round(outcome.elapsed_ms, 2), detail=outcome.detail
+        )
+    results.next_cursor = encode_cursor(next_cursors) if next_cursors else None
     
+    if search_cache_enabled() and not results.partial:
+        search_result_cache.store(cache_key, results, cache_token, includes_decks=include_decks)
     return results
 
-@router.post("/generate-flashcards", response_model=schemas.GeneratedFlashcardsResponse)
+@router.get("/suggest", response_model=schemas.SuggestResults)
+def suggest(
+    *,
+    q: str = Query(..., min_length=1),
+    limit: int = Query(8, ge=1, le=20),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Typeahead suggestions: the user's deck names and flashcard questions,
+    plus public deck names, with a word starting with `q`. Served from an
+    in-memory prefix index, so it is cheap enough to call on every keystroke.
+    """
+    if not suggest_index_enabled():
+        raise HTTPException(status_code=404, detail="Suggestions are disabled")
+    return {"suggestions": suggest_index.suggest(q, user_id=current_user.id, limit=limit)}
+
+@router.post(
+    "/generate-flashcards",
+    response_model=Union[schemas.GeneratedFlashcardsResponse, schemas.Job]
+)
 async def generate_flashcards_from_search(
     *,
     request: schemas.GenerateFlashcardsRequest,
+    response: Response,
+    background: bool = False,
+    search_service: SearchService = Depends(deps.get_search_service),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Search Google for content and generate flashcards using OpenAPI.
+    
+    With `background=true` the request is queued and a job is returned right away
+    (HTTP 202); poll `GET /api/v1/jobs/{id}` for the flashcards.
     """
-    if not settings.OPENAI_API_KEY or not settings.SERPAPI_KEY:
-        raise HTTPException(
-            status_code=500,
-            detail="Search functionality is not configured. Please set OPENAI_API_KEY and SERPAPI_KEY environment variables."
-        )
+    if background:
+        try:
+            job = await get_job_queue().submit(
+                user_id=str(current_user.id),
+                query=request.query,
+                num_flashcards=request.num_flashcards
+            )
+        except JobQueueFull as e:
+            raise HTTPException(status_code=503, detail=str(e))
+        response.status_code = 202
+        return {**job, "count": 0}
     
     try:
-        search_service = SearchService()
-        flashcards = await search_service.search_and_generate_flashcards(
+        flashcards = await search_service.get_or_generate_flashcards(
             query=request.query,
             num_flashcards=request.num_flashcards
         )
@@ -78,49 +185,155 @@ async def generate_flashcards_from_search(
             count=len(flashcards)
         )
         
+    except ProviderUnavailable as e:
+        headers = {"Retry-After": str(max(1, round(e.retry_after)))} if e.retry_after is not None else None
+        raise HTTPException(status_code=503, detail=str(e), headers=headers)
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Error generating flashcards: {str(e)}"
         )
 
+@router.post("/generate-flashcards/batch", response_model=schemas.BatchGenerateFlashcardsResponse)
+async def generate_flashcards_batch(
+    *,
+    request: schemas.BatchGenerateFlashcardsRequest,
+    search_service: SearchService = Depends(deps.get_search_service),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Generate flashcards for many queries at once through a staged pipeline.
+    """
+    if len(request.items) > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"A batch can contain at most {settings.BATCH_MAX_ITEMS} items"
+        )
+    
+    pipeline = BatchGenerationPipeline(
+        search_service.batch_stages(),
+        search_service.generation_cache,
+        search_concurrency=settings.BATCH_SEARCH_CONCURRENCY,
+        fetch_concurrency=settings.BATCH_FETCH_CONCURRENCY,
+        extract_concurrency=settings.BATCH_EXTRACT_CONCURRENCY,
+        llm_concurrency=settings.BATCH_LLM_CONCURRENCY,
+        queue_size=settings.BATCH_QUEUE_SIZE,
+    )
+    return await pipeline.run([(item.query, item.num_flashcards) for item in request.items])
+
+def _sse_event(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@router.post("/generate-flashcards/stream")
+async def stream_flashcards_from_search(
+    *,
+    request: schemas.GenerateFlashcardsRequest,
+    search_service: SearchService = Depends(deps.get_search_service),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> StreamingResponse:
+    """
+    Search Google for content and stream generated flashcards as Server-Sent Events.
+    
+    Each card is sent as a `flashcard` event as soon as the model has written it,
+    followed by a final `done` event with the total count (or an `error` event).
+    """
+    async def event_stream() -> AsyncIterator[str]:
+        count = 0
+        try:
+            async for flashcard in search_service.stream_flashcards(
+                query=request.query,
+                num_flashcards=request.num_flashcards
+            ):
+                count += 1
+                yield _sse_event("flashcard", flashcard)
+            yield _sse_event("done", {"query": request.query, "count": count})
+        except Exception as e:
+            yield _sse_event("error", {"detail": f"Error generating flashcards: {str(e)}"})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/stats")
+async def search_pipeline_stats(
+    search_service: SearchService = Depends(deps.get_search_service),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Cache counters, job queue and outbound provider state (circuit breaker,
+    admission queue depth) for the flashcard generation pipeline, the sizes
+    of the typeahead, fuzzy search and per-deck near-duplicate indexes, and
+    the /search response cache.
+    """
+    return {
+        "content_cache": search_service.content_cache.stats(),
+        "generation_cache": search_service.generation_cache.stats(),
+        "jobs": get_job_queue().stats(),
+        "providers": {
+            "serpapi": search_service.serpapi_governor.stats(),
+            "openai": search_service.openai_governor.stats(),
+        },
+        "suggest_index": suggest_index.stats(),
+        "fuzzy_index": fuzzy_index.stats(),
+        "near_duplicates": deck_duplicate_indexes.stats(),
+        "search_cache": search_result_cache.stats(),
+    }
+
 @router.post("/save-generated-flashcards", response_model=schemas.SaveFlashcardsResponse)
 async def save_generated_flashcards(
     *,
     request: schemas.SaveFlashcardsRequest,
-    db: Session = Depends(deps.get_db),
+    flashcard_repository: AsyncFlashcardRepository = Depends(deps.get_flashcard_repository),
+    deck_repository: AsyncDeckRepository = Depends(deps.get_deck_repository),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Save generated flashcards to a deck.
+    
+    Cards that are near-duplicates of a card already in the deck (or of another
+    card in the request) are returned in `duplicates`; they are not saved unless
+    `skip_duplicates` is false.
     """
     try:
         # Create or get the deck
-        deck = deck_repository.get_by_name(db, name=request.deck_name, user_id=current_user.id)
+        deck = await deck_repository.get_by_name(name=request.deck_name, user_id=current_user.id)
         if not deck:
             deck_data = schemas.DeckCreate(
                 name=request.deck_name,
                 description=f"Generated flashcards for: {request.query}"
             )
-            deck = deck_repository.create(db, obj_in=deck_data, user_id=current_user.id)
+            deck = await deck_repository.create(obj_in=deck_data, user_id=current_user.id)
         
-        # Create flashcards
-        created_flashcards = []
-        for flashcard_data in request.flashcards:
-            flashcard_create = schemas.FlashcardCreate(
-                question=flashcard_data["question"],
-                answer=flashcard_data["answer"],
-                deck_id=deck.id
-            )
-            flashcard = flashcard_repository.create(db, obj_in=flashcard_create, user_id=current_user.id)
-            created_flashcards.append(flashcard)
+        # Check each new card against the LSH buckets of the deck's cached index;
+        # a deck not cached yet is hashed once, off the event loop
+        index = await deck_duplicate_index(
+            deck.id,
+            lambda: flashcard_repository.get_by_deck(deck_id=deck.id, limit=settings.DEDUP_MAX_DECK_CARDS),
+        )
+        unique, duplicates = deck_duplicate_indexes.split(index, request.flashcards)
         
-        return schemas.SaveFlashcardsResponse(
-            deck=deck,
-            flashcards=created_flashcards,
-            count=len(created_flashcards)
+        # Create flashcards in one transaction
+        created_flashcards = await flashcard_repository.bulk_create(
+            objs_in=[
+                schemas.FlashcardCreate(
+                    front=flashcard_data["question"],
+                    back=flashcard_data["answer"],
+                    deck_id=deck.id
+                )
+                for flashcard_data in (unique if request.skip_duplicates else request.flashcards)
+            ],
+            user_id=current_user.id
         )
         
+        return {
+            "deck": deck,
+            "flashcards": created_flashcards,
+            "count": len(created_flashcards),
+            "duplicates": duplicates,
+        }
+        
     except Exception as e:
         raise HTTPException(
             status_code=500,
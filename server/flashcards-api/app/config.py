@@ -17,16 +17,145 @@ class Settings(BaseSettings):
     # MongoDB specific settings
     MONGODB_URL: Optional[str] = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
     MONGODB_DB_NAME: str = os.getenv("MONGODB_DB_NAME", "flashcards")
+    # Lean reads: list and search reads project the response fields and build
+    # models without re-validating documents this app wrote (False: validate)
+    MONGO_LEAN_READS: bool = True
     
     # SQLite fallback
     SQLITE_URL: str = os.getenv("SQLITE_URL", "sqlite:///./data/flashcards.db")
+    # Tuned SQLite mode: WAL journal and per-connection PRAGMAs, a pool for the
+    # app plus a read-only pool for search queries (False: bare default engine)
+    SQLITE_TUNING_ENABLED: bool = True
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_CACHE_SIZE_KB: int = 65536
+    SQLITE_MMAP_SIZE_BYTES: int = 268435456
+    SQLITE_STATEMENT_CACHE_SIZE: int = 256
+    # SQLite has one writer at a time, so a large read-write pool only adds lock waits
+    SQLITE_POOL_SIZE: int = 5
+    SQLITE_MAX_OVERFLOW: int = 5
+    SQLITE_READ_POOL_SIZE: int = 8
+    SQLITE_POOL_TIMEOUT_SECONDS: float = 30.0
     
     # API Keys for search functionality
     OPENAI_API_KEY: Optional[str] = os.getenv("OPENAI_API_KEY")
     SERPAPI_KEY: Optional[str] = os.getenv("SERPAPI_KEY")
+    SERPAPI_TIMEOUT_SECONDS: float = 15.0
+    SERPAPI_BASE_URL: Optional[str] = None
+    
+    # OpenAI client (shared for the lifetime of the application)
+    OPENAI_BASE_URL: Optional[str] = None
+    OPENAI_MODEL: str = "gpt-3.5-turbo"
+    OPENAI_TIMEOUT_SECONDS: float = 30.0
+    OPENAI_MAX_RETRIES: int = 2
+    OPENAI_MAX_CONNECTIONS: int = 20
+    
+    # Outbound call governor: per-provider token bucket and concurrency cap,
+    # bounded admission queue and circuit breaker
+    SERPAPI_RATE_PER_SECOND: float = 5.0
+    SERPAPI_BURST: int = 10
+    SERPAPI_MAX_CONCURRENCY: int = 4
+    SERPAPI_SLOW_CALL_SECONDS: float = 5.0
+    OPENAI_RATE_PER_SECOND: float = 3.0
+    OPENAI_BURST: int = 6
+    OPENAI_MAX_CONCURRENCY: int = 8
+    OPENAI_SLOW_CALL_SECONDS: float = 20.0
+    GOVERNOR_MAX_QUEUE: int = 50
+    GOVERNOR_QUEUE_TIMEOUT_SECONDS: float = 5.0
+    BREAKER_WINDOW: int = 20
+    BREAKER_MIN_CALLS: int = 5
+    BREAKER_ERROR_RATE: float = 0.5
+    BREAKER_SLOW_CALL_RATE: float = 0.5
+    BREAKER_RESET_SECONDS: float = 30.0
+    
+    # Outbound page fetching for search-generated flashcards
+    FETCH_TIMEOUT_SECONDS: float = 10.0
+    FETCH_MAX_CONNECTIONS: int = 20
+    FETCH_MAX_CONNECTIONS_PER_HOST: int = 4
+    FETCH_MAX_BYTES: int = 512 * 1024
+    
+    # HTML text extraction (process pool; 0 workers extracts inline)
+    EXTRACT_PROCESS_WORKERS: int = 2
+    EXTRACT_MAX_CHARS: int = 20000
+    
+    # Passage selection: BM25-ranked page chunks packed into a prompt token budget
+    PROMPT_CONTENT_TOKEN_BUDGET: int = 400
+    PASSAGE_WORDS: int = 80
+    
+    # Near-duplicate flashcard detection (MinHash signatures with LSH banding)
+    DEDUP_THRESHOLD: float = 0.8
+    DEDUP_NUM_PERM: int = 64
+    DEDUP_BANDS: int = 16
+    DEDUP_MAX_DECK_CARDS: int = 10000
+    # Decks whose card signatures stay in memory, kept current by the flashcard write hooks
+    DEDUP_CACHED_DECKS: int = 256
+    
+    # Flashcard/deck search backend: "ilike" (database scan), "index" (in-process BM25 index)
+    # or "fts5" (SQLite FTS5 tables kept in sync by triggers; SQLite only)
+    SEARCH_BACKEND: str = "ilike"
+    SEARCH_INDEX_PATH: str = "./data/search_index.pkl"
+    # /search runs its flashcard, deck and user searches concurrently; each gets this long
+    SEARCH_SUB_QUERY_TIMEOUT_SECONDS: float = 2.0
+    # Threads for sub-searches without an async repository (the user search). A timed-out
+    # query keeps its thread and read connection until it finishes, so this caps how many
+    # connections slow searches can hold; keep it below SQLITE_READ_POOL_SIZE
+    SEARCH_WORKER_THREADS: int = 4
+    
+    # Typeahead suggestions (/search/suggest) from an in-memory prefix index over
+    # deck names and flashcard questions; keys start at each of the first N words
+    SUGGEST_INDEX_ENABLED: bool = True
+    SUGGEST_MAX_WORDS: int = 10
+    
+    # Typo-tolerant search (/search?fuzzy=true) from an in-memory trigram index; each
+    # query word is checked against at most FUZZY_MAX_CANDIDATES words by edit distance
+    # and a lookup stops after FUZZY_BUDGET_MS with the best matches found so far
+    FUZZY_SEARCH_ENABLED: bool = True
+    FUZZY_MAX_CANDIDATES: int = 50
+    FUZZY_BUDGET_MS: float = 50.0
+    
+    # Per-user LRU cache of /search responses; entries are dropped when this
+    # process writes the user's flashcards or decks (or any public deck), else
+    # after the TTL. Assumes a single process: with several uvicorn workers, or
+    # writes from scripts like dedupe_flashcards.py, results can be stale for up
+    # to the TTL (lower it, or disable the cache)
+    SEARCH_CACHE_ENABLED: bool = True
+    SEARCH_CACHE_TTL_SECONDS: float = 60
+    SEARCH_CACHE_MAX_ENTRIES: int = 5000
+    
+    # Deck lists with flashcards (/decks/with-flashcards): newest cards per deck
+    # by default, and the most a request may ask for
+    DECK_PREVIEW_CARDS: int = 5
+    DECK_PREVIEW_MAX_CARDS: int = 50
+    
+    # Cache of cleaned page text (in-memory LRU in front of a SQLite file)
+    CONTENT_CACHE_PATH: str = "./data/content_cache.db"
+    CONTENT_CACHE_TTL_SECONDS: int = 86400
+    CONTENT_CACHE_MEMORY_ENTRIES: int = 512
+    CONTENT_CACHE_DISK_ENTRIES: int = 20000
+    
+    # Cache of generated flashcard sets keyed by (normalized query, num_flashcards)
+    GENERATION_CACHE_TTL_SECONDS: int = 3600
+    GENERATION_CACHE_STALE_SECONDS: int = 600
+    GENERATION_CACHE_MAX_ENTRIES: int = 1000
+    
+    # Batch generation pipeline: workers per stage and queue size between stages
+    BATCH_MAX_ITEMS: int = 500
+    BATCH_SEARCH_CONCURRENCY: int = 4
+    BATCH_FETCH_CONCURRENCY: int = 8
+    BATCH_EXTRACT_CONCURRENCY: int = 4
+    BATCH_LLM_CONCURRENCY: int = 4
+    BATCH_QUEUE_SIZE: int = 16
+    
+    # Background generation jobs
+    JOB_WORKERS: int = 4
+    JOB_QUEUE_MAX_SIZE: int = 100
+    # Unfinished jobs whose queue has not renewed them for this long are failed
+    JOB_LEASE_SECONDS: int = 60
     
     class Config:
         env_file = ".env"
         case_sensitive = True
+        # .env also holds MONGO_URL/MONGO_DATABASE, read by app.db.database
+        extra = "ignore"
 
 settings = Settings()
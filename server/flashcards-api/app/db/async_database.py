@@ -0,0 +1,63 @@
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from app.config import settings
+from app.db.sqlite_tuning import can_open_read_only, engine_options, read_only_url, tune_sqlite_engine
+
+engine: Optional[AsyncEngine] = None
+read_engine: Optional[AsyncEngine] = None
+AsyncSessionLocal: Optional[async_sessionmaker] = None
+AsyncReadSessionLocal: Optional[async_sessionmaker] = None
+
+def async_url(url: str) -> str:
+    """The same database through its asyncio driver, e.g. sqlite:///x.db -> sqlite+aiosqlite:///x.db."""
+    if url.startswith("sqlite:"):
+        return "sqlite+aiosqlite:" + url[len("sqlite:"):]
+    return url
+
+def create_sqlite_async_engine(url: str, read_only: bool = False) -> AsyncEngine:
+    """Async engine for `url`, in the tuned SQLite mode unless SQLITE_TUNING_ENABLED is off."""
+    if not settings.SQLITE_TUNING_ENABLED:
+        return create_async_engine(async_url(url))
+    async_engine = create_async_engine(
+        async_url(read_only_url(url) if read_only else url), **engine_options(read_only)
+    )
+    tune_sqlite_engine(async_engine.sync_engine, read_only)
+    return async_engine
+
+def init_async_engine() -> async_sessionmaker:
+    """Create the asyncio engine and session factory for the SQLite database (called at startup)."""
+    global engine, AsyncSessionLocal
+    if AsyncSessionLocal is None:
+        engine = create_sqlite_async_engine(settings.SQLITE_URL)
+        # Rows outlive the per-call sessions of the async repositories
+        AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+    return AsyncSessionLocal
+
+def init_async_read_engine() -> async_sessionmaker:
+    """
+    Session factory on the read-only pool used by search and listing
+    queries, so they never wait for a pooled connection behind writes.
+    Falls back to the read-write factory when tuning is off or the database
+    cannot be opened read-only (in memory, or no file yet).
+    """
+    global read_engine, AsyncReadSessionLocal
+    if not settings.SQLITE_TUNING_ENABLED or not can_open_read_only(settings.SQLITE_URL):
+        return init_async_engine()
+    if AsyncReadSessionLocal is None:
+        # The read-write engine goes first: it switches the file to WAL
+        init_async_engine()
+        read_engine = create_sqlite_async_engine(settings.SQLITE_URL, read_only=True)
+        AsyncReadSessionLocal = async_sessionmaker(read_engine, expire_on_commit=False)
+    return AsyncReadSessionLocal
+
+async def close_async_engine():
+    global engine, read_engine, AsyncSessionLocal, AsyncReadSessionLocal
+    for async_engine in (read_engine, engine):
+        if async_engine is not None:
+            await async_engine.dispose()
+    engine = None
+    read_engine = None
+    AsyncSessionLocal = None
+    AsyncReadSessionLocal = None
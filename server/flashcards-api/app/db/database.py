@@ -1,7 +1,12 @@
 from motor.motor_asyncio import AsyncIOMotorClient
 from dotenv import load_dotenv
+from sqlalchemy import create_engine
+from sqlalchemy.orm import declarative_base, sessionmaker
 import os
 
+from app.config import settings
+from app.db.sqlite_tuning import can_open_read_only, engine_options, read_only_url, tune_sqlite_engine
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -12,3 +17,24 @@ DATABASE_NAME = os.getenv("MONGO_DATABASE", "flashcards")  # Default to "flashca
 # Initialize MongoDB client
 client = AsyncIOMotorClient(MONGO_URL)
 db = client[DATABASE_NAME]
+
+def create_sqlite_engine(url: str, read_only: bool = False):
+    """Engine for `url`, in the tuned SQLite mode unless SQLITE_TUNING_ENABLED is off."""
+    if not settings.SQLITE_TUNING_ENABLED:
+        return create_engine(url, connect_args={"check_same_thread": False})
+    engine = create_engine(read_only_url(url) if read_only else url, **engine_options(read_only))
+    tune_sqlite_engine(engine, read_only)
+    return engine
+
+# SQLite (DATABASE_TYPE=sqlite): SessionLocal for the app, ReadSessionLocal for
+# search queries on a separate read-only pool (the same engine for in-memory
+# databases and files not created yet)
+engine = create_sqlite_engine(settings.SQLITE_URL)
+read_engine = (
+    create_sqlite_engine(settings.SQLITE_URL, read_only=True)
+    if settings.SQLITE_TUNING_ENABLED and can_open_read_only(settings.SQLITE_URL)
+    else engine
+)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+Base = declarative_base()
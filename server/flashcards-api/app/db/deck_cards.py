@@ -0,0 +1,79 @@
+from typing import Any, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Query, Session, aliased
+
+from app.config import settings
+
+class DeckWithCards:
+    """
+    A deck with its newest flashcards and total card count. Other attributes
+    (id, name, created_at, ...) are read from the deck, so it serializes as
+    DeckWithFlashcards and works with next_cursor like the deck itself.
+    (Not a dataclass: FastAPI would turn it into a dict without those.)
+    """
+
+    def __init__(self, deck: Any, flashcards: Optional[List[Any]] = None, flashcard_count: int = 0):
+        self.deck = deck
+        self.flashcards = flashcards if flashcards is not None else []
+        self.flashcard_count = flashcard_count
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes not set in __init__; "deck" itself is missing only mid-copy
+        if name == "deck":
+            raise AttributeError(name)
+        return getattr(self.deck, name)
+
+def preview_size(cards_per_deck: Optional[int]) -> int:
+    """Cards to load per deck: DECK_PREVIEW_CARDS by default, at most DECK_PREVIEW_MAX_CARDS."""
+    if cards_per_deck is None:
+        return settings.DECK_PREVIEW_CARDS
+    return max(0, min(cards_per_deck, settings.DECK_PREVIEW_MAX_CARDS))
+
+def decks_with_flashcards(
+    db: Session, decks: Query, deck_model: Any, flashcard_model: Any, cards_per_deck: int
+) -> List[DeckWithCards]:
+    """
+    The decks of `decks` (a query already filtered, ordered and limited to
+    one page) with the newest `cards_per_deck` flashcards of each and their
+    card counts, in one statement. The page is a CTE, LEFT JOINed to the
+    cards picked per deck by a correlated ORDER BY ... LIMIT subquery and
+    counted by a correlated COUNT(). Both are seeks on the flashcards
+    (deck_id, created_at, id) index, so the cost grows with the preview
+    size, not with the size of the decks.
+    """
+    page = decks.cte("deck_page")
+    deck = aliased(deck_model, page)
+    card_count = (
+        select(func.count())
+        .select_from(flashcard_model)
+        .where(flashcard_model.deck_id == deck.id)
+        .correlate(page)
+        .scalar_subquery()
+    )
+    q = db.query(deck, card_count)
+    order = [deck.created_at.desc(), deck.id.desc()]
+    if cards_per_deck > 0:
+        newest = aliased(flashcard_model)
+        preview_ids = (
+            select(newest.id)
+            .where(newest.deck_id == deck.id)
+            .order_by(newest.created_at.desc(), newest.id.desc())
+            .limit(cards_per_deck)
+            .correlate(page)
+        )
+        q = q.add_entity(flashcard_model).outerjoin(flashcard_model, flashcard_model.id.in_(preview_ids))
+        order += [flashcard_model.created_at.desc(), flashcard_model.id.desc()]
+    rows = q.order_by(*order).all()
+
+    results = []
+    by_id = {}
+    for row in rows:
+        deck_row, count = row[0], row[1]
+        entry = by_id.get(deck_row.id)
+        if entry is None:
+            entry = by_id[deck_row.id] = DeckWithCards(deck_row, flashcard_count=count)
+            results.append(entry)
+        if cards_per_deck > 0 and row[2] is not None:
+            entry.flashcards.append(row[2])
+    return results
@@ -0,0 +1,165 @@
+import re
+import sqlite3
+from typing import Any, List, Optional, Sequence
+
+from sqlalchemy import column, literal_column, table as sql_table, text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+
+# Content table -> (FTS5 table, text columns)
+FTS_TABLES = {
+    "flashcards": ("flashcards_fts", ("front", "back")),
+    "decks": ("decks_fts", ("name", "description")),
+}
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+def _exists(conn, name: str) -> bool:
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,)).fetchone() is not None
+
+def fts_keys_table(fts_table: str) -> str:
+    """Table giving each content row's UUID id a stable integer key, used as the FTS rowid."""
+    return f"{fts_table}_ids"
+
+def fts_ddl(table: str, fts_table: str, columns: Sequence[str]) -> List[str]:
+    """
+    FTS5 table over `table` plus the triggers that keep it in sync on insert,
+    delete and update. The content tables have UUID primary keys, and the
+    implicit rowid behind them may be renumbered by VACUUM, so FTS rows are
+    keyed by an INTEGER PRIMARY KEY in fts_keys_table() that maps to the id.
+    The FTS table keeps its own copy of the text, for snippet().
+    """
+    keys = fts_keys_table(fts_table)
+    cols = ", ".join(columns)
+    new_values = ", ".join(f"new.{column}" for column in columns)
+    assignments = ", ".join(f"{column} = new.{column}" for column in columns)
+    return [
+        f"CREATE TABLE IF NOT EXISTS {keys} (rowid INTEGER PRIMARY KEY, id NOT NULL UNIQUE)",
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5("
+        f"{cols}, tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {keys}(id) VALUES (new.id); "
+        f"INSERT INTO {fts_table}(rowid, {cols}) "
+        f"VALUES ((SELECT rowid FROM {keys} WHERE id = new.id), {new_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_ad AFTER DELETE ON {table} BEGIN "
+        f"DELETE FROM {fts_table} WHERE rowid = (SELECT rowid FROM {keys} WHERE id = old.id); "
+        f"DELETE FROM {keys} WHERE id = old.id; END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_au AFTER UPDATE OF id, {cols} ON {table} BEGIN "
+        f"UPDATE {keys} SET id = new.id WHERE id = old.id; "
+        f"UPDATE {fts_table} SET {assignments} WHERE rowid = (SELECT rowid FROM {keys} WHERE id = new.id); END",
+    ]
+
+def _drop_fts(conn, fts_table: str):
+    for suffix in ("ai", "ad", "au"):
+        conn.execute(f"DROP TRIGGER IF EXISTS {fts_table}_{suffix}")
+    conn.execute(f"DROP TABLE IF EXISTS {fts_table}")
+    conn.execute(f"DROP TABLE IF EXISTS {fts_keys_table(fts_table)}")
+
+def _fill_fts(conn, table: str, fts_table: str, columns: Sequence[str]):
+    keys = fts_keys_table(fts_table)
+    cols = ", ".join(columns)
+    conn.execute(f"DELETE FROM {fts_table}")
+    conn.execute(f"DELETE FROM {keys}")
+    conn.execute(f"INSERT INTO {keys}(id) SELECT id FROM {table}")
+    conn.execute(
+        f"INSERT INTO {fts_table}(rowid, {cols}) "
+        f"SELECT {keys}.rowid, {', '.join(f'{table}.{column}' for column in columns)} "
+        f"FROM {keys} JOIN {table} ON {table}.id = {keys}.id"
+    )
+
+def ensure_fts(conn, rebuild: bool = False) -> List[str]:
+    """
+    Create the FTS5 tables and triggers on a SQLite DB-API connection if they
+    are missing, and fill newly created (or, with `rebuild`, all) tables from
+    the existing rows. Tables in the older external-content layout (joined
+    on the content rowid) are dropped and rebuilt. Returns the FTS tables
+    that were (re)built.
+    """
+    built = []
+    for table, (fts_table, columns) in FTS_TABLES.items():
+        if not _exists(conn, table):
+            continue
+        exists = _exists(conn, fts_table)
+        if exists and not _exists(conn, fts_keys_table(fts_table)):
+            _drop_fts(conn, fts_table)
+            exists = False
+        for statement in fts_ddl(table, fts_table, columns):
+            conn.execute(statement)
+        if rebuild or not exists:
+            _fill_fts(conn, table, fts_table, columns)
+            built.append(fts_table)
+    conn.commit()
+    return built
+
+def match_expression(query: str) -> Optional[str]:
+    """
+    FTS5 MATCH expression for free-text user input: every word becomes a
+    quoted term (so FTS syntax in the input is never interpreted) and all
+    of them must match. The last word also matches as a prefix, since it
+    is often still being typed; prefixes of every word would expand into
+    too many index terms to stay fast.
+    """
+    tokens = _TOKEN_RE.findall(query)
+    if not tokens:
+        return None
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+def fts_search(
+    db: Session,
+    model: Any,
+    query: str,
+    *filters: Any,
+    limit: int = 10,
+    offset: int = 0,
+    with_snippets: bool = False,
+) -> List[Any]:
+    """
+    Rows of `model` matching the query, best BM25 rank first (starting at
+    rank position `offset`), restricted by the extra SQLAlchemy `filters`. With `with_snippets`, returns
+    (row, snippet) pairs with matches wrapped in <b></b>.
+    """
+    table = model.__tablename__
+    fts_table = FTS_TABLES[table][0]
+    match = match_expression(query)
+    if match is None:
+        return []
+
+    q = db.query(model)
+    if with_snippets:
+        q = q.add_columns(literal_column(f"snippet({fts_table}, -1, '<b>', '</b>', '…', 12)"))
+    fts = sql_table(fts_table, column("rowid"))
+    keys = sql_table(fts_keys_table(fts_table), column("rowid"), column("id"))
+    return (
+        q.join(keys, keys.c.id == literal_column(f"{table}.id"))
+        .join(fts, fts.c.rowid == keys.c.rowid)
+        .filter(text(f"{fts_table} MATCH :match"), *filters)
+        .order_by(text(f"bm25({fts_table})"))
+        .offset(offset)
+        .limit(limit)
+        .params(match=match)
+        .all()
+    )
+
+def fts5_enabled() -> bool:
+    return settings.SEARCH_BACKEND.lower() == "fts5" and settings.DATABASE_TYPE.lower() != "mongodb"
+
+def setup_fts():
+    """Create missing FTS5 tables and triggers on the SQLite database (called from the startup hook)."""
+    if not fts5_enabled():
+        return
+    from app.db.repositories.jobs import sqlite_path_from_url
+
+    try:
+        conn = sqlite3.connect(sqlite_path_from_url(settings.SQLITE_URL))
+        try:
+            built = ensure_fts(conn)
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        print(f"⚠️ Could not set up full-text search tables: {e}")
+        return
+    if built:
+        print(f"✅ Built full-text search tables: {', '.join(built)}")
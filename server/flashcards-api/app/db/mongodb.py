@@ -3,6 +3,38 @@ from pymongo import MongoClient
 from typing import Optional
 from app.config import settings
 
+# Collection -> (keys, options) of each index. Keep in sync with mongo-init.js: an
+# index that exists with other options (e.g. text weights) makes create_index fail.
+INDEXES = {
+    "users": [
+        ("email", {"unique": True}),
+        ("username", {"unique": True}),
+        ([("created_at", -1)], {}),
+    ],
+    "decks": [
+        ("user_id", {}),
+        ("is_public", {}),
+        ("name", {}),
+        ([("created_at", -1)], {}),
+        # Compound indexes serve keyset pagination, newest first
+        ([("user_id", 1), ("created_at", -1), ("_id", -1)], {}),
+        ([("is_public", 1), ("created_at", -1), ("_id", -1)], {}),
+        ([("name", "text"), ("description", "text")], {"weights": {"name": 10, "description": 5}}),
+    ],
+    "flashcards": [
+        ("deck_id", {}),
+        ("user_id", {}),
+        ([("created_at", -1)], {}),
+        ([("user_id", 1), ("created_at", -1), ("_id", -1)], {}),
+        ([("deck_id", 1), ("created_at", -1), ("_id", -1)], {}),
+        ([("question", "text"), ("answer", "text")], {"weights": {"question": 10, "answer": 5}}),
+    ],
+    "jobs": [
+        ("status", {}),
+        ("user_id", {}),
+    ],
+}
+
 class MongoDB:
     client: Optional[AsyncIOMotorClient] = None
     sync_client: Optional[MongoClient] = None
@@ -38,30 +70,22 @@ class MongoDB:
 
     @classmethod
     async def _create_indexes(cls):
-        """Create database indexes for better performance."""
-        try:
-            # User indexes
-            await cls.database.users.create_index("email", unique=True)
-            await cls.database.users.create_index("username", unique=True)
-            
-            # Deck indexes
-            await cls.database.decks.create_index("user_id")
-            await cls.database.decks.create_index("is_public")
-            
-            # Flashcard indexes
-            await cls.database.flashcards.create_index("deck_id")
-            await cls.database.flashcards.create_index("user_id")
-            await cls.database.flashcards.create_index([("question", "text"), ("answer", "text")])
-            
+        """Create the indexes in INDEXES; mongo-init.js creates the same set."""
+        failed = 0
+        for collection, indexes in INDEXES.items():
+            for keys, options in indexes:
+                try:
+                    await cls.database[collection].create_index(keys, **options)
+                except Exception as e:
+                    failed += 1
+                    print(f"⚠️ Warning: Failed to create index {keys} on {collection}: {e}")
+        if not failed:
             print("✅ Database indexes created successfully!")
-            
-        except Exception as e:
-            print(f"⚠️ Warning: Failed to create indexes: {e}")
 
     @classmethod
     def get_collection(cls, collection_name: str):
         """Get a collection from the database."""
-        if not cls.database:
+        if cls.database is None:
             raise Exception("Database not connected. Call connect_to_mongo() first.")
         return cls.database[collection_name]
 
@@ -73,4 +97,7 @@ def get_decks_collection():
     return MongoDB.get_collection("decks")
 
 def get_flashcards_collection():
-    return MongoDB.get_collection("flashcards") 
\ No newline at end of file
+    return MongoDB.get_collection("flashcards")
+
+def get_jobs_collection():
+    return MongoDB.get_collection("jobs")
\ No newline at end of file
@@ -0,0 +1,56 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+class InvalidCursor(ValueError):
+    pass
+
+def encode_cursor(position: Dict[str, Any]) -> str:
+    data = json.dumps(position, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+def decode_cursor(cursor: Optional[str]) -> Dict[str, Any]:
+    if not cursor:
+        return {}
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        position = json.loads(data)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {e}")
+    if not isinstance(position, dict):
+        raise InvalidCursor("Invalid cursor")
+    return position
+
+def keyset_position(cursor: Optional[str]) -> Optional[Tuple[datetime, str]]:
+    """(created_at, id) of the last item of the previous page, or None for the first page."""
+    position = decode_cursor(cursor)
+    if not position:
+        return None
+    try:
+        return datetime.fromisoformat(position["t"]), str(position["i"])
+    except (KeyError, TypeError, ValueError):
+        raise InvalidCursor("Invalid cursor")
+
+def rank_offset(cursor: Optional[str]) -> int:
+    """Position in a ranked result list (search relevance) where the next page starts."""
+    position = decode_cursor(cursor)
+    offset = position.get("o", 0)
+    if not isinstance(offset, int) or offset < 0:
+        raise InvalidCursor("Invalid cursor")
+    return offset
+
+def next_cursor(items: List[Any], limit: int, cursor: Optional[str] = None, ranked: bool = False) -> Optional[str]:
+    """
+    Cursor for the page after `items`, or None when this was the last page.
+
+    Lists ordered by (created_at, id), newest first, continue after the
+    last item's key; ranked lists (search relevance) have no such key and
+    continue at the next rank position instead.
+    """
+    if len(items) < limit:
+        return None
+    if ranked:
+        return encode_cursor({"o": rank_offset(cursor) + len(items)})
+    last = items[-1]
+    return encode_cursor({"t": last.created_at.isoformat(), "i": str(last.id)})
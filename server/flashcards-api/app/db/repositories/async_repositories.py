@@ -0,0 +1,419 @@
+from typing import Any, Callable, Dict, List, Optional, Protocol, Union
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db.deck_cards import DeckWithCards
+from app.schemas.deck import Deck
+from app.schemas.flashcard import Flashcard
+
+class AsyncFlashcardRepository(Protocol):
+    """Flashcard storage as used by async routes; implemented for SQLite and MongoDB."""
+
+    # True when list reads return response schema models that need no further validation
+    lean_responses: bool
+
+    async def get(self, id: Any) -> Optional[Any]: ...
+
+    async def get_by_user(self, *, user_id: Any, limit: int = 100, cursor: Optional[str] = None) -> List[Any]: ...
+
+    async def get_by_deck(self, *, deck_id: Any, limit: int = 100, cursor: Optional[str] = None) -> List[Any]: ...
+
+    async def search(
+        self,
+        *,
+        query: str,
+        user_id: Optional[Any] = None,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        fuzzy: bool = False,
+    ) -> List[Any]: ...
+
+    async def create(self, *, obj_in: BaseModel, user_id: Any) -> Any: ...
+
+    async def bulk_create(self, *, objs_in: List[BaseModel], user_id: Any) -> List[Any]: ...
+
+    async def update(self, *, id: Any, obj_in: Union[BaseModel, Dict[str, Any]]) -> Optional[Any]: ...
+
+    async def remove(self, *, id: Any) -> bool: ...
+
+class AsyncDeckRepository(Protocol):
+    """Deck storage as used by async routes; implemented for SQLite and MongoDB."""
+
+    # True when list reads return response schema models that need no further validation
+    lean_responses: bool
+
+    async def get(self, id: Any) -> Optional[Any]: ...
+
+    async def get_by_user(self, *, user_id: Any, limit: int = 100, cursor: Optional[str] = None) -> List[Any]: ...
+
+    async def get_public_decks(self, *, limit: int = 100, cursor: Optional[str] = None) -> List[Any]: ...
+
+    async def get_by_user_with_flashcards(
+        self, *, user_id: Any, limit: int = 100, cursor: Optional[str] = None, cards_per_deck: Optional[int] = None
+    ) -> List[DeckWithCards]: ...
+
+    async def get_public_with_flashcards(
+        self, *, limit: int = 100, cursor: Optional[str] = None, cards_per_deck: Optional[int] = None
+    ) -> List[DeckWithCards]: ...
+
+    async def get_by_name(self, *, name: str, user_id: Any) -> Optional[Any]: ...
+
+    async def search(
+        self,
+        *,
+        query: str,
+        user_id: Optional[Any] = None,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        fuzzy: bool = False,
+    ) -> List[Any]: ...
+
+    async def create(self, *, obj_in: BaseModel, user_id: Any) -> Any: ...
+
+    async def update(self, *, id: Any, obj_in: Union[BaseModel, Dict[str, Any]]) -> Optional[Any]: ...
+
+    async def remove(self, *, id: Any) -> bool: ...
+
+class SQLAsyncRepository:
+    """
+    Async front for a sync SQL repository. Each call opens an AsyncSession
+    on the aiosqlite engine and runs the repository's query code through
+    `run_sync`, so the database work is awaited instead of blocking the
+    event loop, and the queries stay written once. Reads go through
+    `read_session_factory` when one is given (the read-only SQLite pool).
+    """
+
+    # ORM rows; the routes' response_model validates and encodes them
+    lean_responses = False
+
+    def __init__(
+        self,
+        repository: Any,
+        session_factory: Callable[[], Any],
+        read_session_factory: Optional[Callable[[], Any]] = None,
+    ):
+        self.repository = repository
+        self.session_factory = session_factory
+        self.read_session_factory = read_session_factory or session_factory
+
+    async def _run(self, work: Callable[[Session], Any]) -> Any:
+        async with self.session_factory() as session:
+            return await session.run_sync(work)
+
+    async def _read(self, work: Callable[[Session], Any]) -> Any:
+        async with self.read_session_factory() as session:
+            return await session.run_sync(work)
+
+    async def get(self, id: Any) -> Optional[Any]:
+        return await self._read(lambda db: self.repository.get(db, id=id))
+
+    async def get_by_user(self, *, user_id: Any, limit: int = 100, cursor: Optional[str] = None) -> List[Any]:
+        return await self._read(lambda db: self.repository.get_by_user(db, user_id=user_id, limit=limit, cursor=cursor))
+
+    async def search(
+        self,
+        *,
+        query: str,
+        user_id: Optional[Any] = None,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        fuzzy: bool = False,
+    ) -> List[Any]:
+        return await self._read(
+            lambda db: self.repository.search(db, query=query, user_id=user_id, limit=limit, cursor=cursor, fuzzy=fuzzy)
+        )
+
+    async def create(self, *, obj_in: BaseModel, user_id: Any) -> Any:
+        return await self._run(lambda db: self.repository.create(db, obj_in=obj_in, user_id=user_id))
+
+    async def update(self, *, id: Any, obj_in: Union[BaseModel, Dict[str, Any]]) -> Optional[Any]:
+        def update(db: Session) -> Optional[Any]:
+            db_obj = self.repository.get(db, id=id)
+            return self.repository.update(db, db_obj=db_obj, obj_in=obj_in) if db_obj is not None else None
+
+        return await self._run(update)
+
+    async def remove(self, *, id: Any) -> bool:
+        def remove(db: Session) -> bool:
+            if self.repository.get(db, id=id) is None:
+                return False
+            self.repository.remove(db, id=id)
+            return True
+
+        return await self._run(remove)
+
+class SQLAsyncFlashcardRepository(SQLAsyncRepository):
+    async def get_by_deck(self, *, deck_id: Any, limit: int = 100, cursor: Optional[str] = None) -> List[Any]:
+        return await self._read(lambda db: self.repository.get_by_deck(db, deck_id=deck_id, limit=limit, cursor=cursor))
+
+    async def bulk_create(self, *, objs_in: List[BaseModel], user_id: Any) -> List[Any]:
+        return await self._run(lambda db: self.repository.bulk_create(db, objs_in=objs_in, user_id=user_id))
+
+class SQLAsyncDeckRepository(SQLAsyncRepository):
+    async def get_public_decks(self, *, limit: int = 100, cursor: Optional[str] = None) -> List[Any]:
+        return await self._read(lambda db: self.repository.get_public_decks(db, limit=limit, cursor=cursor))
+
+    async def get_by_user_with_flashcards(
+        self, *, user_id: Any, limit: int = 100, cursor: Optional[str] = None, cards_per_deck: Optional[int] = None
+    ) -> List[DeckWithCards]:
+        return await self._read(
+            lambda db: self.repository.get_by_user_with_flashcards(
+                db, user_id=user_id, limit=limit, cursor=cursor, cards_per_deck=cards_per_deck
+            )
+        )
+
+    async def get_public_with_flashcards(
+        self, *, limit: int = 100, cursor: Optional[str] = None, cards_per_deck: Optional[int] = None
+    ) -> List[DeckWithCards]:
+        return await self._read(
+            lambda db: self.repository.get_public_with_flashcards(
+                db, limit=limit, cursor=cursor, cards_per_deck=cards_per_deck
+            )
+        )
+
+    async def get_by_name(self, *, name: str, user_id: Any) -> Optional[Any]:
+        return await self._read(lambda db: self.repository.get_by_name(db, name=name, user_id=user_id))
+
+def _owner_id(user_id: Any) -> Optional[str]:
+    """
+    `user_id` as the ObjectId string MongoDB documents are owned by, or None
+    when it is missing or not an ObjectId (e.g. a UUID from the SQL users
+    table), in which case the user owns no documents.
+    """
+    if user_id is None or not ObjectId.is_valid(str(user_id)):
+        return None
+    return str(user_id)
+
+# Flashcard schema fields -> MongoDB document fields (cards are stored as question/answer)
+FLASHCARD_DOCUMENT_FIELDS = {"front": "question", "back": "answer"}
+
+def _to_document(
+    obj_in: Union[BaseModel, Dict[str, Any]], user_id: Any = None, fields: Optional[Dict[str, str]] = None
+) -> Dict[str, Any]:
+    """
+    Request schema -> MongoDB document, with fields renamed by `fields` and
+    the reference fields stored as ObjectIds.
+    """
+    data = dict(obj_in) if isinstance(obj_in, dict) else obj_in.dict(exclude_unset=True)
+    data = jsonable_encoder(data)
+    if fields:
+        data = {fields.get(key, key): value for key, value in data.items()}
+    if user_id is not None:
+        data["user_id"] = user_id
+    for field in ("user_id", "deck_id"):
+        if data.get(field) is not None:
+            data[field] = ObjectId(str(data[field]))
+    return data
+
+def _flashcard_from_document(flashcard: Any) -> Optional[Flashcard]:
+    """MongoDB flashcard (question/answer, ObjectIds) -> the response schema (front/back, string ids)."""
+    if flashcard is None:
+        return None
+    return Flashcard.model_construct(
+        id=str(flashcard.id),
+        user_id=str(flashcard.user_id),
+        deck_id=str(flashcard.deck_id),
+        front=flashcard.question,
+        back=flashcard.answer,
+        created_at=flashcard.created_at,
+        updated_at=flashcard.updated_at,
+    )
+
+def _deck_from_document(deck: Any) -> Optional[Deck]:
+    """MongoDB deck -> the response schema, with string ids."""
+    if deck is None:
+        return None
+    return Deck.model_construct(
+        id=str(deck.id),
+        user_id=str(deck.user_id),
+        name=deck.name,
+        description=deck.description,
+        is_public=deck.is_public,
+        created_at=deck.created_at,
+        updated_at=deck.updated_at,
+    )
+
+def _deck_with_cards_from_document(deck: DeckWithCards) -> DeckWithCards:
+    return DeckWithCards(
+        _deck_from_document(deck.deck),
+        [_flashcard_from_document(flashcard) for flashcard in deck.flashcards],
+        deck.flashcard_count,
+    )
+
+class MongoAsyncFlashcardRepository:
+    """
+    AsyncFlashcardRepository over the Motor-based MongoFlashcardRepository.
+    Cards go in and come out with the same fields as on SQLite (front/back);
+    the documents store them as question/answer.
+    """
+
+    def __init__(self, repository: Any):
+        self.repository = repository
+
+    @property
+    def lean_responses(self) -> bool:
+        # The adapters build the response schemas with model_construct
+        return settings.MONGO_LEAN_READS
+
+    async def get(self, id: Any) -> Optional[Any]:
+        return _flashcard_from_document(await self.repository.get_by_id(str(id)))
+
+    async def get_by_user(self, *, user_id: Any, limit: int = 100, cursor: Optional[str] = None) -> List[Any]:
+        owner_id = _owner_id(user_id)
+        if owner_id is None:
+            return []
+        flashcards = await self.repository.get_by_user(owner_id, limit=limit, cursor=cursor)
+        return [_flashcard_from_document(flashcard) for flashcard in flashcards]
+
+    async def get_by_deck(self, *, deck_id: Any, limit: int = 100, cursor: Optional[str] = None) -> List[Any]:
+        flashcards = await self.repository.get_by_deck(str(deck_id), limit=limit, cursor=cursor)
+        return [_flashcard_from_document(flashcard) for flashcard in flashcards]
+
+    async def search(
+        self,
+        *,
+        query: str,
+        user_id: Optional[Any] = None,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        fuzzy: bool = False,
+    ) -> List[Any]:
+        owner_id = _owner_id(user_id)
+        if user_id is not None and owner_id is None:
+            return []
+        flashcards = await self.repository.search(query, user_id=owner_id, limit=limit, cursor=cursor, fuzzy=fuzzy)
+        return [_flashcard_from_document(flashcard) for flashcard in flashcards]
+
+    async def create(self, *, obj_in: BaseModel, user_id: Any) -> Any:
+        return _flashcard_from_document(
+            await self.repository.create(_to_document(obj_in, user_id, FLASHCARD_DOCUMENT_FIELDS))
+        )
+
+    async def bulk_create(self, *, objs_in: List[BaseModel], user_id: Any) -> List[Any]:
+        flashcards = await self.repository.bulk_create(
+            [_to_document(obj_in, user_id, FLASHCARD_DOCUMENT_FIELDS) for obj_in in objs_in]
+        )
+        return [_flashcard_from_document(flashcard) for flashcard in flashcards]
+
+    async def update(self, *, id: Any, obj_in: Union[BaseModel, Dict[str, Any]]) -> Optional[Any]:
+        return _flashcard_from_document(
+            await self.repository.update(str(id), _to_document(obj_in, fields=FLASHCARD_DOCUMENT_FIELDS))
+        )
+
+    async def remove(self, *, id: Any) -> bool:
+        return await self.repository.delete(str(id))
+
+class MongoAsyncDeckRepository:
+    """AsyncDeckRepository over the Motor-based MongoDeckRepository, returning the SQLite response shapes."""
+
+    def __init__(self, repository: Any):
+        self.repository = repository
+
+    @property
+    def lean_responses(self) -> bool:
+        # The adapters build the response schemas with model_construct
+        return settings.MONGO_LEAN_READS
+
+    async def get(self, id: Any) -> Optional[Any]:
+        return _deck_from_document(await self.repository.get_by_id(str(id)))
+
+    async def get_by_user(self, *, user_id: Any, limit: int = 100, cursor: Optional[str] = None) -> List[Any]:
+        owner_id = _owner_id(user_id)
+        if owner_id is None:
+            return []
+        decks = await self.repository.get_by_user(owner_id, limit=limit, cursor=cursor)
+        return [_deck_from_document(deck) for deck in decks]
+
+    async def get_public_decks(self, *, limit: int = 100, cursor: Optional[str] = None) -> List[Any]:
+        decks = await self.repository.get_public_decks(limit=limit, cursor=cursor)
+        return [_deck_from_document(deck) for deck in decks]
+
+    async def get_by_user_with_flashcards(
+        self, *, user_id: Any, limit: int = 100, cursor: Optional[str] = None, cards_per_deck: Optional[int] = None
+    ) -> List[DeckWithCards]:
+        owner_id = _owner_id(user_id)
+        if owner_id is None:
+            return []
+        decks = await self.repository.get_by_user_with_flashcards(
+            owner_id, limit=limit, cursor=cursor, cards_per_deck=cards_per_deck
+        )
+        return [_deck_with_cards_from_document(deck) for deck in decks]
+
+    async def get_public_with_flashcards(
+        self, *, limit: int = 100, cursor: Optional[str] = None, cards_per_deck: Optional[int] = None
+    ) -> List[DeckWithCards]:
+        decks = await self.repository.get_public_with_flashcards(limit=limit, cursor=cursor, cards_per_deck=cards_per_deck)
+        return [_deck_with_cards_from_document(deck) for deck in decks]
+
+    async def get_by_name(self, *, name: str, user_id: Any) -> Optional[Any]:
+        owner_id = _owner_id(user_id)
+        if owner_id is None:
+            return None
+        return _deck_from_document(await self.repository.get_by_name(name, owner_id))
+
+    async def search(
+        self,
+        *,
+        query: str,
+        user_id: Optional[Any] = None,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        fuzzy: bool = False,
+    ) -> List[Any]:
+        # A user who owns no decks still finds the public ones
+        decks = await self.repository.search(
+            query, user_id=_owner_id(user_id), limit=limit, cursor=cursor, fuzzy=fuzzy
+        )
+        return [_deck_from_document(deck) for deck in decks]
+
+    async def create(self, *, obj_in: BaseModel, user_id: Any) -> Any:
+        return _deck_from_document(await self.repository.create(_to_document(obj_in, user_id)))
+
+    async def update(self, *, id: Any, obj_in: Union[BaseModel, Dict[str, Any]]) -> Optional[Any]:
+        return _deck_from_document(await self.repository.update(str(id), _to_document(obj_in)))
+
+    async def remove(self, *, id: Any) -> bool:
+        return await self.repository.delete(str(id))
+
+_flashcard_repository: Optional[AsyncFlashcardRepository] = None
+_deck_repository: Optional[AsyncDeckRepository] = None
+
+def init_async_repositories():
+    """
+    Create the async flashcard and deck repositories for settings.DATABASE_TYPE
+    (called from the startup hook, after the database connection is up).
+    """
+    global _flashcard_repository, _deck_repository
+    if settings.DATABASE_TYPE.lower() == "mongodb":
+        from app.db.repositories.mongo_repositories import MongoDeckRepository, MongoFlashcardRepository
+
+        _flashcard_repository = MongoAsyncFlashcardRepository(MongoFlashcardRepository())
+        _deck_repository = MongoAsyncDeckRepository(MongoDeckRepository())
+    else:
+        from app.db.async_database import init_async_engine, init_async_read_engine
+        from app.db.repositories.decks import deck_repository
+        from app.db.repositories.flashcards import flashcard_repository
+
+        session_factory = init_async_engine()
+        read_session_factory = init_async_read_engine()
+        _flashcard_repository = SQLAsyncFlashcardRepository(flashcard_repository, session_factory, read_session_factory)
+        _deck_repository = SQLAsyncDeckRepository(deck_repository, session_factory, read_session_factory)
+
+async def close_async_repositories():
+    global _flashcard_repository, _deck_repository
+    _flashcard_repository = None
+    _deck_repository = None
+    if settings.DATABASE_TYPE.lower() != "mongodb":
+        from app.db.async_database import close_async_engine
+
+        await close_async_engine()
+
+def current_flashcard_repository() -> Optional[AsyncFlashcardRepository]:
+    return _flashcard_repository
+
+def current_deck_repository() -> Optional[AsyncDeckRepository]:
+    return _deck_repository
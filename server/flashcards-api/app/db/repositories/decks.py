@@ -1,34 +1,66 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Union
 from sqlalchemy.orm import Session
 from uuid import UUID
 
 from .base import BaseRepository
 from app.models.deck import Deck
+from app.models.flashcard import Flashcard
 from app.schemas.deck import DeckCreate, DeckUpdate
+from app.db.deck_cards import DeckWithCards, decks_with_flashcards, preview_size
+from app.db.fts import fts5_enabled, fts_search
+from app.db.pagination import rank_offset
+from app.services.fuzzy_index import fuzzy_index, fuzzy_search_enabled
+from app.services.near_duplicates import deck_duplicate_indexes
+from app.services.search_cache import search_cache_enabled, search_result_cache
+from app.services.search_index import search_index, search_index_enabled
+from app.services.suggest_index import suggest_index, suggest_index_enabled
 
 class DeckRepository(BaseRepository[Deck, DeckCreate, DeckUpdate]):
     def get_by_user(
-        self, db: Session, *, user_id: UUID, skip: int = 0, limit: int = 100
+        self, db: Session, *, user_id: UUID, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
     ) -> List[Deck]:
         return (
-            db.query(Deck)
-            .filter(Deck.user_id == user_id)
+            self._keyset(db.query(Deck).filter(Deck.user_id == user_id), cursor)
             .offset(skip)
             .limit(limit)
             .all()
         )
         
     def get_public_decks(
-        self, db: Session, *, skip: int = 0, limit: int = 100
+        self, db: Session, *, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
     ) -> List[Deck]:
         return (
-            db.query(Deck)
-            .filter(Deck.is_public == True)
+            self._keyset(db.query(Deck).filter(Deck.is_public == True), cursor)
             .offset(skip)
             .limit(limit)
             .all()
         )
         
+    def get_by_user_with_flashcards(
+        self,
+        db: Session,
+        *,
+        user_id: UUID,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        cards_per_deck: Optional[int] = None,
+    ) -> List[DeckWithCards]:
+        """A page of the user's decks with their newest flashcards and card counts, in one query."""
+        decks = self._keyset(db.query(Deck).filter(Deck.user_id == user_id), cursor).limit(limit)
+        return decks_with_flashcards(db, decks, Deck, Flashcard, preview_size(cards_per_deck))
+        
+    def get_public_with_flashcards(
+        self,
+        db: Session,
+        *,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        cards_per_deck: Optional[int] = None,
+    ) -> List[DeckWithCards]:
+        """A page of public decks with their newest flashcards and card counts, in one query."""
+        decks = self._keyset(db.query(Deck).filter(Deck.is_public == True), cursor).limit(limit)
+        return decks_with_flashcards(db, decks, Deck, Flashcard, preview_size(cards_per_deck))
+        
     def get_by_name(
         self, db: Session, *, name: str, user_id: UUID
     ) -> Optional[Deck]:
@@ -39,22 +71,68 @@ class DeckRepository(BaseRepository[Deck, DeckCreate, DeckUpdate]):
         )
         
     def search(
-        self, db: Session, *, query: str, user_id: Optional[UUID] = None, limit: int = 10
+        self,
+        db: Session,
+        *,
+        query: str,
+        user_id: Optional[UUID] = None,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        fuzzy: bool = False,
     ) -> List[Deck]:
-        q = db.query(Deck)
+        if fuzzy:
+            ids = fuzzy_index.search(query, "deck", user_id=user_id, limit=limit, offset=rank_offset(cursor))
+            return self.get_ranked(db, ids)
+        if search_index_enabled():
+            offset = rank_offset(cursor)
+            ids = search_index.search_decks(query, user_id=user_id, limit=offset + limit)
+            return self.get_ranked(db, ids[offset:])
         
         if user_id:
-            q = q.filter((Deck.user_id == user_id) | (Deck.is_public == True))
+            visible = (Deck.user_id == user_id) | (Deck.is_public == True)
         else:
-            q = q.filter(Deck.is_public == True)
+            visible = Deck.is_public == True
+        if fts5_enabled():
+            return fts_search(db, Deck, query, visible, limit=limit, offset=rank_offset(cursor))
             
         return (
-            q.filter(
+            self._keyset(db.query(Deck), cursor)
+            .filter(visible)
+            .filter(
                 (Deck.name.ilike(f"%{query}%")) | 
                 (Deck.description.ilike(f"%{query}%"))
             )
             .limit(limit)
             .all()
         )
+        
+    def update(self, db: Session, *, db_obj: Deck, obj_in: Union[DeckUpdate, Dict[str, Any]]) -> Deck:
+        was_public = db_obj.is_public
+        deck = super().update(db, db_obj=db_obj, obj_in=obj_in)
+        # A deck that stopped being public must leave other users' cached results too
+        if was_public and not deck.is_public and search_cache_enabled():
+            search_result_cache.invalidate_public()
+        return deck
+        
+    def _after_write(self, db_obj: Deck):
+        if search_index_enabled():
+            search_index.index_deck(db_obj.id, db_obj.user_id, db_obj.is_public, db_obj.name, db_obj.description)
+        if suggest_index_enabled():
+            suggest_index.index_deck(db_obj.id, db_obj.user_id, db_obj.is_public, db_obj.name)
+        if fuzzy_search_enabled():
+            fuzzy_index.index_deck(db_obj.id, db_obj.user_id, db_obj.is_public, db_obj.name, db_obj.description)
+        if search_cache_enabled():
+            search_result_cache.invalidate_deck(db_obj.user_id, db_obj.is_public)
+        
+    def _after_delete(self, obj: Deck):
+        if search_index_enabled():
+            search_index.remove_deck(obj.id)
+        if suggest_index_enabled():
+            suggest_index.remove_deck(obj.id)
+        if fuzzy_search_enabled():
+            fuzzy_index.remove_deck(obj.id)
+        deck_duplicate_indexes.remove_deck(obj.id)
+        if search_cache_enabled():
+            search_result_cache.invalidate_deck(obj.user_id, obj.is_public)
 
 deck_repository = DeckRepository(Deck)
@@ -5,45 +5,91 @@ from uuid import UUID
 from .base import BaseRepository
 from app.models.flashcard import Flashcard
 from app.schemas.flashcard import FlashcardCreate, FlashcardUpdate
+from app.db.fts import fts5_enabled, fts_search
+from app.db.pagination import rank_offset
+from app.services.fuzzy_index import fuzzy_index, fuzzy_search_enabled
+from app.services.near_duplicates import deck_duplicate_indexes
+from app.services.search_cache import search_cache_enabled, search_result_cache
+from app.services.search_index import search_index, search_index_enabled
+from app.services.suggest_index import suggest_index, suggest_index_enabled
 
 class FlashcardRepository(BaseRepository[Flashcard, FlashcardCreate, FlashcardUpdate]):
     def get_by_user(
-        self, db: Session, *, user_id: UUID, skip: int = 0, limit: int = 100
+        self, db: Session, *, user_id: UUID, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
     ) -> List[Flashcard]:
         return (
-            db.query(Flashcard)
-            .filter(Flashcard.user_id == user_id)
+            self._keyset(db.query(Flashcard).filter(Flashcard.user_id == user_id), cursor)
             .offset(skip)
             .limit(limit)
             .all()
         )
         
     def get_by_deck(
-        self, db: Session, *, deck_id: UUID, skip: int = 0, limit: int = 100
+        self, db: Session, *, deck_id: UUID, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
     ) -> List[Flashcard]:
         return (
-            db.query(Flashcard)
-            .filter(Flashcard.deck_id == deck_id)
+            self._keyset(db.query(Flashcard).filter(Flashcard.deck_id == deck_id), cursor)
             .offset(skip)
             .limit(limit)
             .all()
         )
         
     def search(
-        self, db: Session, *, query: str, user_id: Optional[UUID] = None, limit: int = 10
+        self,
+        db: Session,
+        *,
+        query: str,
+        user_id: Optional[UUID] = None,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        fuzzy: bool = False,
     ) -> List[Flashcard]:
+        if fuzzy:
+            ids = fuzzy_index.search(query, "flashcard", user_id=user_id, limit=limit, offset=rank_offset(cursor))
+            return self.get_ranked(db, ids)
+        if search_index_enabled():
+            offset = rank_offset(cursor)
+            ids = search_index.search_flashcards(query, user_id=user_id, limit=offset + limit)
+            return self.get_ranked(db, ids[offset:])
+        if fts5_enabled():
+            filters = [Flashcard.user_id == user_id] if user_id else []
+            return fts_search(db, Flashcard, query, *filters, limit=limit, offset=rank_offset(cursor))
+        
         q = db.query(Flashcard)
         
         if user_id:
             q = q.filter(Flashcard.user_id == user_id)
             
         return (
-            q.filter(
+            self._keyset(q, cursor)
+            .filter(
                 (Flashcard.front.ilike(f"%{query}%")) | 
                 (Flashcard.back.ilike(f"%{query}%"))
             )
             .limit(limit)
             .all()
         )
+        
+    def _after_write(self, db_obj: Flashcard):
+        if search_index_enabled():
+            search_index.index_flashcard(db_obj.id, db_obj.user_id, db_obj.front, db_obj.back)
+        if suggest_index_enabled():
+            suggest_index.index_flashcard(db_obj.id, db_obj.user_id, db_obj.front)
+        if fuzzy_search_enabled():
+            fuzzy_index.index_flashcard(db_obj.id, db_obj.user_id, db_obj.front, db_obj.back)
+        deck_duplicate_indexes.index_flashcard(db_obj.id, db_obj.deck_id, db_obj.front, db_obj.back)
+        if search_cache_enabled():
+            search_result_cache.invalidate_user(db_obj.user_id)
+        
+    def _after_delete(self, obj: Flashcard):
+        if search_index_enabled():
+            search_index.remove_flashcard(obj.id)
+        if suggest_index_enabled():
+            suggest_index.remove_flashcard(obj.id)
+        if fuzzy_search_enabled():
+            fuzzy_index.remove_flashcard(obj.id)
+        deck_duplicate_indexes.remove_flashcard(obj.id)
+        if search_cache_enabled():
+            search_result_cache.invalidate_user(obj.user_id)
 
 flashcard_repository = FlashcardRepository(Flashcard)
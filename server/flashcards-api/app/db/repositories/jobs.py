@@ -0,0 +1,171 @@
+import asyncio
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import JSON, Column, DateTime, Integer, String, inspect, or_, text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db.database import Base, SessionLocal
+from app.db.mongodb import get_jobs_collection
+
+UNFINISHED = ("queued", "running")
+
+class MongoJobRepository:
+    """Generation jobs stored in the `jobs` collection, keyed by job id."""
+
+    def __init__(self):
+        self.collection = get_jobs_collection()
+
+    async def create(self, job_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Create a new job."""
+        await self.collection.insert_one({**job_data, "_id": job_data["id"]})
+        return job_data
+
+    async def get_by_id(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get job by ID."""
+        job_data = await self.collection.find_one({"_id": job_id})
+        if not job_data:
+            return None
+        job_data["id"] = job_data.pop("_id")
+        return job_data
+
+    async def update(self, job_id: str, update_data: Dict[str, Any]):
+        """Update job."""
+        await self.collection.update_one({"_id": job_id}, {"$set": update_data})
+
+    async def renew(self, owner: str, heartbeat_at: datetime):
+        """Extend the lease of the owner's queued and running jobs."""
+        await self.collection.update_many(
+            {"owner": owner, "status": {"$in": list(UNFINISHED)}},
+            {"$set": {"heartbeat_at": heartbeat_at}}
+        )
+
+    async def fail_unfinished(self, error: str, stale_before: datetime) -> int:
+        """Mark queued or running jobs whose owner stopped renewing them before `stale_before` as failed."""
+        result = await self.collection.update_many(
+            {
+                "status": {"$in": list(UNFINISHED)},
+                "$or": [{"heartbeat_at": {"$lt": stale_before}}, {"heartbeat_at": None}],
+            },
+            {"$set": {"status": "failed", "error": error, "finished_at": datetime.utcnow()}}
+        )
+        return result.modified_count
+
+class GenerationJob(Base):
+    __tablename__ = "generation_jobs"
+
+    id = Column(String, primary_key=True)
+    user_id = Column(String, nullable=False)
+    query = Column(String, nullable=False)
+    num_flashcards = Column(Integer, nullable=False)
+    status = Column(String, nullable=False, index=True)
+    flashcards = Column(JSON, nullable=False, default=list)
+    error = Column(String)
+    created_at = Column(DateTime, nullable=False)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    # The queue holding the job, and when it last renewed its lease
+    owner = Column(String)
+    heartbeat_at = Column(DateTime)
+
+class SQLiteJobRepository:
+    """
+    Generation jobs stored in a `generation_jobs` table of the SQLite database.
+    Queries run on a session in a worker thread so they never block the event loop.
+    """
+
+    COLUMNS = [column.name for column in GenerationJob.__table__.columns]
+
+    def __init__(self, session_factory: Callable[[], Session]):
+        self.session_factory = session_factory
+        with session_factory() as db:
+            self._create_table(db)
+
+    @staticmethod
+    def _create_table(db: Session):
+        """Create the table, or add the lease columns to one created before they existed."""
+        bind = db.get_bind()
+        GenerationJob.__table__.create(bind, checkfirst=True)
+        existing = {column["name"] for column in inspect(bind).get_columns(GenerationJob.__tablename__)}
+        for column in ("owner", "heartbeat_at"):
+            if column not in existing:
+                column_type = GenerationJob.__table__.c[column].type.compile(bind.dialect)
+                db.execute(text(f"ALTER TABLE {GenerationJob.__tablename__} ADD COLUMN {column} {column_type}"))
+        db.commit()
+
+    async def _run(self, work: Callable[[Session], Any]) -> Any:
+        def run():
+            with self.session_factory() as db:
+                return work(db)
+
+        return await asyncio.to_thread(run)
+
+    def _to_dict(self, job: GenerationJob) -> Dict[str, Any]:
+        return {column: getattr(job, column) for column in self.COLUMNS}
+
+    async def create(self, job_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Create a new job."""
+        def create(db: Session):
+            db.add(GenerationJob(**{column: job_data[column] for column in self.COLUMNS if column in job_data}))
+            db.commit()
+
+        await self._run(create)
+        return job_data
+
+    async def get_by_id(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get job by ID."""
+        def get(db: Session) -> Optional[Dict[str, Any]]:
+            job = db.get(GenerationJob, job_id)
+            return self._to_dict(job) if job is not None else None
+
+        return await self._run(get)
+
+    async def update(self, job_id: str, update_data: Dict[str, Any]):
+        """Update job."""
+        def update(db: Session):
+            db.query(GenerationJob).filter(GenerationJob.id == job_id).update(update_data, synchronize_session=False)
+            db.commit()
+
+        await self._run(update)
+
+    async def renew(self, owner: str, heartbeat_at: datetime):
+        """Extend the lease of the owner's queued and running jobs."""
+        def renew(db: Session):
+            (
+                db.query(GenerationJob)
+                .filter(GenerationJob.owner == owner, GenerationJob.status.in_(UNFINISHED))
+                .update({"heartbeat_at": heartbeat_at}, synchronize_session=False)
+            )
+            db.commit()
+
+        await self._run(renew)
+
+    async def fail_unfinished(self, error: str, stale_before: datetime) -> int:
+        """Mark queued or running jobs whose owner stopped renewing them before `stale_before` as failed."""
+        def fail(db: Session) -> int:
+            count = (
+                db.query(GenerationJob)
+                .filter(
+                    GenerationJob.status.in_(UNFINISHED),
+                    or_(GenerationJob.heartbeat_at.is_(None), GenerationJob.heartbeat_at < stale_before),
+                )
+                .update(
+                    {"status": "failed", "error": error, "finished_at": datetime.utcnow()},
+                    synchronize_session=False,
+                )
+            )
+            db.commit()
+            return count
+
+        return await self._run(fail)
+
+def sqlite_path_from_url(url: str) -> str:
+    """Turn a SQLAlchemy URL such as sqlite:///./data/flashcards.db into a file path."""
+    return url.split(":///", 1)[1] if ":///" in url else ":memory:"
+
+def get_job_repository():
+    """Job repository for the configured database."""
+    if settings.DATABASE_TYPE.lower() == "mongodb":
+        return MongoJobRepository()
+    return SQLiteJobRepository(SessionLocal)
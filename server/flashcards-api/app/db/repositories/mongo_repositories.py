@@ -1,8 +1,121 @@
-from typing import List, Optional, Dict, Any
+import re
+from typing import List, Optional, Dict, Any, Sequence, Type
 from bson import ObjectId
+from bson.errors import InvalidId
 from datetime import datetime
+from pydantic import BaseModel
+from app.config import settings
+from app.db.deck_cards import DeckWithCards, preview_size
 from app.db.mongodb import get_users_collection, get_decks_collection, get_flashcards_collection
+from app.db.pagination import InvalidCursor, keyset_position, rank_offset
 from app.models.mongo_models import UserMongo, DeckMongo, FlashcardMongo, PyObjectId
+from app.services.fuzzy_index import fuzzy_index, fuzzy_search_enabled
+from app.services.near_duplicates import deck_duplicate_indexes
+from app.services.search_cache import search_cache_enabled, search_result_cache
+from app.services.search_index import search_index, search_index_enabled
+from app.services.suggest_index import suggest_index, suggest_index_enabled
+
+# Newest first; matches the compound (..., created_at, _id) indexes
+KEYSET_SORT = [("created_at", -1), ("_id", -1)]
+
+def _after_cursor(query: Dict[str, Any], cursor: Optional[str]) -> Dict[str, Any]:
+    """Add the condition that continues after the (created_at, _id) of the cursor's last document."""
+    position = keyset_position(cursor)
+    if position is None:
+        return query
+    created_at, id = position
+    try:
+        id = ObjectId(id)
+    except (InvalidId, TypeError):
+        raise InvalidCursor("Invalid cursor")
+    after = {"$or": [{"created_at": {"$lt": created_at}}, {"created_at": created_at, "_id": {"$lt": id}}]}
+    return {"$and": [query, after]} if query else after
+
+# Fields list and search reads return; whatever else a document carries stays in the database
+DECK_FIELDS = ("name", "description", "user_id", "is_public", "created_at", "updated_at")
+FLASHCARD_FIELDS = ("question", "answer", "deck_id", "user_id", "created_at", "updated_at")
+
+def lean_reads_enabled() -> bool:
+    return settings.MONGO_LEAN_READS
+
+def projection(fields: Sequence[str]) -> Optional[Dict[str, Any]]:
+    """find() projection of `fields` in lean mode; None (whole documents) otherwise."""
+    return {field: 1 for field in fields} if lean_reads_enabled() else None
+
+def from_document(model: Type[BaseModel], data: Dict[str, Any]) -> Any:
+    """
+    Model for a document read back from our own collections. Documents are
+    validated when they are written, so lean mode builds the model with
+    `model_construct` instead of validating every field again.
+    """
+    return model.model_construct(**data) if lean_reads_enabled() else model(**data)
+
+async def find_page(
+    collection,
+    query: Dict[str, Any],
+    fields: Sequence[str],
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """One page of documents matching `query`, newest first, after the page `cursor` points at."""
+    found = collection.find(_after_cursor(query, cursor), projection(fields)).sort(KEYSET_SORT).skip(skip).limit(limit)
+    # to_list fetches whole batches instead of awaiting each document
+    return await found.to_list(length=None)
+
+# $lookup of a deck's flashcards (MongoDB 5.0+ form: the sub-pipeline runs on the deck_id index)
+DECK_CARDS_LOOKUP = {"from": "flashcards", "localField": "_id", "foreignField": "deck_id"}
+
+TEXT_SCORE = {"$meta": "textScore"}
+
+def text_search_cursor(
+    collection,
+    search_filter: Dict[str, Any],
+    query: str,
+    skip: int = 0,
+    limit: int = 10,
+    fields: Sequence[str] = (),
+):
+    """
+    Cursor over the documents matching `search_filter` and the `$text`
+    query, best textScore first (then newest _id, so pages are stable),
+    with the score projected as `score`.
+    """
+    return (
+        collection.find(
+            {**search_filter, "$text": {"$search": query}}, {**(projection(fields) or {}), "score": TEXT_SCORE}
+        )
+        .sort([("score", TEXT_SCORE), ("_id", -1)])
+        .skip(skip)
+        .limit(limit)
+    )
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+def highlight_snippet(texts: Sequence[Optional[str]], query: str, words: int = 12) -> Optional[str]:
+    """
+    Excerpt of up to `words` words around the first query match in `texts`,
+    with matching words wrapped in <b></b> like the FTS5 snippets. $text
+    matches stems, so a word also counts when it starts with a query word.
+    """
+    terms = [term.lower() for term in _WORD_RE.findall(query)]
+    if not terms:
+        return None
+    for text in texts:
+        tokens = (text or "").split()
+        hits = [
+            any(word.startswith(term) for term in terms for word in _WORD_RE.findall(token.lower()))
+            for token in tokens
+        ]
+        if not any(hits):
+            continue
+        start = max(0, min(hits.index(True) - words // 3, len(tokens) - words))
+        end = min(len(tokens), start + words)
+        excerpt = " ".join(
+            f"<b>{token}</b>" if hit else token for token, hit in zip(tokens[start:end], hits[start:end])
+        )
+        return ("…" if start > 0 else "") + excerpt + ("…" if end < len(tokens) else "")
+    return None
 
 class MongoUserRepository:
     def __init__(self):
@@ -21,19 +134,19 @@ class MongoUserRepository:
         """Get user by ID."""
         try:
             user_data = await self.collection.find_one({"_id": ObjectId(user_id)})
-            return UserMongo(**user_data) if user_data else None
+            return from_document(UserMongo, user_data) if user_data else None
         except:
             return None
 
     async def get_by_email(self, email: str) -> Optional[UserMongo]:
         """Get user by email."""
         user_data = await self.collection.find_one({"email": email})
-        return UserMongo(**user_data) if user_data else None
+        return from_document(UserMongo, user_data) if user_data else None
 
     async def get_by_username(self, username: str) -> Optional[UserMongo]:
         """Get user by username."""
         user_data = await self.collection.find_one({"username": username})
-        return UserMongo(**user_data) if user_data else None
+        return from_document(UserMongo, user_data) if user_data else None
 
     async def update(self, user_id: str, update_data: Dict[str, Any]) -> Optional[UserMongo]:
         """Update user."""
@@ -59,23 +172,36 @@ class MongoDeckRepository:
         
         result = await self.collection.insert_one(deck_data)
         deck_data["_id"] = result.inserted_id
-        return DeckMongo(**deck_data)
+        deck = DeckMongo(**deck_data)
+        self._index(deck)
+        return deck
 
     async def get_by_id(self, deck_id: str) -> Optional[DeckMongo]:
         """Get deck by ID."""
         try:
             deck_data = await self.collection.find_one({"_id": ObjectId(deck_id)})
-            return DeckMongo(**deck_data) if deck_data else None
+            return from_document(DeckMongo, deck_data) if deck_data else None
         except:
             return None
 
-    async def get_by_user(self, user_id: str, skip: int = 0, limit: int = 100) -> List[DeckMongo]:
-        """Get decks by user ID."""
-        cursor = self.collection.find({"user_id": ObjectId(user_id)}).skip(skip).limit(limit)
-        decks = []
-        async for deck_data in cursor:
-            decks.append(DeckMongo(**deck_data))
-        return decks
+    async def get_by_user(
+        self, user_id: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+    ) -> List[DeckMongo]:
+        """Get decks by user ID, newest first, after the page `cursor` points at."""
+        decks = await find_page(self.collection, {"user_id": ObjectId(user_id)}, DECK_FIELDS, skip, limit, cursor)
+        return [from_document(DeckMongo, deck_data) for deck_data in decks]
+
+    async def get_by_user_with_flashcards(
+        self, user_id: str, limit: int = 100, cursor: Optional[str] = None, cards_per_deck: Optional[int] = None
+    ) -> List[DeckWithCards]:
+        """A page of the user's decks with their newest flashcards and card counts, in one aggregation."""
+        return await self._with_flashcards({"user_id": ObjectId(user_id)}, limit, cursor, cards_per_deck)
+
+    async def get_public_with_flashcards(
+        self, limit: int = 100, cursor: Optional[str] = None, cards_per_deck: Optional[int] = None
+    ) -> List[DeckWithCards]:
+        """A page of public decks with their newest flashcards and card counts, in one aggregation."""
+        return await self._with_flashcards({"is_public": True}, limit, cursor, cards_per_deck)
 
     async def get_by_name(self, name: str, user_id: str) -> Optional[DeckMongo]:
         """Get deck by name and user ID."""
@@ -83,18 +209,32 @@ class MongoDeckRepository:
             "name": name,
             "user_id": ObjectId(user_id)
         })
-        return DeckMongo(**deck_data) if deck_data else None
+        return from_document(DeckMongo, deck_data) if deck_data else None
 
-    async def get_public_decks(self, skip: int = 0, limit: int = 100) -> List[DeckMongo]:
-        """Get public decks."""
-        cursor = self.collection.find({"is_public": True}).skip(skip).limit(limit)
-        decks = []
-        async for deck_data in cursor:
-            decks.append(DeckMongo(**deck_data))
-        return decks
+    async def get_public_decks(
+        self, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+    ) -> List[DeckMongo]:
+        """Get public decks, newest first, after the page `cursor` points at."""
+        decks = await find_page(self.collection, {"is_public": True}, DECK_FIELDS, skip, limit, cursor)
+        return [from_document(DeckMongo, deck_data) for deck_data in decks]
 
-    async def search(self, query: str, user_id: Optional[str] = None, limit: int = 10) -> List[DeckMongo]:
-        """Search decks."""
+    async def search(
+        self,
+        query: str,
+        user_id: Optional[str] = None,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        fuzzy: bool = False,
+    ) -> List[DeckMongo]:
+        """Search decks; with `fuzzy`, tolerate typos through the trigram index."""
+        if fuzzy:
+            ids = fuzzy_index.search(query, "deck", user_id=user_id, limit=limit, offset=rank_offset(cursor))
+            return await self._get_ranked(ids)
+        if search_index_enabled():
+            offset = rank_offset(cursor)
+            ids = search_index.search_decks(query, user_id=user_id, limit=offset + limit)
+            return await self._get_ranked(ids[offset:])
+        
         search_filter = {}
         
         if user_id:
@@ -105,13 +245,14 @@ class MongoDeckRepository:
         else:
             search_filter["is_public"] = True
         
-        # Text search
-        search_filter["$text"] = {"$search": query}
-        
-        cursor = self.collection.find(search_filter).limit(limit)
+        # Text search, most relevant first; pages continue at the next rank position
+        cursor = text_search_cursor(
+            self.collection, search_filter, query, skip=rank_offset(cursor), limit=limit, fields=DECK_FIELDS
+        )
         decks = []
-        async for deck_data in cursor:
-            decks.append(DeckMongo(**deck_data))
+        for deck_data in await cursor.to_list(length=None):
+            deck_data["snippet"] = highlight_snippet((deck_data.get("name"), deck_data.get("description")), query)
+            decks.append(from_document(DeckMongo, deck_data))
         return decks
 
     async def update(self, deck_id: str, update_data: Dict[str, Any]) -> Optional[DeckMongo]:
@@ -124,13 +265,80 @@ class MongoDeckRepository:
         )
         
         if result.modified_count:
-            return await self.get_by_id(deck_id)
+            deck = await self.get_by_id(deck_id)
+            if deck is not None:
+                self._index(deck)
+                # The deck may have stopped being public; other users' cached results can hold it
+                if "is_public" in update_data and search_cache_enabled():
+                    search_result_cache.invalidate_public()
+            return deck
         return None
 
     async def delete(self, deck_id: str) -> bool:
         """Delete deck."""
-        result = await self.collection.delete_one({"_id": ObjectId(deck_id)})
-        return result.deleted_count > 0
+        deleted = await self.collection.find_one_and_delete(
+            {"_id": ObjectId(deck_id)}, projection={"user_id": 1, "is_public": 1}
+        )
+        if deleted is not None and search_cache_enabled():
+            search_result_cache.invalidate_deck(deleted.get("user_id"), deleted.get("is_public", False))
+        if search_index_enabled():
+            search_index.remove_deck(deck_id)
+        if suggest_index_enabled():
+            suggest_index.remove_deck(deck_id)
+        if fuzzy_search_enabled():
+            fuzzy_index.remove_deck(deck_id)
+        deck_duplicate_indexes.remove_deck(deck_id)
+        return deleted is not None
+
+    async def _get_ranked(self, ids: List[str]) -> List[DeckMongo]:
+        """Load decks by id, keeping the order of `ids`."""
+        cursor = self.collection.find({"_id": {"$in": [ObjectId(id) for id in ids]}}, projection(DECK_FIELDS))
+        by_id = {
+            str(deck_data["_id"]): from_document(DeckMongo, deck_data) for deck_data in await cursor.to_list(length=None)
+        }
+        return [by_id[id] for id in ids if id in by_id]
+
+    async def _with_flashcards(
+        self, query: Dict[str, Any], limit: int, cursor: Optional[str], cards_per_deck: Optional[int]
+    ) -> List[DeckWithCards]:
+        """
+        One page of decks matching `query`, each joined by $lookup (on the
+        flashcards (deck_id, created_at, _id) index) to its newest cards and
+        to its card count.
+        """
+        cards_per_deck = preview_size(cards_per_deck)
+        pipeline = [
+            {"$match": _after_cursor(query, cursor)},
+            {"$sort": dict(KEYSET_SORT)},
+            {"$limit": limit},
+        ]
+        if lean_reads_enabled():
+            pipeline.append({"$project": projection(DECK_FIELDS)})
+        if cards_per_deck:
+            cards = [{"$sort": dict(KEYSET_SORT)}, {"$limit": cards_per_deck}]
+            if lean_reads_enabled():
+                cards.append({"$project": projection(FLASHCARD_FIELDS)})
+            pipeline.append({"$lookup": {**DECK_CARDS_LOOKUP, "pipeline": cards, "as": "flashcards"}})
+        pipeline += [
+            {"$lookup": {**DECK_CARDS_LOOKUP, "pipeline": [{"$count": "n"}], "as": "flashcard_count"}},
+            {"$set": {"flashcard_count": {"$ifNull": [{"$first": "$flashcard_count.n"}, 0]}}},
+        ]
+        decks = []
+        for deck_data in await self.collection.aggregate(pipeline).to_list(length=None):
+            flashcards = [from_document(FlashcardMongo, card) for card in deck_data.pop("flashcards", [])]
+            flashcard_count = deck_data.pop("flashcard_count")
+            decks.append(DeckWithCards(from_document(DeckMongo, deck_data), flashcards, flashcard_count))
+        return decks
+
+    def _index(self, deck: DeckMongo):
+        if search_index_enabled():
+            search_index.index_deck(deck.id, deck.user_id, deck.is_public, deck.name, deck.description)
+        if suggest_index_enabled():
+            suggest_index.index_deck(deck.id, deck.user_id, deck.is_public, deck.name)
+        if fuzzy_search_enabled():
+            fuzzy_index.index_deck(deck.id, deck.user_id, deck.is_public, deck.name, deck.description)
+        if search_cache_enabled():
+            search_result_cache.invalidate_deck(deck.user_id, deck.is_public)
 
 class MongoFlashcardRepository:
     def __init__(self):
@@ -143,46 +351,86 @@ class MongoFlashcardRepository:
         
         result = await self.collection.insert_one(flashcard_data)
         flashcard_data["_id"] = result.inserted_id
-        return FlashcardMongo(**flashcard_data)
+        flashcard = FlashcardMongo(**flashcard_data)
+        self._index(flashcard)
+        return flashcard
+
+    async def bulk_create(self, flashcards_data: List[Dict[str, Any]]) -> List[FlashcardMongo]:
+        """Create many flashcards with a single insert_many round trip."""
+        if not flashcards_data:
+            return []
+        now = datetime.utcnow()
+        for flashcard_data in flashcards_data:
+            flashcard_data["created_at"] = now
+            flashcard_data["updated_at"] = now
+
+        result = await self.collection.insert_many(flashcards_data, ordered=True)
+        flashcards = []
+        for flashcard_data, inserted_id in zip(flashcards_data, result.inserted_ids):
+            flashcard_data["_id"] = inserted_id
+            flashcard = FlashcardMongo(**flashcard_data)
+            self._index(flashcard)
+            flashcards.append(flashcard)
+        return flashcards
 
     async def get_by_id(self, flashcard_id: str) -> Optional[FlashcardMongo]:
         """Get flashcard by ID."""
         try:
             flashcard_data = await self.collection.find_one({"_id": ObjectId(flashcard_id)})
-            return FlashcardMongo(**flashcard_data) if flashcard_data else None
+            return from_document(FlashcardMongo, flashcard_data) if flashcard_data else None
         except:
             return None
 
-    async def get_by_deck(self, deck_id: str, skip: int = 0, limit: int = 100) -> List[FlashcardMongo]:
-        """Get flashcards by deck ID."""
-        cursor = self.collection.find({"deck_id": ObjectId(deck_id)}).skip(skip).limit(limit)
-        flashcards = []
-        async for flashcard_data in cursor:
-            flashcards.append(FlashcardMongo(**flashcard_data))
-        return flashcards
+    async def get_by_deck(
+        self, deck_id: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+    ) -> List[FlashcardMongo]:
+        """Get flashcards by deck ID, newest first, after the page `cursor` points at."""
+        flashcards = await find_page(
+            self.collection, {"deck_id": ObjectId(deck_id)}, FLASHCARD_FIELDS, skip, limit, cursor
+        )
+        return [from_document(FlashcardMongo, flashcard_data) for flashcard_data in flashcards]
 
-    async def get_by_user(self, user_id: str, skip: int = 0, limit: int = 100) -> List[FlashcardMongo]:
-        """Get flashcards by user ID."""
-        cursor = self.collection.find({"user_id": ObjectId(user_id)}).skip(skip).limit(limit)
-        flashcards = []
-        async for flashcard_data in cursor:
-            flashcards.append(FlashcardMongo(**flashcard_data))
-        return flashcards
+    async def get_by_user(
+        self, user_id: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+    ) -> List[FlashcardMongo]:
+        """Get flashcards by user ID, newest first, after the page `cursor` points at."""
+        flashcards = await find_page(
+            self.collection, {"user_id": ObjectId(user_id)}, FLASHCARD_FIELDS, skip, limit, cursor
+        )
+        return [from_document(FlashcardMongo, flashcard_data) for flashcard_data in flashcards]
 
-    async def search(self, query: str, user_id: Optional[str] = None, limit: int = 10) -> List[FlashcardMongo]:
-        """Search flashcards."""
+    async def search(
+        self,
+        query: str,
+        user_id: Optional[str] = None,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        fuzzy: bool = False,
+    ) -> List[FlashcardMongo]:
+        """Search flashcards; with `fuzzy`, tolerate typos through the trigram index."""
+        if fuzzy:
+            ids = fuzzy_index.search(query, "flashcard", user_id=user_id, limit=limit, offset=rank_offset(cursor))
+            return await self._get_ranked(ids)
+        if search_index_enabled():
+            offset = rank_offset(cursor)
+            ids = search_index.search_flashcards(query, user_id=user_id, limit=offset + limit)
+            return await self._get_ranked(ids[offset:])
+        
         search_filter = {}
         
         if user_id:
             search_filter["user_id"] = ObjectId(user_id)
         
-        # Text search
-        search_filter["$text"] = {"$search": query}
-        
-        cursor = self.collection.find(search_filter).limit(limit)
+        # Text search, most relevant first; pages continue at the next rank position
+        cursor = text_search_cursor(
+            self.collection, search_filter, query, skip=rank_offset(cursor), limit=limit, fields=FLASHCARD_FIELDS
+        )
         flashcards = []
-        async for flashcard_data in cursor:
-            flashcards.append(FlashcardMongo(**flashcard_data))
+        for flashcard_data in await cursor.to_list(length=None):
+            flashcard_data["snippet"] = highlight_snippet(
+                (flashcard_data.get("question"), flashcard_data.get("answer")), query
+            )
+            flashcards.append(from_document(FlashcardMongo, flashcard_data))
         return flashcards
 
     async def update(self, flashcard_id: str, update_data: Dict[str, Any]) -> Optional[FlashcardMongo]:
@@ -195,13 +443,62 @@ class MongoFlashcardRepository:
         )
         
         if result.modified_count:
-            return await self.get_by_id(flashcard_id)
+            flashcard = await self.get_by_id(flashcard_id)
+            if flashcard is not None:
+                self._index(flashcard)
+            return flashcard
         return None
 
     async def delete(self, flashcard_id: str) -> bool:
         """Delete flashcard."""
-        result = await self.collection.delete_one({"_id": ObjectId(flashcard_id)})
-        return result.deleted_count > 0
+        deleted = await self.collection.find_one_and_delete(
+            {"_id": ObjectId(flashcard_id)}, projection={"user_id": 1}
+        )
+        self._unindex(flashcard_id, deleted.get("user_id") if deleted is not None else None)
+        return deleted is not None
+
+    async def bulk_delete(self, flashcard_ids: List[Any]) -> int:
+        """Delete many flashcards with one delete_many round trip; returns how many were deleted."""
+        if not flashcard_ids:
+            return 0
+        cursor = self.collection.find({"_id": {"$in": [ObjectId(str(id)) for id in flashcard_ids]}}, {"user_id": 1})
+        deleted = await cursor.to_list(length=None)
+        await self.collection.delete_many({"_id": {"$in": [flashcard_data["_id"] for flashcard_data in deleted]}})
+        for flashcard_data in deleted:
+            self._unindex(str(flashcard_data["_id"]), flashcard_data.get("user_id"))
+        return len(deleted)
+
+    async def _get_ranked(self, ids: List[str]) -> List[FlashcardMongo]:
+        """Load flashcards by id, keeping the order of `ids`."""
+        cursor = self.collection.find({"_id": {"$in": [ObjectId(id) for id in ids]}}, projection(FLASHCARD_FIELDS))
+        by_id = {
+            str(flashcard_data["_id"]): from_document(FlashcardMongo, flashcard_data)
+            for flashcard_data in await cursor.to_list(length=None)
+        }
+        return [by_id[id] for id in ids if id in by_id]
+
+    def _index(self, flashcard: FlashcardMongo):
+        if search_index_enabled():
+            search_index.index_flashcard(flashcard.id, flashcard.user_id, flashcard.question, flashcard.answer)
+        if suggest_index_enabled():
+            suggest_index.index_flashcard(flashcard.id, flashcard.user_id, flashcard.question)
+        if fuzzy_search_enabled():
+            fuzzy_index.index_flashcard(flashcard.id, flashcard.user_id, flashcard.question, flashcard.answer)
+        if flashcard.deck_id is not None:
+            deck_duplicate_indexes.index_flashcard(flashcard.id, flashcard.deck_id, flashcard.question, flashcard.answer)
+        if search_cache_enabled():
+            search_result_cache.invalidate_user(flashcard.user_id)
+
+    def _unindex(self, flashcard_id: str, user_id: Any = None):
+        if user_id is not None and search_cache_enabled():
+            search_result_cache.invalidate_user(user_id)
+        if search_index_enabled():
+            search_index.remove_flashcard(flashcard_id)
+        if suggest_index_enabled():
+            suggest_index.remove_flashcard(flashcard_id)
+        if fuzzy_search_enabled():
+            fuzzy_index.remove_flashcard(flashcard_id)
+        deck_duplicate_indexes.remove_flashcard(flashcard_id)
 
 # Repository instances
 mongo_user_repository = MongoUserRepository()
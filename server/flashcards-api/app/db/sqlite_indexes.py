@@ -0,0 +1,43 @@
+import sqlite3
+from typing import List
+
+from app.config import settings
+
+# Compound indexes for keyset pagination: (filter column, created_at, id), so the
+# newest-first page after a cursor is an index seek rather than a scan
+PAGINATION_INDEXES = {
+    "ix_flashcards_user_created": ("flashcards", ("user_id", "created_at", "id")),
+    "ix_flashcards_deck_created": ("flashcards", ("deck_id", "created_at", "id")),
+    "ix_decks_user_created": ("decks", ("user_id", "created_at", "id")),
+    "ix_decks_public_created": ("decks", ("is_public", "created_at", "id")),
+}
+
+def ensure_pagination_indexes(conn) -> List[str]:
+    """Create the missing pagination indexes on a SQLite DB-API connection; returns their names."""
+    created = []
+    for name, (table, columns) in PAGINATION_INDEXES.items():
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})").fetchall()}
+        if not set(columns) <= existing:
+            continue
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (name,)).fetchone():
+            continue
+        conn.execute(f"CREATE INDEX {name} ON {table} ({', '.join(columns)})")
+        created.append(name)
+    conn.commit()
+    return created
+
+def setup_sqlite_indexes():
+    """Create missing pagination indexes on the SQLite database (called from the startup hook)."""
+    from app.db.repositories.jobs import sqlite_path_from_url
+
+    try:
+        conn = sqlite3.connect(sqlite_path_from_url(settings.SQLITE_URL))
+        try:
+            created = ensure_pagination_indexes(conn)
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        print(f"⚠️ Could not create pagination indexes: {e}")
+        return
+    if created:
+        print(f"✅ Created pagination indexes: {', '.join(created)}")
@@ -0,0 +1,83 @@
+import os
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+
+from app.config import settings
+
+def sqlite_pragmas(read_only: bool = False) -> List[str]:
+    """
+    Per-connection PRAGMAs of the tuned SQLite mode. WAL lets readers run
+    alongside the single writer instead of queueing behind its lock, and
+    with WAL, synchronous=NORMAL only syncs at checkpoints; busy_timeout makes
+    a writer wait for the lock instead of failing with "database is locked".
+    """
+    pragmas = [
+        f"PRAGMA busy_timeout = {settings.SQLITE_BUSY_TIMEOUT_MS}",
+        f"PRAGMA synchronous = {settings.SQLITE_SYNCHRONOUS}",
+        # Negative cache_size is in KiB rather than pages
+        f"PRAGMA cache_size = -{settings.SQLITE_CACHE_SIZE_KB}",
+        f"PRAGMA mmap_size = {settings.SQLITE_MMAP_SIZE_BYTES}",
+        "PRAGMA temp_store = MEMORY",
+    ]
+    if read_only:
+        pragmas.append("PRAGMA query_only = ON")
+    else:
+        # journal_mode is stored in the database file; read-only connections cannot set it
+        pragmas.insert(0, "PRAGMA journal_mode = WAL")
+    return pragmas
+
+def apply_sqlite_pragmas(dbapi_connection: Any, read_only: bool = False):
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in sqlite_pragmas(read_only):
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+def sqlite_file(url: str) -> Optional[str]:
+    """Path of the file behind a SQLite URL, or None for an in-memory database (sqlite://, sqlite:///:memory:)."""
+    if ":///" not in url:
+        return None
+    path = url.split(":///", 1)[1]
+    if path in ("", ":memory:") or path.startswith("file::memory:") or "mode=memory" in path:
+        return None
+    return path
+
+def can_open_read_only(url: str) -> bool:
+    """
+    Whether a separate read-only pool can serve `url`. An in-memory database
+    would open a second, empty database, and mode=ro cannot create a file
+    that does not exist yet; callers use the read-write engine instead.
+    """
+    path = sqlite_file(url)
+    return path is not None and os.path.exists(path)
+
+def read_only_url(url: str) -> str:
+    """The same SQLite database opened read-only: sqlite:///x.db -> sqlite:///file:x.db?mode=ro&uri=true."""
+    if sqlite_file(url) is None:
+        raise ValueError(f"An in-memory SQLite database cannot be opened read-only: {url}")
+    scheme, path = url.split(":///", 1)
+    return f"{scheme}:///file:{path}?mode=ro&uri=true"
+
+def engine_options(read_only: bool = False) -> Dict[str, Any]:
+    """create_engine / create_async_engine keyword arguments for the tuned mode."""
+    return {
+        "pool_size": settings.SQLITE_READ_POOL_SIZE if read_only else settings.SQLITE_POOL_SIZE,
+        "max_overflow": 0 if read_only else settings.SQLITE_MAX_OVERFLOW,
+        "pool_timeout": settings.SQLITE_POOL_TIMEOUT_SECONDS,
+        "connect_args": {
+            # Sessions move between threadpool threads; each connection is used by one at a time
+            "check_same_thread": False,
+            "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000,
+            # Prepared statements kept per pooled connection
+            "cached_statements": settings.SQLITE_STATEMENT_CACHE_SIZE,
+        },
+    }
+
+def tune_sqlite_engine(engine: Any, read_only: bool = False):
+    """Apply the PRAGMAs to every new connection of `engine` (sync, or the sync_engine of an async one)."""
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        apply_sqlite_pragmas(dbapi_connection, read_only)
@@ -1,7 +1,7 @@
 from pydantic import BaseModel, Field
 from typing import List, Optional
 from bson import ObjectId
-from helper import PyObjectId
+from .helper import PyObjectId
 
 class Deck(BaseModel):
     id: Optional[PyObjectId] = Field(default_factory=PyObjectId, alias="_id")
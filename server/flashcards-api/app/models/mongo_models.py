@@ -1,12 +1,15 @@
 from datetime import datetime
 from typing import Optional, List
 from pydantic import BaseModel, Field
+from pydantic_core import core_schema
 from bson import ObjectId
 
 class PyObjectId(ObjectId):
     @classmethod
-    def __get_validators__(cls):
-        yield cls.validate
+    def __get_pydantic_core_schema__(cls, source_type, handler):
+        return core_schema.no_info_plain_validator_function(
+            cls.validate, serialization=core_schema.plain_serializer_function_ser_schema(str)
+        )
 
     @classmethod
     def validate(cls, v):
@@ -15,20 +18,20 @@ class PyObjectId(ObjectId):
         return ObjectId(v)
 
     @classmethod
-    def __modify_schema__(cls, field_schema):
-        field_schema.update(type="string")
+    def __get_pydantic_json_schema__(cls, schema, handler):
+        return {"type": "string"}
 
 class MongoBaseModel(BaseModel):
     id: Optional[PyObjectId] = Field(default_factory=PyObjectId, alias="_id")
     
     class Config:
-        allow_population_by_field_name = True
+        populate_by_name = True
         arbitrary_types_allowed = True
         json_encoders = {ObjectId: str}
 
 class UserMongo(MongoBaseModel):
     username: str = Field(..., min_length=3, max_length=50)
-    email: str = Field(..., regex=r"^[^@]+@[^@]+\.[^@]+$")
+    email: str = Field(..., pattern=r"^[^@]+@[^@]+\.[^@]+$")
     hashed_password: str
     is_active: bool = True
     is_admin: bool = False
@@ -42,6 +45,9 @@ class DeckMongo(MongoBaseModel):
     is_public: bool = False
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+    # Set on search results only: text relevance and a highlighted excerpt
+    score: Optional[float] = None
+    snippet: Optional[str] = None
 
 class FlashcardMongo(MongoBaseModel):
     question: str = Field(..., min_length=1, max_length=1000)
@@ -49,4 +55,7 @@ class FlashcardMongo(MongoBaseModel):
     deck_id: PyObjectId
     user_id: PyObjectId
     created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow) 
\ No newline at end of file
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    # Set on search results only: text relevance and a highlighted excerpt
+    score: Optional[float] = None
+    snippet: Optional[str] = None 
\ No newline at end of file
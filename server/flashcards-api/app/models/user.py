@@ -1,6 +1,6 @@
 from pydantic import BaseModel, EmailStr, Field
 from typing import List, Optional
-from helper import PyObjectId
+from .helper import PyObjectId
 from bson import ObjectId
 
 class User(BaseModel):
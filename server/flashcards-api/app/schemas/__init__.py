@@ -1,12 +1,18 @@
 from .user import User, UserCreate, UserUpdate, UserInDB
-from .flashcard import Flashcard, FlashcardCreate, FlashcardUpdate
-from .deck import Deck, DeckCreate, DeckUpdate, DeckWithFlashcards
+from .flashcard import Flashcard, FlashcardCreate, FlashcardUpdate, FlashcardPage
+from .deck import Deck, DeckCreate, DeckUpdate, DeckWithFlashcards, DeckPage
 from .token import Token, TokenPayload
+from .job import Job, JobQueueStats
 from .search import (
     SearchResults, 
+    SubSearchTiming,
     SearchQuery, 
+    Suggestion,
+    SuggestResults,
     GenerateFlashcardsRequest, 
     GeneratedFlashcardsResponse,
+    BatchGenerateFlashcardsRequest,
+    BatchGenerateFlashcardsResponse,
     SaveFlashcardsRequest,
     SaveFlashcardsResponse
 )
@@ -1,7 +1,7 @@
 from pydantic import BaseModel
 from typing import Optional, List
 from datetime import datetime
-from uuid import UUID
+from .ids import EntityId
 from .flashcard import Flashcard
 
 class DeckBase(BaseModel):
@@ -18,8 +18,8 @@ class DeckUpdate(BaseModel):
     is_public: Optional[bool] = None
 
 class DeckInDBBase(DeckBase):
-    id: UUID
-    user_id: UUID
+    id: EntityId
+    user_id: EntityId
     created_at: datetime
     updated_at: datetime
     
@@ -30,4 +30,16 @@ class Deck(DeckInDBBase):
     pass
 
 class DeckWithFlashcards(Deck):
+    # The newest cards of the deck (up to the requested count) and how many it has in all
     flashcards: List[Flashcard] = []
+    flashcard_count: int = 0
+
+class DeckPage(BaseModel):
+    items: List[Deck] = []
+    # Pass back as `cursor` for the next page; None on the last page
+    next_cursor: Optional[str] = None
+
+class DeckWithFlashcardsPage(BaseModel):
+    items: List[DeckWithFlashcards] = []
+    # Pass back as `cursor` for the next page; None on the last page
+    next_cursor: Optional[str] = None
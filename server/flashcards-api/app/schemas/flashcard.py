@@ -1,12 +1,12 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
-from uuid import UUID
+from .ids import EntityId
 
 class FlashcardBase(BaseModel):
     front: str
     back: str
-    deck_id: UUID
+    deck_id: EntityId
 
 class FlashcardCreate(FlashcardBase):
     pass
@@ -14,11 +14,11 @@ class FlashcardCreate(FlashcardBase):
 class FlashcardUpdate(BaseModel):
     front: Optional[str] = None
     back: Optional[str] = None
-    deck_id: Optional[UUID] = None
+    deck_id: Optional[EntityId] = None
 
 class FlashcardInDBBase(FlashcardBase):
-    id: UUID
-    user_id: UUID
+    id: EntityId
+    user_id: EntityId
     created_at: datetime
     updated_at: datetime
     
@@ -27,3 +27,8 @@ class FlashcardInDBBase(FlashcardBase):
 
 class Flashcard(FlashcardInDBBase):
     pass
+
+class FlashcardPage(BaseModel):
+    items: List[Flashcard] = []
+    # Pass back as `cursor` for the next page; None on the last page
+    next_cursor: Optional[str] = None
@@ -0,0 +1,11 @@
+from typing import Annotated, Union
+from uuid import UUID
+
+from pydantic import BeforeValidator, Field
+
+# Flashcard and deck ids: UUIDs on SQLite, ObjectIds (kept as their string
+# form) on MongoDB. Both serialize as strings.
+EntityId = Annotated[
+    Union[UUID, Annotated[str, BeforeValidator(str)]],
+    Field(union_mode="left_to_right"),
+]
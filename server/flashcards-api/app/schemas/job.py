@@ -0,0 +1,26 @@
+from pydantic import BaseModel
+from typing import List, Optional, Dict
+from datetime import datetime
+
+class Job(BaseModel):
+    id: str
+    status: str
+    query: str
+    num_flashcards: int
+    flashcards: List[Dict[str, str]] = []
+    count: int = 0
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+class JobQueueStats(BaseModel):
+    submitted: int
+    completed: int
+    failed: int
+    rejected: int
+    queue_depth: int
+    max_queue_size: int
+    workers: int
+    busy_workers: int
+    utilisation: float
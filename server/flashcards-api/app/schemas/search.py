@@ -4,10 +4,22 @@ from .user import User
 from .deck import Deck
 from .flashcard import Flashcard
 
+class SubSearchTiming(BaseModel):
+    # "ok", "timeout" or "error"; a timed-out database query may still be
+    # running server-side after the response is sent
+    status: str
+    elapsed_ms: float
+    detail: Optional[str] = None
+
 class SearchResults(BaseModel):
     users: List[User] = []
     decks: List[Deck] = []
     flashcards: List[Flashcard] = []
+    # True when a sub-search timed out or failed and its results are missing
+    partial: bool = False
+    timings: Dict[str, SubSearchTiming] = {}
+    # Pass back as `cursor` for the next page of flashcards and decks
+    next_cursor: Optional[str] = None
     
 class SearchQuery(BaseModel):
     query: str
@@ -16,10 +28,47 @@ class SearchQuery(BaseModel):
     include_flashcards: bool = True
     limit: Optional[int] = 10
 
+class Suggestion(BaseModel):
+    type: str  # "deck" or "flashcard"
+    id: str
+    text: str
+
+class SuggestResults(BaseModel):
+    suggestions: List[Suggestion] = []
+
 class GenerateFlashcardsRequest(BaseModel):
     query: str
     num_flashcards: int = 5
 
+class BatchGenerateFlashcardsRequest(BaseModel):
+    items: List[GenerateFlashcardsRequest]
+
+class BatchItemStatus(BaseModel):
+    query: str
+    status: str
+    flashcards: List[Dict[str, str]] = []
+    count: int = 0
+    cached: bool = False
+    error: Optional[str] = None
+    stage_seconds: Dict[str, float] = {}
+
+class BatchStageStats(BaseModel):
+    name: str
+    concurrency: int
+    processed: int
+    failed: int
+    busy_seconds: float
+    max_queue_depth: int
+
+class BatchGenerateFlashcardsResponse(BaseModel):
+    items: List[BatchItemStatus]
+    completed: int
+    failed: int
+    total_flashcards: int
+    elapsed_seconds: float
+    items_per_second: float
+    stages: List[BatchStageStats]
+
 class GeneratedFlashcard(BaseModel):
     question: str
     answer: str
@@ -33,8 +82,10 @@ class SaveFlashcardsRequest(BaseModel):
     flashcards: List[Dict[str, str]]
     deck_name: str
     query: str
+    skip_duplicates: bool = True
 
 class SaveFlashcardsResponse(BaseModel):
     deck: Deck
     flashcards: List[Flashcard]
     count: int
+    duplicates: List[Dict[str, str]] = []
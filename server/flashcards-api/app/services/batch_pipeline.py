@@ -0,0 +1,209 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.services.page_fetcher import FetchedPage
+from app.services.result_cache import GenerationCache
+
+@dataclass
+class BatchItem:
+    index: int
+    query: str
+    num_flashcards: int
+    status: str = "pending"
+    error: Optional[str] = None
+    cached: bool = False
+    search_results: List[Dict[str, Any]] = field(default_factory=list)
+    pages: List[Tuple[Optional[str], Optional[FetchedPage]]] = field(default_factory=list)
+    content: str = ""
+    flashcards: List[Dict[str, str]] = field(default_factory=list)
+    stage_seconds: Dict[str, float] = field(default_factory=dict)
+
+    def fail(self, error: str):
+        self.status = "failed"
+        self.error = error
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "query": self.query,
+            "status": self.status,
+            "flashcards": self.flashcards,
+            "count": len(self.flashcards),
+            "cached": self.cached,
+            "error": self.error,
+            "stage_seconds": self.stage_seconds,
+        }
+
+@dataclass
+class BatchStages:
+    """The per-query steps the batch pipeline runs; `SearchService.batch_stages()` provides them."""
+
+    search: Callable[[str], Awaitable[List[Dict[str, Any]]]]
+    fetch_page: Callable[[str], Awaitable[Tuple[Optional[str], Optional[FetchedPage]]]]
+    extract_page_text: Callable[[FetchedPage], Awaitable[Optional[str]]]
+    select_passages: Callable[[str, List[str]], str]
+    generate_flashcards: Callable[[str, str, int], Awaitable[List[Dict[str, Any]]]]
+
+class PipelineStage:
+    """
+    One step of the batch pipeline: a bounded input queue drained by a fixed
+    number of workers, so each stage is throttled independently.
+    """
+
+    def __init__(self, name: str, handler: Callable[[BatchItem], Awaitable[None]], concurrency: int, queue_size: int):
+        self.name = name
+        self.handler = handler
+        self.concurrency = concurrency
+        self.queue: "asyncio.Queue[BatchItem]" = asyncio.Queue(maxsize=queue_size)
+        self.next_stage: Optional["PipelineStage"] = None
+
+        self.processed = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+        self.max_queue_depth = 0
+
+    async def put(self, item: BatchItem):
+        await self.queue.put(item)
+        self.max_queue_depth = max(self.max_queue_depth, self.queue.qsize())
+
+    async def worker(self):
+        while True:
+            item = await self.queue.get()
+            try:
+                # Failed and cache-served items just flow through to the end
+                if item.status == "pending":
+                    start = time.perf_counter()
+                    try:
+                        await self.handler(item)
+                    except Exception as e:
+                        item.fail(f"{self.name} stage failed: {e}")
+                    elapsed = time.perf_counter() - start
+                    item.stage_seconds[self.name] = round(elapsed, 4)
+                    self.busy_seconds += elapsed
+                    self.processed += 1
+                    if item.status == "failed":
+                        self.failed += 1
+                if self.next_stage is not None:
+                    await self.next_stage.put(item)
+            finally:
+                self.queue.task_done()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "concurrency": self.concurrency,
+            "processed": self.processed,
+            "failed": self.failed,
+            "busy_seconds": round(self.busy_seconds, 4),
+            "max_queue_depth": self.max_queue_depth,
+        }
+
+class BatchGenerationPipeline:
+    """
+    Generates flashcards for many queries through search -> fetch -> extract -> llm
+    stages that run the steps in `steps`, serving and storing sets through `cache`.
+
+    Every stage has its own concurrency limit and bounded queue, so slow LLM
+    calls do not stop other items from being searched and downloaded, and
+    a burst of downloads cannot starve the LLM stage of work.
+    """
+
+    def __init__(
+        self,
+        steps: BatchStages,
+        cache: GenerationCache,
+        search_concurrency: int = 4,
+        fetch_concurrency: int = 8,
+        extract_concurrency: int = 4,
+        llm_concurrency: int = 4,
+        queue_size: int = 16,
+    ):
+        self.steps = steps
+        self.cache = cache
+        self.stages = [
+            PipelineStage("search", self._search, search_concurrency, queue_size),
+            PipelineStage("fetch", self._fetch, fetch_concurrency, queue_size),
+            PipelineStage("extract", self._extract, extract_concurrency, queue_size),
+            PipelineStage("llm", self._generate, llm_concurrency, queue_size),
+        ]
+        for stage, next_stage in zip(self.stages, self.stages[1:]):
+            stage.next_stage = next_stage
+
+    async def run(self, requests: List[Tuple[str, int]]) -> Dict[str, Any]:
+        """
+        Process (query, num_flashcards) pairs and report per-item status and throughput.
+        """
+        start = time.perf_counter()
+        items = [BatchItem(index, query, num_flashcards) for index, (query, num_flashcards) in enumerate(requests)]
+
+        cache = self.cache
+        workers = [
+            asyncio.create_task(stage.worker())
+            for stage in self.stages
+            for _ in range(stage.concurrency)
+        ]
+        try:
+            for item in items:
+                cached = cache.peek(item.query, item.num_flashcards)
+                if cached is not None:
+                    item.flashcards = cached
+                    item.cached = True
+                    item.status = "completed"
+                    continue
+                await self.stages[0].put(item)
+            # Items only move forward, so draining the stages in order drains the pipeline
+            for stage in self.stages:
+                await stage.queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        for item in items:
+            if item.status == "pending":
+                item.status = "completed"
+                cache.store(item.query, item.num_flashcards, item.flashcards)
+
+        elapsed = time.perf_counter() - start
+        completed = sum(1 for item in items if item.status == "completed")
+        total_flashcards = sum(len(item.flashcards) for item in items)
+        return {
+            "items": [item.to_dict() for item in items],
+            "completed": completed,
+            "failed": len(items) - completed,
+            "total_flashcards": total_flashcards,
+            "elapsed_seconds": round(elapsed, 4),
+            "items_per_second": round(len(items) / elapsed, 4) if elapsed else 0.0,
+            "stages": [stage.stats() for stage in self.stages],
+        }
+
+    async def _search(self, item: BatchItem):
+        item.search_results = await self.steps.search(item.query)
+        if not item.search_results:
+            item.fail("No search results")
+
+    async def _fetch(self, item: BatchItem):
+        urls = [result.get("link") for result in item.search_results if result.get("link")]
+        item.pages = await asyncio.gather(*(self.steps.fetch_page(url) for url in urls))
+
+    async def _extract(self, item: BatchItem):
+        async def page_text(text: Optional[str], page: Optional[FetchedPage]) -> Optional[str]:
+            if page is not None:
+                return await self.steps.extract_page_text(page)
+            return text
+
+        texts = await asyncio.gather(*(page_text(text, page) for text, page in item.pages))
+        item.pages = []
+        item.content = self.steps.select_passages(item.query, [text for text in texts if text])
+        if not item.content.strip():
+            item.fail("No content extracted from search results")
+
+    async def _generate(self, item: BatchItem):
+        item.flashcards = await self.steps.generate_flashcards(
+            item.content,
+            item.query,
+            item.num_flashcards,
+        )
+        if not item.flashcards:
+            item.fail("No flashcards generated")
@@ -0,0 +1,268 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that never change page content
+TRACKING_PARAM_PREFIXES = ("utm_",)
+TRACKING_PARAMS = {"gclid", "fbclid", "msclkid", "ref", "ref_src"}
+DEFAULT_PORTS = {("http", 80), ("https", 443)}
+# Disk hits queue their access time; the queue is written with the next put or at this size
+ACCESS_FLUSH_BATCH = 100
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalize a URL so that trivially different links share one cache entry:
+    lowercase scheme/host, drop default ports, fragments and tracking params,
+    and sort the remaining query string.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    port = parts.port
+    netloc = host if port is None or (scheme, port) in DEFAULT_PORTS else f"{host}:{port}"
+
+    query = [
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key not in TRACKING_PARAMS and not key.startswith(TRACKING_PARAM_PREFIXES)
+    ]
+    return urlunsplit((scheme, netloc, parts.path or "/", urlencode(sorted(query)), ""))
+
+@dataclass
+class CachedPage:
+    url: str
+    text: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+    def is_fresh(self, ttl_seconds: float) -> bool:
+        return time.time() - self.fetched_at < ttl_seconds
+
+    def revalidation_headers(self) -> Dict[str, str]:
+        """Conditional request headers for refreshing a stale entry."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+class ContentCache:
+    """
+    Two-tier cache of cleaned page text keyed by canonical URL.
+
+    Lookups hit a bounded in-memory LRU first and fall back to a SQLite
+    table on disk; disk hits are promoted back into memory. Entries older
+    than the TTL are still returned so the caller can revalidate them with
+    ETag/Last-Modified instead of downloading and parsing the page again.
+    Async callers use the `*_async` methods, which run the SQLite work in a
+    worker thread; memory hits are answered inline. Disk access times used
+    for eviction are written in batches, not on every hit.
+    """
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        ttl_seconds: float = 86400,
+        max_memory_entries: int = 512,
+        max_disk_entries: int = 20000,
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+
+        self._memory: "OrderedDict[str, CachedPage]" = OrderedDict()
+        self._accessed: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._counters = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "stale": 0,
+            "revalidated": 0,
+            "memory_evictions": 0,
+            "disk_evictions": 0,
+        }
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS page_content (
+                url TEXT PRIMARY KEY,
+                text TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_page_content_accessed_at ON page_content (accessed_at)"
+        )
+        self._conn.commit()
+        (self._disk_entries,) = self._conn.execute("SELECT COUNT(*) FROM page_content").fetchone()
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        """
+        Look up a page by URL. Stale entries are returned too; check `is_fresh`.
+        """
+        key = canonicalize_url(url)
+        with self._lock:
+            entry = self._get_memory(key)
+        return entry if entry is not None else self._get_disk(key)
+
+    async def get_async(self, url: str) -> Optional[CachedPage]:
+        """`get` that reads the disk tier in a worker thread."""
+        key = canonicalize_url(url)
+        with self._lock:
+            entry = self._get_memory(key)
+        return entry if entry is not None else await asyncio.to_thread(self._get_disk, key)
+
+    def _get_memory(self, key: str) -> Optional[CachedPage]:
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        self._memory.move_to_end(key)
+        self._counters["memory_hits"] += 1
+        if not entry.is_fresh(self.ttl_seconds):
+            self._counters["stale"] += 1
+        return entry
+
+    def _get_disk(self, key: str) -> Optional[CachedPage]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, text, etag, last_modified, fetched_at FROM page_content WHERE url = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                self._counters["misses"] += 1
+                return None
+            entry = CachedPage(*row)
+            self._accessed[key] = time.time()
+            if len(self._accessed) >= ACCESS_FLUSH_BATCH:
+                self._flush_accessed()
+                self._conn.commit()
+            self._remember(key, entry)
+            self._counters["disk_hits"] += 1
+            if not entry.is_fresh(self.ttl_seconds):
+                self._counters["stale"] += 1
+            return entry
+
+    def put(
+        self,
+        url: str,
+        text: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> CachedPage:
+        """Store freshly fetched and cleaned page text."""
+        key = canonicalize_url(url)
+        entry = CachedPage(key, text, etag, last_modified, time.time())
+        with self._lock:
+            self._remember(key, entry)
+            self._accessed.pop(key, None)
+            exists = self._conn.execute("SELECT 1 FROM page_content WHERE url = ?", (key,)).fetchone()
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO page_content (url, text, etag, last_modified, fetched_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (key, text, etag, last_modified, entry.fetched_at, entry.fetched_at),
+            )
+            if exists is None:
+                self._disk_entries += 1
+            self._flush_accessed()
+            self._evict_disk()
+            self._conn.commit()
+        return entry
+
+    async def put_async(
+        self,
+        url: str,
+        text: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> CachedPage:
+        """`put` in a worker thread."""
+        return await asyncio.to_thread(self.put, url, text, etag, last_modified)
+
+    def mark_revalidated(self, entry: CachedPage) -> CachedPage:
+        """Reset the TTL of an entry after the origin answered 304 Not Modified."""
+        entry.fetched_at = time.time()
+        with self._lock:
+            self._remember(entry.url, entry)
+            self._accessed.pop(entry.url, None)
+            self._conn.execute(
+                "UPDATE page_content SET fetched_at = ?, accessed_at = ? WHERE url = ?",
+                (entry.fetched_at, entry.fetched_at, entry.url),
+            )
+            self._flush_accessed()
+            self._conn.commit()
+            self._counters["revalidated"] += 1
+        return entry
+
+    async def mark_revalidated_async(self, entry: CachedPage) -> CachedPage:
+        """`mark_revalidated` in a worker thread."""
+        return await asyncio.to_thread(self.mark_revalidated, entry)
+
+    def _remember(self, key: str, entry: CachedPage):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self._counters["memory_evictions"] += 1
+
+    def _flush_accessed(self):
+        """Write the queued access times; the caller commits."""
+        if self._accessed:
+            self._conn.executemany(
+                "UPDATE page_content SET accessed_at = ? WHERE url = ?",
+                [(accessed_at, key) for key, accessed_at in self._accessed.items()],
+            )
+            self._accessed.clear()
+
+    def _evict_disk(self):
+        overflow = self._disk_entries - self.max_disk_entries
+        if overflow > 0:
+            self._conn.execute(
+                """
+                DELETE FROM page_content WHERE url IN (
+                    SELECT url FROM page_content ORDER BY accessed_at ASC LIMIT ?
+                )
+                """,
+                (overflow,),
+            )
+            self._disk_entries -= overflow
+            self._counters["disk_evictions"] += overflow
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters and sizes for tuning the cache."""
+        with self._lock:
+            disk_entries = self._disk_entries
+            counters = dict(self._counters)
+        lookups = counters["memory_hits"] + counters["disk_hits"] + counters["misses"]
+        hits = counters["memory_hits"] + counters["disk_hits"]
+        return {
+            **counters,
+            "hits": hits,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "disk_entries": disk_entries,
+        }
+
+    def close(self):
+        with self._lock:
+            self._flush_accessed()
+            self._conn.commit()
+            self._conn.close()
@@ -0,0 +1,206 @@
+import heapq
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.config import settings
+from app.services.passage_selector import tokenize
+
+def trigrams(word: str) -> Set[str]:
+    padded = f"  {word} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+def bounded_levenshtein(a: str, b: str, max_distance: int) -> Optional[int]:
+    """
+    Edit distance between `a` and `b`, or None as soon as it is certain to
+    exceed `max_distance`. Only the diagonal band of width 2 * max_distance + 1
+    is computed, so the cost is O(len * max_distance) rather than O(len^2).
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return None
+    if len(a) > len(b):
+        a, b = b, a
+    too_far = max_distance + 1
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        low = max(1, i - max_distance)
+        high = min(len(b), i + max_distance)
+        current = [too_far] * (len(b) + 1)
+        current[0] = i if i <= max_distance else too_far
+        row_min = current[0]
+        for j in range(low, high + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            current[j] = value if value < too_far else too_far
+            row_min = min(row_min, current[j])
+        if row_min > max_distance:
+            return None
+        previous = current
+    return previous[len(b)] if previous[len(b)] <= max_distance else None
+
+PUBLIC = "*"
+
+class FuzzyIndex:
+    """
+    Typo-tolerant search over flashcards and decks.
+
+    Documents are indexed per scope: one per kind and owner, plus one for
+    public decks, so a lookup only ever considers words the user can see.
+    Within a scope, words are indexed by their character trigrams. A query
+    word first collects the scope's words sharing the most trigrams with it
+    (cheap set lookups), and only those candidates are checked with a
+    bounded edit distance. Documents are then ranked by how many query
+    words they match and how closely. The whole lookup stops at
+    `budget_ms`, returning the best results found so far.
+    """
+
+    def __init__(self, max_candidates: int = 50, budget_ms: float = 50.0):
+        self._lock = threading.RLock()
+        self.max_candidates = max_candidates
+        self.budget_ms = budget_ms
+        # (kind, owner or PUBLIC) -> (trigram -> words, word -> document ids)
+        self.scopes: Dict[Tuple[str, str], Tuple[Dict[str, Set[str]], Dict[str, Set[str]]]] = {}
+        # (kind, id) -> (scope, distinct words)
+        self.docs: Dict[Tuple[str, str], Tuple[Tuple[str, str], Tuple[str, ...]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def add(self, kind: str, doc_id: Any, scope: Any, *texts: Optional[str]):
+        """Index a document under `scope`, replacing any previous version with the same id."""
+        ref = (kind, str(doc_id))
+        key = (kind, str(scope))
+        words = set(tokenize(" ".join(text for text in texts if text)))
+        with self._lock:
+            self.remove(kind, doc_id)
+            trigram_words, word_docs = self.scopes.setdefault(key, ({}, {}))
+            for word in words:
+                docs = word_docs.get(word)
+                if docs is None:
+                    docs = word_docs[word] = set()
+                    for trigram in trigrams(word):
+                        trigram_words.setdefault(trigram, set()).add(word)
+                docs.add(ref[1])
+            self.docs[ref] = (key, tuple(words))
+
+    def remove(self, kind: str, doc_id: Any):
+        ref = (kind, str(doc_id))
+        with self._lock:
+            doc = self.docs.pop(ref, None)
+            if doc is None:
+                return
+            key, doc_words = doc
+            trigram_words, word_docs = self.scopes[key]
+            for word in doc_words:
+                docs = word_docs[word]
+                docs.discard(ref[1])
+                if not docs:
+                    del word_docs[word]
+                    for trigram in trigrams(word):
+                        words = trigram_words[trigram]
+                        words.discard(word)
+                        if not words:
+                            del trigram_words[trigram]
+            if not word_docs:
+                del self.scopes[key]
+
+    def index_flashcard(self, card_id: Any, user_id: Any, *texts: Optional[str]):
+        self.add("flashcard", card_id, user_id, *texts)
+
+    def index_deck(self, deck_id: Any, user_id: Any, is_public: bool, *texts: Optional[str]):
+        self.add("deck", deck_id, PUBLIC if is_public else user_id, *texts)
+
+    def remove_flashcard(self, card_id: Any):
+        self.remove("flashcard", card_id)
+
+    def remove_deck(self, deck_id: Any):
+        self.remove("deck", deck_id)
+
+    def _similar_words(
+        self, trigram_words: Dict[str, Set[str]], word_docs: Dict[str, Set[str]], token: str, deadline: float
+    ) -> Dict[str, float]:
+        """Words of one scope within the edit distance allowed for `token`, with a 0-1 similarity."""
+        if token in word_docs:
+            return {token: 1.0}
+        max_distance = 1 if len(token) <= 4 else 2
+        shared = Counter()
+        for trigram in trigrams(token):
+            if time.perf_counter() > deadline:
+                return {}
+            shared.update(trigram_words.get(trigram, ()))
+        similar = {}
+        for word, _ in shared.most_common(self.max_candidates):
+            if time.perf_counter() > deadline:
+                break
+            distance = bounded_levenshtein(token, word, max_distance)
+            if distance is not None:
+                similar[word] = 1.0 - distance / max(len(token), len(word))
+        return similar
+
+    def search(
+        self, query: str, kind: str, user_id: Optional[Any] = None, limit: int = 10, offset: int = 0
+    ) -> List[str]:
+        """
+        Ids of the best fuzzy matches of `kind` ("flashcard" or "deck") the
+        user can see: their own documents, plus public ones for decks.
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+        keys = [] if user_id is None else [(kind, str(user_id))]
+        if kind == "deck":
+            keys.append((kind, PUBLIC))
+        deadline = time.perf_counter() + self.budget_ms / 1000
+        # id -> (query words matched, summed similarity)
+        scores: Dict[str, List[float]] = {}
+        with self._lock:
+            scopes = [self.scopes[key] for key in keys if key in self.scopes]
+            for token in tokens:
+                best: Dict[str, float] = {}
+                for trigram_words, word_docs in scopes:
+                    for word, similarity in self._similar_words(trigram_words, word_docs, token, deadline).items():
+                        for doc_id in word_docs[word]:
+                            if similarity > best.get(doc_id, 0.0):
+                                best[doc_id] = similarity
+                for doc_id, similarity in best.items():
+                    score = scores.setdefault(doc_id, [0, 0.0])
+                    score[0] += 1
+                    score[1] += similarity
+                if time.perf_counter() > deadline:
+                    break
+        top = heapq.nlargest(offset + limit, scores.items(), key=lambda item: (item[1][0], item[1][1], item[0]))
+        return [doc_id for doc_id, _ in top[offset:]]
+
+    def build(
+        self,
+        decks: Iterable[Tuple[Any, Any, bool, Tuple[Optional[str], ...]]],
+        flashcards: Iterable[Tuple[Any, Any, Tuple[Optional[str], ...]]],
+    ):
+        """Replace the whole index from (id, user_id, is_public, texts) deck rows and (id, user_id, texts) card rows."""
+        with self._lock:
+            self.clear()
+            for deck_id, user_id, is_public, texts in decks:
+                self.index_deck(deck_id, user_id, is_public, *texts)
+            for card_id, user_id, texts in flashcards:
+                self.index_flashcard(card_id, user_id, *texts)
+
+    def clear(self):
+        with self._lock:
+            self.scopes = {}
+            self.docs = {}
+
+    def stats(self) -> Dict[str, int]:
+        """Documents, scopes, and words and trigrams summed over the scopes."""
+        with self._lock:
+            return {
+                "documents": len(self.docs),
+                "scopes": len(self.scopes),
+                "words": sum(len(word_docs) for _, word_docs in self.scopes.values()),
+                "trigrams": sum(len(trigram_words) for trigram_words, _ in self.scopes.values()),
+            }
+
+fuzzy_index = FuzzyIndex(max_candidates=settings.FUZZY_MAX_CANDIDATES, budget_ms=settings.FUZZY_BUDGET_MS)
+
+def fuzzy_search_enabled() -> bool:
+    return settings.FUZZY_SEARCH_ENABLED
@@ -0,0 +1,271 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, TypeVar
+
+T = TypeVar("T")
+
+class ProviderUnavailable(Exception):
+    """Raised instead of calling a provider that is failing or overloaded."""
+
+    def __init__(self, provider: str, reason: str, retry_after: Optional[float] = None):
+        super().__init__(f"{provider} is unavailable: {reason}")
+        self.provider = provider
+        self.reason = reason
+        self.retry_after = retry_after
+
+class TokenBucket:
+    """Allows `rate` calls per second on average with bursts of up to `burst` calls."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, deadline: float) -> bool:
+        """Take one token, waiting until `deadline` (monotonic time) at most."""
+        if self.rate <= 0:
+            return True
+        while True:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            wait = (1 - self._tokens) / self.rate
+            if time.monotonic() + wait > deadline:
+                return False
+            await asyncio.sleep(wait)
+
+class CircuitBreaker:
+    """
+    Opens when too many of the last `window` calls failed or were slower
+    than `slow_call_seconds`, rejects calls for `reset_seconds`, then lets
+    a single probe call through (half-open) to decide whether to close.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        window: int = 20,
+        min_calls: int = 5,
+        error_rate: float = 0.5,
+        slow_call_seconds: float = 10.0,
+        slow_call_rate: float = 0.5,
+        reset_seconds: float = 30.0,
+    ):
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.reset_seconds = reset_seconds
+
+        self._outcomes: "deque[tuple]" = deque(maxlen=window)
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_seconds:
+            self._state = self.HALF_OPEN
+        return self._state
+
+    def retry_after(self) -> float:
+        return max(0.0, self.reset_seconds - (time.monotonic() - self._opened_at))
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def record(self, success: bool, seconds: float):
+        slow = seconds >= self.slow_call_seconds
+        if self._state == self.HALF_OPEN:
+            self._probe_in_flight = False
+            if success and not slow:
+                self._state = self.CLOSED
+                self._outcomes.clear()
+            else:
+                self._open()
+            return
+
+        self._outcomes.append((success, slow))
+        if len(self._outcomes) < self.min_calls:
+            return
+        failures = sum(1 for ok, _ in self._outcomes if not ok) / len(self._outcomes)
+        slow_calls = sum(1 for _, was_slow in self._outcomes if was_slow) / len(self._outcomes)
+        if failures >= self.error_rate or slow_calls >= self.slow_call_rate:
+            self._open()
+
+    def abandon(self):
+        """A call ended without an outcome (cancelled); free the probe slot."""
+        if self._state == self.HALF_OPEN:
+            self._probe_in_flight = False
+
+    def _open(self):
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+        self.times_opened += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "times_opened": self.times_opened,
+            "recent_calls": len(self._outcomes),
+            "recent_failures": sum(1 for ok, _ in self._outcomes if not ok),
+            "recent_slow_calls": sum(1 for _, slow in self._outcomes if slow),
+        }
+
+class ProviderGovernor:
+    """
+    Admission control for calls to one outbound provider (SerpAPI, OpenAI).
+
+    A call is admitted once it gets one of `max_concurrency` slots and a
+    token from the provider's token bucket. At most `max_queue` callers wait
+    for admission, for at most `queue_timeout` seconds; past either limit,
+    or while the circuit breaker is open, ProviderUnavailable is raised
+    straight away instead of letting requests pile up behind a slow
+    provider. Every admitted call's outcome and latency feed the breaker.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate: float,
+        burst: int,
+        max_concurrency: int,
+        max_queue: int,
+        queue_timeout: float,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.bucket = TokenBucket(rate, burst)
+        self.breaker = breaker or CircuitBreaker()
+
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._waiting = 0
+        self._in_flight = 0
+        self._counters = {
+            "admitted": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "rejected_open": 0,
+            "rejected_queue_full": 0,
+            "rejected_timeout": 0,
+        }
+
+    def _reject(self, counter: str, reason: str, retry_after: Optional[float] = None):
+        self._counters[counter] += 1
+        raise ProviderUnavailable(self.name, reason, retry_after)
+
+    async def _admit(self):
+        if self.breaker.state == CircuitBreaker.OPEN:
+            self._reject("rejected_open", "circuit open", self.breaker.retry_after())
+        if self._waiting >= self.max_queue and self._slots.locked():
+            self._reject("rejected_queue_full", f"admission queue is full ({self.max_queue} waiting)")
+
+        deadline = time.monotonic() + self.queue_timeout
+        self._waiting += 1
+        try:
+            try:
+                await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                self._reject("rejected_timeout", f"no free slot within {self.queue_timeout}s")
+            try:
+                cleared = await self.bucket.acquire(deadline)
+            except BaseException:
+                # Cancelled while waiting for the rate limit: give the slot back
+                self._slots.release()
+                raise
+            if not cleared:
+                self._slots.release()
+                self._reject("rejected_timeout", f"rate limit not cleared within {self.queue_timeout}s")
+        finally:
+            self._waiting -= 1
+
+        if not self.breaker.allow():
+            self._slots.release()
+            self._reject("rejected_open", "circuit open", self.breaker.retry_after())
+
+    def _release(self, succeeded: Optional[bool], start: float):
+        """Record the outcome of an admitted call (None: abandoned, no verdict) and free its slot."""
+        if succeeded is None:
+            self.breaker.abandon()
+        else:
+            self._counters["succeeded" if succeeded else "failed"] += 1
+            self.breaker.record(succeeded, time.monotonic() - start)
+        self._in_flight -= 1
+        self._slots.release()
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        """
+        Hold an admission slot for the body of the `async with` block, e.g.
+        around a streamed response. An exception escaping the block counts
+        as a provider failure.
+        """
+        await self._admit()
+        self._counters["admitted"] += 1
+        self._in_flight += 1
+        start = time.monotonic()
+        try:
+            yield
+        except Exception:
+            self._release(False, start)
+            raise
+        except BaseException:
+            # Cancelled or closed early by the consumer: no verdict on the provider
+            self._release(None, start)
+            raise
+        else:
+            self._release(True, start)
+
+    async def call(self, fn: Callable[..., Awaitable[T]], *args, **kwargs) -> T:
+        """
+        Await `fn(*args, **kwargs)` once admitted.
+
+        The call is shielded from the caller's cancellation and keeps its
+        slot until it actually finishes: a request running in a thread
+        (asyncio.to_thread) cannot be stopped, so releasing the slot on
+        cancel would let more than `max_concurrency` requests reach the
+        provider at once.
+        """
+        await self._admit()
+        self._counters["admitted"] += 1
+        self._in_flight += 1
+        start = time.monotonic()
+        work = asyncio.ensure_future(fn(*args, **kwargs))
+
+        def finished(work: "asyncio.Future[T]"):
+            self._release(None if work.cancelled() else work.exception() is None, start)
+
+        work.add_done_callback(finished)
+        return await asyncio.shield(work)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._counters,
+            **self.breaker.stats(),
+            "queue_depth": self._waiting,
+            "in_flight": self._in_flight,
+            "max_concurrency": self.max_concurrency,
+        }
@@ -0,0 +1,118 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from html.parser import HTMLParser
+from typing import List, Optional
+
+# Elements whose text is page chrome or code rather than article content
+BOILERPLATE_TAGS = {
+    "script", "style", "noscript", "template", "svg", "iframe",
+    "nav", "footer", "aside", "form", "button", "select",
+}
+# A <header> is site chrome at page level, but inside these it holds the
+# article's own title and byline
+CONTENT_TAGS = {"article", "main"}
+
+class _TextCollector(HTMLParser):
+    """
+    Streaming HTML parser that keeps whitespace-normalized text outside
+    boilerplate elements and stops collecting once it has enough.
+    """
+
+    def __init__(self, max_chars: int):
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.parts: List[str] = []
+        self.length = 0
+        self._skip_depth = 0
+        self._content_depth = 0
+        # Per open <header>: whether it was skipped
+        self._headers: List[bool] = []
+
+    @property
+    def full(self) -> bool:
+        return self.length >= self.max_chars
+
+    def handle_starttag(self, tag, attrs):
+        if tag in BOILERPLATE_TAGS:
+            self._skip_depth += 1
+        elif tag in CONTENT_TAGS:
+            self._content_depth += 1
+        elif tag == "header":
+            skipped = not self._content_depth
+            self._headers.append(skipped)
+            if skipped:
+                self._skip_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in BOILERPLATE_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        elif tag in CONTENT_TAGS and self._content_depth:
+            self._content_depth -= 1
+        elif tag == "header" and self._headers and self._headers.pop() and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data):
+        if self._skip_depth or self.full:
+            return
+        text = " ".join(data.split())
+        if text:
+            self.parts.append(text)
+            self.length += len(text) + 1
+
+def extract_text(html: bytes, encoding: Optional[str] = None, max_chars: int = 1000, chunk_size: int = 16384) -> str:
+    """
+    Extract up to `max_chars` of readable text from an HTML document.
+
+    The document is fed to the parser in chunks and parsing stops as soon as
+    enough text has been collected, so the tail of a large page is never
+    tokenized. Runs in worker processes, so it must stay a plain top-level
+    function of bytes and primitives.
+    """
+    try:
+        document = html.decode(encoding or "utf-8", errors="replace")
+    except LookupError:
+        document = html.decode("utf-8", errors="replace")
+
+    collector = _TextCollector(max_chars)
+    for start in range(0, len(document), chunk_size):
+        collector.feed(document[start:start + chunk_size])
+        if collector.full:
+            break
+    return " ".join(collector.parts)[:max_chars]
+
+class HTMLExtractor:
+    """
+    Runs `extract_text` in a process pool so several pages parse in parallel
+    across cores without holding up the event loop.
+    With `max_workers=0` extraction runs inline, which is useful for tests
+    and single-core deployments. If a worker dies, the broken pool is
+    replaced on the next call and the page is extracted inline.
+    """
+
+    def __init__(self, max_workers: int = 2, max_chars: int = 1000):
+        self.max_workers = max_workers
+        self.max_chars = max_chars
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._pool
+
+    async def extract(self, html: bytes, encoding: Optional[str] = None) -> str:
+        if self.max_workers <= 0:
+            return extract_text(html, encoding, self.max_chars)
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self.pool, extract_text, html, encoding, self.max_chars)
+        except BrokenProcessPool as e:
+            print(f"HTML extraction pool failed, extracting inline: {e}")
+            self.close()
+            return extract_text(html, encoding, self.max_chars)
+
+    def close(self, wait: bool = False):
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
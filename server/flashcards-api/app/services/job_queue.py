@@ -0,0 +1,206 @@
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from app.services.search_service import SearchService
+
+class JobQueueFull(Exception):
+    pass
+
+class GenerationJobQueue:
+    """
+    In-process worker pool for flashcard generation jobs.
+
+    Requests enqueue a job id and return immediately; a fixed number of
+    worker tasks run the SearchService pipeline and persist status and
+    results through the job repository, so workers are sized independently
+    of request handlers and clients poll `GET /jobs/{id}` for the outcome.
+    """
+
+    def __init__(
+        self,
+        repository,
+        search_service: Optional[SearchService],
+        workers: int = 4,
+        max_queue_size: int = 100,
+        lease_seconds: float = 60.0,
+    ):
+        self.repository = repository
+        self.search_service = search_service
+        self.workers = workers
+        self.max_queue_size = max_queue_size
+        # Jobs are leased by this queue: it renews the lease of its unfinished
+        # jobs every lease_seconds / 3, and any queue fails jobs whose lease
+        # ran out, since the process holding them is gone
+        self.lease_seconds = lease_seconds
+        self.owner = uuid.uuid4().hex
+
+        self._queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=max_queue_size)
+        # Places taken by submissions still being persisted
+        self._reserved = 0
+        self._worker_tasks: List[asyncio.Task] = []
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._busy_workers = 0
+        self._busy_seconds = 0.0
+        self._started_at: Optional[float] = None
+        self._counters = {"submitted": 0, "completed": 0, "failed": 0, "rejected": 0}
+
+    async def start(self):
+        """Fail jobs abandoned by stopped processes and start the workers."""
+        await self._fail_abandoned()
+        self._started_at = time.monotonic()
+        self._worker_tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._heartbeat_task = asyncio.create_task(self._heartbeat())
+
+    async def stop(self):
+        tasks = self._worker_tasks + ([self._heartbeat_task] if self._heartbeat_task else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._worker_tasks = []
+        self._heartbeat_task = None
+
+    async def _fail_abandoned(self):
+        stale_before = datetime.utcnow() - timedelta(seconds=self.lease_seconds)
+        failed = await self.repository.fail_unfinished("Worker stopped before the job finished", stale_before)
+        if failed:
+            print(f"⚠️ Marked {failed} abandoned generation jobs as failed")
+
+    async def _heartbeat(self):
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                await self.repository.renew(self.owner, datetime.utcnow())
+                await self._fail_abandoned()
+            except Exception as e:
+                print(f"⚠️ Could not renew generation job leases: {e}")
+
+    async def submit(self, user_id: str, query: str, num_flashcards: int) -> Dict[str, Any]:
+        """
+        Persist a queued job and hand it to the workers.
+        Raises JobQueueFull instead of waiting when the queue is at capacity.
+        """
+        if self._queue.qsize() + self._reserved >= self.max_queue_size:
+            self._counters["rejected"] += 1
+            raise JobQueueFull(f"Generation queue is full ({self.max_queue_size} jobs)")
+
+        job = {
+            "id": uuid.uuid4().hex,
+            "user_id": user_id,
+            "query": query,
+            "num_flashcards": num_flashcards,
+            "status": "queued",
+            "flashcards": [],
+            "error": None,
+            "created_at": datetime.utcnow(),
+            "started_at": None,
+            "finished_at": None,
+            "owner": self.owner,
+            "heartbeat_at": datetime.utcnow(),
+        }
+        # Hold a place while the job is persisted, so concurrent submissions
+        # cannot fill the queue in the meantime and make put_nowait fail
+        self._reserved += 1
+        try:
+            await self.repository.create(job)
+        finally:
+            self._reserved -= 1
+        self._queue.put_nowait(job)
+        self._counters["submitted"] += 1
+        return job
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await self.repository.get_by_id(job_id)
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            self._busy_workers += 1
+            start = time.monotonic()
+            try:
+                await self._run(job)
+            except Exception as e:
+                # A repository error must not end the worker: the queue would lose it for good
+                print(f"⚠️ Generation job {job['id']} could not be processed: {e}")
+                await self._mark_failed(job, f"Error processing job: {e}")
+            finally:
+                self._busy_seconds += time.monotonic() - start
+                self._busy_workers -= 1
+                self._queue.task_done()
+
+    async def _mark_failed(self, job: Dict[str, Any], error: str):
+        """Best effort, since the repository may still be failing."""
+        try:
+            await self.repository.update(job["id"], {
+                "status": "failed",
+                "error": error,
+                "finished_at": datetime.utcnow(),
+            })
+        except Exception as e:
+            print(f"⚠️ Could not mark generation job {job['id']} as failed: {e}")
+
+    async def _run(self, job: Dict[str, Any]):
+        await self.repository.update(job["id"], {"status": "running", "started_at": datetime.utcnow()})
+        try:
+            if self.search_service is None:
+                raise ValueError("search functionality is not configured")
+            flashcards = await self.search_service.get_or_generate_flashcards(job["query"], job["num_flashcards"])
+            if not flashcards:
+                raise ValueError("no flashcards could be generated for this query")
+        except Exception as e:
+            self._counters["failed"] += 1
+            await self.repository.update(job["id"], {
+                "status": "failed",
+                "error": f"Error generating flashcards: {str(e)}",
+                "finished_at": datetime.utcnow(),
+            })
+            return
+
+        self._counters["completed"] += 1
+        await self.repository.update(job["id"], {
+            "status": "completed",
+            "flashcards": flashcards,
+            "finished_at": datetime.utcnow(),
+        })
+
+    def stats(self) -> Dict[str, Any]:
+        uptime = time.monotonic() - self._started_at if self._started_at is not None else 0.0
+        capacity = uptime * self.workers
+        return {
+            **self._counters,
+            "queue_depth": self._queue.qsize(),
+            "max_queue_size": self.max_queue_size,
+            "workers": self.workers,
+            "busy_workers": self._busy_workers,
+            "utilisation": round(self._busy_seconds / capacity, 4) if capacity else 0.0,
+        }
+
+_job_queue: Optional[GenerationJobQueue] = None
+
+async def start_job_queue(
+    repository,
+    search_service: Optional[SearchService],
+    workers: int,
+    max_queue_size: int,
+    lease_seconds: float = 60.0,
+) -> GenerationJobQueue:
+    """Create and start the application-wide job queue (called from the startup hook)."""
+    global _job_queue
+    _job_queue = GenerationJobQueue(
+        repository, search_service, workers=workers, max_queue_size=max_queue_size, lease_seconds=lease_seconds
+    )
+    await _job_queue.start()
+    return _job_queue
+
+async def stop_job_queue():
+    global _job_queue
+    if _job_queue is not None:
+        await _job_queue.stop()
+        _job_queue = None
+
+def get_job_queue() -> GenerationJobQueue:
+    if _job_queue is None:
+        raise RuntimeError("Job queue is not running. Call start_job_queue() first.")
+    return _job_queue
@@ -0,0 +1,287 @@
+import asyncio
+import re
+import threading
+import zlib
+from collections import OrderedDict, defaultdict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.config import settings
+
+# Mersenne prime used for the universal hash family; with 31-bit coefficients
+# and 32-bit shingle hashes every product fits in an unsigned 64-bit integer
+_PRIME = np.uint64((1 << 61) - 1)
+_MAX_COEFFICIENT = (1 << 31) - 1
+_WORD_RE = re.compile(r"\w+")
+
+def normalize_card_text(question: str, answer: str) -> str:
+    return " ".join(_WORD_RE.findall(f"{question} {answer}".lower()))
+
+def shingles(text: str, size: int = 4) -> np.ndarray:
+    """32-bit hashes of the character `size`-grams of already normalized text."""
+    if len(text) <= size:
+        grams = {text} if text else set()
+    else:
+        grams = {text[start:start + size] for start in range(len(text) - size + 1)}
+    return np.fromiter((zlib.crc32(gram.encode()) for gram in grams), dtype=np.uint64, count=len(grams))
+
+class MinHasher:
+    """MinHash signatures with `num_perm` hash functions of the form (a*x + b) mod p."""
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self._a = rng.integers(1, _MAX_COEFFICIENT, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _MAX_COEFFICIENT, size=num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> np.ndarray:
+        hashes = shingles(text)
+        if hashes.size == 0:
+            return np.full(self.num_perm, _PRIME, dtype=np.uint64)
+        # (num_perm x shingles) matrix, minimum over each row
+        return ((np.outer(self._a, hashes) + self._b[:, None]) % _PRIME).min(axis=1)
+
+class NearDuplicateIndex:
+    """
+    LSH index over MinHash signatures of flashcard text.
+
+    Signatures are cut into `bands` bands; two cards become candidates when
+    any band matches exactly, and candidates are confirmed by the estimated
+    Jaccard similarity of their signatures. Lookups only touch the cards
+    sharing a bucket, not the whole deck. With the default 16 bands of 4
+    rows, pairs above ~0.5 similarity almost always collide, comfortably
+    below the 0.8 threshold used to call a card a duplicate.
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 64, bands: int = 16, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hasher = MinHasher(num_perm, seed)
+        self._buckets: List[Dict[bytes, List[Hashable]]] = [defaultdict(list) for _ in range(bands)]
+        self._signatures: Dict[Hashable, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def keys(self) -> List[Hashable]:
+        return list(self._signatures)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def add(self, key: Hashable, question: str, answer: str, signature: Optional[np.ndarray] = None):
+        """Index a card, replacing any previous version with the same key."""
+        self.remove(key)
+        if signature is None:
+            signature = self.hasher.signature(normalize_card_text(question, answer))
+        self._signatures[key] = signature
+        for band, band_key in enumerate(self._band_keys(signature)):
+            self._buckets[band][band_key].append(key)
+
+    def remove(self, key: Hashable):
+        signature = self._signatures.pop(key, None)
+        if signature is None:
+            return
+        for band, band_key in enumerate(self._band_keys(signature)):
+            bucket = self._buckets[band][band_key]
+            bucket.remove(key)
+            if not bucket:
+                del self._buckets[band][band_key]
+
+    def query(self, question: str, answer: str) -> List[Tuple[Hashable, float]]:
+        """Keys of indexed cards at or above the threshold, most similar first."""
+        return self._query(self.hasher.signature(normalize_card_text(question, answer)))
+
+    def _query(self, signature: np.ndarray) -> List[Tuple[Hashable, float]]:
+        candidates = set()
+        for band, band_key in enumerate(self._band_keys(signature)):
+            candidates.update(self._buckets[band].get(band_key, ()))
+
+        matches = []
+        for key in candidates:
+            similarity = float(np.mean(self._signatures[key] == signature))
+            if similarity >= self.threshold:
+                matches.append((key, similarity))
+        matches.sort(key=lambda match: match[1], reverse=True)
+        return matches
+
+    def check_and_add(self, key: Hashable, question: str, answer: str) -> Optional[Tuple[Hashable, float]]:
+        """
+        Return the closest indexed near-duplicate of the card, or index the
+        card under `key` and return None when it is new.
+        """
+        signature = self.hasher.signature(normalize_card_text(question, answer))
+        matches = self._query(signature)
+        if matches:
+            return matches[0]
+        self.add(key, question, answer, signature=signature)
+        return None
+
+def new_duplicate_index() -> NearDuplicateIndex:
+    """Empty index with the configured threshold and signature parameters."""
+    return NearDuplicateIndex(
+        threshold=settings.DEDUP_THRESHOLD,
+        num_perm=settings.DEDUP_NUM_PERM,
+        bands=settings.DEDUP_BANDS,
+    )
+
+def split_near_duplicates(
+    flashcards: Iterable[Dict[str, Any]],
+    index: Optional[NearDuplicateIndex] = None,
+    existing: Optional[NearDuplicateIndex] = None,
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Split cards into (unique, duplicates), checking each against `index`
+    and against the cards kept before it. Kept cards are added to the
+    index. `existing` (for example a deck's cached index) is also checked
+    but left unchanged.
+    """
+    if index is None:
+        index = new_duplicate_index()
+    unique, duplicates = [], []
+    for position, card in enumerate(flashcards):
+        matches = existing.query(card["question"], card["answer"]) if existing is not None else []
+        match = matches[0] if matches else index.check_and_add(("new", position), card["question"], card["answer"])
+        if match is None:
+            unique.append(card)
+        else:
+            duplicates.append(card)
+    return unique, duplicates
+
+def build_duplicate_index(cards: Iterable[Tuple[Any, str, str]]) -> NearDuplicateIndex:
+    """Index of (id, front, back) cards keyed by card id; CPU-bound, run it off the event loop."""
+    index = new_duplicate_index()
+    for card_id, front, back in cards:
+        index.add(str(card_id), front or "", back or "")
+    return index
+
+class DeckDuplicateIndexes:
+    """
+    Near-duplicate indexes of recently used decks, so saving cards to a deck
+    only hashes the new cards instead of every card already in it.
+
+    A bounded LRU of deck id -> NearDuplicateIndex keyed by card id. The
+    flashcard repositories keep cached decks current from their write
+    hooks. A deck that is not cached is loaded between `begin_load` and
+    `end_load`; when one of its cards is written meanwhile, the loaded
+    index may have missed it and is used once but not cached.
+    """
+
+    def __init__(self, max_decks: int = 256):
+        self.max_decks = max_decks
+        self._lock = threading.RLock()
+        self._indexes: "OrderedDict[str, NearDuplicateIndex]" = OrderedDict()
+        self._card_decks: Dict[str, str] = {}
+        # deck id -> [loads in flight, card writes seen since the first began]
+        self._loading: Dict[str, List[int]] = {}
+
+    def get(self, deck_id: Any) -> Optional[NearDuplicateIndex]:
+        deck_id = str(deck_id)
+        with self._lock:
+            index = self._indexes.get(deck_id)
+            if index is not None:
+                self._indexes.move_to_end(deck_id)
+            return index
+
+    def begin_load(self, deck_id: Any) -> int:
+        """Token to pass to `end_load` once the deck's index is built."""
+        with self._lock:
+            loading = self._loading.setdefault(str(deck_id), [0, 0])
+            loading[0] += 1
+            return loading[1]
+
+    def end_load(self, deck_id: Any, token: int, index: Optional[NearDuplicateIndex] = None):
+        """Cache `index` unless a card of the deck was written since `begin_load`."""
+        deck_id = str(deck_id)
+        with self._lock:
+            loading = self._loading[deck_id]
+            loading[0] -= 1
+            unchanged = loading[1] == token
+            if not loading[0]:
+                del self._loading[deck_id]
+            if index is None or not unchanged:
+                return
+            self._drop(deck_id)
+            self._indexes[deck_id] = index
+            for card_id in index.keys():
+                self._card_decks[card_id] = deck_id
+            while len(self._indexes) > self.max_decks:
+                self._drop(next(iter(self._indexes)))
+
+    def split(self, index: NearDuplicateIndex, flashcards: Iterable[Dict[str, Any]]):
+        """split_near_duplicates against a deck index that write hooks may be updating."""
+        with self._lock:
+            return split_near_duplicates(flashcards, existing=index)
+
+    def index_flashcard(self, card_id: Any, deck_id: Any, front: Optional[str], back: Optional[str]):
+        card_id, deck_id = str(card_id), str(deck_id)
+        with self._lock:
+            self._touch(deck_id)
+            previous = self._card_decks.pop(card_id, None)
+            if previous is not None and previous != deck_id:
+                self._touch(previous)
+                self._indexes[previous].remove(card_id)
+            index = self._indexes.get(deck_id)
+            if index is not None:
+                index.add(card_id, front or "", back or "")
+                self._card_decks[card_id] = deck_id
+
+    def remove_flashcard(self, card_id: Any):
+        card_id = str(card_id)
+        with self._lock:
+            deck_id = self._card_decks.pop(card_id, None)
+            if deck_id is not None:
+                self._touch(deck_id)
+                self._indexes[deck_id].remove(card_id)
+
+    def remove_deck(self, deck_id: Any):
+        with self._lock:
+            self._drop(str(deck_id))
+
+    def _touch(self, deck_id: str):
+        """Record a card write to the deck for loads in flight."""
+        loading = self._loading.get(deck_id)
+        if loading is not None:
+            loading[1] += 1
+
+    def _drop(self, deck_id: str):
+        index = self._indexes.pop(deck_id, None)
+        if index is not None:
+            for card_id in index.keys():
+                self._card_decks.pop(card_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._indexes.clear()
+            self._card_decks.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"decks": len(self._indexes), "flashcards": len(self._card_decks)}
+
+deck_duplicate_indexes = DeckDuplicateIndexes(max_decks=settings.DEDUP_CACHED_DECKS)
+
+async def deck_duplicate_index(
+    deck_id: Any, load_cards: Callable[[], Awaitable[List[Any]]]
+) -> NearDuplicateIndex:
+    """
+    The deck's cached index, or one built from `load_cards()` (rows with
+    id, front and back) in a worker thread and cached.
+    """
+    index = deck_duplicate_indexes.get(deck_id)
+    if index is not None:
+        return index
+    token = deck_duplicate_indexes.begin_load(deck_id)
+    index = None
+    try:
+        cards = await load_cards()
+        index = await asyncio.to_thread(
+            build_duplicate_index, [(card.id, card.front, card.back) for card in cards]
+        )
+    finally:
+        deck_duplicate_indexes.end_load(deck_id, token, index)
+    return index
@@ -0,0 +1,112 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+)
+
+@dataclass
+class FetchedPage:
+    url: str
+    status_code: int
+    headers: httpx.Headers
+    content: bytes
+    encoding: Optional[str]
+    truncated: bool = False
+
+class PageFetcher:
+    """
+    Downloads search result pages concurrently over one keep-alive connection pool.
+
+    A global semaphore caps the number of in-flight requests and a per-host
+    semaphore keeps us from hammering a single site when several results
+    point at the same domain. Bodies are streamed and cut off at
+    `max_bytes`, since only the start of each page is ever used.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 20,
+        max_connections_per_host: int = 4,
+        timeout: float = 10.0,
+        max_bytes: int = 512 * 1024,
+        user_agent: str = DEFAULT_USER_AGENT,
+    ):
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.user_agent = user_agent
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._global_limit = asyncio.Semaphore(max_connections)
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared HTTP client, created on first use so it binds to the running loop."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                follow_redirects=True,
+                headers={"User-Agent": self.user_agent},
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+        return self._client
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc.lower()
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.max_connections_per_host)
+        return self._host_limits[host]
+
+    async def fetch(self, url: str, headers: Optional[Dict[str, str]] = None) -> Optional[FetchedPage]:
+        """
+        Fetch a single URL, returning None on any network or HTTP error
+        (status 400 and up). A 304 Not Modified answer to a conditional
+        request is returned like any other page, with an empty body.
+        """
+        try:
+            async with self._global_limit, self._host_limit(url):
+                async with self.client.stream("GET", url, headers=headers) as response:
+                    if response.status_code >= 400:
+                        print(f"Error fetching {url}: HTTP {response.status_code}")
+                        return None
+                    body = bytearray()
+                    truncated = False
+                    async for chunk in response.aiter_bytes():
+                        body.extend(chunk)
+                        if len(body) >= self.max_bytes:
+                            truncated = True
+                            break
+            return FetchedPage(
+                url=url,
+                status_code=response.status_code,
+                headers=response.headers,
+                content=bytes(body[:self.max_bytes]),
+                encoding=response.charset_encoding,
+                truncated=truncated,
+            )
+        except Exception as e:
+            print(f"Error fetching {url}: {e}")
+            return None
+
+    async def fetch_all(self, urls: List[str]) -> List[Optional[FetchedPage]]:
+        """
+        Fetch all URLs at once; results are returned in the same order as `urls`.
+        """
+        return await asyncio.gather(*(self.fetch(url) for url in urls))
+
+    async def close(self):
+        """Close the underlying connection pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
@@ -0,0 +1,135 @@
+import math
+import re
+from collections import Counter
+from typing import Callable, List
+
+import numpy as np
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - optional dependency
+    tiktoken = None
+
+WORD_RE = re.compile(r"\w+")
+
+def tokenize(text: str) -> List[str]:
+    return WORD_RE.findall(text.lower())
+
+class TokenCounter:
+    """
+    Counts prompt tokens with the model's real tokenizer (tiktoken).
+
+    Falls back to a ~4 characters per token estimate when tiktoken is not
+    installed or its encoding files cannot be loaded, so the pipeline keeps
+    working offline.
+    """
+
+    def __init__(self, model: str):
+        self.model = model
+        self._encoding = None
+        if tiktoken is not None:
+            try:
+                self._encoding = tiktoken.encoding_for_model(model)
+            except Exception as e:
+                try:
+                    self._encoding = tiktoken.get_encoding("cl100k_base")
+                except Exception:
+                    print(f"⚠️ tiktoken encoding unavailable ({e}); estimating token counts")
+
+    @property
+    def exact(self) -> bool:
+        return self._encoding is not None
+
+    def __call__(self, text: str) -> int:
+        if self._encoding is not None:
+            return len(self._encoding.encode(text))
+        return math.ceil(len(text) / 4)
+
+def split_passages(text: str, words_per_passage: int = 80, overlap: int = 0) -> List[str]:
+    """Split text into windows of `words_per_passage` words, optionally overlapping."""
+    words = text.split()
+    if not words:
+        return []
+    step = max(1, words_per_passage - overlap)
+    passages = []
+    for start in range(0, len(words), step):
+        passages.append(" ".join(words[start:start + words_per_passage]))
+        if start + words_per_passage >= len(words):
+            break
+    return passages
+
+def bm25_scores(query: str, passages: List[str], k1: float = 1.5, b: float = 0.75) -> np.ndarray:
+    """
+    Okapi BM25 score of every passage against the query, computed over a
+    (passages x query terms) term-frequency matrix with the passages
+    themselves as the corpus.
+    """
+    terms = sorted(set(tokenize(query)))
+    if not passages or not terms:
+        return np.zeros(len(passages))
+
+    term_index = {term: column for column, term in enumerate(terms)}
+    tf = np.zeros((len(passages), len(terms)))
+    lengths = np.zeros(len(passages))
+    for row, passage in enumerate(passages):
+        tokens = tokenize(passage)
+        lengths[row] = len(tokens)
+        for term, count in Counter(tokens).items():
+            column = term_index.get(term)
+            if column is not None:
+                tf[row, column] = count
+
+    df = np.count_nonzero(tf, axis=0)
+    idf = np.log((len(passages) - df + 0.5) / (df + 0.5) + 1.0)
+    avg_length = lengths.mean() or 1.0
+    norm = k1 * (1 - b + b * lengths / avg_length)
+    return ((tf * (k1 + 1)) / (tf + norm[:, None])) @ idf
+
+def select_passages(
+    query: str,
+    pages: List[str],
+    token_budget: int,
+    count_tokens: Callable[[str], int],
+    words_per_passage: int = 80,
+    overlap: int = 0,
+) -> str:
+    """
+    Pick the passages most relevant to the query that fit in `token_budget`.
+
+    Passages are packed greedily by descending BM25 score, then emitted in
+    their original page order so the prompt still reads coherently. When
+    nothing matches the query, passages are taken from the top of each page
+    in turn: every page's first passage, then every page's second, and so on.
+    """
+    passages: List[str] = []
+    page_numbers: List[int] = []
+    positions: List[int] = []
+    for page_number, page in enumerate(pages):
+        for position, passage in enumerate(split_passages(page, words_per_passage, overlap)):
+            passages.append(passage)
+            page_numbers.append(page_number)
+            positions.append(position)
+    if not passages:
+        return ""
+
+    scores = bm25_scores(query, passages)
+    if scores.any():
+        # Stable sort keeps earlier passages first among equal scores
+        order = np.argsort(-scores, kind="stable")
+    else:
+        # Round-robin across pages: by position within the page, then by page
+        order = np.lexsort((page_numbers, positions))
+
+    selected: List[int] = []
+    remaining = token_budget
+    for index in order:
+        if scores.any() and scores[index] <= 0:
+            break
+        cost = count_tokens(passages[index])
+        if cost <= remaining:
+            selected.append(int(index))
+            remaining -= cost
+        if remaining <= 0:
+            break
+
+    return "\n\n".join(passages[index] for index in sorted(selected))
@@ -0,0 +1,130 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+GenerationKey = Tuple[str, int]
+
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive form of a search query."""
+    return " ".join(query.lower().split())
+
+class GenerationCache:
+    """
+    Cache of generated flashcard sets keyed by (normalized query, num_flashcards).
+
+    - Entries younger than `ttl_seconds` are served directly.
+    - Entries within the following `stale_seconds` are served immediately while
+      one background refresh runs (stale-while-revalidate).
+    - Concurrent misses for the same key share a single pipeline run
+      (single-flight); the run is a separate task, so one caller
+      disconnecting does not cancel it for the others.
+    """
+
+    def __init__(self, ttl_seconds: float = 3600, stale_seconds: float = 600, max_entries: int = 1000):
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.max_entries = max_entries
+
+        self._entries: "OrderedDict[GenerationKey, Tuple[List[Dict[str, Any]], float]]" = OrderedDict()
+        self._inflight: Dict[GenerationKey, asyncio.Task] = {}
+        self._counters = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "refreshes": 0,
+            "evictions": 0,
+        }
+
+    @staticmethod
+    def make_key(query: str, num_flashcards: int) -> GenerationKey:
+        return normalize_query(query), num_flashcards
+
+    async def get_or_generate(
+        self,
+        query: str,
+        num_flashcards: int,
+        generate: Callable[[], Awaitable[List[Dict[str, Any]]]],
+    ) -> List[Dict[str, Any]]:
+        """
+        Return cached flashcards for the query, running `generate` at most once
+        per key no matter how many callers ask at the same time.
+        """
+        key = self.make_key(query, num_flashcards)
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            flashcards, created_at = entry
+            age = time.monotonic() - created_at
+            if age < self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self._counters["hits"] += 1
+                return flashcards
+            if age < self.ttl_seconds + self.stale_seconds:
+                self._entries.move_to_end(key)
+                self._counters["stale_hits"] += 1
+                if key not in self._inflight:
+                    self._counters["refreshes"] += 1
+                    self._start(key, generate)
+                return flashcards
+
+        if key in self._inflight:
+            self._counters["coalesced"] += 1
+        else:
+            self._counters["misses"] += 1
+        return await asyncio.shield(self._start(key, generate))
+
+    def peek(self, query: str, num_flashcards: int) -> Optional[List[Dict[str, Any]]]:
+        """Return a fresh cached set without triggering generation."""
+        entry = self._entries.get(self.make_key(query, num_flashcards))
+        if entry is None or time.monotonic() - entry[1] >= self.ttl_seconds:
+            self._counters["misses"] += 1
+            return None
+        self._counters["hits"] += 1
+        return entry[0]
+
+    def store(self, query: str, num_flashcards: int, flashcards: List[Dict[str, Any]]):
+        """Record a set generated outside `get_or_generate`, e.g. by the streaming path."""
+        self._remember(self.make_key(query, num_flashcards), flashcards)
+
+    def _start(self, key: GenerationKey, generate: Callable[[], Awaitable[List[Dict[str, Any]]]]) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._generate_and_store(key, generate))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return task
+
+    def _finish(self, key: GenerationKey, task: asyncio.Task):
+        self._inflight.pop(key, None)
+        # Background refreshes have no awaiting caller; retrieve their error here
+        if not task.cancelled() and task.exception() is not None:
+            print(f"Error generating flashcards for {key[0]!r}: {task.exception()}")
+
+    async def _generate_and_store(
+        self, key: GenerationKey, generate: Callable[[], Awaitable[List[Dict[str, Any]]]]
+    ) -> List[Dict[str, Any]]:
+        flashcards = await generate()
+        self._remember(key, flashcards)
+        return flashcards
+
+    def _remember(self, key: GenerationKey, flashcards: List[Dict[str, Any]]):
+        # An empty set means the pipeline failed; let the next request retry
+        if not flashcards:
+            return
+        self._entries[key] = (flashcards, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._counters["hits"] + self._counters["stale_hits"] + self._counters["misses"] + self._counters["coalesced"]
+        served_from_cache = self._counters["hits"] + self._counters["stale_hits"]
+        return {
+            **self._counters,
+            "hit_rate": served_from_cache / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+            "inflight": len(self._inflight),
+        }
@@ -0,0 +1,166 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Set, Tuple
+
+from app.config import settings
+from app.services.result_cache import normalize_query
+
+def approximate_size(value: Any, _seen: Optional[Set[int]] = None) -> int:
+    """Rough deep size in bytes of a response: containers, models and ORM rows are walked."""
+    seen = _seen if _seen is not None else set()
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(approximate_size(k, seen) + approximate_size(v, seen) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(approximate_size(item, seen) for item in value)
+    elif hasattr(value, "__dict__"):
+        size += sum(
+            approximate_size(v, seen) for k, v in vars(value).items() if not k.startswith("_sa_")
+        )
+    return size
+
+class SearchResultCache:
+    """
+    Bounded LRU cache of /search responses with a TTL, keyed per user.
+
+    Writes made through this process's repositories drop the entries they
+    could change: any flashcard or deck write drops its owner's entries, and
+    a write to a public deck (or one that stops being public) drops every
+    entry that includes decks, since public decks appear in everyone's
+    results. A search that was running while such a write happened is not
+    stored, so a result computed before the write cannot be cached after it.
+
+    The cache lives in one process and only sees that process's writes.
+    Writes from other uvicorn workers or from scripts such as
+    dedupe_flashcards.py are not seen, and their effects show up only once
+    the affected entries expire after `ttl_seconds`.
+    """
+
+    def __init__(self, ttl_seconds: float = 60, max_entries: int = 5000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        # key -> (response, expires_at, user_id, includes decks, approximate bytes)
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float, str, bool, int]]" = OrderedDict()
+        self._by_user: Dict[str, Set[Hashable]] = {}
+        self._with_decks: Set[Hashable] = set()
+        self._user_versions: Dict[str, int] = {}
+        self._public_version = 0
+        self._bytes = 0
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "evictions": 0,
+            "invalidated": 0,
+            "stale_skips": 0,
+        }
+
+    @staticmethod
+    def make_key(user_id: Any, query: str, *flags: Hashable) -> Tuple[Hashable, ...]:
+        return (str(user_id), normalize_query(query), *flags)
+
+    def get(self, key: Tuple[Hashable, ...]) -> Tuple[Optional[Any], Tuple[int, int]]:
+        """
+        The cached response for `key` (None on a miss) and a version token
+        to pass to `store` for the response computed after a miss.
+        """
+        user_id = key[0]
+        with self._lock:
+            token = (self._user_versions.get(user_id, 0), self._public_version)
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[1] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._counters["hits"] += 1
+                    return entry[0], token
+                self._drop(key)
+                self._counters["expired"] += 1
+            self._counters["misses"] += 1
+            return None, token
+
+    def store(self, key: Tuple[Hashable, ...], response: Any, token: Tuple[int, int], includes_decks: bool):
+        """Cache `response` unless the user's data (or a public deck) changed since `token` was taken."""
+        user_id = key[0]
+        size = approximate_size(response)
+        with self._lock:
+            user_version, public_version = token
+            if user_version != self._user_versions.get(user_id, 0) or (
+                includes_decks and public_version != self._public_version
+            ):
+                self._counters["stale_skips"] += 1
+                return
+            self._drop(key)
+            self._entries[key] = (response, time.monotonic() + self.ttl_seconds, user_id, includes_decks, size)
+            self._by_user.setdefault(user_id, set()).add(key)
+            if includes_decks:
+                self._with_decks.add(key)
+            self._bytes += size
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+                self._counters["evictions"] += 1
+
+    def invalidate_user(self, user_id: Any):
+        """Drop every entry of a user whose flashcards or decks changed."""
+        user_id = str(user_id)
+        with self._lock:
+            self._user_versions[user_id] = self._user_versions.get(user_id, 0) + 1
+            for key in list(self._by_user.get(user_id, ())):
+                self._drop(key)
+                self._counters["invalidated"] += 1
+
+    def invalidate_public(self):
+        """Drop every entry that includes decks, after a public deck changed."""
+        with self._lock:
+            self._public_version += 1
+            for key in list(self._with_decks):
+                self._drop(key)
+                self._counters["invalidated"] += 1
+
+    def invalidate_deck(self, user_id: Any, is_public: bool):
+        self.invalidate_user(user_id)
+        if is_public:
+            self.invalidate_public()
+
+    def _drop(self, key: Hashable):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        _, _, user_id, _, size = entry
+        keys = self._by_user.get(user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[user_id]
+        self._with_decks.discard(key)
+        self._bytes -= size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+            self._with_decks.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                **self._counters,
+                "hit_rate": self._counters["hits"] / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "approx_bytes": self._bytes,
+            }
+
+search_result_cache = SearchResultCache(
+    ttl_seconds=settings.SEARCH_CACHE_TTL_SECONDS, max_entries=settings.SEARCH_CACHE_MAX_ENTRIES
+)
+
+def search_cache_enabled() -> bool:
+    return settings.SEARCH_CACHE_ENABLED
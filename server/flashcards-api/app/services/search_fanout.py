@@ -0,0 +1,78 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+
+@dataclass
+class SubSearchOutcome:
+    status: str  # "ok", "timeout" or "error"
+    elapsed_ms: float
+    value: Any = None
+    detail: Optional[str] = None
+
+def _run_in_session(search: Callable[[Session], Any]) -> Any:
+    from app.db.database import ReadSessionLocal
+
+    db = ReadSessionLocal()
+    try:
+        return search(db)
+    finally:
+        db.close()
+
+_worker_pool: Optional[ThreadPoolExecutor] = None
+
+def _workers() -> ThreadPoolExecutor:
+    global _worker_pool
+    if _worker_pool is None:
+        _worker_pool = ThreadPoolExecutor(
+            max_workers=settings.SEARCH_WORKER_THREADS, thread_name_prefix="search-worker"
+        )
+    return _worker_pool
+
+async def in_worker_session(search: Callable[[Session], Any]) -> Any:
+    """
+    Run a sync search on a worker thread with its own session, for queries
+    that have no async repository. On timeout the thread cannot be
+    cancelled: it finishes in the background, holding its database
+    connection until then, and its result is dropped. The threads come
+    from a pool of SEARCH_WORKER_THREADS, so runaway queries tie up at most
+    that many connections; further searches wait for a free thread, and
+    that wait counts against their timeout.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_workers(), _run_in_session, search)
+
+def close_worker_pool(wait: bool = False):
+    global _worker_pool
+    if _worker_pool is not None:
+        _worker_pool.shutdown(wait=wait, cancel_futures=True)
+        _worker_pool = None
+
+async def _run_one(search: Callable[[], Awaitable[Any]], timeout: float) -> SubSearchOutcome:
+    start = time.perf_counter()
+    try:
+        value = await asyncio.wait_for(search(), timeout)
+    except asyncio.TimeoutError:
+        return SubSearchOutcome("timeout", (time.perf_counter() - start) * 1000, detail=f"exceeded {timeout}s")
+    except Exception as e:
+        return SubSearchOutcome("error", (time.perf_counter() - start) * 1000, detail=str(e))
+    return SubSearchOutcome("ok", (time.perf_counter() - start) * 1000, value=value)
+
+async def run_sub_searches(
+    searches: Dict[str, Callable[[], Awaitable[Any]]], timeout: float
+) -> Dict[str, SubSearchOutcome]:
+    """
+    Run independent searches (coroutine factories, usually async repository
+    calls) concurrently, giving each at most `timeout` seconds; a search
+    that runs over is cancelled (see `in_worker_session` for what that
+    means for a thread). Slow or failing searches are reported in their
+    outcome instead of failing the whole request.
+    """
+    names = list(searches)
+    outcomes = await asyncio.gather(*(_run_one(searches[name], timeout) for name in names))
+    return dict(zip(names, outcomes))
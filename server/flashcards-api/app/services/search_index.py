@@ -0,0 +1,240 @@
+import heapq
+import math
+import os
+import pickle
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.config import settings
+from app.services.passage_selector import tokenize
+
+SNAPSHOT_VERSION = 2
+
+class InvertedIndex:
+    """
+    Tokenized inverted index over one kind of document, ranked with Okapi BM25.
+
+    Each document keeps its term frequencies so it can be replaced or removed
+    without a rebuild, plus a small metadata dict used to filter results
+    (owner, visibility).
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, Dict[str, int]] = {}
+        self.doc_terms: Dict[str, Dict[str, int]] = {}
+        self.doc_lengths: Dict[str, int] = {}
+        self.meta: Dict[str, Dict[str, Any]] = {}
+        self.total_length = 0
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def add(self, doc_id: str, text: str, **meta):
+        """Index a document, replacing any previous version with the same id."""
+        self.remove(doc_id)
+        tokens = tokenize(text)
+        terms = dict(Counter(tokens))
+        for term, count in terms.items():
+            self.postings.setdefault(term, {})[doc_id] = count
+        self.doc_terms[doc_id] = terms
+        self.doc_lengths[doc_id] = len(tokens)
+        self.meta[doc_id] = meta
+        self.total_length += len(tokens)
+
+    def remove(self, doc_id: str):
+        terms = self.doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            posting = self.postings.get(term)
+            if posting is not None:
+                posting.pop(doc_id, None)
+                if not posting:
+                    del self.postings[term]
+        self.total_length -= self.doc_lengths.pop(doc_id)
+        self.meta.pop(doc_id, None)
+
+    def search(
+        self, query: str, limit: int = 10, accept: Optional[Callable[[Dict[str, Any]], bool]] = None
+    ) -> List[Tuple[str, float]]:
+        """Top `limit` (doc id, score) pairs for the query, best first."""
+        if not self.doc_lengths:
+            return []
+        doc_count = len(self.doc_lengths)
+        avg_length = self.total_length / doc_count or 1.0
+        scores: Dict[str, float] = {}
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            idf = math.log((doc_count - len(posting) + 0.5) / (len(posting) + 0.5) + 1.0)
+            for doc_id, tf in posting.items():
+                if accept is not None and not accept(self.meta[doc_id]):
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[doc_id] / avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+
+class SearchIndex:
+    """
+    In-process BM25 search over flashcards and decks.
+
+    Flashcards are only ever searched within one user's collection, so they
+    are partitioned into one inverted index per user; a query then touches
+    that user's postings only. Decks (own plus public) share one index.
+    Repositories keep it current on every create/update/delete; snapshots
+    written with `save()` let a restart load the index instead of
+    re-tokenizing every card, after which only rows changed since the
+    snapshot are re-indexed (see `catch_up`).
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.flashcards: Dict[str, InvertedIndex] = {}
+        self.flashcard_owners: Dict[str, str] = {}
+        self.decks = InvertedIndex()
+        self.snapshot_at: Optional[datetime] = None
+
+    def index_flashcard(self, card_id: Any, user_id: Any, *texts: Optional[str]):
+        card_id, user_id = str(card_id), str(user_id)
+        with self._lock:
+            if self.flashcard_owners.get(card_id, user_id) != user_id:
+                self.remove_flashcard(card_id)
+            self.flashcards.setdefault(user_id, InvertedIndex()).add(card_id, " ".join(text for text in texts if text))
+            self.flashcard_owners[card_id] = user_id
+
+    def index_deck(self, deck_id: Any, user_id: Any, is_public: bool, *texts: Optional[str]):
+        with self._lock:
+            self.decks.add(
+                str(deck_id), " ".join(text for text in texts if text),
+                user_id=str(user_id), is_public=bool(is_public),
+            )
+
+    def remove_flashcard(self, card_id: Any):
+        card_id = str(card_id)
+        with self._lock:
+            user_id = self.flashcard_owners.pop(card_id, None)
+            if user_id is None:
+                return
+            partition = self.flashcards[user_id]
+            partition.remove(card_id)
+            if not len(partition):
+                del self.flashcards[user_id]
+
+    def remove_deck(self, deck_id: Any):
+        with self._lock:
+            self.decks.remove(str(deck_id))
+
+    def search_flashcards(self, query: str, user_id: Optional[Any] = None, limit: int = 10) -> List[str]:
+        """Ids of the user's best matching flashcards (all users' when user_id is None)."""
+        with self._lock:
+            if user_id is not None:
+                partition = self.flashcards.get(str(user_id))
+                hits = partition.search(query, limit) if partition is not None else []
+            else:
+                hits = heapq.nlargest(
+                    limit,
+                    (hit for partition in self.flashcards.values() for hit in partition.search(query, limit)),
+                    key=lambda hit: hit[1],
+                )
+        return [doc_id for doc_id, _ in hits]
+
+    def search_decks(self, query: str, user_id: Optional[Any] = None, limit: int = 10) -> List[str]:
+        """Ids of the best matching decks owned by the user or public."""
+        owner = str(user_id) if user_id is not None else None
+        with self._lock:
+            hits = self.decks.search(
+                query, limit, accept=lambda meta: meta["is_public"] or meta["user_id"] == owner
+            )
+        return [doc_id for doc_id, _ in hits]
+
+    def catch_up(
+        self,
+        flashcard_ids: Iterable[Any],
+        deck_ids: Iterable[Any],
+        changed_flashcards: Iterable[Tuple[Any, Any, Tuple[Optional[str], ...]]],
+        changed_decks: Iterable[Tuple[Any, Any, bool, Tuple[Optional[str], ...]]],
+    ):
+        """
+        Bring a loaded snapshot up to date: drop documents whose ids no longer
+        exist and re-index rows changed since `snapshot_at`, given as
+        (id, user_id, texts) and (id, user_id, is_public, texts) tuples.
+        """
+        with self._lock:
+            live = {str(doc_id) for doc_id in flashcard_ids}
+            for card_id in [card_id for card_id in self.flashcard_owners if card_id not in live]:
+                self.remove_flashcard(card_id)
+            live = {str(doc_id) for doc_id in deck_ids}
+            for deck_id in [deck_id for deck_id in self.decks.doc_lengths if deck_id not in live]:
+                self.decks.remove(deck_id)
+            for card_id, user_id, texts in changed_flashcards:
+                self.index_flashcard(card_id, user_id, *texts)
+            for deck_id, user_id, is_public, texts in changed_decks:
+                self.index_deck(deck_id, user_id, is_public, *texts)
+
+    def clear(self):
+        with self._lock:
+            self.flashcards = {}
+            self.flashcard_owners = {}
+            self.decks = InvertedIndex()
+            self.snapshot_at = None
+
+    def save(self, path: str):
+        """Write a snapshot atomically (temporary file, then rename)."""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            # Rows written after this instant are caught up on the next load
+            taken_at = datetime.utcnow()
+            data = pickle.dumps(
+                {
+                    "version": SNAPSHOT_VERSION,
+                    "taken_at": taken_at,
+                    "flashcards": self.flashcards,
+                    "flashcard_owners": self.flashcard_owners,
+                    "decks": self.decks,
+                },
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        self.snapshot_at = taken_at
+
+    def load(self, path: str) -> bool:
+        """Load a snapshot; returns False when there is none or it is unusable."""
+        try:
+            with open(path, "rb") as f:
+                data = pickle.load(f)
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable search index snapshot {path}: {e}")
+            return False
+        if data.get("version") != SNAPSHOT_VERSION:
+            return False
+        with self._lock:
+            self.flashcards = data["flashcards"]
+            self.flashcard_owners = data["flashcard_owners"]
+            self.decks = data["decks"]
+            self.snapshot_at = data["taken_at"]
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "flashcards": len(self.flashcard_owners),
+                "decks": len(self.decks),
+                "users": len(self.flashcards),
+                "snapshot_at": self.snapshot_at,
+            }
+
+search_index = SearchIndex()
+
+def search_index_enabled() -> bool:
+    return settings.SEARCH_BACKEND.lower() == "index"
@@ -0,0 +1,182 @@
+import asyncio
+import time
+from datetime import datetime
+from typing import Optional
+
+from app.config import settings
+from app.services.fuzzy_index import fuzzy_index, fuzzy_search_enabled
+from app.services.search_index import search_index, search_index_enabled
+from app.services.suggest_index import suggest_index, suggest_index_enabled
+
+async def load_search_index():
+    """
+    Warm start for the in-process search index (called from the startup hook).
+
+    Loads the last snapshot and re-indexes only rows changed since it was
+    taken, dropping rows deleted in the meantime; without a usable snapshot
+    every card and deck is indexed from the database.
+    """
+    if not search_index_enabled():
+        return
+    start = time.perf_counter()
+    loaded = await asyncio.to_thread(search_index.load, settings.SEARCH_INDEX_PATH)
+    since = search_index.snapshot_at if loaded else None
+    if not loaded:
+        search_index.clear()
+
+    if settings.DATABASE_TYPE.lower() == "mongodb":
+        await _sync_from_mongodb(since)
+    else:
+        await asyncio.to_thread(_sync_from_sql, since)
+
+    stats = search_index.stats()
+    print(
+        f"✅ Search index ready ({'snapshot + catch-up' if loaded else 'full build'}): "
+        f"{stats['flashcards']} flashcards, {stats['decks']} decks in {time.perf_counter() - start:.2f}s"
+    )
+    await asyncio.to_thread(save_search_index)
+
+async def load_suggest_index():
+    """
+    Build the typeahead index from every deck name and flashcard question
+    (called from the startup hook); repositories keep it current afterwards.
+    """
+    if not suggest_index_enabled():
+        return
+    start = time.perf_counter()
+    if settings.DATABASE_TYPE.lower() == "mongodb":
+        from app.db.mongodb import get_decks_collection, get_flashcards_collection
+
+        decks = [
+            (doc["_id"], doc.get("user_id"), doc.get("is_public", False), doc.get("name"))
+            async for doc in get_decks_collection().find({}, {"user_id": 1, "is_public": 1, "name": 1})
+        ]
+        flashcards = [
+            (doc["_id"], doc.get("user_id"), doc.get("question"))
+            async for doc in get_flashcards_collection().find({}, {"user_id": 1, "question": 1})
+        ]
+        await asyncio.to_thread(suggest_index.build, decks, flashcards)
+    else:
+        await asyncio.to_thread(_build_suggest_from_sql)
+
+    stats = suggest_index.stats()
+    print(
+        f"✅ Suggest index ready: {stats['entries']} entries, {stats['keys']} keys "
+        f"in {time.perf_counter() - start:.2f}s"
+    )
+
+def _build_suggest_from_sql():
+    from app.db.database import SessionLocal
+    from app.models.deck import Deck
+    from app.models.flashcard import Flashcard
+
+    db = SessionLocal()
+    try:
+        suggest_index.build(
+            db.query(Deck.id, Deck.user_id, Deck.is_public, Deck.name).yield_per(1000),
+            db.query(Flashcard.id, Flashcard.user_id, Flashcard.front).yield_per(1000),
+        )
+    finally:
+        db.close()
+
+async def load_fuzzy_index():
+    """
+    Build the fuzzy search index from every deck and flashcard (called from
+    the startup hook); repositories keep it current afterwards.
+    """
+    if not fuzzy_search_enabled():
+        return
+    start = time.perf_counter()
+    if settings.DATABASE_TYPE.lower() == "mongodb":
+        from app.db.mongodb import get_decks_collection, get_flashcards_collection
+
+        decks = [
+            (doc["_id"], doc.get("user_id"), doc.get("is_public", False), (doc.get("name"), doc.get("description")))
+            async for doc in get_decks_collection().find({}, {"user_id": 1, "is_public": 1, "name": 1, "description": 1})
+        ]
+        flashcards = [
+            (doc["_id"], doc.get("user_id"), (doc.get("question"), doc.get("answer")))
+            async for doc in get_flashcards_collection().find({}, {"user_id": 1, "question": 1, "answer": 1})
+        ]
+        await asyncio.to_thread(fuzzy_index.build, decks, flashcards)
+    else:
+        await asyncio.to_thread(_build_fuzzy_from_sql)
+
+    stats = fuzzy_index.stats()
+    print(
+        f"✅ Fuzzy search index ready: {stats['documents']} documents, {stats['words']} words, "
+        f"{stats['trigrams']} trigrams in {time.perf_counter() - start:.2f}s"
+    )
+
+def _build_fuzzy_from_sql():
+    from app.db.database import SessionLocal
+    from app.models.deck import Deck
+    from app.models.flashcard import Flashcard
+
+    db = SessionLocal()
+    try:
+        fuzzy_index.build(
+            (
+                (row.id, row.user_id, row.is_public, (row.name, row.description))
+                for row in db.query(Deck.id, Deck.user_id, Deck.is_public, Deck.name, Deck.description).yield_per(1000)
+            ),
+            (
+                (row.id, row.user_id, (row.front, row.back))
+                for row in db.query(Flashcard.id, Flashcard.user_id, Flashcard.front, Flashcard.back).yield_per(1000)
+            ),
+        )
+    finally:
+        db.close()
+
+def save_search_index():
+    """Write a snapshot of the search index (called at shutdown)."""
+    if not search_index_enabled():
+        return
+    try:
+        search_index.save(settings.SEARCH_INDEX_PATH)
+    except Exception as e:
+        print(f"⚠️ Failed to save search index snapshot: {e}")
+
+async def _sync_from_mongodb(since: Optional[datetime]):
+    from app.db.mongodb import get_decks_collection, get_flashcards_collection
+
+    flashcards = get_flashcards_collection()
+    decks = get_decks_collection()
+    changed = {"updated_at": {"$gte": since}} if since is not None else {}
+
+    flashcard_ids = [doc["_id"] async for doc in flashcards.find({}, {"_id": 1})]
+    deck_ids = [doc["_id"] async for doc in decks.find({}, {"_id": 1})]
+    changed_flashcards = [
+        (doc["_id"], doc.get("user_id"), (doc.get("question"), doc.get("answer")))
+        async for doc in flashcards.find(changed, {"user_id": 1, "question": 1, "answer": 1})
+    ]
+    changed_decks = [
+        (doc["_id"], doc.get("user_id"), doc.get("is_public", False), (doc.get("name"), doc.get("description")))
+        async for doc in decks.find(changed, {"user_id": 1, "is_public": 1, "name": 1, "description": 1})
+    ]
+    search_index.catch_up(flashcard_ids, deck_ids, changed_flashcards, changed_decks)
+
+def _sync_from_sql(since: Optional[datetime]):
+    from app.db.database import SessionLocal
+    from app.models.deck import Deck
+    from app.models.flashcard import Flashcard
+
+    db = SessionLocal()
+    try:
+        flashcard_query = db.query(Flashcard)
+        deck_query = db.query(Deck)
+        if since is not None:
+            flashcard_query = flashcard_query.filter(Flashcard.updated_at >= since)
+            deck_query = deck_query.filter(Deck.updated_at >= since)
+
+        search_index.catch_up(
+            [row.id for row in db.query(Flashcard.id)],
+            [row.id for row in db.query(Deck.id)],
+            ((card.id, card.user_id, (card.front, card.back)) for card in flashcard_query.yield_per(1000)),
+            (
+                (deck.id, deck.user_id, deck.is_public, (deck.name, deck.description))
+                for deck in deck_query.yield_per(1000)
+            ),
+        )
+    finally:
+        db.close()
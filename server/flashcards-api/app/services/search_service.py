@@ -1,106 +1,259 @@
 import os
-import requests
-import json
-import re
-from typing import List, Dict, Any
-from bs4 import BeautifulSoup
+import asyncio
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
+import httpx
 import openai
 from serpapi import GoogleSearch
 from app.config import settings
+from app.services.page_fetcher import PageFetcher, FetchedPage
+from app.services.html_extractor import HTMLExtractor
+from app.services.content_cache import ContentCache
+from app.services.batch_pipeline import BatchStages
+from app.services.result_cache import GenerationCache
+from app.services.stream_parser import JSONArrayStreamParser
+from app.services.passage_selector import TokenCounter, select_passages
+from app.services.near_duplicates import new_duplicate_index, split_near_duplicates
+from app.services.governor import CircuitBreaker, ProviderGovernor, ProviderUnavailable
 
 class SearchService:
+    """
+    Google search + OpenAI flashcard generation pipeline.
+    
+    Meant to be long-lived: one instance is created at application startup
+    and owns the OpenAI clients, the page fetcher's connection pool, the
+    extraction process pool and the caches, so connections and TLS sessions
+    are reused across requests. Call `close()` at shutdown.
+    """
+    
     def __init__(self):
         if not settings.OPENAI_API_KEY:
             raise ValueError("OPENAI_API_KEY is not configured")
         if not settings.SERPAPI_KEY:
             raise ValueError("SERPAPI_KEY is not configured")
-            
-        self.openai_client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
+        
+        openai_limits = httpx.Limits(
+            max_connections=settings.OPENAI_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.OPENAI_MAX_CONNECTIONS,
+        )
+        self.openai_client = openai.OpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            base_url=settings.OPENAI_BASE_URL,
+            timeout=settings.OPENAI_TIMEOUT_SECONDS,
+            max_retries=settings.OPENAI_MAX_RETRIES,
+            http_client=httpx.Client(limits=openai_limits),
+        )
+        self.async_openai_client = openai.AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            base_url=settings.OPENAI_BASE_URL,
+            timeout=settings.OPENAI_TIMEOUT_SECONDS,
+            max_retries=settings.OPENAI_MAX_RETRIES,
+            http_client=httpx.AsyncClient(limits=openai_limits),
+        )
         self.serpapi_key = settings.SERPAPI_KEY
+        
+        self.page_fetcher = PageFetcher(
+            max_connections=settings.FETCH_MAX_CONNECTIONS,
+            max_connections_per_host=settings.FETCH_MAX_CONNECTIONS_PER_HOST,
+            timeout=settings.FETCH_TIMEOUT_SECONDS,
+            max_bytes=settings.FETCH_MAX_BYTES,
+        )
+        self.html_extractor = HTMLExtractor(
+            max_workers=settings.EXTRACT_PROCESS_WORKERS,
+            max_chars=settings.EXTRACT_MAX_CHARS,
+        )
+        self.token_counter = TokenCounter(settings.OPENAI_MODEL)
+        self.serpapi_governor = ProviderGovernor(
+            "SerpAPI",
+            rate=settings.SERPAPI_RATE_PER_SECOND,
+            burst=settings.SERPAPI_BURST,
+            max_concurrency=settings.SERPAPI_MAX_CONCURRENCY,
+            max_queue=settings.GOVERNOR_MAX_QUEUE,
+            queue_timeout=settings.GOVERNOR_QUEUE_TIMEOUT_SECONDS,
+            breaker=_circuit_breaker(settings.SERPAPI_SLOW_CALL_SECONDS),
+        )
+        self.openai_governor = ProviderGovernor(
+            "OpenAI",
+            rate=settings.OPENAI_RATE_PER_SECOND,
+            burst=settings.OPENAI_BURST,
+            max_concurrency=settings.OPENAI_MAX_CONCURRENCY,
+            max_queue=settings.GOVERNOR_MAX_QUEUE,
+            queue_timeout=settings.GOVERNOR_QUEUE_TIMEOUT_SECONDS,
+            breaker=_circuit_breaker(settings.OPENAI_SLOW_CALL_SECONDS),
+        )
+        self.content_cache = ContentCache(
+            path=settings.CONTENT_CACHE_PATH,
+            ttl_seconds=settings.CONTENT_CACHE_TTL_SECONDS,
+            max_memory_entries=settings.CONTENT_CACHE_MEMORY_ENTRIES,
+            max_disk_entries=settings.CONTENT_CACHE_DISK_ENTRIES,
+        )
+        self.generation_cache = GenerationCache(
+            ttl_seconds=settings.GENERATION_CACHE_TTL_SECONDS,
+            stale_seconds=settings.GENERATION_CACHE_STALE_SECONDS,
+            max_entries=settings.GENERATION_CACHE_MAX_ENTRIES,
+        )
+    
+    async def close(self):
+        """Release connection pools, worker processes and the content cache."""
+        self.openai_client.close()
+        await self.async_openai_client.close()
+        await self.page_fetcher.close()
+        self.html_extractor.close()
+        self.content_cache.close()
+    
+    async def get_or_generate_flashcards(self, query: str, num_flashcards: int = 5) -> List[Dict[str, Any]]:
+        """
+        Serve flashcards from the generation cache, running the pipeline only on a miss.
+        Identical concurrent requests share one pipeline run.
+        """
+        return await self.generation_cache.get_or_generate(
+            query,
+            num_flashcards,
+            lambda: self.search_and_generate_flashcards(query, num_flashcards),
+        )
+    
+    def batch_stages(self) -> BatchStages:
+        """The steps of `search_and_generate_flashcards`, for the batch pipeline to run stage by stage."""
+        return BatchStages(
+            search=self._google_search,
+            fetch_page=self._fetch_page,
+            extract_page_text=self._extract_page_text,
+            select_passages=self._select_passages,
+            generate_flashcards=self._generate_flashcards,
+        )
     
     async def search_and_generate_flashcards(self, query: str, num_flashcards: int = 5) -> List[Dict[str, Any]]:
         """
         Search Google for content and generate flashcards using OpenAPI
         """
         try:
-            # Step 1: Search Google using SerpAPI (synchronous call)
-            search_results = self._google_search(query)
+            # Step 1: Search Google using SerpAPI
+            search_results = await self._google_search(query)
             
-            # Step 2: Extract content from top results (synchronous call)
-            content = self._extract_content_from_results(search_results)
+            # Step 2: Fetch the top results concurrently, extract their text and
+            # keep the passages most relevant to the query
+            pages = await self._extract_content_from_results(search_results)
+            content = self._select_passages(query, pages)
             
-            # Step 3: Generate flashcards using OpenAPI (synchronous call)
-            flashcards = self._generate_flashcards_from_content(content, query, num_flashcards)
+            # Step 3: Generate flashcards using OpenAPI
+            flashcards = await self._generate_flashcards(content, query, num_flashcards)
             
             return flashcards
             
+        except ProviderUnavailable:
+            raise
         except Exception as e:
             print(f"Error in search_and_generate_flashcards: {e}")
             return []
     
-    def _google_search(self, query: str) -> List[Dict[str, Any]]:
+    async def _google_search(self, query: str) -> List[Dict[str, Any]]:
         """
-        Perform Google search using SerpAPI (synchronous)
+        Perform Google search using SerpAPI, admitted by the SerpAPI governor.
+        Raises ProviderUnavailable when the call is rejected.
         """
         try:
-            search = GoogleSearch({
-                "q": query,
-                "api_key": self.serpapi_key,
-                "num": 5  # Get top 5 results
-            })
-            results = search.get_dict()
-            
-            # Extract organic results
-            organic_results = results.get("organic_results", [])
-            return organic_results[:5]  # Return top 5 results
-            
+            return await self.serpapi_governor.call(asyncio.to_thread, self._serpapi_search, query)
+        except ProviderUnavailable:
+            raise
         except Exception as e:
             print(f"Error in Google search: {e}")
             return []
     
-    def _extract_content_from_results(self, search_results: List[Dict[str, Any]]) -> str:
+    def _serpapi_search(self, query: str) -> List[Dict[str, Any]]:
         """
-        Extract content from search result URLs (synchronous)
+        Blocking SerpAPI request; errors propagate so the circuit breaker sees them
         """
-        content_pieces = []
+        search = GoogleSearch({
+            "q": query,
+            "api_key": self.serpapi_key,
+            "num": 5  # Get top 5 results
+        })
+        search.timeout = settings.SERPAPI_TIMEOUT_SECONDS
+        if settings.SERPAPI_BASE_URL:
+            search.BACKEND = settings.SERPAPI_BASE_URL
+        results = search.get_dict()
         
-        for result in search_results:
-            try:
-                url = result.get("link")
-                if url:
-                    response = requests.get(url, timeout=10, headers={
-                        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-                    })
-                    response.raise_for_status()  # Raise exception for bad status codes
-                    
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    
-                    # Extract text content
-                    text_content = soup.get_text()
-                    # Clean up the text
-                    cleaned_text = ' '.join(text_content.split())[:1000]  # Limit to 1000 chars
-                    content_pieces.append(cleaned_text)
-                    
-            except Exception as e:
-                print(f"Error extracting content from {result.get('link', 'unknown')}: {e}")
-                continue
+        # Extract organic results
+        organic_results = results.get("organic_results", [])
+        return organic_results[:5]  # Return top 5 results
+    
+    async def _extract_content_from_results(self, search_results: List[Dict[str, Any]]) -> List[str]:
+        """
+        Extract the text of each search result page, loading all pages concurrently
+        """
+        urls = [result.get("link") for result in search_results if result.get("link")]
+        texts = await asyncio.gather(*(self._load_page_text(url) for url in urls))
+        return [text for text in texts if text]
+    
+    def _select_passages(self, query: str, pages: List[str]) -> str:
+        """
+        Rank page chunks against the query with BM25 and pack the best ones
+        into the prompt token budget
+        """
+        return select_passages(
+            query,
+            pages,
+            token_budget=settings.PROMPT_CONTENT_TOKEN_BUDGET,
+            count_tokens=self.token_counter,
+            words_per_passage=settings.PASSAGE_WORDS,
+        )
+    
+    async def _load_page_text(self, url: str) -> Optional[str]:
+        """
+        Get the cleaned text of one page, skipping download and parse on a cache hit
+        """
+        text, page = await self._fetch_page(url)
+        if page is not None:
+            return await self._extract_page_text(page)
+        return text
+    
+    async def _fetch_page(self, url: str) -> Tuple[Optional[str], Optional[FetchedPage]]:
+        """
+        Fetch stage for one page. Returns (text, None) when cached text can be used
+        as-is, or (None, page) when the downloaded page still has to be extracted.
+        """
+        cache = self.content_cache
+        cached = await cache.get_async(url)
+        if cached is not None and cached.is_fresh(cache.ttl_seconds):
+            return cached.text, None
         
-        return " ".join(content_pieces)
+        # Stale entries are revalidated with a conditional request
+        headers = cached.revalidation_headers() if cached is not None else None
+        page = await self.page_fetcher.fetch(url, headers=headers)
+        if page is None:
+            # Serve stale text rather than nothing when the origin is unreachable
+            return (cached.text if cached is not None else None), None
+        if page.status_code == 304 and cached is not None:
+            return (await cache.mark_revalidated_async(cached)).text, None
+        return None, page
     
-    def _generate_flashcards_from_content(self, content: str, original_query: str, num_flashcards: int) -> List[Dict[str, Any]]:
+    async def _extract_page_text(self, page: FetchedPage) -> Optional[str]:
         """
-        Generate flashcards using OpenAPI based on the content (synchronous)
+        Extract stage for one page: strip boilerplate in the process pool and
+        store the text in the content cache
         """
         try:
-            if not content.strip():
-                print("No content available for flashcard generation")
-                return []
-                
-            prompt = f"""
+            text = await self.html_extractor.extract(page.content, page.encoding)
+        except Exception as e:
+            print(f"Error extracting content from {page.url}: {e}")
+            return None
+        
+        await self.content_cache.put_async(
+            page.url,
+            text,
+            etag=page.headers.get("ETag"),
+            last_modified=page.headers.get("Last-Modified"),
+        )
+        return text
+    
+    def _build_messages(self, content: str, original_query: str, num_flashcards: int) -> List[Dict[str, str]]:
+        """
+        Chat messages asking the model for flashcards about the query
+        """
+        prompt = f"""
             Based on the following content and search query, generate {num_flashcards} educational flashcards.
             
             Search Query: {original_query}
-            Content: {content[:2000]}  # Limit content to avoid token limits
+            Content: {content}
             
             Generate flashcards in the following format:
             - Each flashcard should have a clear question and answer
@@ -110,57 +263,193 @@ class SearchService:
             
             Return the flashcards as a JSON array with 'question' and 'answer' fields.
             """
-            
-            response = self.openai_client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are an educational assistant that creates high-quality flashcards."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=1000,
-                temperature=0.7
+        return [
+            {"role": "system", "content": "You are an educational assistant that creates high-quality flashcards."},
+            {"role": "user", "content": prompt}
+        ]
+    
+    async def _generate_flashcards(self, content: str, original_query: str, num_flashcards: int) -> List[Dict[str, Any]]:
+        """
+        Generate flashcards through the OpenAI governor.
+        Raises ProviderUnavailable when the call is rejected.
+        """
+        if not content.strip():
+            print("No content available for flashcard generation")
+            return []
+        try:
+            return await self.openai_governor.call(
+                asyncio.to_thread,
+                self._generate_flashcards_from_content,
+                content,
+                original_query,
+                num_flashcards,
             )
-            
-            # Parse the response to extract flashcards
-            response_text = response.choices[0].message.content
-            
-            # Try to extract JSON from the response
-            json_match = re.search(r'\[.*\]', response_text, re.DOTALL)
-            if json_match:
-                try:
-                    flashcards_data = json.loads(json_match.group())
-                    # Validate the structure
-                    if isinstance(flashcards_data, list):
-                        validated_flashcards = []
-                        for card in flashcards_data:
-                            if isinstance(card, dict) and 'question' in card and 'answer' in card:
-                                validated_flashcards.append({
-                                    "question": str(card['question']),
-                                    "answer": str(card['answer'])
-                                })
-                        return validated_flashcards[:num_flashcards]
-                except (json.JSONDecodeError, KeyError, TypeError) as e:
-                    print(f"Error parsing JSON response: {e}")
-            
-            # Fallback: parse manually if JSON parsing fails
-            flashcards = []
-            lines = response_text.split('\n')
-            current_question = None
-            
-            for line in lines:
-                line = line.strip()
-                if line.startswith('Q:') or line.startswith('Question:'):
-                    current_question = line.split(':', 1)[1].strip()
-                elif (line.startswith('A:') or line.startswith('Answer:')) and current_question:
-                    answer = line.split(':', 1)[1].strip()
-                    flashcards.append({
-                        "question": current_question,
-                        "answer": answer
-                    })
-                    current_question = None
-            
-            return flashcards[:num_flashcards]
-            
+        except ProviderUnavailable:
+            raise
         except Exception as e:
             print(f"Error generating flashcards: {e}")
-            return [] 
\ No newline at end of file
+            return []
+    
+    def _generate_flashcards_from_content(self, content: str, original_query: str, num_flashcards: int) -> List[Dict[str, Any]]:
+        """
+        Generate flashcards using OpenAPI based on the content (synchronous).
+        API errors propagate so the circuit breaker sees them.
+        """
+        if not content.strip():
+            print("No content available for flashcard generation")
+            return []
+        
+        response = self.openai_client.chat.completions.create(
+            model=settings.OPENAI_MODEL,
+            messages=self._build_messages(content, original_query, num_flashcards),
+            max_tokens=1000,
+            temperature=0.7
+        )
+        
+        # Parse the response to extract flashcards
+        response_text = response.choices[0].message.content
+        flashcards = self._parse_flashcards(response_text, num_flashcards)
+        unique, _ = split_near_duplicates(flashcards)
+        return unique
+    
+    async def stream_flashcards(self, query: str, num_flashcards: int = 5) -> AsyncIterator[Dict[str, str]]:
+        """
+        Yield flashcards one by one as soon as the model has finished writing each of them.
+        A fresh cached set for the same query is replayed instead of running the pipeline.
+        """
+        cache = self.generation_cache
+        cached = cache.peek(query, num_flashcards)
+        if cached is not None:
+            for card in cached:
+                yield card
+            return
+        
+        flashcards = []
+        async for card in self._stream_generated_flashcards(query, num_flashcards):
+            flashcards.append(card)
+            yield card
+        cache.store(query, num_flashcards, flashcards)
+    
+    async def _stream_generated_flashcards(self, query: str, num_flashcards: int) -> AsyncIterator[Dict[str, str]]:
+        """
+        Run the search pipeline and stream the chat completion through an incremental JSON parser
+        """
+        search_results = await self._google_search(query)
+        pages = await self._extract_content_from_results(search_results)
+        content = self._select_passages(query, pages)
+        if not content.strip():
+            print("No content available for flashcard generation")
+            return
+        
+        parser = JSONArrayStreamParser()
+        seen = new_duplicate_index()
+        response_text = []
+        count = 0
+        # The governor slot is held until the stream has been read
+        async with self.openai_governor.admit():
+            stream = await self.async_openai_client.chat.completions.create(
+                model=settings.OPENAI_MODEL,
+                messages=self._build_messages(content, query, num_flashcards),
+                max_tokens=1000,
+                temperature=0.7,
+                stream=True
+            )
+            try:
+                async for chunk in stream:
+                    if not chunk.choices or not chunk.choices[0].delta.content:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    response_text.append(delta)
+                    for item in parser.feed(delta):
+                        card = self._validate_flashcard(item)
+                        if card is None or seen.check_and_add(count, card["question"], card["answer"]):
+                            continue
+                        yield card
+                        count += 1
+                        if count >= num_flashcards:
+                            return
+                    if parser.done:
+                        break
+            finally:
+                await stream.close()
+        
+        # The model ignored the JSON instruction; fall back to the Q:/A: parser
+        if count == 0:
+            flashcards = self._parse_flashcards("".join(response_text), num_flashcards)
+            for card in split_near_duplicates(flashcards, seen)[0]:
+                yield card
+    
+    @staticmethod
+    def _validate_flashcard(card: Any) -> Optional[Dict[str, str]]:
+        if isinstance(card, dict) and 'question' in card and 'answer' in card:
+            return {
+                "question": str(card['question']),
+                "answer": str(card['answer'])
+            }
+        return None
+    
+    def _parse_flashcards(self, response_text: str, num_flashcards: int) -> List[Dict[str, str]]:
+        """
+        Extract flashcards from a completed model response
+        """
+        # Try to extract the JSON array from the response
+        items = JSONArrayStreamParser().feed(response_text)
+        if items:
+            validated_flashcards = []
+            for item in items:
+                card = self._validate_flashcard(item)
+                if card is not None:
+                    validated_flashcards.append(card)
+            return validated_flashcards[:num_flashcards]
+        
+        # Fallback: parse manually if JSON parsing fails
+        flashcards = []
+        lines = response_text.split('\n')
+        current_question = None
+        
+        for line in lines:
+            line = line.strip()
+            if line.startswith('Q:') or line.startswith('Question:'):
+                current_question = line.split(':', 1)[1].strip()
+            elif (line.startswith('A:') or line.startswith('Answer:')) and current_question:
+                answer = line.split(':', 1)[1].strip()
+                flashcards.append({
+                    "question": current_question,
+                    "answer": answer
+                })
+                current_question = None
+        
+        return flashcards[:num_flashcards]
+
+def _circuit_breaker(slow_call_seconds: float) -> CircuitBreaker:
+    return CircuitBreaker(
+        window=settings.BREAKER_WINDOW,
+        min_calls=settings.BREAKER_MIN_CALLS,
+        error_rate=settings.BREAKER_ERROR_RATE,
+        slow_call_seconds=slow_call_seconds,
+        slow_call_rate=settings.BREAKER_SLOW_CALL_RATE,
+        reset_seconds=settings.BREAKER_RESET_SECONDS,
+    )
+
+_search_service: Optional[SearchService] = None
+
+def init_search_service() -> Optional[SearchService]:
+    """
+    Create the application-wide SearchService (called from the startup hook).
+    Returns None when the search API keys are not configured.
+    """
+    global _search_service
+    if not settings.OPENAI_API_KEY or not settings.SERPAPI_KEY:
+        print("⚠️ OPENAI_API_KEY or SERPAPI_KEY not set; search-generated flashcards are disabled")
+        return None
+    _search_service = SearchService()
+    return _search_service
+
+async def close_search_service():
+    global _search_service
+    if _search_service is not None:
+        await _search_service.close()
+        _search_service = None
+
+def current_search_service() -> Optional[SearchService]:
+    return _search_service
@@ -0,0 +1,65 @@
+import json
+from typing import Any, List
+
+class JSONArrayStreamParser:
+    """
+    Incrementally extracts the elements of the first top-level JSON array in a
+    text stream, such as a chat completion arriving token by token.
+
+    Any prose before the opening bracket is ignored. Each object or array
+    element is decoded as soon as its closing bracket arrives, so callers
+    can act on the first item long before the model finishes. Elements that
+    fail to decode are skipped.
+    """
+
+    def __init__(self):
+        self.done = False
+        self._in_array = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._buffer: List[str] = []
+
+    def feed(self, chunk: str) -> List[Any]:
+        """
+        Consume the next piece of text and return the elements it completed.
+        """
+        items = []
+        for char in chunk:
+            if self.done:
+                break
+            if not self._in_array:
+                if char == "[":
+                    self._in_array = True
+                    self._depth = 1
+                continue
+
+            if self._depth > 1:
+                self._buffer.append(char)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                if self._depth == 1:
+                    self._buffer = [char]
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 1:
+                    try:
+                        items.append(json.loads("".join(self._buffer)))
+                    except json.JSONDecodeError as e:
+                        print(f"Skipping malformed JSON element: {e}")
+                    self._buffer = []
+                elif self._depth == 0:
+                    self.done = True
+        return items
@@ -0,0 +1,178 @@
+import re
+import threading
+from bisect import bisect_left, bisect_right
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.config import settings
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+PUBLIC = "*"
+# Keys read per requested suggestion at most, when many documents share a text
+SCAN_FACTOR = 16
+
+def normalize(text: str) -> str:
+    return " ".join(_WORD_RE.findall(text.lower()))
+
+class SuggestIndex:
+    """
+    In-memory prefix index for typeahead over deck names and flashcard questions.
+
+    Each scope (one per user, plus one for public decks) keeps a sorted
+    array of keys, the normalized text starting at each of its first few
+    words cut to `key_length` characters (longer prefixes are matched on
+    that many), and a parallel array pointing back at the document. A
+    lookup is one bisection per scope and a short scan, whatever the
+    collection size; writes insert or remove a handful of keys in place.
+    """
+
+    def __init__(self, max_words: int = 10, key_length: int = 32):
+        self._lock = threading.RLock()
+        self.max_words = max_words
+        self.key_length = key_length
+        # scope -> (sorted keys, (kind, id) of the document behind each key)
+        self.scopes: Dict[str, Tuple[List[str], List[Tuple[str, str]]]] = {}
+        # (kind, id) -> (scope, display text, keys, key at the start of the text)
+        self.entries: Dict[Tuple[str, str], Tuple[str, str, List[str], str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _keys(self, text: str) -> List[str]:
+        words = normalize(text).split()
+        return [" ".join(words[start:])[: self.key_length] for start in range(min(len(words), self.max_words))]
+
+    def add(self, kind: str, doc_id: Any, scope: Any, text: Optional[str]):
+        """Index `text` under `scope`, replacing any previous version of the document."""
+        ref = (kind, str(doc_id))
+        scope = str(scope)
+        with self._lock:
+            self.remove(kind, doc_id)
+            keys = self._keys(text or "")
+            if not keys:
+                return
+            unique_keys = sorted(set(keys))
+            scope_keys, scope_refs = self.scopes.setdefault(scope, ([], []))
+            for key in unique_keys:
+                position = bisect_right(scope_keys, key)
+                scope_keys.insert(position, key)
+                scope_refs.insert(position, ref)
+            self.entries[ref] = (scope, text.strip(), unique_keys, keys[0])
+
+    def remove(self, kind: str, doc_id: Any):
+        ref = (kind, str(doc_id))
+        with self._lock:
+            entry = self.entries.pop(ref, None)
+            if entry is None:
+                return
+            scope, _, keys, _ = entry
+            scope_keys, scope_refs = self.scopes[scope]
+            for key in keys:
+                position = bisect_left(scope_keys, key)
+                while position < len(scope_keys) and scope_keys[position] == key:
+                    if scope_refs[position] == ref:
+                        del scope_keys[position]
+                        del scope_refs[position]
+                        break
+                    position += 1
+            if not scope_keys:
+                del self.scopes[scope]
+
+    def index_deck(self, deck_id: Any, user_id: Any, is_public: bool, name: Optional[str]):
+        self.add("deck", deck_id, PUBLIC if is_public else user_id, name)
+
+    def index_flashcard(self, card_id: Any, user_id: Any, question: Optional[str]):
+        self.add("flashcard", card_id, user_id, question)
+
+    def remove_deck(self, deck_id: Any):
+        self.remove("deck", deck_id)
+
+    def remove_flashcard(self, card_id: Any):
+        self.remove("flashcard", card_id)
+
+    def suggest(self, prefix: str, user_id: Optional[Any] = None, limit: int = 8) -> List[Dict[str, str]]:
+        """
+        Up to `limit` suggestions whose text has a word starting with `prefix`,
+        from the user's decks and cards and from public decks. Matches at the
+        start of the text come first, then shorter texts.
+        """
+        prefix = normalize(prefix)[: self.key_length]
+        if not prefix:
+            return []
+        scopes = [PUBLIC] if user_id is None else [str(user_id), PUBLIC]
+        found: Dict[Tuple[str, str], Tuple[bool, int, str, str]] = {}
+        with self._lock:
+            for scope in scopes:
+                if scope not in self.scopes:
+                    continue
+                scope_keys, scope_refs = self.scopes[scope]
+                # Read a few more distinct texts than needed so the ranking below has a
+                # choice, skipping repeated texts, but never more than a bounded run of keys
+                candidates = set()
+                position = start = bisect_left(scope_keys, prefix)
+                end = min(start + limit * SCAN_FACTOR, len(scope_keys))
+                while position < end and len(candidates) < limit * 2:
+                    if not scope_keys[position].startswith(prefix):
+                        break
+                    kind, doc_id = scope_refs[position]
+                    position += 1
+                    _, text, _, first_key = self.entries[(kind, doc_id)]
+                    candidates.add((kind, text))
+                    rank = (not first_key.startswith(prefix), len(text), kind, doc_id)
+                    # Several cards (or decks) with the same text are suggested once
+                    if rank < found.get((kind, text), (True, len(text) + 1)):
+                        found[(kind, text)] = rank
+            ranked = sorted(found.values())[:limit]
+            return [
+                {"type": kind, "id": doc_id, "text": self.entries[(kind, doc_id)][1]} for _, _, kind, doc_id in ranked
+            ]
+
+    def build(
+        self,
+        decks: Iterable[Tuple[Any, Any, bool, Optional[str]]],
+        flashcards: Iterable[Tuple[Any, Any, Optional[str]]],
+    ):
+        """
+        Replace the whole index from (id, user_id, is_public, name) deck rows
+        and (id, user_id, question) card rows, sorting each scope once at the
+        end instead of inserting keys one by one.
+        """
+        rows = [("deck", deck_id, PUBLIC if is_public else user_id, name) for deck_id, user_id, is_public, name in decks]
+        rows += [("flashcard", card_id, user_id, question) for card_id, user_id, question in flashcards]
+        pairs: Dict[str, List[Tuple[str, Tuple[str, str]]]] = {}
+        entries = {}
+        for kind, doc_id, scope, text in rows:
+            keys = self._keys(text or "")
+            if not keys:
+                continue
+            ref = (kind, str(doc_id))
+            scope = str(scope)
+            unique_keys = sorted(set(keys))
+            pairs.setdefault(scope, []).extend((key, ref) for key in unique_keys)
+            entries[ref] = (scope, text.strip(), unique_keys, keys[0])
+        scopes = {}
+        for scope, scope_pairs in pairs.items():
+            scope_pairs.sort(key=itemgetter(0))
+            scopes[scope] = ([key for key, _ in scope_pairs], [ref for _, ref in scope_pairs])
+        with self._lock:
+            self.scopes = scopes
+            self.entries = entries
+
+    def clear(self):
+        with self._lock:
+            self.scopes = {}
+            self.entries = {}
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self.entries),
+                "keys": sum(len(scope_keys) for scope_keys, _ in self.scopes.values()),
+                "scopes": len(self.scopes),
+            }
+
+suggest_index = SuggestIndex(max_words=settings.SUGGEST_MAX_WORDS)
+
+def suggest_index_enabled() -> bool:
+    return settings.SUGGEST_INDEX_ENABLED
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Benchmark for saving generated flashcard sets: BaseRepository.create per
+card (a commit and a refresh each) against BaseRepository.bulk_create
+(one multi-row INSERT, one commit, one SELECT back).
+
+Runs against a SQLite file, so every commit pays for a real fsync, with a
+flashcards table shaped like the app's. With --mongo-url, also compares
+insert_one per card with insert_many on a scratch MongoDB database.
+
+Usage: python benchmarks/benchmark_bulk_create.py [--set-sizes 10 50 200] [--mongo-url mongodb://localhost:27017]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+from pydantic import BaseModel
+from sqlalchemy import Column, DateTime, String, Uuid, create_engine
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+# Add the app directory to the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.db.repositories.base import BaseRepository
+
+BenchmarkBase = declarative_base()
+
+class BenchmarkFlashcard(BenchmarkBase):
+    __tablename__ = "flashcards"
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    # jsonable_encoder hands create() string ids
+    user_id = Column(String(36), index=True)
+    deck_id = Column(String(36), index=True)
+    front = Column(String)
+    back = Column(String)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class BenchmarkFlashcardCreate(BaseModel):
+    front: str
+    back: str
+    deck_id: uuid.UUID
+
+def make_set(size: int, deck_id: uuid.UUID):
+    return [
+        BenchmarkFlashcardCreate(front=f"Generated question {i}?", back=f"Generated answer {i}", deck_id=deck_id)
+        for i in range(size)
+    ]
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+def bench_sql(set_sizes, repeat):
+    repository = BaseRepository(BenchmarkFlashcard)
+    user_id = str(uuid.uuid4())
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'flashcards.db')}")
+        BenchmarkBase.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine)
+        print("SQLite (file)")
+        print(f"{'cards':>6} {'per-row ms':>11} {'bulk ms':>9} {'per-row cards/s':>16} {'bulk cards/s':>13} {'speedup':>8}")
+        for size in set_sizes:
+            cards = make_set(size, uuid.uuid4())
+
+            def per_row():
+                db = Session()
+                try:
+                    for card in cards:
+                        repository.create(db, obj_in=card, user_id=user_id)
+                finally:
+                    db.close()
+
+            def bulk():
+                db = Session()
+                try:
+                    created = repository.bulk_create(db, objs_in=cards, user_id=user_id)
+                    assert len(created) == size
+                finally:
+                    db.close()
+
+            per_row_s = timed(per_row, repeat)
+            bulk_s = timed(bulk, repeat)
+            print(
+                f"{size:>6} {per_row_s * 1000:>11.1f} {bulk_s * 1000:>9.1f} {size / per_row_s:>16.0f} "
+                f"{size / bulk_s:>13.0f} {per_row_s / bulk_s:>7.1f}x"
+            )
+        engine.dispose()
+
+def bench_mongo(mongo_url, set_sizes, repeat):
+    from pymongo import MongoClient
+
+    client = MongoClient(mongo_url)
+    database = client[f"flashcards_benchmark_{uuid.uuid4().hex[:8]}"]
+    collection = database.flashcards
+    try:
+        print("\nMongoDB")
+        print(f"{'cards':>6} {'insert_one ms':>14} {'insert_many ms':>15} {'speedup':>8}")
+        for size in set_sizes:
+            def docs():
+                now = datetime.utcnow()
+                return [
+                    {"question": f"Q{i}", "answer": f"A{i}", "created_at": now, "updated_at": now}
+                    for i in range(size)
+                ]
+
+            one_s = timed(lambda: [collection.insert_one(doc) for doc in docs()], repeat)
+            many_s = timed(lambda: collection.insert_many(docs(), ordered=True), repeat)
+            print(f"{size:>6} {one_s * 1000:>14.1f} {many_s * 1000:>15.1f} {one_s / many_s:>7.1f}x")
+    finally:
+        client.drop_database(database.name)
+        client.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--set-sizes", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--mongo-url", help="also benchmark MongoDB inserts on this server")
+    args = parser.parse_args()
+
+    bench_sql(args.set_sizes, args.repeat)
+    if args.mongo_url:
+        bench_mongo(args.mongo_url, args.set_sizes, args.repeat)
+
+if __name__ == "__main__":
+    main()
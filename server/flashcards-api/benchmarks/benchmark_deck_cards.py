@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Benchmark for deck lists with cards: N+1 queries (the deck page, then
+get_by_deck and a COUNT per deck) against decks_with_flashcards (one
+statement: deck page CTE LEFT JOIN each deck's newest cards, picked and
+counted by correlated subqueries).
+
+Runs against a SQLite file with decks and flashcards tables shaped like the
+app's, including the (deck_id, created_at, id) index. Both ways must return
+the same decks, cards and counts; the table shows statements per page and
+median page time.
+
+Usage: python benchmarks/benchmark_deck_cards.py [--decks 2000] [--cards-per-deck 40] [--page-size 20] [--preview 0 5 20]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import Boolean, Column, DateTime, Index, String, Uuid, create_engine, event, func
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+# Add the app directory to the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.db.deck_cards import DeckWithCards, decks_with_flashcards
+
+BenchmarkBase = declarative_base()
+
+class BenchmarkDeck(BenchmarkBase):
+    __tablename__ = "decks"
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    user_id = Column(String(36))
+    name = Column(String)
+    description = Column(String)
+    is_public = Column(Boolean, default=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+    __table_args__ = (Index("ix_decks_user_created", "user_id", "created_at", "id"),)
+
+class BenchmarkFlashcard(BenchmarkBase):
+    __tablename__ = "flashcards"
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    user_id = Column(String(36))
+    deck_id = Column(Uuid)
+    front = Column(String)
+    back = Column(String)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+    __table_args__ = (Index("ix_flashcards_deck_created", "deck_id", "created_at", "id"),)
+
+def populate(engine, decks: int, cards_per_deck: int, user_id: str):
+    BenchmarkBase.metadata.create_all(engine)
+    rng = random.Random(25)
+    start = datetime(2024, 1, 1)
+    deck_rows, card_rows = [], []
+    for d in range(decks):
+        deck_id = uuid.UUID(int=rng.getrandbits(128))
+        deck_rows.append({
+            "id": deck_id, "user_id": user_id, "name": f"Deck {d}", "description": f"About topic {d}",
+            "is_public": False, "created_at": start + timedelta(minutes=d), "updated_at": start,
+        })
+        # Uneven decks, including empty ones
+        for c in range(rng.randint(0, 2 * cards_per_deck)):
+            card_rows.append({
+                "id": uuid.UUID(int=rng.getrandbits(128)), "user_id": user_id, "deck_id": deck_id,
+                "front": f"Question {d}.{c}", "back": f"Answer {d}.{c}",
+                "created_at": start + timedelta(minutes=d, seconds=c), "updated_at": start,
+            })
+    with engine.begin() as conn:
+        conn.execute(BenchmarkDeck.__table__.insert(), deck_rows)
+        conn.execute(BenchmarkFlashcard.__table__.insert(), card_rows)
+
+def deck_page(db, user_id, page_size):
+    return (
+        db.query(BenchmarkDeck)
+        .filter(BenchmarkDeck.user_id == user_id)
+        .order_by(BenchmarkDeck.created_at.desc(), BenchmarkDeck.id.desc())
+        .limit(page_size)
+    )
+
+def n_plus_one(db, user_id, page_size, preview):
+    results = []
+    for deck in deck_page(db, user_id, page_size).all():
+        cards = (
+            db.query(BenchmarkFlashcard)
+            .filter(BenchmarkFlashcard.deck_id == deck.id)
+            .order_by(BenchmarkFlashcard.created_at.desc(), BenchmarkFlashcard.id.desc())
+            .limit(preview)
+            .all()
+        )
+        count = db.query(func.count(BenchmarkFlashcard.id)).filter(BenchmarkFlashcard.deck_id == deck.id).scalar()
+        results.append(DeckWithCards(deck, cards, count))
+    return results
+
+def one_query(db, user_id, page_size, preview):
+    return decks_with_flashcards(db, deck_page(db, user_id, page_size), BenchmarkDeck, BenchmarkFlashcard, preview)
+
+def summary(results):
+    return [(d.id, [c.id for c in d.flashcards], d.flashcard_count) for d in results]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--decks", type=int, default=2000)
+    parser.add_argument("--cards-per-deck", type=int, default=40)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--preview", type=int, nargs="+", default=[0, 5, 20])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    user_id = str(uuid.uuid4())
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'flashcards.db')}")
+        populate(engine, args.decks, args.cards_per_deck, user_id)
+        statements = [0]
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def count_statement(*_):
+            statements[0] += 1
+
+        Session = sessionmaker(bind=engine)
+        print(f"{'preview':>8} {'way':>10} {'statements':>11} {'page ms':>9}")
+        for preview in args.preview:
+            expected = None
+            for way, load in (("N+1", n_plus_one), ("one query", one_query)):
+                samples = []
+                for _ in range(args.repeat):
+                    db = Session()
+                    statements[0] = 0
+                    start = time.perf_counter()
+                    results = load(db, user_id, args.page_size, preview)
+                    samples.append(time.perf_counter() - start)
+                    db.close()
+                if expected is None:
+                    expected = summary(results)
+                assert summary(results) == expected, f"{way} returned different decks or cards"
+                samples.sort()
+                print(f"{preview:>8} {way:>10} {statements[0]:>11} {samples[len(samples) // 2] * 1000:>9.2f}")
+        engine.dispose()
+
+if __name__ == "__main__":
+    main()
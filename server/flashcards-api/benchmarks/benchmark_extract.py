@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the HTML extraction stage of the search pipeline.
+
+Parses a corpus of saved HTML pages with the old BeautifulSoup get_text()
+path, the streaming extractor inline, and the streaming extractor in a
+process pool, reporting pages/sec and peak RSS for each. Every mode runs
+in its own subprocess so peak RSS numbers do not bleed into each other.
+
+Usage:
+    python benchmarks/benchmark_extract.py                 # synthetic corpus
+    python benchmarks/benchmark_extract.py --corpus DIR    # *.html files in DIR
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add the app directory to the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+MODES = ["bs4", "streaming", "process_pool"]
+WORDS = "the of and a to in is was for on that by with as from at an are it this be or which".split()
+
+def make_synthetic_corpus(directory: Path, pages: int, seed: int = 7):
+    """Write pages shaped like typical search results: heavy chrome, scripts, then the article."""
+    rng = random.Random(seed)
+    for index in range(pages):
+        nav = "".join(f'<li><a href="/section/{i}">Section {i}</a></li>' for i in range(rng.randint(50, 300)))
+        script = "var config = {" + ",".join(f'"k{i}": {i}' for i in range(rng.randint(500, 3000))) + "};"
+        paragraphs = "".join(
+            "<p>" + " ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 120))) + "</p>"
+            for _ in range(rng.randint(20, 200))
+        )
+        html = (
+            f"<html><head><title>Page {index}</title><style>body {{ margin: 0 }}</style>"
+            f"<script>{script}</script></head><body>"
+            f"<header><nav><ul>{nav}</ul></nav></header>"
+            f"<main><article><h1>Article {index}</h1>{paragraphs}</article></main>"
+            f"<footer>{nav}</footer></body></html>"
+        )
+        (directory / f"page_{index:04d}.html").write_text(html)
+
+def bs4_extract(html: bytes) -> str:
+    """The pre-streaming behaviour: full parse tree, then keep 1000 chars."""
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, "html.parser")
+    return " ".join(soup.get_text().split())[:1000]
+
+async def run_process_pool(pages, workers):
+    from app.services.html_extractor import HTMLExtractor
+    extractor = HTMLExtractor(max_workers=workers)
+    try:
+        return await asyncio.gather(*(extractor.extract(html) for html in pages))
+    finally:
+        # Wait for the workers so their peak RSS shows up in RUSAGE_CHILDREN
+        extractor.close(wait=True)
+
+def run_mode(mode: str, corpus: Path, workers: int):
+    from app.services.html_extractor import extract_text
+    pages = [path.read_bytes() for path in sorted(corpus.glob("*.html"))]
+
+    start = time.perf_counter()
+    if mode == "bs4":
+        for html in pages:
+            bs4_extract(html)
+    elif mode == "streaming":
+        for html in pages:
+            extract_text(html)
+    else:
+        asyncio.run(run_process_pool(pages, workers))
+    elapsed = time.perf_counter() - start
+
+    # ru_maxrss is reported in kilobytes on Linux
+    peak_self = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    print(json.dumps({
+        "mode": mode,
+        "pages": len(pages),
+        "megabytes": sum(len(html) for html in pages) / 1e6,
+        "seconds": elapsed,
+        "peak_rss_mb": peak_self / 1024,
+        "peak_worker_rss_mb": peak_children / 1024,
+    }))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", type=Path, help="directory of saved *.html pages")
+    parser.add_argument("--pages", type=int, default=200, help="synthetic corpus size")
+    parser.add_argument("--workers", type=int, default=4, help="process pool size")
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.corpus, args.workers)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = args.corpus
+        if corpus is None:
+            corpus = Path(tmp)
+            make_synthetic_corpus(corpus, args.pages)
+
+        print(f"📊 HTML extraction over {corpus}")
+        for mode in MODES:
+            output = subprocess.run(
+                [sys.executable, __file__, "--mode", mode, "--corpus", str(corpus), "--workers", str(args.workers)],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(
+                f"   {mode:<13} {result['pages'] / result['seconds']:8.1f} pages/s  "
+                f"{result['megabytes'] / result['seconds']:6.1f} MB/s  "
+                f"peak RSS {result['peak_rss_mb']:6.1f} MB (workers {result['peak_worker_rss_mb']:6.1f} MB)"
+            )
+
+if __name__ == "__main__":
+    main()
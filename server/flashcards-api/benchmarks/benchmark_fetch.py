@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the page fetch stage of the search pipeline.
+
+Starts a local stub HTTP server whose pages respond after a configurable
+delay, then compares the old sequential download loop against
+SearchService._extract_content_from_results.
+Usage: python benchmarks/benchmark_fetch.py [iterations]
+"""
+
+import asyncio
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+
+# Add the app directory to the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# The service refuses to start without keys; none of them are used here
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+os.environ.setdefault("SERPAPI_KEY", "benchmark")
+# Every stub page lives on the same host, so lift the per-host cap above 5
+os.environ.setdefault("FETCH_MAX_CONNECTIONS_PER_HOST", "8")
+# Keep the content cache out of the way so every pipeline really downloads its pages
+os.environ.setdefault("CONTENT_CACHE_PATH", ":memory:")
+os.environ.setdefault("CONTENT_CACHE_TTL_SECONDS", "0")
+
+from app.services.search_service import SearchService
+
+PAGE_BODY = "<html><head><title>Stub</title></head><body>{}</body></html>"
+
+class StubPageHandler(BaseHTTPRequestHandler):
+    """Serves /page?delay=<seconds>&size=<bytes> after sleeping for `delay`."""
+
+    def do_GET(self):
+        params = parse_qs(urlsplit(self.path).query)
+        time.sleep(float(params.get("delay", ["0"])[0]))
+        size = int(params.get("size", ["20000"])[0])
+        body = PAGE_BODY.format("<p>lorem ipsum dolor sit amet</p>" * (size // 32)).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubPageHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+def make_results(base_url, rng):
+    """Five fake SerpAPI organic results with latencies between 50ms and 400ms."""
+    delays = [rng.uniform(0.05, 0.4) for _ in range(5)]
+    results = [{"link": f"{base_url}/page?delay={delay:.3f}&n={i}"} for i, delay in enumerate(delays)]
+    return results, delays
+
+def sequential_fetch(search_results):
+    """The pre-concurrency behaviour: one blocking request after another."""
+    pieces = []
+    for result in search_results:
+        response = requests.get(result["link"], timeout=10)
+        response.raise_for_status()
+        pieces.append(response.text[:1000])
+    return " ".join(pieces)
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def report(name, samples):
+    print(f"   {name:<28} p50={percentile(samples, 50) * 1000:7.1f}ms  p99={percentile(samples, 99) * 1000:7.1f}ms")
+
+async def run_benchmark(iterations):
+    server = start_stub_server()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    rng = random.Random(42)
+    service = SearchService()
+
+    sequential, concurrent, fetch_only, sum_of_fetches, slowest_fetch = [], [], [], [], []
+    try:
+        for _ in range(iterations):
+            results, delays = make_results(base_url, rng)
+            sum_of_fetches.append(sum(delays))
+            slowest_fetch.append(max(delays))
+
+            start = time.perf_counter()
+            sequential_fetch(results)
+            sequential.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            await service._extract_content_from_results(results)
+            concurrent.append(time.perf_counter() - start)
+
+            # Network time alone, without the HTML parse that follows it
+            start = time.perf_counter()
+            await service.page_fetcher.fetch_all([result["link"] for result in results])
+            fetch_only.append(time.perf_counter() - start)
+    finally:
+        await service.close()
+        server.shutdown()
+
+    print(f"📊 Fetch stage latency over {iterations} pipelines (5 pages each)")
+    report("sum of page delays", sum_of_fetches)
+    report("slowest page delay", slowest_fetch)
+    report("sequential requests.get", sequential)
+    report("concurrent fetch + parse", concurrent)
+    report("concurrent fetch only", fetch_only)
+    print(f"   speedup at p50: {statistics.median(sequential) / statistics.median(concurrent):.1f}x")
+
+if __name__ == "__main__":
+    asyncio.run(run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 30))
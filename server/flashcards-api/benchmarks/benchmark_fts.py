@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the SQLite FTS5 search backend.
+
+For each corpus size, loads synthetic flashcards for a handful of users
+into a SQLite file, then compares per-query latency of the current
+`LIKE '%query%'` scan with an FTS5 MATCH ranked by bm25() and filtered
+by owner, as issued by FlashcardRepository.search with SEARCH_BACKEND=fts5.
+Queries are timed separately for common words, where the unranked LIKE
+scan can stop after the first few hits, rare ones, and misspelled words
+with no hits at all, where LIKE reads every card the user owns.
+Also reports the one-off build time of the FTS table and the insert
+throughput with and without the sync triggers.
+
+Usage: python benchmarks/benchmark_fts.py [--sizes 10000 100000 300000]
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add the app directory to the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.db.fts import ensure_fts, match_expression
+
+VOCABULARY = [
+    "cell", "energy", "protein", "enzyme", "molecule", "atom", "reaction", "bond", "photosynthesis",
+    "gravity", "force", "mass", "velocity", "acceleration", "wave", "frequency", "history", "empire",
+    "revolution", "treaty", "war", "king", "republic", "function", "derivative", "integral", "matrix",
+    "vector", "theorem", "proof", "language", "grammar", "verb", "noun", "sentence",
+] + [f"term{i:04d}" for i in range(2000)]
+# Word frequencies follow Zipf's law, as in real text
+WEIGHTS = [1 / rank for rank in range(1, len(VOCABULARY) + 1)]
+FILLER = "what is the of and a to in which how does why are".split()
+USERS = [f"user-{i}" for i in range(20)]
+
+SCHEMA = "CREATE TABLE flashcards (id TEXT PRIMARY KEY, user_id TEXT, front TEXT, back TEXT)"
+
+def words(rng: random.Random, count: int):
+    return [rng.choice(FILLER) if rng.random() < 0.3 else word for word in rng.choices(VOCABULARY, WEIGHTS, k=count)]
+
+def make_cards(count: int, rng: random.Random, offset: int = 0):
+    for index in range(offset, offset + count):
+        question = " ".join(words(rng, rng.randint(5, 12))) + "?"
+        answer = " ".join(words(rng, rng.randint(10, 30))) + "."
+        yield f"card-{index}", rng.choice(USERS), question, answer
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+def insert_rate(conn, cards):
+    start = time.perf_counter()
+    for card in cards:
+        conn.execute("INSERT INTO flashcards VALUES (?, ?, ?, ?)", card)
+    conn.commit()
+    return len(cards) / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 300000])
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--inserts", type=int, default=2000, help="rows inserted to measure trigger overhead")
+    args = parser.parse_args()
+
+    rng = random.Random(14)
+    print(
+        f"{'cards':>8} {'common: LIKE ms':>16} {'FTS5 ms':>8} {'rare: LIKE ms':>14} {'FTS5 ms':>8} "
+        f"{'miss: LIKE ms':>14} {'FTS5 ms':>8} {'build s':>8} "
+        f"{'ins/s plain':>12} {'ins/s FTS':>10} {'DB MB':>7} {'FTS MB':>7}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            path = os.path.join(directory, f"flashcards-{size}.db")
+            conn = sqlite3.connect(path)
+            conn.execute(SCHEMA)
+            conn.execute("CREATE INDEX ix_flashcards_user_id ON flashcards (user_id)")
+            conn.executemany("INSERT INTO flashcards VALUES (?, ?, ?, ?)", make_cards(size, rng))
+            conn.commit()
+            plain_inserts = insert_rate(conn, list(make_cards(args.inserts, rng, offset=size)))
+            db_mb = os.path.getsize(path) / 1e6
+
+            start = time.perf_counter()
+            ensure_fts(conn)
+            build = time.perf_counter() - start
+            fts_inserts = insert_rate(conn, list(make_cards(args.inserts, rng, offset=size + args.inserts)))
+            fts_mb = os.path.getsize(path) / 1e6 - db_mb
+
+            common = [rng.choice(VOCABULARY[:35]) for _ in range(args.queries)]
+            rare = [rng.choice(VOCABULARY[-500:]) for _ in range(args.queries)]
+            misses = [rng.choice(VOCABULARY[:35]) + "x" for _ in range(args.queries)]
+
+            def like_search(queries):
+                for query in queries:
+                    conn.execute(
+                        "SELECT id FROM flashcards WHERE user_id = ? AND (front LIKE ? OR back LIKE ?) LIMIT 10",
+                        (USERS[0], f"%{query}%", f"%{query}%"),
+                    ).fetchall()
+
+            def fts_search(queries):
+                for query in queries:
+                    conn.execute(
+                        "SELECT flashcards.id FROM flashcards "
+                        "JOIN flashcards_fts_ids ON flashcards_fts_ids.id = flashcards.id "
+                        "JOIN flashcards_fts ON flashcards_fts.rowid = flashcards_fts_ids.rowid "
+                        "WHERE flashcards_fts MATCH ? AND flashcards.user_id = ? "
+                        "ORDER BY bm25(flashcards_fts) LIMIT 10",
+                        (match_expression(query), USERS[0]),
+                    ).fetchall()
+
+            latencies = [
+                timed(lambda: search(queries), 3) / len(queries) * 1000
+                for queries in (common, rare, misses)
+                for search in (like_search, fts_search)
+            ]
+            print(
+                f"{size:>8} {latencies[0]:>16.3f} {latencies[1]:>8.3f} {latencies[2]:>14.3f} {latencies[3]:>8.3f} "
+                f"{latencies[4]:>14.3f} {latencies[5]:>8.3f} "
+                f"{build:>8.2f} "
+                f"{plain_inserts:>12.0f} {fts_inserts:>10.0f} {db_mb:>7.1f} {fts_mb:>7.1f}"
+            )
+            conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the trigram index behind /api/v1/search?fuzzy=true.
+
+For each corpus size, builds FuzzyIndex over synthetic flashcards and
+decks for a handful of users and times queries with one or two typos per
+word. Reports the index size (distinct words, trigrams, traced memory),
+the build time, query latency, how many queries hit the latency budget,
+and, for comparison, the cost of checking a query word's edit distance
+against every word the user can see without the trigram filter.
+
+Usage: python benchmarks/benchmark_fuzzy.py [--sizes 10000 50000 200000]
+"""
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add the app directory to the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.config import settings
+from app.services.fuzzy_index import FuzzyIndex, bounded_levenshtein
+
+VOCABULARY = [
+    "react", "native", "component", "state", "props", "hook", "effect", "render", "javascript",
+    "photosynthesis", "chlorophyll", "mitochondria", "protein", "enzyme", "molecule", "reaction",
+    "gravity", "velocity", "acceleration", "frequency", "revolution", "republic", "derivative",
+    "integral", "matrix", "vector", "theorem", "grammar", "sentence", "language", "history",
+]
+FILLER = "what is the of and a to in which how does why are".split()
+USERS = [f"user-{i}" for i in range(20)]
+ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+
+def synthetic_words(count: int, rng: random.Random):
+    """Pronounceable-ish words, so trigrams overlap the way real vocabulary does."""
+    syllables = [c + v for c in "bcdfghklmnprstvz" for v in "aeiou"]
+    return ["".join(rng.choices(syllables, k=rng.randint(2, 4))) for _ in range(count)]
+
+def make_rows(count: int, vocabulary, rng: random.Random):
+    decks = [
+        (f"deck-{index}", rng.choice(USERS), rng.random() < 0.2, (" ".join(rng.choices(vocabulary, k=3)), None))
+        for index in range(max(1, count // 50))
+    ]
+    cards = [
+        (
+            f"card-{index}",
+            rng.choice(USERS),
+            (" ".join(rng.choices(FILLER + vocabulary, k=8)) + "?", " ".join(rng.choices(vocabulary, k=6))),
+        )
+        for index in range(count)
+    ]
+    return decks, cards
+
+def misspell(word: str, rng: random.Random) -> str:
+    for _ in range(1 if len(word) <= 4 else rng.randint(1, 2)):
+        position = rng.randrange(len(word))
+        edit = rng.choice(["swap", "drop", "replace"])
+        if edit == "swap" and position < len(word) - 1:
+            word = word[:position] + word[position + 1] + word[position] + word[position + 2 :]
+        elif edit == "drop" and len(word) > 3:
+            word = word[:position] + word[position + 1 :]
+        else:
+            word = word[:position] + rng.choice(ALPHABET) + word[position + 1 :]
+    return word
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 50000, 200000])
+    parser.add_argument("--vocabulary", type=int, default=20000, help="synthetic words on top of the fixed list")
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+
+    rng = random.Random(18)
+    vocabulary = VOCABULARY + synthetic_words(args.vocabulary, rng)
+    print(
+        f"{'cards':>8} {'words':>7} {'trigrams':>9} {'MB':>6} {'build s':>8} "
+        f"{'p50 ms':>7} {'p99 ms':>7} {'budget':>7} {'scan ms':>8}"
+    )
+    for size in args.sizes:
+        decks, cards = make_rows(size, vocabulary, rng)
+        queries = [
+            " ".join(misspell(word, rng) for word in rng.sample(vocabulary, rng.randint(1, 3)))
+            for _ in range(args.queries)
+        ]
+
+        index = FuzzyIndex(max_candidates=settings.FUZZY_MAX_CANDIDATES, budget_ms=settings.FUZZY_BUDGET_MS)
+        start = time.perf_counter()
+        index.build(decks, cards)
+        build = time.perf_counter() - start
+        # Build a second copy under tracemalloc, which would distort the timing above
+        tracemalloc.start()
+        copy = FuzzyIndex()
+        copy.build(decks, cards)
+        memory_mb = tracemalloc.get_traced_memory()[0] / 1e6
+        tracemalloc.stop()
+        del copy
+        stats = index.stats()
+
+        samples = []
+        over_budget = 0
+        for query in queries:
+            start = time.perf_counter()
+            index.search(query, "flashcard", user_id=USERS[0], limit=10)
+            elapsed = time.perf_counter() - start
+            samples.append(elapsed)
+            over_budget += elapsed * 1000 >= settings.FUZZY_BUDGET_MS
+
+        # Edit distance against every word the user can see, i.e. no trigram filter
+        words = list(index.scopes[("flashcard", USERS[0])][1])
+        scan_samples = []
+        for query in queries[:20]:
+            token = query.split()[0]
+            start = time.perf_counter()
+            for word in words:
+                bounded_levenshtein(token, word, 2)
+            scan_samples.append(time.perf_counter() - start)
+
+        print(
+            f"{size:>8} {stats['words']:>7} {stats['trigrams']:>9} {memory_mb:>6.0f} {build:>8.2f} "
+            f"{percentile(samples, 50) * 1000:>7.2f} {percentile(samples, 99) * 1000:>7.2f} "
+            f"{over_budget:>7} {percentile(scan_samples, 50) * 1000:>8.1f}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the outbound call governor (token bucket, concurrency cap,
+admission queue and circuit breaker) against a fake provider.
+
+Requests arrive at a fixed rate while the fake provider goes through
+healthy, degraded (slow and failing) and recovered phases. Each phase is
+run once calling the provider directly and once through ProviderGovernor,
+reporting caller latency percentiles, failures, fast rejections and the
+peak number of calls in flight at the provider, plus breaker transitions.
+
+Usage: python benchmarks/benchmark_governor.py [--rate 20] [--phase-seconds 5]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add the app directory to the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+os.environ.setdefault("SERPAPI_KEY", "benchmark")
+
+from app.services.governor import CircuitBreaker, ProviderGovernor, ProviderUnavailable
+
+# (name, mean latency seconds, error rate)
+PHASES = [
+    ("healthy", 0.05, 0.0),
+    ("degraded", 2.0, 0.5),
+    ("recovered", 0.05, 0.0),
+]
+
+class FakeProvider:
+    """Async stand-in for an outbound API with injectable latency and errors."""
+
+    def __init__(self, seed: int = 3):
+        self.rng = random.Random(seed)
+        self.latency = 0.05
+        self.error_rate = 0.0
+        self.timeout = 3.0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def __call__(self):
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            latency = self.rng.expovariate(1 / self.latency)
+            if latency >= self.timeout:
+                await asyncio.sleep(self.timeout)
+                raise TimeoutError("provider timed out")
+            await asyncio.sleep(latency)
+            if self.rng.random() < self.error_rate:
+                raise RuntimeError("provider error")
+            return "ok"
+        finally:
+            self.in_flight -= 1
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+async def run(governed: bool, rate: float, phase_seconds: float):
+    provider = FakeProvider()
+    governor = ProviderGovernor(
+        "fake",
+        rate=rate,
+        burst=int(rate),
+        max_concurrency=8,
+        max_queue=16,
+        queue_timeout=0.5,
+        breaker=CircuitBreaker(window=10, min_calls=5, error_rate=0.5, slow_call_seconds=1.0, reset_seconds=1.0),
+    )
+    transitions = []
+    phase_name = PHASES[0][0]
+
+    async def watch_breaker():
+        while True:
+            state = governor.breaker.state
+            if not transitions or transitions[-1][1] != state:
+                transitions.append((phase_name, state))
+            await asyncio.sleep(0.01)
+
+    async def one_call(results):
+        start = time.perf_counter()
+        try:
+            if governed:
+                await governor.call(provider)
+            else:
+                await provider()
+            outcome = "ok"
+        except ProviderUnavailable:
+            outcome = "rejected"
+        except Exception:
+            outcome = "failed"
+        results.append((outcome, time.perf_counter() - start))
+
+    print(f"\n{'governed' if governed else 'direct'} calls")
+    print(f"   {'phase':<10} {'requests':>8} {'ok':>5} {'failed':>7} {'rejected':>9} {'p50 ms':>8} {'p99 ms':>8} {'peak in flight':>15}")
+    watcher = asyncio.create_task(watch_breaker()) if governed else None
+    for name, latency, error_rate in PHASES:
+        phase_name = name
+        provider.latency = latency
+        provider.error_rate = error_rate
+        provider.peak_in_flight = provider.in_flight
+        results = []
+        tasks = []
+        end = time.perf_counter() + phase_seconds
+        while time.perf_counter() < end:
+            tasks.append(asyncio.create_task(one_call(results)))
+            await asyncio.sleep(1 / rate)
+        await asyncio.gather(*tasks)
+
+        latencies = [seconds for _, seconds in results]
+        counts = {outcome: sum(1 for o, _ in results if o == outcome) for outcome in ("ok", "failed", "rejected")}
+        print(
+            f"   {name:<10} {len(results):>8} {counts['ok']:>5} {counts['failed']:>7} {counts['rejected']:>9} "
+            f"{percentile(latencies, 50) * 1000:>8.1f} {percentile(latencies, 99) * 1000:>8.1f} {provider.peak_in_flight:>15}"
+        )
+
+    if watcher is not None:
+        watcher.cancel()
+        print("   breaker: " + " -> ".join(f"{state} ({phase})" for phase, state in transitions))
+        print(f"   stats: {governor.stats()}")
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rate", type=float, default=20.0, help="requests per second")
+    parser.add_argument("--phase-seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    await run(False, args.rate, args.phase_seconds)
+    await run(True, args.rate, args.phase_seconds)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Benchmark for lean MongoDB reads on list endpoints returning 1,000+ cards.
+
+Compares the two ways GET /flashcards turns a page of flashcard documents
+into a JSON response body:
+  validated  whole documents -> FlashcardMongo(**doc) -> Flashcard -> response_model validation + encoding
+  lean       projected documents -> model_construct -> Flashcard -> page_json
+
+Without --mongo-url, the documents are BSON-decoded in process from
+payloads shaped like a server reply. A whole document carries the stored
+extras that the projection leaves on the server: the source URL and the
+generation context. With --mongo-url, the same pipelines run through
+the flashcard repository's get_by_deck against a scratch database.
+Reports documents/sec and peak traced allocations (tracemalloc) per page.
+
+Usage: python benchmarks/benchmark_mongo_reads.py [--page-sizes 1000 5000] [--repeat 5] [--mongo-url mongodb://localhost:27017]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import bson
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from motor.motor_asyncio import AsyncIOMotorClient
+
+# Add the app directory to the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.api.pages import page_json
+from app.config import settings
+from app.db.mongodb import MongoDB
+
+# The repository module creates its instances at import, which needs a database
+# handle; the client does not connect until it is used
+MongoDB.database = AsyncIOMotorClient(settings.MONGODB_URL)[settings.MONGODB_DB_NAME]
+
+from app.db.repositories.async_repositories import MongoAsyncFlashcardRepository, _flashcard_from_document
+from app.db.repositories.mongo_repositories import FLASHCARD_FIELDS, MongoFlashcardRepository, from_document
+from app.models.mongo_models import FlashcardMongo
+from app.schemas.flashcard import FlashcardPage
+
+def make_documents(count: int, deck_id: ObjectId, user_id: ObjectId):
+    start = datetime(2024, 1, 1)
+    return [
+        {
+            "_id": ObjectId(),
+            "question": f"What is the role of the mitochondria in cell number {i}?",
+            "answer": f"It produces ATP through cellular respiration ({i}).",
+            "deck_id": deck_id,
+            "user_id": user_id,
+            "created_at": start + timedelta(seconds=i),
+            "updated_at": start + timedelta(seconds=i),
+            # Stored with generated cards, never returned by list endpoints
+            "source_url": f"https://example.com/biology/cells/{i}",
+            "generation_context": "Cells are the basic unit of life. " * 20,
+        }
+        for i in range(count)
+    ]
+
+def response_model_json(flashcards) -> bytes:
+    """What FastAPI does with a returned page: validate it against FlashcardPage, then encode it."""
+    content = jsonable_encoder({"items": flashcards, "next_cursor": None})
+    page = FlashcardPage.model_validate(content).model_dump(mode="json")
+    return json.dumps(page, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def validated_json(documents) -> bytes:
+    return response_model_json([_flashcard_from_document(FlashcardMongo(**document)) for document in documents])
+
+def lean_json(documents) -> bytes:
+    flashcards = [_flashcard_from_document(from_document(FlashcardMongo, document)) for document in documents]
+    return page_json(flashcards, None)
+
+def measure(fn, repeat):
+    """Median seconds and peak traced KiB of fn() over `repeat` runs."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return samples[len(samples) // 2], peak / 1024
+
+def print_row(size, mode, seconds, peak_kib, body_bytes):
+    print(f"{size:>6} {mode:>10} {seconds * 1000:>9.1f} {size / seconds:>9.0f} {peak_kib:>10.0f} {body_bytes / 1024:>9.0f}")
+
+def print_header(title):
+    print(title)
+    print(f"{'cards':>6} {'mode':>10} {'ms':>9} {'docs/s':>9} {'peak KiB':>10} {'body KiB':>9}")
+
+def bench_in_process(page_sizes, repeat):
+    print_header("In process (BSON decode + models + JSON)")
+    for size in page_sizes:
+        documents = make_documents(size, ObjectId(), ObjectId())
+        keep = {"_id", *FLASHCARD_FIELDS}
+        whole = b"".join(bson.encode(document) for document in documents)
+        projected = b"".join(
+            bson.encode({key: value for key, value in document.items() if key in keep}) for document in documents
+        )
+        pipelines = {
+            "validated": lambda: validated_json(bson.decode_all(whole)),
+            "lean": lambda: lean_json(bson.decode_all(projected)),
+        }
+        for mode, pipeline in pipelines.items():
+            settings.MONGO_LEAN_READS = mode != "validated"
+            seconds, peak_kib = measure(pipeline, repeat)
+            print_row(size, mode, seconds, peak_kib, len(pipeline()))
+
+async def bench_mongo(mongo_url, page_sizes, repeat):
+    client = AsyncIOMotorClient(mongo_url)
+    database = client[f"flashcards_benchmark_{uuid.uuid4().hex[:8]}"]
+    mongo_repository = MongoFlashcardRepository()
+    mongo_repository.collection = database.flashcards
+    repository = MongoAsyncFlashcardRepository(mongo_repository)
+    await mongo_repository.collection.create_index([("deck_id", 1), ("created_at", -1), ("_id", -1)])
+    loop = asyncio.get_running_loop()
+    try:
+        print_header("\nMongoDB (MongoAsyncFlashcardRepository.get_by_deck)")
+        for size in page_sizes:
+            deck_id = ObjectId()
+            await mongo_repository.collection.insert_many(make_documents(size, deck_id, ObjectId()))
+
+            async def validated():
+                settings.MONGO_LEAN_READS = False
+                return response_model_json(await repository.get_by_deck(deck_id=str(deck_id), limit=size))
+
+            async def lean():
+                settings.MONGO_LEAN_READS = True
+                return page_json(await repository.get_by_deck(deck_id=str(deck_id), limit=size), None)
+
+            for mode, pipeline in (("validated", validated), ("lean", lean)):
+                samples = []
+                for _ in range(repeat):
+                    start = loop.time()
+                    body = await pipeline()
+                    samples.append(loop.time() - start)
+                samples.sort()
+                tracemalloc.start()
+                await pipeline()
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                print_row(size, mode, samples[len(samples) // 2], peak / 1024, len(body))
+    finally:
+        await client.drop_database(database.name)
+        client.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=[1000, 5000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--mongo-url", help="also benchmark reads through the repository on this server")
+    args = parser.parse_args()
+
+    bench_in_process(args.page_sizes, args.repeat)
+    if args.mongo_url:
+        asyncio.run(bench_mongo(args.mongo_url, args.page_sizes, args.repeat))
+
+if __name__ == "__main__":
+    main()
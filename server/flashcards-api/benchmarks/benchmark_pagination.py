@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark for keyset (cursor) pagination against OFFSET pagination.
+
+Loads one large flashcard collection (plus other users' cards) into a
+SQLite file with the compound (user_id, created_at, id) index created at
+startup, then times fetching page 1, 10, 100, 1,000 and 10,000 of the
+user's cards newest first, both with `OFFSET (page - 1) * limit` and with
+the `(created_at, id) < (cursor)` seek issued by BaseRepository._keyset.
+
+Usage: python benchmarks/benchmark_pagination.py [--cards 250000] [--limit 20]
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add the app directory to the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.db.sqlite_indexes import ensure_pagination_indexes
+
+OFFSET_PAGE = (
+    "SELECT id, front, back, created_at FROM flashcards WHERE user_id = ? "
+    "ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?"
+)
+KEYSET_PAGE = (
+    "SELECT id, front, back, created_at FROM flashcards WHERE user_id = ? AND (created_at, id) < (?, ?) "
+    "ORDER BY created_at DESC, id DESC LIMIT ?"
+)
+
+def make_cards(count: int, users, rng: random.Random):
+    start = datetime(2024, 1, 1)
+    for index in range(count):
+        # Several cards share a timestamp, as in a bulk save, so the id tiebreak matters
+        created_at = start + timedelta(seconds=index // 4)
+        yield uuid.UUID(int=rng.getrandbits(128)).hex, rng.choice(users), f"question {index}", f"answer {index}", created_at.isoformat(" ")
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cards", type=int, default=250000, help="cards owned by the benchmarked user")
+    parser.add_argument("--other-cards", type=int, default=50000, help="cards owned by other users")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10, 100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(17)
+    user = "benchmark-user"
+    with tempfile.TemporaryDirectory() as directory:
+        conn = sqlite3.connect(os.path.join(directory, "flashcards.db"))
+        conn.execute(
+            "CREATE TABLE flashcards (id TEXT PRIMARY KEY, user_id TEXT, deck_id TEXT, "
+            "front TEXT, back TEXT, created_at TEXT)"
+        )
+        conn.executemany(
+            "INSERT INTO flashcards (id, user_id, front, back, created_at) VALUES (?, ?, ?, ?, ?)",
+            make_cards(args.cards, [user], rng),
+        )
+        conn.executemany(
+            "INSERT INTO flashcards (id, user_id, front, back, created_at) VALUES (?, ?, ?, ?, ?)",
+            make_cards(args.other_cards, [f"user-{i}" for i in range(10)], rng),
+        )
+        conn.commit()
+        ensure_pagination_indexes(conn)
+
+        print(f"📊 {args.cards} cards for one user (+{args.other_cards} others), {args.limit} per page")
+        print(f"   {'page':>7} {'OFFSET ms':>10} {'keyset ms':>10}")
+        for page in args.pages:
+            offset = (page - 1) * args.limit
+            if offset >= args.cards:
+                print(f"   {page:>7} {'(past the end)':>21}")
+                continue
+            # Cursor for this page: the key of the previous page's last row
+            previous = conn.execute(OFFSET_PAGE, (user, 1, offset - 1)).fetchone() if offset else None
+
+            def offset_page():
+                return conn.execute(OFFSET_PAGE, (user, args.limit, offset)).fetchall()
+
+            def keyset_page():
+                if previous is None:
+                    return conn.execute(OFFSET_PAGE, (user, args.limit, 0)).fetchall()
+                return conn.execute(KEYSET_PAGE, (user, previous[3], previous[0], args.limit)).fetchall()
+
+            assert offset_page() == keyset_page()
+            offset_ms = timed(offset_page, args.repeat) * 1000
+            keyset_ms = timed(keyset_page, args.repeat) * 1000
+            print(f"   {page:>7} {offset_ms:>10.3f} {keyset_ms:>10.3f}")
+        conn.close()
+
+if __name__ == "__main__":
+    main()
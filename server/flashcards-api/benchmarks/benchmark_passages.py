@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the passage selection stage of the search pipeline.
+
+Builds synthetic result pages where the text relevant to the query sits
+behind leftover site chrome (breadcrumbs, cookie notices, related links)
+and compares the prompt content of the old approach (first 1000 chars of
+each page joined, cut to 2000 chars) with BM25-selected passages packed
+into PROMPT_CONTENT_TOKEN_BUDGET. Reports prompt tokens, the share of
+query-relevant sentences that reach the prompt, and selection time.
+
+Usage:
+    python benchmarks/benchmark_passages.py [--queries 50] [--budget 400]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add the app directory to the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.passage_selector import TokenCounter, select_passages
+
+FILLER = "the of and a to in is was for on that by with as from at an are it this be or which".split()
+CHROME = [
+    "Home > Articles > Science > Reference",
+    "We use cookies to improve your experience. Accept all cookies Manage preferences",
+    "Sign in Subscribe Newsletter Share on Facebook Share on Twitter Print this page",
+    "Related articles Most popular Editor's picks Trending now Read more",
+]
+TOPICS = [
+    ("photosynthesis", ["chlorophyll", "light", "glucose", "carbon", "dioxide"]),
+    ("mitochondria", ["cell", "energy", "atp", "respiration", "membrane"]),
+    ("french revolution", ["bastille", "monarchy", "1789", "republic", "estates"]),
+    ("binary search", ["sorted", "array", "midpoint", "logarithmic", "comparison"]),
+    ("plate tectonics", ["crust", "mantle", "earthquake", "subduction", "continental"]),
+]
+
+def make_pages(rng: random.Random, query: str, vocabulary, pages: int = 5):
+    """Pages of chrome and filler with a few on-topic sentences buried in the body."""
+    relevant = []
+    texts = []
+    for _ in range(pages):
+        parts = [rng.choice(CHROME) for _ in range(rng.randint(8, 20))]
+        for _ in range(rng.randint(20, 60)):
+            if rng.random() < 0.15:
+                sentence = f"{query.title()} " + " ".join(
+                    rng.choice(vocabulary + FILLER) for _ in range(rng.randint(12, 25))
+                ) + "."
+                relevant.append(sentence)
+                parts.append(sentence)
+            else:
+                parts.append(" ".join(rng.choice(FILLER) for _ in range(rng.randint(12, 25))) + ".")
+        texts.append(" ".join(parts)[:20000])
+    return texts, relevant
+
+def old_content(pages):
+    """The pre-selection behaviour: 1000 chars per page, joined, cut to 2000."""
+    return " ".join(page[:1000] for page in pages)[:2000]
+
+def coverage(content: str, relevant) -> float:
+    if not relevant:
+        return 0.0
+    # A sentence counts as included when its opening words made it into the prompt
+    return sum(1 for sentence in relevant if " ".join(sentence.split()[:6]) in content) / len(relevant)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--budget", type=int, default=400)
+    parser.add_argument("--model", default="gpt-3.5-turbo")
+    args = parser.parse_args()
+
+    counter = TokenCounter(args.model)
+    rng = random.Random(11)
+
+    results = {"old": {"tokens": [], "coverage": []}, "bm25": {"tokens": [], "coverage": [], "ms": []}}
+    for _ in range(args.queries):
+        query, vocabulary = rng.choice(TOPICS)
+        pages, relevant = make_pages(rng, query, vocabulary)
+
+        content = old_content(pages)
+        results["old"]["tokens"].append(counter(content))
+        results["old"]["coverage"].append(coverage(content, relevant))
+
+        start = time.perf_counter()
+        content = select_passages(query, pages, token_budget=args.budget, count_tokens=counter, words_per_passage=80)
+        results["bm25"]["ms"].append((time.perf_counter() - start) * 1000)
+        results["bm25"]["tokens"].append(counter(content))
+        results["bm25"]["coverage"].append(coverage(content, relevant))
+
+    tokenizer = "tiktoken" if counter.exact else "estimate (tiktoken encoding unavailable)"
+    print(f"{args.queries} queries, 5 pages each, budget {args.budget} tokens, tokenizer: {tokenizer}")
+    print(f"{'strategy':<10} {'mean tokens':>12} {'relevant sentences in prompt':>30} {'selection ms':>14}")
+    for name, data in results.items():
+        ms = f"{statistics.mean(data['ms']):.2f}" if "ms" in data else "-"
+        print(
+            f"{name:<10} {statistics.mean(data['tokens']):>12.1f} "
+            f"{statistics.mean(data['coverage']) * 100:>29.1f}% {ms:>14}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark of search_and_generate_flashcards against local
+stand-ins for SerpAPI, the result pages and the OpenAI chat API
+(see benchmarks/standins.py), so it needs no network access or credits.
+
+Requests arrive open-loop (Poisson) at the target rate for the given
+duration. The report has per-stage latency percentiles (search, per-page
+fetch and extract, passage selection, LLM, end to end), throughput,
+stand-in request counts and peak RSS of the server and its extraction
+workers. For CI-style runs, --json writes the report to a file and
+--max-p99-ms / --min-throughput exit non-zero on a regression.
+
+Usage:
+    python benchmarks/benchmark_pipeline.py --rate 2 --duration 30
+    python benchmarks/benchmark_pipeline.py --llm-ms 3000 --page-kb 200 --json report.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import sys
+import time
+from collections import defaultdict
+from functools import wraps
+from pathlib import Path
+
+# Add the app directory to the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from standins import Latency, StandInConfig, StandIns
+
+STAGES = ["search", "fetch", "extract", "select", "llm", "total"]
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def instrument(service, timings):
+    """Record the duration of every pipeline stage call on this service instance."""
+    def timed(stage, method):
+        if asyncio.iscoroutinefunction(method):
+            @wraps(method)
+            async def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await method(*args, **kwargs)
+                finally:
+                    timings[stage].append(time.perf_counter() - start)
+        else:
+            @wraps(method)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return method(*args, **kwargs)
+                finally:
+                    timings[stage].append(time.perf_counter() - start)
+        return wrapper
+
+    service._google_search = timed("search", service._google_search)
+    service._fetch_page = timed("fetch", service._fetch_page)
+    service._extract_page_text = timed("extract", service._extract_page_text)
+    service._select_passages = timed("select", service._select_passages)
+    service._generate_flashcards = timed("llm", service._generate_flashcards)
+
+async def drive(service, rate: float, duration: float, distinct_queries: int, seed: int):
+    timings = defaultdict(list)
+    instrument(service, timings)
+    outcomes = {"completed": 0, "empty": 0, "failed": 0}
+    rng = random.Random(seed)
+
+    async def one_request(index: int):
+        query = f"benchmark topic {index % distinct_queries if distinct_queries else index}"
+        start = time.perf_counter()
+        try:
+            flashcards = await service.search_and_generate_flashcards(query, 5)
+            outcomes["completed" if flashcards else "empty"] += 1
+        except Exception:
+            outcomes["failed"] += 1
+        timings["total"].append(time.perf_counter() - start)
+
+    tasks = []
+    start = time.perf_counter()
+    next_arrival = start
+    index = 0
+    while next_arrival < start + duration:
+        await asyncio.sleep(max(0.0, next_arrival - time.perf_counter()))
+        tasks.append(asyncio.create_task(one_request(index)))
+        index += 1
+        next_arrival += rng.expovariate(rate)
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+    return timings, outcomes, elapsed
+
+async def run(args):
+    config = StandInConfig(
+        search_latency=Latency(args.search_ms, args.sigma),
+        page_latency=Latency(args.page_ms, args.sigma),
+        llm_latency=Latency(args.llm_ms, args.sigma),
+        results_per_search=args.results,
+        page_bytes=args.page_kb * 1024,
+    )
+    standins = StandIns(config)
+
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    os.environ.setdefault("SERPAPI_KEY", "benchmark")
+    os.environ["OPENAI_BASE_URL"] = standins.openai_url
+    os.environ["SERPAPI_BASE_URL"] = standins.serpapi_url
+    # Every stand-in page lives on one host; do not let the per-host cap model a single site
+    os.environ.setdefault("FETCH_MAX_CONNECTIONS_PER_HOST", os.environ.get("FETCH_MAX_CONNECTIONS", "20"))
+    os.environ.setdefault("CONTENT_CACHE_PATH", ":memory:")
+
+    # Import after the environment is set so Settings picks it up
+    from app.services.search_service import SearchService
+    service = SearchService()
+    try:
+        timings, outcomes, elapsed = await drive(service, args.rate, args.duration, args.distinct_queries, args.seed)
+        governors = {"serpapi": service.serpapi_governor.stats(), "openai": service.openai_governor.stats()}
+    finally:
+        # Wait for the extraction workers so their peak RSS shows up in RUSAGE_CHILDREN
+        service.html_extractor.close(wait=True)
+        await service.close()
+        standins.close()
+
+    requests = sum(outcomes.values())
+    # ru_maxrss is reported in kilobytes on Linux
+    return {
+        "config": {
+            "rate": args.rate,
+            "duration": args.duration,
+            "search_ms": args.search_ms,
+            "page_ms": args.page_ms,
+            "llm_ms": args.llm_ms,
+            "sigma": args.sigma,
+            "results": args.results,
+            "page_kb": args.page_kb,
+        },
+        "requests": requests,
+        **outcomes,
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_per_second": round(outcomes["completed"] / elapsed, 3) if elapsed else 0.0,
+        "stages": {
+            stage: {
+                "count": len(timings[stage]),
+                "p50_ms": round(percentile(timings[stage], 50) * 1000, 2),
+                "p90_ms": round(percentile(timings[stage], 90) * 1000, 2),
+                "p99_ms": round(percentile(timings[stage], 99) * 1000, 2),
+                "max_ms": round(max(timings[stage], default=0.0) * 1000, 2),
+            }
+            for stage in STAGES
+        },
+        "standin_requests": standins.requests,
+        "governors": governors,
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "peak_worker_rss_mb": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024, 1),
+    }
+
+def print_report(report):
+    config = report["config"]
+    print(
+        f"📊 {report['requests']} requests at {config['rate']}/s for {config['duration']}s "
+        f"(search {config['search_ms']}ms, page {config['page_ms']}ms, llm {config['llm_ms']}ms, "
+        f"sigma {config['sigma']}, {config['results']} x {config['page_kb']}KB pages)"
+    )
+    print(f"   {'stage':<8} {'count':>6} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for stage, stats in report["stages"].items():
+        print(
+            f"   {stage:<8} {stats['count']:>6} {stats['p50_ms']:>9.1f} {stats['p90_ms']:>9.1f} "
+            f"{stats['p99_ms']:>9.1f} {stats['max_ms']:>9.1f}"
+        )
+    print(
+        f"   completed={report['completed']} empty={report['empty']} failed={report['failed']} "
+        f"throughput={report['throughput_per_second']}/s"
+    )
+    print(f"   stand-in requests: {report['standin_requests']}")
+    print(f"   peak RSS: server {report['peak_rss_mb']} MB, extraction workers {report['peak_worker_rss_mb']} MB")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rate", type=float, default=2.0, help="target requests per second")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds of arrivals")
+    parser.add_argument("--search-ms", type=float, default=300.0, help="median SerpAPI latency")
+    parser.add_argument("--page-ms", type=float, default=150.0, help="median page latency")
+    parser.add_argument("--llm-ms", type=float, default=1500.0, help="median chat completion latency")
+    parser.add_argument("--sigma", type=float, default=0.4, help="lognormal spread of all latencies")
+    parser.add_argument("--results", type=int, default=5, help="search results per query")
+    parser.add_argument("--page-kb", type=int, default=60, help="size of each page")
+    parser.add_argument("--distinct-queries", type=int, default=0, help="cycle through N queries (0: all unique)")
+    parser.add_argument("--seed", type=int, default=5)
+    parser.add_argument("--json", type=Path, help="also write the report to this file")
+    parser.add_argument("--max-p99-ms", type=float, help="fail if end-to-end p99 exceeds this")
+    parser.add_argument("--min-throughput", type=float, help="fail if completed requests/second is lower")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+
+    failures = []
+    if args.max_p99_ms is not None and report["stages"]["total"]["p99_ms"] > args.max_p99_ms:
+        failures.append(f"end-to-end p99 {report['stages']['total']['p99_ms']}ms > {args.max_p99_ms}ms")
+    if args.min_throughput is not None and report["throughput_per_second"] < args.min_throughput:
+        failures.append(f"throughput {report['throughput_per_second']}/s < {args.min_throughput}/s")
+    for failure in failures:
+        print(f"❌ {failure}")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the in-process BM25 search index.
+
+For each corpus size, loads synthetic flashcards for a handful of users
+into a SQLite table and into SearchIndex, then compares per-query latency
+of the current `LIKE '%query%'` scan (as issued by FlashcardRepository.search)
+with an index lookup. Also reports full build time against snapshot
+save/load time, which is what a warm start pays.
+
+Usage: python benchmarks/benchmark_search_index.py [--sizes 1000 10000 100000]
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add the app directory to the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.search_index import SearchIndex
+
+VOCABULARY = [
+    "cell", "energy", "protein", "enzyme", "molecule", "atom", "reaction", "bond", "photosynthesis",
+    "gravity", "force", "mass", "velocity", "acceleration", "wave", "frequency", "history", "empire",
+    "revolution", "treaty", "war", "king", "republic", "function", "derivative", "integral", "matrix",
+    "vector", "theorem", "proof", "language", "grammar", "verb", "noun", "sentence",
+] + [f"term{i}" for i in range(2000)]
+FILLER = "what is the of and a to in which how does why are".split()
+USERS = [f"user-{i}" for i in range(20)]
+
+def make_cards(count: int, rng: random.Random):
+    for index in range(count):
+        question = " ".join(rng.choice(FILLER + VOCABULARY) for _ in range(rng.randint(5, 12))) + "?"
+        answer = " ".join(rng.choice(FILLER + VOCABULARY) for _ in range(rng.randint(10, 30))) + "."
+        yield f"card-{index}", rng.choice(USERS), question, answer
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(13)
+    print(f"{'cards':>8} {'LIKE ms':>9} {'index ms':>9} {'build s':>8} {'save s':>7} {'load s':>7} {'snapshot MB':>12}")
+    for size in args.sizes:
+        cards = list(make_cards(size, rng))
+        queries = [rng.choice(VOCABULARY[:35]) for _ in range(args.queries)]
+
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE flashcards (id TEXT PRIMARY KEY, user_id TEXT, front TEXT, back TEXT)")
+        conn.execute("CREATE INDEX ix_flashcards_user_id ON flashcards (user_id)")
+        conn.executemany("INSERT INTO flashcards VALUES (?, ?, ?, ?)", cards)
+
+        def like_search():
+            for query in queries:
+                conn.execute(
+                    "SELECT id FROM flashcards WHERE user_id = ? AND (front LIKE ? OR back LIKE ?) LIMIT 10",
+                    (USERS[0], f"%{query}%", f"%{query}%"),
+                ).fetchall()
+
+        index = SearchIndex()
+        start = time.perf_counter()
+        for card_id, user_id, question, answer in cards:
+            index.index_flashcard(card_id, user_id, question, answer)
+        build = time.perf_counter() - start
+
+        def index_search():
+            for query in queries:
+                index.search_flashcards(query, user_id=USERS[0], limit=10)
+
+        like_ms = timed(like_search, 3) / len(queries) * 1000
+        index_ms = timed(index_search, 3) / len(queries) * 1000
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "search_index.pkl")
+            start = time.perf_counter()
+            index.save(path)
+            save = time.perf_counter() - start
+            start = time.perf_counter()
+            SearchIndex().load(path)
+            load = time.perf_counter() - start
+            snapshot_mb = os.path.getsize(path) / 1e6
+
+        print(f"{size:>8} {like_ms:>9.3f} {index_ms:>9.3f} {build:>8.2f} {save:>7.2f} {load:>7.2f} {snapshot_mb:>12.1f}")
+        conn.close()
+
+if __name__ == "__main__":
+    main()
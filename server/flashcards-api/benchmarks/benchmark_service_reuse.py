@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for SearchService reuse.
+
+Starts a local stub of the OpenAI chat completions endpoint and measures
+per-request latency of the LLM step when a new SearchService (and so a new
+OpenAI client and connection pool) is built for every request, versus one
+long-lived instance whose keep-alive connections are reused.
+Usage: python benchmarks/benchmark_service_reuse.py [requests]
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add the app directory to the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+os.environ.setdefault("SERPAPI_KEY", "benchmark")
+os.environ.setdefault("CONTENT_CACHE_PATH", ":memory:")
+
+COMPLETION = {
+    "id": "chatcmpl-benchmark",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "gpt-3.5-turbo",
+    "choices": [{
+        "index": 0,
+        "finish_reason": "stop",
+        "message": {
+            "role": "assistant",
+            "content": json.dumps([{"question": "What is a stub?", "answer": "A stand-in."}]),
+        },
+    }],
+    "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+}
+
+class StubOpenAIHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 so clients can keep the connection alive between requests
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; avoid Nagle/delayed-ACK stalls
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = json.dumps(COMPLETION).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubOpenAIHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def report(name, samples):
+    print(f"   {name:<26} p50={percentile(samples, 50) * 1000:7.2f}ms  p99={percentile(samples, 99) * 1000:7.2f}ms")
+
+async def run_benchmark(requests):
+    server = start_stub_server()
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    # Import after OPENAI_BASE_URL is set so Settings picks it up
+    from app.services.search_service import SearchService
+
+    per_request, shared = [], []
+    try:
+        for _ in range(requests):
+            start = time.perf_counter()
+            service = SearchService()
+            service._generate_flashcards_from_content("content", "stubs", 1)
+            await service.close()
+            per_request.append(time.perf_counter() - start)
+
+        service = SearchService()
+        try:
+            for _ in range(requests):
+                start = time.perf_counter()
+                service._generate_flashcards_from_content("content", "stubs", 1)
+                shared.append(time.perf_counter() - start)
+        finally:
+            await service.close()
+    finally:
+        server.shutdown()
+
+    print(f"📊 LLM step latency over {requests} requests against a local stub")
+    report("new SearchService/request", per_request)
+    report("shared SearchService", shared)
+    overhead = percentile(per_request, 50) - percentile(shared, 50)
+    print(f"   per-request overhead at p50: {overhead * 1000:.2f}ms")
+
+if __name__ == "__main__":
+    asyncio.run(run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 200))
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Concurrent read/write benchmark for the tuned SQLite mode.
+
+Reader threads run a search-shaped query (a LIKE over the user's cards,
+first page) while writer threads insert cards one commit at a time, both
+against a SQLite file. `default` is a plain create_engine(url): rollback
+journal, synchronous=FULL, one pool shared by readers and writers.
+`tuned` uses the app's engines (SQLITE_* settings): WAL, synchronous=NORMAL,
+a larger page cache, mmap, busy_timeout, statement cache, and readers on
+the separate read-only pool. The table shows throughput, p50/p99 latency
+and how many operations failed with "database is locked".
+
+Usage: python benchmarks/benchmark_sqlite_tuning.py [--cards 50000] [--readers 8] [--writers 2] [--seconds 5]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+
+from sqlalchemy import Column, DateTime, String, Uuid, create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+# Add the app directory to the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.db.database import create_sqlite_engine
+
+BenchmarkBase = declarative_base()
+
+class BenchmarkFlashcard(BenchmarkBase):
+    __tablename__ = "flashcards"
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    user_id = Column(String(36), index=True)
+    deck_id = Column(String(36), index=True)
+    front = Column(String)
+    back = Column(String)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+WORDS = ["photosynthesis", "mitochondria", "enzyme", "protein", "gravity", "velocity", "atom", "molecule"]
+
+def populate(url: str, cards: int, users: List[str]):
+    engine = create_engine(url)
+    BenchmarkBase.metadata.create_all(engine)
+    rng = random.Random(23)
+    start = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(
+            BenchmarkFlashcard.__table__.insert(),
+            [
+                {
+                    "id": uuid.UUID(int=rng.getrandbits(128)),
+                    "user_id": rng.choice(users),
+                    "front": f"What does {rng.choice(WORDS)} do? ({i})",
+                    "back": f"It relates to {rng.choice(WORDS)}",
+                    "created_at": start + timedelta(seconds=i),
+                    "updated_at": start + timedelta(seconds=i),
+                }
+                for i in range(cards)
+            ],
+        )
+    engine.dispose()
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+class Counters:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = {"read": [], "write": []}
+        self.locked = {"read": 0, "write": 0}
+
+    def record(self, kind: str, elapsed: float):
+        with self.lock:
+            self.latencies[kind].append(elapsed)
+
+    def record_locked(self, kind: str):
+        with self.lock:
+            self.locked[kind] += 1
+
+def reader(Session, users, counters, deadline, seed):
+    rng = random.Random(seed)
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        db = Session()
+        try:
+            (
+                db.query(BenchmarkFlashcard)
+                .filter(BenchmarkFlashcard.user_id == rng.choice(users))
+                .filter(BenchmarkFlashcard.front.like(f"%{rng.choice(WORDS)}%"))
+                .order_by(BenchmarkFlashcard.created_at.desc())
+                .limit(20)
+                .all()
+            )
+            counters.record("read", time.perf_counter() - start)
+        except OperationalError as e:
+            if "locked" not in str(e):
+                raise
+            counters.record_locked("read")
+        finally:
+            db.close()
+
+def writer(Session, users, counters, deadline, seed):
+    rng = random.Random(seed)
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        db = Session()
+        try:
+            db.add(BenchmarkFlashcard(user_id=rng.choice(users), front=f"New {rng.choice(WORDS)} card", back="answer"))
+            db.commit()
+            counters.record("write", time.perf_counter() - start)
+        except OperationalError as e:
+            if "locked" not in str(e):
+                raise
+            db.rollback()
+            counters.record_locked("write")
+        finally:
+            db.close()
+
+def run(write_engine, read_engine, users, args) -> Counters:
+    WriteSession = sessionmaker(bind=write_engine)
+    ReadSession = sessionmaker(bind=read_engine)
+    counters = Counters()
+    deadline = time.perf_counter() + args.seconds
+    threads = [
+        threading.Thread(target=reader, args=(ReadSession, users, counters, deadline, i)) for i in range(args.readers)
+    ] + [
+        threading.Thread(target=writer, args=(WriteSession, users, counters, deadline, 1000 + i))
+        for i in range(args.writers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return counters
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cards", type=int, default=50000)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    users = [str(uuid.uuid4()) for _ in range(50)]
+    print(
+        f"{'mode':>8} {'reads/s':>9} {'read p50 ms':>12} {'read p99 ms':>12} "
+        f"{'writes/s':>9} {'write p50 ms':>13} {'write p99 ms':>13} {'locked':>7}"
+    )
+    for mode in ("default", "tuned"):
+        with tempfile.TemporaryDirectory() as directory:
+            url = f"sqlite:///{os.path.join(directory, 'flashcards.db')}"
+            populate(url, args.cards, users)
+            if mode == "default":
+                write_engine = read_engine = create_engine(url)
+            else:
+                write_engine = create_sqlite_engine(url)
+                # Open a read-write connection first so the file is in WAL mode
+                write_engine.connect().close()
+                read_engine = create_sqlite_engine(url, read_only=True)
+            counters = run(write_engine, read_engine, users, args)
+            for engine in {write_engine, read_engine}:
+                engine.dispose()
+        reads, writes = counters.latencies["read"], counters.latencies["write"]
+        print(
+            f"{mode:>8} {len(reads) / args.seconds:>9.1f} {percentile(reads, 50) * 1000:>12.2f} "
+            f"{percentile(reads, 99) * 1000:>12.2f} {len(writes) / args.seconds:>9.1f} "
+            f"{percentile(writes, 50) * 1000:>13.2f} {percentile(writes, 99) * 1000:>13.2f} "
+            f"{counters.locked['read'] + counters.locked['write']:>7}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the typeahead prefix index behind /api/v1/search/suggest.
+
+For each corpus size, builds SuggestIndex over synthetic deck names and
+flashcard questions for a handful of users and times suggestions for
+1-6 character prefixes, next to the `LIKE '%text%'` scan a full
+/api/v1/search request runs on every keystroke today. Also reports the
+bulk build time, the cost of incremental writes and the index's memory.
+
+Usage: python benchmarks/benchmark_suggest.py [--sizes 10000 100000 300000]
+"""
+
+import argparse
+import random
+import sqlite3
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add the app directory to the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.config import settings
+from app.services.suggest_index import SuggestIndex
+
+VOCABULARY = [
+    "cell", "energy", "protein", "enzyme", "molecule", "atom", "reaction", "bond", "photosynthesis",
+    "gravity", "force", "mass", "velocity", "acceleration", "wave", "frequency", "history", "empire",
+    "revolution", "treaty", "war", "king", "republic", "function", "derivative", "integral", "matrix",
+    "vector", "theorem", "proof", "language", "grammar", "verb", "noun", "sentence",
+] + [f"term{i:04d}" for i in range(2000)]
+FILLER = "what is the of and a to in which how does why are".split()
+USERS = [f"user-{i}" for i in range(20)]
+
+def make_rows(count: int, rng: random.Random):
+    decks = [
+        (f"deck-{index}", rng.choice(USERS), rng.random() < 0.2, " ".join(rng.choices(VOCABULARY, k=rng.randint(1, 4))))
+        for index in range(max(1, count // 50))
+    ]
+    cards = [
+        (f"card-{index}", rng.choice(USERS), " ".join(rng.choices(FILLER + VOCABULARY, k=rng.randint(5, 12))) + "?")
+        for index in range(count)
+    ]
+    return decks, cards
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 300000])
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(15)
+    print(
+        f"{'cards':>8} {'p50 us':>8} {'p99 us':>8} {'LIKE us':>9} {'build s':>8} "
+        f"{'add us':>7} {'remove us':>10} {'MB':>6}"
+    )
+    for size in args.sizes:
+        decks, cards = make_rows(size, rng)
+        words = [rng.choice(VOCABULARY) for _ in range(args.queries)]
+        prefixes = [word[: rng.randint(1, min(6, len(word)))] for word in words]
+
+        index = SuggestIndex(max_words=settings.SUGGEST_MAX_WORDS)
+        start = time.perf_counter()
+        index.build(decks, cards)
+        build = time.perf_counter() - start
+        # Build a second copy under tracemalloc, which would distort the timing above
+        tracemalloc.start()
+        copy = SuggestIndex(max_words=settings.SUGGEST_MAX_WORDS)
+        copy.build(decks, cards)
+        memory_mb = tracemalloc.get_traced_memory()[0] / 1e6
+        tracemalloc.stop()
+        del copy
+
+        samples = []
+        for prefix in prefixes:
+            start = time.perf_counter()
+            index.suggest(prefix, user_id=USERS[0], limit=8)
+            samples.append(time.perf_counter() - start)
+
+        extra = [(f"new-{i}", rng.choice(USERS), " ".join(rng.choices(VOCABULARY, k=8)) + "?") for i in range(1000)]
+        start = time.perf_counter()
+        for card_id, user_id, question in extra:
+            index.index_flashcard(card_id, user_id, question)
+        add_us = (time.perf_counter() - start) / len(extra) * 1e6
+        start = time.perf_counter()
+        for card_id, _, _ in extra:
+            index.remove_flashcard(card_id)
+        remove_us = (time.perf_counter() - start) / len(extra) * 1e6
+
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE flashcards (id TEXT PRIMARY KEY, user_id TEXT, question TEXT)")
+        conn.execute("CREATE INDEX ix_flashcards_user_id ON flashcards (user_id)")
+        conn.executemany("INSERT INTO flashcards VALUES (?, ?, ?)", cards)
+        like_samples = []
+        for prefix in prefixes[:200]:
+            start = time.perf_counter()
+            conn.execute(
+                "SELECT id, question FROM flashcards WHERE user_id = ? AND question LIKE ? LIMIT 8",
+                (USERS[0], f"%{prefix}%"),
+            ).fetchall()
+            like_samples.append(time.perf_counter() - start)
+        conn.close()
+
+        print(
+            f"{size:>8} {percentile(samples, 50) * 1e6:>8.1f} {percentile(samples, 99) * 1e6:>8.1f} "
+            f"{percentile(like_samples, 50) * 1e6:>9.1f} {build:>8.2f} {add_us:>7.1f} {remove_us:>10.1f} {memory_mb:>6.0f}"
+        )
+
+if __name__ == "__main__":
+    main()
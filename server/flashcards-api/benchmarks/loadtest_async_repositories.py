@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Load test for the async repository layer on a single worker.
+
+Serves two versions of the same query from one in-process FastAPI app (one
+event loop, like one uvicorn worker): `/blocking` calls the sync repository
+from an async route, as /search used to, and `/async` awaits the same
+repository through SQLAsyncRepository on the aiosqlite engine. For each
+concurrency level, N clients call one endpoint in a loop while a probe
+calls `/health` (no database work); the table shows request throughput
+and the probe's latency, which stays flat only if the database calls leave
+the event loop free.
+
+Usage: python benchmarks/loadtest_async_repositories.py [--cards 200000] [--concurrency 1 8 32] [--seconds 5]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Optional
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import Column, DateTime, String, Uuid, create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
+
+# Add the app directory to the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.db.async_database import async_url
+from app.db.repositories.async_repositories import SQLAsyncRepository
+from app.db.repositories.base import BaseRepository
+
+LoadTestBase = declarative_base()
+
+class LoadTestFlashcard(LoadTestBase):
+    __tablename__ = "flashcards"
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    user_id = Column(String(36))
+    deck_id = Column(String(36))
+    front = Column(String)
+    back = Column(String)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+class LoadTestFlashcardRepository(BaseRepository):
+    def get_by_user(
+        self, db: Session, *, user_id: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+    ) -> List[LoadTestFlashcard]:
+        # No user_id index on purpose: every call scans the table, like a %query% search
+        return (
+            self._keyset(db.query(LoadTestFlashcard).filter(LoadTestFlashcard.user_id == user_id), cursor)
+            .limit(limit)
+            .all()
+        )
+
+def populate(url: str, cards: int, users: List[str]):
+    engine = create_engine(url)
+    LoadTestBase.metadata.create_all(engine)
+    rng = random.Random(22)
+    start = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(
+            LoadTestFlashcard.__table__.insert(),
+            [
+                {
+                    "id": uuid.UUID(int=rng.getrandbits(128)),
+                    "user_id": rng.choice(users),
+                    "front": f"question {i}",
+                    "back": f"answer {i}",
+                    "created_at": start + timedelta(seconds=i),
+                    "updated_at": start + timedelta(seconds=i),
+                }
+                for i in range(cards)
+            ],
+        )
+    engine.dispose()
+
+def make_app(url: str, users: List[str]) -> FastAPI:
+    repository = LoadTestFlashcardRepository(LoadTestFlashcard)
+    SyncSession = sessionmaker(bind=create_engine(url))
+    async_repository = SQLAsyncRepository(
+        repository, async_sessionmaker(create_async_engine(async_url(url)), expire_on_commit=False)
+    )
+    app = FastAPI()
+
+    @app.get("/blocking")
+    async def blocking():
+        db = SyncSession()
+        try:
+            return {"count": len(repository.get_by_user(db, user_id=random.choice(users), limit=20))}
+        finally:
+            db.close()
+
+    @app.get("/async")
+    async def non_blocking():
+        return {"count": len(await async_repository.get_by_user(user_id=random.choice(users), limit=20))}
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    return app
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+async def run_load(app: FastAPI, path: str, concurrency: int, seconds: float):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+        deadline = time.perf_counter() + seconds
+        completed = 0
+        probe_samples = []
+
+        async def worker():
+            nonlocal completed
+            while time.perf_counter() < deadline:
+                response = await client.get(path)
+                response.raise_for_status()
+                completed += 1
+
+        async def probe():
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                await client.get("/health")
+                probe_samples.append(time.perf_counter() - start)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(probe(), *(worker() for _ in range(concurrency)))
+        return completed / seconds, probe_samples
+
+async def main_async(args):
+    users = [str(uuid.uuid4()) for _ in range(50)]
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{os.path.join(directory, 'flashcards.db')}"
+        populate(url, args.cards, users)
+        app = make_app(url, users)
+        print(f"{'path':>10} {'clients':>8} {'req/s':>8} {'health p50 ms':>14} {'health p99 ms':>14}")
+        for path in ("/blocking", "/async"):
+            for concurrency in args.concurrency:
+                throughput, probe = await run_load(app, path, concurrency, args.seconds)
+                print(
+                    f"{path:>10} {concurrency:>8} {throughput:>8.1f} "
+                    f"{percentile(probe, 50) * 1000:>14.2f} {percentile(probe, 99) * 1000:>14.2f}"
+                )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cards", type=int, default=200000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""
+Local stand-ins for the services the generation pipeline talks to:
+SerpAPI's /search endpoint, the result web pages and the OpenAI chat
+completions API (plain and streamed). Each runs on its own port with a
+configurable latency distribution and response size, so the pipeline can
+be benchmarked without network access or API credits.
+"""
+
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+WORDS = "the of and a to in is was for on that by with as from at an are it this be or which".split()
+
+@dataclass
+class Latency:
+    """
+    Response delay in milliseconds: lognormal around `median_ms` with shape
+    `sigma` (0 gives a constant delay), capped at `max_ms`.
+    """
+    median_ms: float = 0.0
+    sigma: float = 0.0
+    max_ms: float = 30000.0
+
+    def sample(self, rng: random.Random) -> float:
+        if self.median_ms <= 0:
+            return 0.0
+        delay = self.median_ms * (rng.lognormvariate(0, self.sigma) if self.sigma > 0 else 1.0)
+        return min(delay, self.max_ms) / 1000
+
+@dataclass
+class StandInConfig:
+    search_latency: Latency = field(default_factory=lambda: Latency(300, 0.3))
+    page_latency: Latency = field(default_factory=lambda: Latency(150, 0.6))
+    llm_latency: Latency = field(default_factory=lambda: Latency(1500, 0.4))
+    results_per_search: int = 5
+    page_bytes: int = 60_000
+    flashcards_per_completion: int = 5
+    stream_chunk_chars: int = 16
+    seed: int = 5
+
+class _Handler(BaseHTTPRequestHandler):
+    # HTTP/1.1 so clients can keep the connection alive between requests
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; avoid Nagle/delayed-ACK stalls
+    disable_nagle_algorithm = True
+
+    standins: "StandIns"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, content_type: str, body: bytes):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+class _SerpAPIHandler(_Handler):
+    def do_GET(self):
+        standins = self.standins
+        standins.count("search")
+        query = parse_qs(urlparse(self.path).query).get("q", [""])[0]
+        time.sleep(standins.config.search_latency.sample(standins.rng()))
+        slug = re.sub(r"\W+", "-", query.lower()).strip("-") or "page"
+        results = [
+            {
+                "position": position + 1,
+                "title": f"{query} - result {position + 1}",
+                "link": f"{standins.pages_url}/{slug}/{position}",
+                "snippet": f"About {query}",
+            }
+            for position in range(standins.config.results_per_search)
+        ]
+        self._send(200, "application/json", json.dumps({"organic_results": results}).encode())
+
+class _PageHandler(_Handler):
+    def do_GET(self):
+        standins = self.standins
+        standins.count("page")
+        rng = standins.rng()
+        time.sleep(standins.config.page_latency.sample(rng))
+        topic = urlparse(self.path).path.strip("/").split("/")[0].replace("-", " ")
+        self._send(200, "text/html; charset=utf-8", standins.page(topic, rng))
+
+class _OpenAIHandler(_Handler):
+    def do_POST(self):
+        standins = self.standins
+        standins.count("completion")
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        rng = standins.rng()
+        delay = standins.config.llm_latency.sample(rng)
+        content = json.dumps(standins.flashcards(request, rng))
+
+        if not request.get("stream"):
+            time.sleep(delay)
+            body = {
+                "id": "chatcmpl-standin",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request.get("model", "gpt-3.5-turbo"),
+                "choices": [{
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": content},
+                }],
+                "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+            }
+            self._send(200, "application/json", json.dumps(body).encode())
+            return
+
+        # Spread the delay over the streamed chunks, like token generation
+        size = standins.config.stream_chunk_chars
+        pieces = [content[start:start + size] for start in range(0, len(content), size)]
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for piece in pieces + [None]:
+            time.sleep(delay / (len(pieces) + 1))
+            chunk = {
+                "id": "chatcmpl-standin",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": request.get("model", "gpt-3.5-turbo"),
+                "choices": [{
+                    "index": 0,
+                    "delta": {"content": piece} if piece is not None else {},
+                    "finish_reason": None if piece is not None else "stop",
+                }],
+            }
+            self._write_chunk(f"data: {json.dumps(chunk)}\n\n".encode())
+        self._write_chunk(b"data: [DONE]\n\n")
+        self._write_chunk(b"")
+
+    def _write_chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+class StandIns:
+    """
+    Starts the three stand-in servers on free local ports.
+
+    Use `serpapi_url`, `pages_url` and `openai_url` as SERPAPI_BASE_URL and
+    OPENAI_BASE_URL; `requests` counts calls per endpoint.
+    """
+
+    def __init__(self, config: Optional[StandInConfig] = None):
+        self.config = config or StandInConfig()
+        self.requests: Dict[str, int] = {"search": 0, "page": 0, "completion": 0}
+        self._lock = threading.Lock()
+        self._seed = self.config.seed
+        self._servers = []
+        self.serpapi_url = self._start(_SerpAPIHandler)
+        self.pages_url = self._start(_PageHandler)
+        self.openai_url = self._start(_OpenAIHandler) + "/v1"
+
+    def _start(self, handler: type) -> str:
+        server = ThreadingHTTPServer(("127.0.0.1", 0), type(handler.__name__, (handler,), {"standins": self}))
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self._servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}"
+
+    def rng(self) -> random.Random:
+        """Independent, reproducible random stream per request."""
+        with self._lock:
+            self._seed += 1
+            return random.Random(self._seed)
+
+    def count(self, endpoint: str):
+        with self._lock:
+            self.requests[endpoint] += 1
+
+    def page(self, topic: str, rng: random.Random) -> bytes:
+        """Article about `topic` wrapped in navigation and scripts, about `page_bytes` long."""
+        chrome = "".join(f'<li><a href="/section/{i}">Section {i}</a></li>' for i in range(40))
+        head = (
+            f"<html><head><title>{topic}</title><script>var tracking = {{}};</script></head><body>"
+            f"<header><nav><ul>{chrome}</ul></nav></header><main><article><h1>{topic}</h1>"
+        )
+        tail = f"</article></main><footer><ul>{chrome}</ul></footer></body></html>"
+        paragraphs = []
+        size = len(head) + len(tail)
+        while size < self.config.page_bytes:
+            words = [rng.choice(WORDS) for _ in range(rng.randint(40, 90))]
+            if rng.random() < 0.3:
+                words.insert(rng.randrange(len(words)), topic)
+            paragraph = "<p>" + " ".join(words) + ".</p>"
+            paragraphs.append(paragraph)
+            size += len(paragraph)
+        return (head + "".join(paragraphs) + tail).encode()
+
+    def flashcards(self, request: dict, rng: random.Random):
+        prompt = request.get("messages", [{}])[-1].get("content", "")
+        match = re.search(r"generate (\d+) educational flashcards", prompt)
+        count = int(match.group(1)) if match else self.config.flashcards_per_completion
+        query = re.search(r"Search Query: (.*)", prompt)
+        topic = query.group(1).strip() if query else "the topic"
+        return [
+            {
+                "question": f"Question {index + 1} about {topic}: {' '.join(rng.choice(WORDS) for _ in range(8))}?",
+                "answer": f"Answer {index + 1}: {' '.join(rng.choice(WORDS) for _ in range(20))}.",
+            }
+            for index in range(count)
+        ]
+
+    def close(self):
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
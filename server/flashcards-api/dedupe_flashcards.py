@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Find (and optionally delete) near-duplicate flashcards in existing decks.
+Cards are compared within each deck using MinHash signatures with LSH
+banding; the oldest card of every group of near-duplicates is kept.
+
+Usage: python dedupe_flashcards.py [--delete] [--threshold 0.8]
+"""
+
+import argparse
+import asyncio
+from typing import Any, Iterable, List, Tuple
+
+from app.config import settings
+from app.db.mongodb import MongoDB
+from app.services.near_duplicates import NearDuplicateIndex
+
+# Deletes go through the repositories in batches of this many cards, so the
+# search, suggest and fuzzy indexes and the search cache drop them too
+DELETE_BATCH = 1000
+
+def find_duplicates(rows: Iterable[Tuple[Any, Any, str, str]], threshold: float) -> List[Tuple[Any, Any]]:
+    """
+    (duplicate id, kept id) pairs for rows of (id, deck_id, front, back)
+    ordered by deck and then by creation time.
+    """
+    duplicates = []
+    current_deck = object()
+    index = None
+    for card_id, deck_id, front, back in rows:
+        if deck_id != current_deck:
+            current_deck = deck_id
+            index = NearDuplicateIndex(
+                threshold=threshold, num_perm=settings.DEDUP_NUM_PERM, bands=settings.DEDUP_BANDS
+            )
+        match = index.check_and_add(card_id, front or "", back or "")
+        if match is not None:
+            duplicates.append((card_id, match[0]))
+    return duplicates
+
+async def dedupe_mongodb(threshold: float, delete: bool) -> int:
+    await MongoDB.connect_to_mongo()
+    try:
+        from app.db.repositories.mongo_repositories import MongoFlashcardRepository
+
+        repository = MongoFlashcardRepository()
+        # MongoDB documents store the card sides as question/answer
+        cursor = repository.collection.find(
+            {}, {"deck_id": 1, "question": 1, "answer": 1}
+        ).sort([("deck_id", 1), ("created_at", 1)])
+        rows = [(doc["_id"], doc.get("deck_id"), doc.get("question"), doc.get("answer")) async for doc in cursor]
+        duplicates = find_duplicates(rows, threshold)
+        report(duplicates, len(rows))
+
+        if delete and duplicates:
+            ids = [card_id for card_id, _ in duplicates]
+            deleted = 0
+            for start in range(0, len(ids), DELETE_BATCH):
+                deleted += await repository.bulk_delete(ids[start:start + DELETE_BATCH])
+            print(f"🗑️ Deleted {deleted} near-duplicate flashcards")
+        return len(duplicates)
+    finally:
+        await MongoDB.close_mongo_connection()
+
+def dedupe_sqlite(threshold: float, delete: bool) -> int:
+    from app.db.database import SessionLocal
+    from app.db.repositories.flashcards import flashcard_repository
+    from app.models.flashcard import Flashcard
+
+    db = SessionLocal()
+    try:
+        rows = (
+            db.query(Flashcard.id, Flashcard.deck_id, Flashcard.front, Flashcard.back)
+            .order_by(Flashcard.deck_id, Flashcard.created_at)
+            .all()
+        )
+        duplicates = find_duplicates(rows, threshold)
+        report(duplicates, len(rows))
+
+        if delete and duplicates:
+            ids = [card_id for card_id, _ in duplicates]
+            deleted = 0
+            for start in range(0, len(ids), DELETE_BATCH):
+                deleted += len(flashcard_repository.bulk_remove(db, ids=ids[start:start + DELETE_BATCH]))
+            print(f"🗑️ Deleted {deleted} near-duplicate flashcards")
+        return len(duplicates)
+    finally:
+        db.close()
+
+def report(duplicates: List[Tuple[Any, Any]], total: int):
+    print(f"🔍 Scanned {total} flashcards, found {len(duplicates)} near-duplicates")
+    for card_id, kept_id in duplicates[:20]:
+        print(f"  {card_id} duplicates {kept_id}")
+    if len(duplicates) > 20:
+        print(f"  ... and {len(duplicates) - 20} more")
+
+def main():
+    parser = argparse.ArgumentParser(description="Remove near-duplicate flashcards from existing decks")
+    parser.add_argument("--delete", action="store_true", help="delete duplicates instead of only reporting them")
+    parser.add_argument("--threshold", type=float, default=settings.DEDUP_THRESHOLD)
+    args = parser.parse_args()
+
+    if args.delete:
+        response = input("\n⚠️ This will permanently delete near-duplicate flashcards. Continue? (y/N): ")
+        if response.lower() != 'y':
+            print("Dedupe cancelled.")
+            return
+
+    if settings.DATABASE_TYPE.lower() == "mongodb":
+        asyncio.run(dedupe_mongodb(args.threshold, args.delete))
+    else:
+        dedupe_sqlite(args.threshold, args.delete)
+
+if __name__ == "__main__":
+    main()
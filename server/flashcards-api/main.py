@@ -1,8 +1,16 @@
 from fastapi import FastAPI
-from .app.api.routes import auth, users, flashcards, decks, search
+from .app.api.routes import auth, users, flashcards, decks, search, jobs
 from .app.core.errors import register_exception_handlers
 from .app.config import settings
 from .app.db.mongodb import MongoDB
+from .app.services.search_service import init_search_service, close_search_service
+from .app.services.search_fanout import close_worker_pool
+from .app.services.job_queue import start_job_queue, stop_job_queue
+from .app.db.repositories.jobs import get_job_repository
+from .app.db.repositories.async_repositories import close_async_repositories, init_async_repositories
+from .app.services.search_index_loader import load_fuzzy_index, load_search_index, load_suggest_index, save_search_index
+from .app.db.fts import setup_fts
+from .app.db.sqlite_indexes import setup_sqlite_indexes
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -19,19 +27,40 @@ app.include_router(users.router)
 app.include_router(flashcards.router)
 app.include_router(decks.router)
 app.include_router(search.router)
+app.include_router(jobs.router)
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database connection on startup."""
+    """Initialize database connection, async repositories, the search index, the search service and generation job workers on startup."""
     if settings.DATABASE_TYPE.lower() == "mongodb":
         print("🚀 Starting with MongoDB database...")
         await MongoDB.connect_to_mongo()
     else:
         print("🚀 Starting with SQLite database...")
+        setup_sqlite_indexes()
+        setup_fts()
+    init_async_repositories()
+    
+    await load_search_index()
+    await load_suggest_index()
+    await load_fuzzy_index()
+    search_service = init_search_service()
+    await start_job_queue(
+        get_job_repository(),
+        search_service,
+        workers=settings.JOB_WORKERS,
+        max_queue_size=settings.JOB_QUEUE_MAX_SIZE,
+        lease_seconds=settings.JOB_LEASE_SECONDS,
+    )
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    """Close database connection on shutdown."""
+    """Stop job workers, then close the search service's and sub-search pools, snapshot the search index and close the database connections."""
+    await stop_job_queue()
+    await close_search_service()
+    close_worker_pool()
+    save_search_index()
+    await close_async_repositories()
     if settings.DATABASE_TYPE.lower() == "mongodb":
         await MongoDB.close_mongo_connection()
 
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Add SQLite FTS5 search tables to an existing database.
+Creates flashcards_fts / decks_fts (keyed by the rows' UUID ids through
+flashcards_fts_ids / decks_fts_ids) plus the triggers that keep them in
+sync, then fills them. Tables left by the older rowid-keyed layout are
+rebuilt.
+A copy of the database is written next to it before anything changes.
+
+Usage: python migrate_fts5.py [--database ./data/flashcards.db] [--rebuild] [--no-backup]
+"""
+
+import argparse
+import shutil
+import sqlite3
+from datetime import datetime
+
+from app.config import settings
+from app.db.fts import FTS_TABLES, ensure_fts
+from app.db.repositories.jobs import sqlite_path_from_url
+
+def main():
+    parser = argparse.ArgumentParser(description="Add FTS5 full-text search tables to a SQLite database")
+    parser.add_argument("--database", default=sqlite_path_from_url(settings.SQLITE_URL))
+    parser.add_argument("--rebuild", action="store_true", help="refill FTS tables that already exist")
+    parser.add_argument("--no-backup", action="store_true", help="skip copying the database first")
+    args = parser.parse_args()
+
+    if not args.no_backup:
+        backup = f"{args.database}.{datetime.now():%Y%m%d%H%M%S}.bak"
+        shutil.copy2(args.database, backup)
+        print(f"💾 Backed up database to {backup}")
+
+    conn = sqlite3.connect(args.database)
+    try:
+        built = ensure_fts(conn, rebuild=args.rebuild)
+        for table, (fts_table, _) in FTS_TABLES.items():
+            exists = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts_table,)
+            ).fetchone()
+            if not exists:
+                print(f"  ⏭️ {table}: no such table, skipped")
+                continue
+            rows = conn.execute(f"SELECT count(*) FROM {table}").fetchone()[0]
+            status = "built" if fts_table in built else "already present"
+            print(f"  ✅ {fts_table}: {status} ({rows} rows)")
+    finally:
+        conn.close()
+    print("🎉 Full-text search tables ready; set SEARCH_BACKEND=fts5 to use them")
+
+if __name__ == "__main__":
+    main()
@@ -10,8 +10,11 @@ db = db.getSiblingDB('flashcards');
 db.createCollection('users');
 db.createCollection('decks');
 db.createCollection('flashcards');
+db.createCollection('jobs');
 
-// Create indexes for better performance
+// Create indexes for better performance. Keep in sync with INDEXES in
+// app/db/mongodb.py: the API creates the same indexes at startup and fails
+// on one that exists with other options (e.g. text weights).
 print('📊 Creating database indexes...');
 
 // User indexes
@@ -24,11 +27,15 @@ db.decks.createIndex({ "user_id": 1 });
 db.decks.createIndex({ "is_public": 1 });
 db.decks.createIndex({ "name": 1 });
 db.decks.createIndex({ "created_at": -1 });
+db.decks.createIndex({ "user_id": 1, "created_at": -1, "_id": -1 });
+db.decks.createIndex({ "is_public": 1, "created_at": -1, "_id": -1 });
 
 // Flashcard indexes
 db.flashcards.createIndex({ "deck_id": 1 });
 db.flashcards.createIndex({ "user_id": 1 });
 db.flashcards.createIndex({ "created_at": -1 });
+db.flashcards.createIndex({ "user_id": 1, "created_at": -1, "_id": -1 });
+db.flashcards.createIndex({ "deck_id": 1, "created_at": -1, "_id": -1 });
 
 // Text search indexes
 db.decks.createIndex({ 
@@ -51,6 +58,10 @@ db.flashcards.createIndex({
     }
 });
 
+// Generation job indexes
+db.jobs.createIndex({ "status": 1 });
+db.jobs.createIndex({ "user_id": 1 });
+
 print('✅ Database indexes created successfully!');
 
 // Create a sample admin user if no users exist
@@ -75,5 +86,5 @@ if (userCount === 0) {
 
 print('🎉 MongoDB initialization completed!');
 print('📝 Database: flashcards');
-print('📊 Collections: users, decks, flashcards');
+print('📊 Collections: users, decks, flashcards, jobs');
 print('🔍 Text search enabled for decks and flashcards'); 
\ No newline at end of file
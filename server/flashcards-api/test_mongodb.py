@@ -68,6 +68,11 @@ async def test_mongodb_connection():
         print("\n5. Testing search functionality...")
         search_results = await mongo_flashcard_repository.search("MongoDB")
         print(f"   ✅ Search found {len(search_results)} results")
+        assert search_results and search_results[0].score is not None, "search results carry no textScore"
+        print(f"   ✅ Top result scored {search_results[0].score:.2f}: {search_results[0].snippet}")
+        deck_results = await mongo_deck_repository.search("MongoDB", user_id=str(created_user.id))
+        assert deck_results, "deck text search found nothing"
+        print(f"   ✅ Deck search found {len(deck_results)} results")
         
         # Test user's decks
         print("\n6. Testing user's decks...")
@@ -0,0 +1,54 @@
+import os
+import sys
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from sqlalchemy import Boolean, Column, DateTime, String, Uuid, create_engine
+from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Settings need a MongoDB URL at import; these tests never connect to it
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.db.repositories.base import BaseRepository
+
+TestBase = declarative_base()
+
+class CardRow(TestBase):
+    """A flashcards table shaped like the app's, for repository tests."""
+
+    __tablename__ = "flashcards"
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    user_id = Column(String(36), index=True)
+    deck_id = Column(String(36), index=True)
+    front = Column(String)
+    back = Column(String)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+class UserRow(TestBase):
+    """A users table standing in for the app's user model."""
+
+    __tablename__ = "users"
+    id = Column(String(36), primary_key=True)
+    email = Column(String)
+    is_active = Column(Boolean, default=True)
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    TestBase.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+@pytest.fixture
+def card_repository():
+    return BaseRepository(CardRow)
@@ -0,0 +1,138 @@
+import asyncio
+import uuid
+from datetime import datetime
+
+from bson import ObjectId
+
+from app import schemas
+from app.schemas.deck import DeckWithFlashcardsPage
+from app.db.deck_cards import DeckWithCards
+from app.db.repositories.async_repositories import MongoAsyncDeckRepository, MongoAsyncFlashcardRepository
+from app.models.mongo_models import DeckMongo, FlashcardMongo
+
+class FakeMongoFlashcards:
+    """Stands in for MongoFlashcardRepository: stores documents as given."""
+
+    def __init__(self):
+        self.documents = []
+
+    async def bulk_create(self, flashcards_data):
+        for flashcard_data in flashcards_data:
+            flashcard_data.update(_id=ObjectId(), created_at=datetime.utcnow(), updated_at=datetime.utcnow())
+            self.documents.append(flashcard_data)
+        return [FlashcardMongo(**flashcard_data) for flashcard_data in flashcards_data]
+
+    async def update(self, flashcard_id, update_data):
+        document = next(doc for doc in self.documents if str(doc["_id"]) == flashcard_id)
+        document.update(update_data)
+        return FlashcardMongo(**document)
+
+    async def get_by_deck(self, deck_id, limit=100, cursor=None):
+        return [FlashcardMongo(**doc) for doc in self.documents if str(doc["deck_id"]) == deck_id][:limit]
+
+class FakeMongoDecks:
+    def __init__(self, with_flashcards=()):
+        self.with_flashcards = list(with_flashcards)
+
+    async def create(self, deck_data):
+        deck_data.update(_id=ObjectId(), created_at=datetime.utcnow(), updated_at=datetime.utcnow())
+        return DeckMongo(**deck_data)
+
+    async def get_by_user_with_flashcards(self, user_id, limit=100, cursor=None, cards_per_deck=None):
+        return [deck for deck in self.with_flashcards if str(deck.user_id) == user_id][:limit]
+
+def test_mongo_flashcards_map_front_back_to_question_answer():
+    mongo = FakeMongoFlashcards()
+    repository = MongoAsyncFlashcardRepository(mongo)
+    user_id, deck_id = ObjectId(), ObjectId()
+
+    async def scenario():
+        created = await repository.bulk_create(
+            objs_in=[schemas.FlashcardCreate(front="What is ATP?", back="Energy currency", deck_id=deck_id)],
+            user_id=user_id,
+        )
+        updated = await repository.update(id=created[0].id, obj_in=schemas.FlashcardUpdate(back="Cell energy"))
+        return created, updated, await repository.get_by_deck(deck_id=str(deck_id))
+
+    created, updated, listed = asyncio.run(scenario())
+
+    document = mongo.documents[0]
+    assert (document["question"], document["answer"]) == ("What is ATP?", "Cell energy")
+    assert "front" not in document and isinstance(document["deck_id"], ObjectId)
+    assert (created[0].front, created[0].back) == ("What is ATP?", "Energy currency")
+    assert (updated.front, updated.back) == ("What is ATP?", "Cell energy")
+
+    # Same response shape as on SQLite, with string ids
+    page = schemas.FlashcardPage(items=listed).model_dump(mode="json")
+    assert page["items"][0]["front"] == "What is ATP?"
+    assert page["items"][0]["id"] == str(document["_id"])
+    assert page["items"][0]["deck_id"] == str(deck_id)
+    assert page["items"][0]["user_id"] == str(user_id)
+
+def test_mongo_decks_come_back_with_string_ids():
+    repository = MongoAsyncDeckRepository(FakeMongoDecks())
+    user_id = ObjectId()
+
+    deck = asyncio.run(repository.create(obj_in=schemas.DeckCreate(name="Cells"), user_id=user_id))
+
+    body = schemas.Deck.model_validate(deck).model_dump(mode="json")
+    assert body["user_id"] == str(user_id)
+    assert body["name"] == "Cells"
+
+def test_mongo_decks_with_flashcards_come_back_in_the_sqlite_shape():
+    user_id, deck_id = ObjectId(), ObjectId()
+    now = datetime.utcnow()
+    deck = DeckMongo(_id=deck_id, user_id=user_id, name="Cells", created_at=now, updated_at=now)
+    card = FlashcardMongo(
+        _id=ObjectId(), user_id=user_id, deck_id=deck_id, question="What is ATP?", answer="Energy currency",
+        created_at=now, updated_at=now,
+    )
+    repository = MongoAsyncDeckRepository(FakeMongoDecks([DeckWithCards(deck, [card], 7)]))
+
+    decks = asyncio.run(repository.get_by_user_with_flashcards(user_id=user_id, cards_per_deck=1))
+
+    body = DeckWithFlashcardsPage.model_validate({"items": decks}, from_attributes=True).model_dump(mode="json")
+    assert body["items"][0]["id"] == str(deck_id)
+    assert body["items"][0]["flashcard_count"] == 7
+    assert body["items"][0]["flashcards"][0]["front"] == "What is ATP?"
+    assert body["items"][0]["flashcards"][0]["deck_id"] == str(deck_id)
+
+class RecordingMongo:
+    """Stands in for either Mongo repository, recording calls and returning nothing."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        async def call(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return None if name == "get_by_name" else []
+        return call
+
+def test_mongo_reads_for_non_object_id_users_find_nothing_instead_of_failing():
+    flashcards, decks = RecordingMongo(), RecordingMongo()
+    flashcard_repository, deck_repository = MongoAsyncFlashcardRepository(flashcards), MongoAsyncDeckRepository(decks)
+    sql_user_id = uuid.uuid4()
+
+    async def scenario():
+        return [
+            await flashcard_repository.get_by_user(user_id=sql_user_id),
+            await flashcard_repository.search(query="atp", user_id=sql_user_id),
+            await deck_repository.get_by_user(user_id=sql_user_id),
+            await deck_repository.get_by_user_with_flashcards(user_id=sql_user_id),
+            await deck_repository.get_by_name(name="Cells", user_id=sql_user_id),
+            await deck_repository.search(query="atp", user_id=sql_user_id),
+        ]
+
+    assert asyncio.run(scenario()) == [[], [], [], [], None, []]
+    assert flashcards.calls == []
+    # Public decks are still searched
+    assert decks.calls == [("search", ("atp",), {"user_id": None, "limit": 10, "cursor": None, "fuzzy": False})]
+
+def test_mongo_reads_pass_object_id_users_through():
+    flashcards = RecordingMongo()
+    user_id = ObjectId()
+
+    asyncio.run(MongoAsyncFlashcardRepository(flashcards).get_by_user(user_id=user_id, limit=5))
+
+    assert flashcards.calls == [("get_by_user", (str(user_id),), {"limit": 5, "cursor": None})]
@@ -0,0 +1,47 @@
+import threading
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.api import deps
+from app.core.security import create_access_token
+
+from .conftest import UserRow
+
+@pytest.fixture
+def client(db, monkeypatch):
+    monkeypatch.setattr(deps, "User", UserRow)
+    app = FastAPI()
+
+    @app.get("/me")
+    async def me(current_user=Depends(deps.get_current_active_user)):
+        return {"id": current_user.id, "thread": threading.get_ident()}
+
+    app.dependency_overrides[deps.get_db] = lambda: db
+    return TestClient(app)
+
+def auth(user_id):
+    return {"Authorization": f"Bearer {create_access_token(user_id)}"}
+
+def test_current_user_is_loaded_off_the_event_loop(db, client):
+    db.add(UserRow(id="u1", email="u1@example.com"))
+    db.commit()
+    query_threads = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *_: query_threads.append(threading.get_ident()))
+
+    response = client.get("/me", headers=auth("u1"))
+
+    assert response.status_code == 200
+    assert response.json()["id"] == "u1"
+    # The route body runs on the event loop thread; the blocking lookup must not
+    assert query_threads and response.json()["thread"] not in query_threads
+
+def test_invalid_token_unknown_and_inactive_users_are_rejected(db, client):
+    db.add(UserRow(id="u2", email="u2@example.com", is_active=False))
+    db.commit()
+
+    assert client.get("/me", headers={"Authorization": "Bearer nope"}).status_code == 401
+    assert client.get("/me", headers=auth("missing")).status_code == 401
+    assert client.get("/me", headers=auth("u2")).status_code == 400
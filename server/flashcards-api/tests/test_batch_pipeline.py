@@ -0,0 +1,123 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.services.batch_pipeline import BatchGenerationPipeline, BatchStages
+from app.services.page_fetcher import FetchedPage
+from app.services.result_cache import GenerationCache
+
+class FakeSteps:
+    """Pipeline steps that record which ran for which query; later queries finish first."""
+
+    def __init__(self, fail=None, block=None):
+        self.calls = []
+        self.fail = fail or {}
+        self.block = block
+
+    async def _step(self, name, query, delay):
+        self.calls.append((name, query))
+        if self.block is not None:
+            await self.block.wait()
+        await asyncio.sleep(delay)
+        if self.fail.get(query) == name:
+            raise RuntimeError(f"{name} broke")
+
+    async def search(self, query):
+        await self._step("search", query, 0.004 / len(query))
+        return [{"link": f"https://example.com/{query}"}]
+
+    async def fetch_page(self, url):
+        query = url.rsplit("/", 1)[1]
+        await self._step("fetch", query, 0.003 / len(query))
+        return None, FetchedPage(url, 200, httpx.Headers(), f"<p>{query}</p>".encode(), "utf-8")
+
+    async def extract_page_text(self, page):
+        query = page.url.rsplit("/", 1)[1]
+        await self._step("extract", query, 0.002 / len(query))
+        return f"All about {query}"
+
+    def select_passages(self, query, pages):
+        return " ".join(pages)
+
+    async def generate_flashcards(self, content, query, num_flashcards):
+        await self._step("llm", query, 0.001 / len(query))
+        return [{"front": f"{query} {i}", "back": content} for i in range(num_flashcards)]
+
+    def stages(self):
+        return BatchStages(
+            search=self.search,
+            fetch_page=self.fetch_page,
+            extract_page_text=self.extract_page_text,
+            select_passages=self.select_passages,
+            generate_flashcards=self.generate_flashcards,
+        )
+
+def make_pipeline(steps, cache=None):
+    return BatchGenerationPipeline(
+        steps.stages(), cache or GenerationCache(), search_concurrency=2, fetch_concurrency=2,
+        extract_concurrency=2, llm_concurrency=2, queue_size=1,
+    )
+
+QUERIES = ["a", "bb", "ccc", "dddd", "eeeee"]
+
+def test_items_run_every_stage_in_order_and_come_back_in_request_order():
+    steps = FakeSteps()
+
+    result = asyncio.run(make_pipeline(steps).run([(query, 2) for query in QUERIES]))
+
+    assert [item["query"] for item in result["items"]] == QUERIES
+    assert [item["status"] for item in result["items"]] == ["completed"] * 5
+    assert result["items"][1]["flashcards"] == [
+        {"front": "bb 0", "back": "All about bb"}, {"front": "bb 1", "back": "All about bb"},
+    ]
+    for query in QUERIES:
+        assert [name for name, called_for in steps.calls if called_for == query] == ["search", "fetch", "extract", "llm"]
+    assert result["total_flashcards"] == 10
+    assert [stage["processed"] for stage in result["stages"]] == [5, 5, 5, 5]
+
+def test_a_failing_item_skips_the_remaining_stages_without_affecting_the_others():
+    steps = FakeSteps(fail={"bb": "fetch"})
+    cache = GenerationCache()
+
+    result = asyncio.run(make_pipeline(steps, cache).run([(query, 1) for query in QUERIES]))
+
+    failed = result["items"][1]
+    assert (failed["status"], failed["error"], failed["flashcards"]) == ("failed", "fetch stage failed: fetch broke", [])
+    assert [name for name, query in steps.calls if query == "bb"] == ["search", "fetch"]
+    assert [item["status"] for item in result["items"]].count("completed") == 4
+    assert (result["completed"], result["failed"]) == (4, 1)
+    assert [stage["failed"] for stage in result["stages"]] == [0, 1, 0, 0]
+    # Only the completed sets are cached
+    assert cache.peek("bb", 1) is None and cache.peek("a", 1) is not None
+
+def test_cached_queries_skip_the_stages():
+    steps = FakeSteps()
+    cache = GenerationCache()
+    cache.store("a", 1, [{"front": "cached", "back": "card"}])
+
+    result = asyncio.run(make_pipeline(steps, cache).run([("a", 1), ("bb", 1)]))
+
+    assert result["items"][0]["cached"] is True
+    assert result["items"][0]["flashcards"] == [{"front": "cached", "back": "card"}]
+    assert {query for _, query in steps.calls} == {"bb"}
+
+def test_workers_stop_when_the_run_finishes_or_is_cancelled():
+    async def scenario():
+        before = asyncio.all_tasks()
+        await make_pipeline(FakeSteps()).run([(query, 1) for query in QUERIES])
+        left_after_run = asyncio.all_tasks() - before
+
+        steps = FakeSteps(block=asyncio.Event())
+        run = asyncio.ensure_future(make_pipeline(steps).run([(query, 1) for query in QUERIES]))
+        while not steps.calls:
+            await asyncio.sleep(0)
+        run.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await run
+        return left_after_run, asyncio.all_tasks() - before
+
+    left_after_run, left_after_cancel = asyncio.run(scenario())
+
+    assert left_after_run == set()
+    assert left_after_cancel == set()
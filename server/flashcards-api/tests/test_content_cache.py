@@ -0,0 +1,60 @@
+import asyncio
+
+from app.services.content_cache import ACCESS_FLUSH_BATCH, ContentCache, canonicalize_url
+
+def test_canonical_urls_share_an_entry():
+    assert canonicalize_url("HTTPS://Example.com:443/a?utm_source=x&b=2&a=1#top") == "https://example.com/a?a=1&b=2"
+
+def test_disk_hit_is_promoted_and_access_time_written_in_batches(tmp_path):
+    path = str(tmp_path / "content.db")
+    ContentCache(path=path).put("https://example.com/a", "text a")
+
+    cache = ContentCache(path=path, max_memory_entries=1)
+    (before,) = cache._conn.execute("SELECT accessed_at FROM page_content").fetchone()
+    assert cache.get("https://example.com/a").text == "text a"
+    assert cache.stats()["disk_hits"] == 1
+
+    # Not written on the hit itself, only with the next write
+    assert cache._conn.execute("SELECT accessed_at FROM page_content").fetchone() == (before,)
+    cache.put("https://example.com/b", "text b")
+    (after,) = cache._conn.execute(
+        "SELECT accessed_at FROM page_content WHERE url = ?", ("https://example.com/a",)
+    ).fetchone()
+    assert after > before
+
+def test_access_times_flush_once_the_batch_is_full():
+    cache = ContentCache(max_memory_entries=1)
+    for i in range(ACCESS_FLUSH_BATCH + 1):
+        cache.put(f"https://example.com/{i}", "text")
+    for i in range(ACCESS_FLUSH_BATCH):
+        cache.get(f"https://example.com/{i}")
+
+    assert cache._accessed == {}
+
+def test_least_recently_accessed_pages_are_evicted_from_disk():
+    cache = ContentCache(max_memory_entries=1, max_disk_entries=2)
+    cache.put("https://example.com/a", "a")
+    cache.put("https://example.com/b", "b")
+    cache.put("https://example.com/b", "b again")
+    assert cache.stats()["disk_entries"] == 2
+
+    cache.get("https://example.com/a")
+    cache.put("https://example.com/c", "c")
+
+    assert cache.stats()["disk_entries"] == 2
+    assert cache.stats()["disk_evictions"] == 1
+    assert cache.get("https://example.com/b") is None
+    assert cache.get("https://example.com/a").text == "a"
+
+def test_async_methods():
+    cache = ContentCache()
+
+    async def scenario():
+        await cache.put_async("https://example.com/a", "a", etag='"v1"')
+        return await cache.get_async("https://example.com/a"), await cache.get_async("https://example.com/b")
+
+    hit, miss = asyncio.run(scenario())
+    assert hit.etag == '"v1"'
+    assert miss is None
+    assert cache.stats()["memory_hits"] == 1
+    assert cache.stats()["misses"] == 1
@@ -0,0 +1,112 @@
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import deps
+from app.api.routes import decks
+from app.db.deck_cards import DeckWithCards
+from app.db.pagination import InvalidCursor
+
+USER_ID = uuid.uuid4()
+
+def make_deck(minutes, user_id=USER_ID, is_public=False):
+    created_at = datetime(2024, 1, 1) + timedelta(minutes=minutes)
+    return SimpleNamespace(
+        id=uuid.uuid4(), user_id=user_id, name=f"Deck {minutes}", description=None, is_public=is_public,
+        created_at=created_at, updated_at=created_at,
+    )
+
+def make_card(deck):
+    return SimpleNamespace(
+        id=uuid.uuid4(), user_id=deck.user_id, deck_id=deck.id, front="Question", back="Answer",
+        created_at=deck.created_at, updated_at=deck.created_at,
+    )
+
+class FakeDeckRepository:
+    """Async deck repository over a list, newest first, as the routes see either backend."""
+
+    lean_responses = False
+
+    def __init__(self, decks):
+        self.decks = sorted(decks, key=lambda deck: deck.created_at, reverse=True)
+        self.calls = []
+
+    def _page(self, decks, limit, cursor):
+        if cursor == "bad":
+            raise InvalidCursor("Invalid cursor")
+        return decks[:limit]
+
+    async def get_by_user(self, *, user_id, limit=100, cursor=None):
+        self.calls.append(("get_by_user", user_id))
+        return self._page([deck for deck in self.decks if deck.user_id == user_id], limit, cursor)
+
+    async def get_public_decks(self, *, limit=100, cursor=None):
+        self.calls.append(("get_public_decks",))
+        return self._page([deck for deck in self.decks if deck.is_public], limit, cursor)
+
+    async def get_by_user_with_flashcards(self, *, user_id, limit=100, cursor=None, cards_per_deck=None):
+        self.calls.append(("get_by_user_with_flashcards", user_id, cards_per_deck))
+        page = self._page([deck for deck in self.decks if deck.user_id == user_id], limit, cursor)
+        return [DeckWithCards(deck, [make_card(deck)], 3) for deck in page]
+
+    async def get_public_with_flashcards(self, *, limit=100, cursor=None, cards_per_deck=None):
+        self.calls.append(("get_public_with_flashcards", cards_per_deck))
+        page = self._page([deck for deck in self.decks if deck.is_public], limit, cursor)
+        return [DeckWithCards(deck, [], 0) for deck in page]
+
+@pytest.fixture
+def repository():
+    return FakeDeckRepository(
+        [make_deck(1), make_deck(2), make_deck(3, user_id=uuid.uuid4(), is_public=True)]
+    )
+
+@pytest.fixture
+def client(repository):
+    app = FastAPI()
+    app.include_router(decks.router)
+    app.dependency_overrides[deps.get_deck_repository] = lambda: repository
+    app.dependency_overrides[deps.get_current_active_user] = lambda: SimpleNamespace(id=USER_ID, is_active=True)
+    return TestClient(app)
+
+def test_decks_go_through_the_deck_repository(client, repository):
+    response = client.get("/decks/", params={"limit": 2})
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert [deck["name"] for deck in body["items"]] == ["Deck 2", "Deck 1"]
+    assert body["next_cursor"]
+    assert repository.calls == [("get_by_user", USER_ID)]
+
+def test_public_decks_go_through_the_deck_repository(client, repository):
+    response = client.get("/decks/public")
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert [deck["name"] for deck in body["items"]] == ["Deck 3"]
+    assert body["next_cursor"] is None
+    assert repository.calls == [("get_public_decks",)]
+
+def test_decks_with_flashcards_go_through_the_deck_repository(client, repository):
+    response = client.get("/decks/with-flashcards", params={"limit": 1, "cards_per_deck": 1})
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert [deck["name"] for deck in body["items"]] == ["Deck 2"]
+    assert body["items"][0]["flashcard_count"] == 3
+    assert body["items"][0]["flashcards"][0]["front"] == "Question"
+    assert body["next_cursor"]
+    assert repository.calls == [("get_by_user_with_flashcards", USER_ID, 1)]
+
+def test_public_decks_with_flashcards_go_through_the_deck_repository(client, repository):
+    response = client.get("/decks/public/with-flashcards")
+
+    assert response.status_code == 200, response.text
+    assert [deck["name"] for deck in response.json()["items"]] == ["Deck 3"]
+    assert repository.calls == [("get_public_with_flashcards", None)]
+
+def test_decks_with_flashcards_reject_invalid_cursor(client):
+    assert client.get("/decks/with-flashcards", params={"cursor": "bad"}).status_code == 400
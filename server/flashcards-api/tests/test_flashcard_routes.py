@@ -0,0 +1,132 @@
+import json
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from bson import ObjectId
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import deps
+from app.api.routes import flashcards
+from app.config import settings
+from app.db.repositories.async_repositories import MongoAsyncFlashcardRepository
+from app.models.mongo_models import FlashcardMongo
+
+USER_ID = uuid.uuid4()
+
+def make_card(user_id, deck_id):
+    now = datetime.utcnow()
+    return SimpleNamespace(
+        id=uuid.uuid4(), user_id=user_id, deck_id=deck_id, front="Question", back="Answer",
+        created_at=now, updated_at=now,
+    )
+
+class FakeFlashcardRepository:
+    lean_responses = False
+
+    def __init__(self):
+        self.calls = []
+
+    async def get_by_user(self, *, user_id, limit=100, cursor=None):
+        self.calls.append(("get_by_user", user_id))
+        return [make_card(user_id, uuid.uuid4())]
+
+    async def get_by_deck(self, *, deck_id, limit=100, cursor=None):
+        self.calls.append(("get_by_deck", deck_id))
+        return [make_card(USER_ID, deck_id)]
+
+class FakeDeckRepository:
+    def __init__(self, decks):
+        self.decks = {str(deck.id): deck for deck in decks}
+
+    async def get(self, id):
+        return self.decks.get(str(id))
+
+@pytest.fixture
+def repositories():
+    decks = [
+        SimpleNamespace(id=uuid.uuid4(), user_id=USER_ID, is_public=False),
+        # A MongoDB deck: ObjectId ids, compared to the user's id as strings
+        SimpleNamespace(id=ObjectId(), user_id=str(USER_ID), is_public=False),
+        SimpleNamespace(id=uuid.uuid4(), user_id=uuid.uuid4(), is_public=False),
+    ]
+    return FakeFlashcardRepository(), FakeDeckRepository(decks), decks
+
+@pytest.fixture
+def client(repositories):
+    flashcard_repository, deck_repository, _ = repositories
+    app = FastAPI()
+    app.include_router(flashcards.router)
+    app.dependency_overrides[deps.get_flashcard_repository] = lambda: flashcard_repository
+    app.dependency_overrides[deps.get_deck_repository] = lambda: deck_repository
+    app.dependency_overrides[deps.get_current_active_user] = lambda: SimpleNamespace(id=USER_ID, is_active=True)
+    return TestClient(app)
+
+def test_list_flashcards_goes_through_the_flashcard_repository(client, repositories):
+    flashcard_repository, _, _ = repositories
+
+    response = client.get("/flashcards/")
+
+    assert response.status_code == 200, response.text
+    assert response.json()["items"][0]["front"] == "Question"
+    assert flashcard_repository.calls == [("get_by_user", USER_ID)]
+
+def test_list_flashcards_of_a_deck_accepts_uuid_and_object_ids(client, repositories):
+    flashcard_repository, _, decks = repositories
+
+    for deck in decks[:2]:
+        response = client.get("/flashcards/", params={"deck_id": str(deck.id)})
+        assert response.status_code == 200, response.text
+
+    # UUIDs stay UUIDs for the SQLite repositories, ObjectIds are passed on as strings
+    assert flashcard_repository.calls == [("get_by_deck", decks[0].id), ("get_by_deck", str(decks[1].id))]
+
+def test_list_flashcards_hides_other_users_private_decks(client, repositories):
+    _, _, decks = repositories
+
+    assert client.get("/flashcards/", params={"deck_id": str(decks[2].id)}).status_code == 404
+    assert client.get("/flashcards/", params={"deck_id": str(ObjectId())}).status_code == 404
+
+class FakeMongoFlashcards:
+    """Stands in for MongoFlashcardRepository: builds models like from_document does."""
+
+    def __init__(self, documents):
+        self.documents = documents
+
+    async def get_by_user(self, user_id, limit=100, cursor=None):
+        model = FlashcardMongo.model_construct if settings.MONGO_LEAN_READS else FlashcardMongo
+        return [model(**document) for document in self.documents if str(document["user_id"]) == user_id][:limit]
+
+def test_lean_and_validated_flashcard_pages_are_the_same_json(monkeypatch):
+    user_id = ObjectId()
+    documents = [
+        {
+            "_id": ObjectId(), "question": f"Qu'est-ce que l'ATP {i}?", "answer": "Énergie", "deck_id": ObjectId(),
+            "user_id": user_id, "created_at": datetime(2024, 1, 1, 12, 0, i, 123000),
+            "updated_at": datetime(2024, 1, 2),
+        }
+        for i in range(3)
+    ]
+    app = FastAPI()
+    app.include_router(flashcards.router)
+    app.dependency_overrides[deps.get_flashcard_repository] = lambda: MongoAsyncFlashcardRepository(
+        FakeMongoFlashcards(documents)
+    )
+    app.dependency_overrides[deps.get_deck_repository] = lambda: FakeDeckRepository([])
+    app.dependency_overrides[deps.get_current_active_user] = lambda: SimpleNamespace(id=user_id, is_active=True)
+    client = TestClient(app)
+
+    bodies = []
+    for lean in (False, True):
+        monkeypatch.setattr(settings, "MONGO_LEAN_READS", lean)
+        response = client.get("/flashcards/", params={"limit": 2})
+        assert response.status_code == 200, response.text
+        assert response.headers["content-type"] == "application/json"
+        bodies.append(response.content)
+
+    assert bodies[0] == bodies[1]
+    page = json.loads(bodies[1])
+    assert [card["front"] for card in page["items"]] == ["Qu'est-ce que l'ATP 0?", "Qu'est-ce que l'ATP 1?"]
+    assert page["next_cursor"] is not None
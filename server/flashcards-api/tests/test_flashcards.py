@@ -0,0 +1,60 @@
+from types import SimpleNamespace
+
+from app.db.repositories.base import BaseRepository
+
+from .conftest import CardRow
+
+class RecordingRepository(BaseRepository):
+    def __init__(self, model):
+        super().__init__(model)
+        self.written = []
+
+    def _after_write(self, db_obj):
+        self.written.append(db_obj.id)
+
+def test_bulk_create_inserts_all_rows_in_order(db):
+    repository = RecordingRepository(CardRow)
+    objs_in = [SimpleNamespace(front=f"Q{i}", back=f"A{i}", deck_id="d1") for i in range(5)]
+
+    cards = repository.bulk_create(db, objs_in=objs_in, user_id="u1")
+
+    assert [card.front for card in cards] == ["Q0", "Q1", "Q2", "Q3", "Q4"]
+    assert all(card.user_id == "u1" and card.deck_id == "d1" for card in cards)
+    assert db.query(CardRow).count() == 5
+    assert repository.written == [card.id for card in cards]
+
+def test_bulk_create_commits_once(db):
+    commits = []
+    db.commit = lambda original=db.commit: commits.append(1) or original()
+
+    BaseRepository(CardRow).bulk_create(
+        db, objs_in=[SimpleNamespace(front="Q", back="A", deck_id="d1") for _ in range(3)]
+    )
+
+    assert len(commits) == 1
+
+def test_bulk_create_with_nothing_to_insert(db):
+    assert BaseRepository(CardRow).bulk_create(db, objs_in=[]) == []
+
+class DeleteRecordingRepository(BaseRepository):
+    def __init__(self, model):
+        super().__init__(model)
+        self.deleted = []
+
+    def _after_delete(self, obj):
+        self.deleted.append((obj.id, obj.user_id))
+
+def test_bulk_remove_deletes_in_one_commit_and_runs_hooks(db):
+    repository = DeleteRecordingRepository(CardRow)
+    cards = repository.bulk_create(
+        db, objs_in=[SimpleNamespace(front=f"Q{i}", back="A", deck_id="d1") for i in range(4)], user_id="u1"
+    )
+    commits = []
+    db.commit = lambda original=db.commit: commits.append(1) or original()
+
+    removed = repository.bulk_remove(db, ids=[cards[0].id, cards[2].id])
+
+    assert len(removed) == 2
+    assert len(commits) == 1
+    assert sorted(repository.deleted) == sorted([(cards[0].id, "u1"), (cards[2].id, "u1")])
+    assert [card.front for card in db.query(CardRow).order_by(CardRow.front)] == ["Q1", "Q3"]
@@ -0,0 +1,89 @@
+import sqlite3
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.fts import ensure_fts, fts_search
+
+from .conftest import CardRow, TestBase
+
+@pytest.fixture
+def database(tmp_path):
+    path = tmp_path / "flashcards.db"
+    engine = create_engine(f"sqlite:///{path}")
+    TestBase.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield path, session
+    finally:
+        session.close()
+        engine.dispose()
+
+def add_cards(session, *fronts):
+    cards = [CardRow(user_id="u1", deck_id="d1", front=front, back="answer") for front in fronts]
+    session.add_all(cards)
+    session.commit()
+    return cards
+
+def run(path, *statements):
+    conn = sqlite3.connect(path)
+    try:
+        for statement in statements:
+            conn.execute(statement)
+        conn.commit()
+    finally:
+        conn.close()
+
+def fronts(session, query):
+    return sorted(card.front for card in fts_search(session, CardRow, query, limit=50))
+
+def test_search_survives_vacuum_renumbering_rowids(database):
+    path, session = database
+    cards = add_cards(session, *[f"mitochondria fact {i}" for i in range(20)])
+    conn = sqlite3.connect(path)
+    ensure_fts(conn)
+    conn.close()
+
+    for card in cards[:10]:
+        session.delete(card)
+    session.commit()
+    # VACUUM may renumber the implicit rowids of tables with non-integer primary keys
+    run(path, "VACUUM")
+    add_cards(session, "mitochondria fact new")
+
+    assert fronts(session, "mitochondria") == sorted([card.front for card in cards[10:]] + ["mitochondria fact new"])
+    assert fronts(session, "fact 15") == ["mitochondria fact 15"]
+
+def test_triggers_follow_updates_and_deletes(database):
+    path, session = database
+    card, other = add_cards(session, "photosynthesis", "enzyme")
+    conn = sqlite3.connect(path)
+    ensure_fts(conn)
+    conn.close()
+
+    card.front = "chloroplast"
+    session.delete(other)
+    session.commit()
+
+    assert fronts(session, "chloroplast") == ["chloroplast"]
+    assert fronts(session, "photosynthesis") == []
+    assert fronts(session, "enzyme") == []
+
+def test_rowid_keyed_tables_are_rebuilt(database):
+    path, session = database
+    add_cards(session, "gravity")
+    # The earlier external-content layout, joined on flashcards.rowid
+    run(
+        path,
+        "CREATE VIRTUAL TABLE flashcards_fts USING fts5(front, back, content='flashcards', content_rowid='rowid')",
+        "CREATE TRIGGER flashcards_fts_ai AFTER INSERT ON flashcards BEGIN "
+        "INSERT INTO flashcards_fts(rowid, front, back) VALUES (new.rowid, new.front, new.back); END",
+    )
+
+    conn = sqlite3.connect(path)
+    assert "flashcards_fts" in ensure_fts(conn)
+    conn.close()
+    add_cards(session, "gravity well")
+
+    assert fronts(session, "gravity") == ["gravity", "gravity well"]
@@ -0,0 +1,42 @@
+from app.services import fuzzy_index as fuzzy_module
+from app.services.fuzzy_index import FuzzyIndex
+
+def test_other_users_words_do_not_crowd_out_candidates():
+    index = FuzzyIndex(max_candidates=1)
+    # Words sharing more trigrams with the typo than the user's own word
+    for i, word in enumerate(["mitochondrias", "mitochondrion", "mitochondrial"]):
+        index.index_flashcard(f"other-{i}", "someone-else", word)
+    index.index_flashcard("mine", "me", "mitochondria")
+
+    assert index.search("mitochondira", "flashcard", user_id="me") == ["mine"]
+    assert index.search("mitochondria", "flashcard", user_id="nobody") == []
+
+def test_decks_include_the_public_scope():
+    index = FuzzyIndex()
+    index.index_deck("private", "me", False, "Photosynthesis")
+    index.index_deck("public", "someone-else", True, "Photosynthesis basics")
+    index.index_deck("hidden", "someone-else", False, "Photosynthesis")
+
+    assert sorted(index.search("photosynthsis", "deck", user_id="me")) == ["private", "public"]
+    assert index.search("photosynthsis", "deck") == ["public"]
+
+    # Making a deck private moves it out of the public scope
+    index.index_deck("public", "someone-else", False, "Photosynthesis basics")
+    assert index.search("photosynthsis", "deck", user_id="me") == ["private"]
+    assert index.stats()["scopes"] == 2
+
+def test_remove_drops_empty_scopes():
+    index = FuzzyIndex()
+    index.index_flashcard("card", "me", "enzyme")
+    index.remove_flashcard("card")
+
+    assert index.scopes == {} and len(index) == 0
+
+def test_deadline_is_checked_while_collecting_candidates(monkeypatch):
+    index = FuzzyIndex(budget_ms=1)
+    index.index_flashcard("card", "me", "enzyme")
+    ticks = iter(range(0, 1000))
+    # Every clock read advances one second, so the budget is spent on the first trigram
+    monkeypatch.setattr(fuzzy_module.time, "perf_counter", lambda: next(ticks))
+
+    assert index.search("enzyem", "flashcard", user_id="me") == []
@@ -0,0 +1,155 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.services.governor import CircuitBreaker, ProviderGovernor, ProviderUnavailable
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr("app.services.governor.time.monotonic", clock)
+    return clock
+
+def test_breaker_opens_on_error_rate(clock):
+    breaker = CircuitBreaker(window=10, min_calls=4, error_rate=0.5, reset_seconds=30)
+    for success in (True, False, True):
+        breaker.record(success, 0.1)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    breaker.record(False, 0.1)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+    assert breaker.retry_after() == 30
+
+def test_breaker_opens_on_slow_calls(clock):
+    breaker = CircuitBreaker(min_calls=2, slow_call_seconds=5, slow_call_rate=0.5)
+    breaker.record(True, 1)
+    breaker.record(True, 6)
+    assert breaker.state == CircuitBreaker.OPEN
+
+def test_half_open_lets_one_probe_through_then_closes(clock):
+    breaker = CircuitBreaker(min_calls=1, reset_seconds=30)
+    breaker.record(False, 0.1)
+    clock.now += 30
+
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record(True, 0.1)
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow()
+
+def test_failed_probe_reopens(clock):
+    breaker = CircuitBreaker(min_calls=1, reset_seconds=30)
+    breaker.record(False, 0.1)
+    clock.now += 30
+    assert breaker.allow()
+
+    breaker.record(False, 0.1)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.times_opened == 2
+
+def test_abandoned_probe_frees_the_probe_slot(clock):
+    breaker = CircuitBreaker(min_calls=1, reset_seconds=30)
+    breaker.record(False, 0.1)
+    clock.now += 30
+    assert breaker.allow()
+
+    breaker.abandon()
+    assert breaker.allow()
+
+def make_governor(**overrides):
+    options = dict(rate=0, burst=1, max_concurrency=1, max_queue=1, queue_timeout=1)
+    options.update(overrides)
+    return ProviderGovernor("test", **options)
+
+def test_failures_open_the_breaker_and_reject_calls():
+    async def scenario():
+        governor = make_governor(breaker=CircuitBreaker(min_calls=2, error_rate=0.5))
+
+        async def fail():
+            raise RuntimeError("provider down")
+
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                await governor.call(fail)
+        with pytest.raises(ProviderUnavailable) as excinfo:
+            await governor.call(asyncio.sleep, 0)
+        return governor, excinfo.value
+
+    governor, error = asyncio.run(scenario())
+    assert error.reason == "circuit open"
+    assert governor.stats()["failed"] == 2
+    assert governor.stats()["rejected_open"] == 1
+    assert governor.stats()["in_flight"] == 0
+
+def test_full_queue_is_rejected_straight_away():
+    async def scenario():
+        governor = make_governor(max_queue=0)
+        release = asyncio.Event()
+        holder = asyncio.create_task(governor.call(release.wait))
+        while governor.stats()["in_flight"] == 0:
+            await asyncio.sleep(0)
+        with pytest.raises(ProviderUnavailable) as excinfo:
+            await governor.call(asyncio.sleep, 0)
+        release.set()
+        await holder
+        return excinfo.value
+
+    assert "queue is full" in asyncio.run(scenario()).reason
+
+def test_cancelled_while_rate_limited_releases_the_slot():
+    async def scenario():
+        governor = make_governor(rate=0.1, queue_timeout=60)
+        await governor.call(asyncio.sleep, 0)
+        # The bucket is empty: the next call holds the only slot while it waits ~10s for a token
+        waiter = asyncio.create_task(governor.call(asyncio.sleep, 0))
+        while not governor._slots.locked():
+            await asyncio.sleep(0)
+        # Let the waiter get past wait_for() and into the bucket's sleep
+        for _ in range(5):
+            await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        return governor
+
+    governor = asyncio.run(scenario())
+    assert not governor._slots.locked()
+    assert governor.stats()["in_flight"] == 0
+
+def test_cancelled_caller_keeps_the_slot_until_the_thread_finishes():
+    async def scenario():
+        governor = make_governor()
+        started, release = threading.Event(), threading.Event()
+
+        def provider_request():
+            started.set()
+            release.wait(5)
+            return "done"
+
+        caller = asyncio.create_task(governor.call(asyncio.to_thread, provider_request))
+        await asyncio.to_thread(started.wait, 5)
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+        # The request is still running in its thread, so it still counts against the cap
+        held = governor._slots.locked(), governor.stats()["in_flight"]
+        release.set()
+        while governor._slots.locked():
+            await asyncio.sleep(0.01)
+        return governor, held
+
+    governor, held = asyncio.run(scenario())
+    assert held == (True, 1)
+    assert governor.stats()["in_flight"] == 0
+    assert governor.stats()["succeeded"] == 1
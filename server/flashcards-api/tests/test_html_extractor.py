@@ -0,0 +1,70 @@
+import asyncio
+from concurrent.futures.process import BrokenProcessPool
+
+from app.services.html_extractor import HTMLExtractor, extract_text
+
+ARTICLE = b"""
+<html><head><title>Cells</title><style>p { color: red }</style><script>var tracking = 1;</script></head>
+<body>
+  <header><a href="/">Biology Daily</a> <nav>Home | About</nav></header>
+  <main>
+    <article>
+      <header><h1>The Mitochondrion</h1><p>By A. Author</p></header>
+      <p>Mitochondria produce ATP.</p>
+      <aside>Related: ribosomes</aside>
+    </article>
+  </main>
+  <footer>Copyright</footer>
+</body></html>
+"""
+
+def test_boilerplate_is_skipped_but_the_article_header_is_kept():
+    text = extract_text(ARTICLE, max_chars=1000)
+
+    assert text == "Cells The Mitochondrion By A. Author Mitochondria produce ATP."
+
+def test_page_level_header_with_unbalanced_markup_does_not_hide_the_rest():
+    text = extract_text(b"<header>Site</header></header><p>Body text</p></article><p>More</p>", max_chars=1000)
+
+    assert text == "Body text More"
+
+def test_text_is_capped_at_max_chars():
+    html = b"<p>" + b"cell " * 50000 + b"</p>"
+
+    text = extract_text(html, max_chars=100, chunk_size=64)
+
+    assert len(text) == 100
+    assert text.startswith("cell cell")
+
+def test_unknown_encoding_falls_back_to_utf8():
+    assert extract_text("<p>Énergie</p>".encode(), encoding="no-such-codec") == "Énergie"
+
+def test_pool_and_inline_extraction_give_the_same_text():
+    async def extract(max_workers):
+        extractor = HTMLExtractor(max_workers=max_workers, max_chars=1000)
+        try:
+            return await extractor.extract(ARTICLE, "utf-8")
+        finally:
+            extractor.close(wait=True)
+
+    assert asyncio.run(extract(1)) == asyncio.run(extract(0)) == extract_text(ARTICLE, max_chars=1000)
+
+class BrokenPool:
+    def __init__(self):
+        self.shut_down = False
+
+    def submit(self, *args, **kwargs):
+        raise BrokenProcessPool("a worker process died")
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shut_down = True
+
+def test_broken_pool_falls_back_to_inline_extraction_and_is_replaced():
+    extractor = HTMLExtractor(max_workers=1, max_chars=1000)
+    broken = extractor._pool = BrokenPool()
+
+    text = asyncio.run(extractor.extract(ARTICLE, "utf-8"))
+
+    assert text == extract_text(ARTICLE, max_chars=1000)
+    assert broken.shut_down
+    assert extractor._pool is None
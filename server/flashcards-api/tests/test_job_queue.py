@@ -0,0 +1,148 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.repositories.jobs import SQLiteJobRepository
+from app.services.job_queue import GenerationJobQueue, JobQueueFull
+
+class SlowJobRepository:
+    """Job repository whose create() yields to the event loop before storing."""
+
+    def __init__(self, fail_create=False):
+        self.jobs = {}
+        self.fail_create = fail_create
+
+    async def create(self, job_data):
+        await asyncio.sleep(0.01)
+        if self.fail_create:
+            raise RuntimeError("database unavailable")
+        self.jobs[job_data["id"]] = dict(job_data)
+        return job_data
+
+@pytest.fixture
+def job_repository():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    try:
+        yield SQLiteJobRepository(sessionmaker(bind=engine))
+    finally:
+        engine.dispose()
+
+def make_job(job_id, owner, heartbeat_at, status="queued"):
+    return {
+        "id": job_id, "user_id": "u1", "query": "cells", "num_flashcards": 5, "status": status,
+        "flashcards": [], "error": None, "created_at": datetime.utcnow(), "started_at": None,
+        "finished_at": None, "owner": owner, "heartbeat_at": heartbeat_at,
+    }
+
+def test_concurrent_submissions_cannot_overfill_the_queue():
+    queue = GenerationJobQueue(SlowJobRepository(), None, max_queue_size=2)
+
+    async def scenario():
+        return await asyncio.gather(*(queue.submit("u1", "cells", 5) for _ in range(5)), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+
+    assert sum(isinstance(result, dict) for result in results) == 2
+    assert sum(isinstance(result, JobQueueFull) for result in results) == 3
+    assert queue.stats()["queue_depth"] == 2
+
+def test_failed_create_releases_its_place():
+    repository = SlowJobRepository(fail_create=True)
+    queue = GenerationJobQueue(repository, None, max_queue_size=1)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(queue.submit("u1", "cells", 5))
+    repository.fail_create = False
+    asyncio.run(queue.submit("u1", "cells", 5))
+
+    assert queue.stats()["queue_depth"] == 1
+
+def test_only_jobs_with_expired_leases_are_failed(job_repository):
+    now = datetime.utcnow()
+
+    async def scenario():
+        await job_repository.create(make_job("live", "other-worker", now))
+        await job_repository.create(make_job("abandoned", "gone-worker", now - timedelta(minutes=5)))
+        await job_repository.create(make_job("legacy", None, None, status="running"))
+        await job_repository.create(make_job("done", "gone-worker", now - timedelta(minutes=5), status="completed"))
+        failed = await job_repository.fail_unfinished("Worker stopped", now - timedelta(minutes=1))
+        return failed, {job_id: await job_repository.get_by_id(job_id) for job_id in ("live", "abandoned", "legacy", "done")}
+
+    failed, jobs = asyncio.run(scenario())
+
+    assert failed == 2
+    assert {job_id: job["status"] for job_id, job in jobs.items()} == {
+        "live": "queued", "abandoned": "failed", "legacy": "failed", "done": "completed",
+    }
+    assert jobs["abandoned"]["error"] == "Worker stopped"
+
+def test_renew_extends_the_owners_unfinished_jobs(job_repository):
+    old = datetime.utcnow() - timedelta(minutes=5)
+
+    async def scenario():
+        await job_repository.create(make_job("mine", "me", old))
+        await job_repository.create(make_job("theirs", "them", old))
+        await job_repository.renew("me", datetime.utcnow())
+        return await job_repository.fail_unfinished("Worker stopped", datetime.utcnow() - timedelta(minutes=1))
+
+    assert asyncio.run(scenario()) == 1
+    assert asyncio.run(job_repository.get_by_id("mine"))["status"] == "queued"
+
+def test_jobs_round_trip_through_the_session(job_repository):
+    job = make_job("j1", "me", datetime.utcnow())
+
+    async def scenario():
+        await job_repository.create(job)
+        await job_repository.update("j1", {"status": "completed", "flashcards": [{"question": "Q", "answer": "A"}]})
+        return await job_repository.get_by_id("j1")
+
+    stored = asyncio.run(scenario())
+
+    assert stored["flashcards"] == [{"question": "Q", "answer": "A"}]
+    assert stored["created_at"] == job["created_at"]
+    assert asyncio.run(job_repository.get_by_id("missing")) is None
+
+class FlakyJobRepository:
+    """Fails the first `failures` updates, like a database that is briefly unreachable."""
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.updates = []
+
+    async def create(self, job_data):
+        return job_data
+
+    async def update(self, job_id, update_data):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("database unavailable")
+        self.updates.append((job_id, update_data["status"]))
+
+class FakeSearchService:
+    async def get_or_generate_flashcards(self, query, num_flashcards):
+        return [{"question": "Q", "answer": "A"}]
+
+def test_repository_errors_do_not_kill_the_workers():
+    repository = FlakyJobRepository(failures=1)
+    queue = GenerationJobQueue(repository, FakeSearchService(), workers=1)
+
+    async def scenario():
+        queue._worker_tasks = [asyncio.create_task(queue._worker())]
+        first = await queue.submit("u1", "cells", 5)
+        second = await queue.submit("u1", "atoms", 5)
+        await asyncio.wait_for(queue._queue.join(), 1)
+        alive = not queue._worker_tasks[0].done()
+        await queue.stop()
+        return first, second, alive
+
+    first, second, alive = asyncio.run(scenario())
+
+    assert alive
+    # The first job's "running" update failed; it was then marked failed, and the worker went on
+    assert repository.updates == [
+        (first["id"], "failed"), (second["id"], "running"), (second["id"], "completed"),
+    ]
@@ -0,0 +1,97 @@
+import asyncio
+import os
+import uuid
+
+import pytest
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.db.mongodb import INDEXES, MongoDB
+
+# A scratch database is created on this server and dropped afterwards
+MONGODB_URL = os.environ.get("TEST_MONGODB_URL", "mongodb://localhost:27017")
+
+def plan_stages(plan):
+    """Every stage name in an explain() plan tree."""
+    if not isinstance(plan, dict):
+        return []
+    stages = [plan["stage"]] if "stage" in plan else []
+    for key in ("queryPlan", "inputStage"):
+        stages += plan_stages(plan.get(key))
+    for child in plan.get("inputStages", []):
+        stages += plan_stages(child)
+    return stages
+
+def run_against_mongo(scenario):
+    """Run `scenario(database)` on a scratch database, skipping when no MongoDB is reachable."""
+
+    async def run():
+        client = AsyncIOMotorClient(MONGODB_URL, serverSelectionTimeoutMS=1000)
+        try:
+            await client.admin.command("ping")
+        except Exception as e:
+            client.close()
+            pytest.skip(f"no MongoDB at {MONGODB_URL}: {e}")
+        database = client[f"flashcards_test_{uuid.uuid4().hex[:8]}"]
+        try:
+            for collection in ("flashcards", "decks"):
+                for keys, options in INDEXES[collection]:
+                    await database[collection].create_index(keys, **options)
+            return await scenario(database)
+        finally:
+            await client.drop_database(database.name)
+            client.close()
+
+    return asyncio.run(run())
+
+def text_search_cursor(*args, **kwargs):
+    # The repository module builds its instances at import, which needs a database handle
+    if MongoDB.database is None:
+        MongoDB.database = AsyncIOMotorClient(MONGODB_URL, serverSelectionTimeoutMS=1000)["flashcards"]
+    from app.db.repositories.mongo_repositories import text_search_cursor
+
+    return text_search_cursor(*args, **kwargs)
+
+async def check_plan_and_order(collection, search_filter, query):
+    explain = await text_search_cursor(collection, search_filter, query).explain()
+    stages = plan_stages(explain["queryPlanner"]["winningPlan"])
+    scores = [doc["score"] async for doc in text_search_cursor(collection, search_filter, query, limit=50)]
+    return stages, scores
+
+def test_flashcard_text_search_uses_the_text_index_and_sorts_by_score():
+    user_id = ObjectId()
+
+    async def scenario(database):
+        await database.flashcards.insert_many([
+            {"question": f"What is mitochondria number {i}?", "answer": "mitochondria " * (i % 5 + 1),
+             "user_id": user_id, "deck_id": ObjectId()}
+            for i in range(30)
+        ] + [{"question": "Unrelated", "answer": "card", "user_id": user_id, "deck_id": ObjectId()}])
+        return await check_plan_and_order(database.flashcards, {"user_id": user_id}, "mitochondria")
+
+    stages, scores = run_against_mongo(scenario)
+
+    assert "TEXT" in stages or "TEXT_MATCH" in stages
+    assert "COLLSCAN" not in stages
+    assert len(scores) == 30
+    assert scores == sorted(scores, reverse=True)
+
+def test_deck_text_search_over_own_and_public_decks_uses_the_text_index():
+    user_id = ObjectId()
+
+    async def scenario(database):
+        await database.decks.insert_many([
+            {"name": "Cell biology", "description": "Mitochondria and ribosomes", "user_id": user_id, "is_public": False},
+            {"name": "Mitochondria", "description": "Public deck", "user_id": ObjectId(), "is_public": True},
+            {"name": "Mitochondria", "description": "Someone's private deck", "user_id": ObjectId(), "is_public": False},
+        ])
+        return await check_plan_and_order(
+            database.decks, {"$or": [{"user_id": user_id}, {"is_public": True}]}, "mitochondria"
+        )
+
+    stages, scores = run_against_mongo(scenario)
+
+    assert "TEXT" in stages or "TEXT_MATCH" in stages
+    assert "COLLSCAN" not in stages
+    assert len(scores) == 2
+    assert scores == sorted(scores, reverse=True)
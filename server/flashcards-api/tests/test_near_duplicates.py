@@ -0,0 +1,64 @@
+from app.services.near_duplicates import (
+    DeckDuplicateIndexes,
+    build_duplicate_index,
+    new_duplicate_index,
+    split_near_duplicates,
+)
+
+CARD = ("What do mitochondria produce in the cell?", "ATP through cellular respiration")
+OTHER = ("What is the capital of France?", "Paris is the capital")
+
+def test_remove_takes_a_card_out_of_its_buckets():
+    index = new_duplicate_index()
+    index.add("c1", *CARD)
+    assert index.query(*CARD)[0][0] == "c1"
+
+    index.remove("c1")
+    assert index.query(*CARD) == []
+    assert len(index) == 0
+
+def test_split_checks_existing_index_without_changing_it():
+    existing = build_duplicate_index([("c1", *CARD)])
+    cards = [dict(question=CARD[0], answer=CARD[1]), dict(question=OTHER[0], answer=OTHER[1])]
+
+    unique, duplicates = split_near_duplicates(cards, existing=existing)
+
+    assert unique == cards[1:]
+    assert duplicates == cards[:1]
+    assert existing.keys() == ["c1"]
+
+def test_write_hooks_keep_cached_deck_current():
+    indexes = DeckDuplicateIndexes()
+    indexes.end_load("d1", indexes.begin_load("d1"), build_duplicate_index([("c1", *OTHER)]))
+
+    indexes.index_flashcard("c2", "d1", *CARD)
+    assert indexes.get("d1").query(*CARD)[0][0] == "c2"
+
+    # Moved to another deck, then deleted
+    indexes.index_flashcard("c2", "d2", *CARD)
+    assert indexes.get("d1").query(*CARD) == []
+    indexes.remove_flashcard("c1")
+    assert len(indexes.get("d1")) == 0
+
+    indexes.remove_deck("d1")
+    assert indexes.get("d1") is None
+
+def test_load_raced_by_a_write_is_not_cached():
+    indexes = DeckDuplicateIndexes()
+    token = indexes.begin_load("d1")
+    indexes.index_flashcard("c9", "d1", *CARD)
+    indexes.end_load("d1", token, build_duplicate_index([]))
+
+    assert indexes.get("d1") is None
+    assert indexes._loading == {}
+
+def test_least_recently_used_deck_is_evicted():
+    indexes = DeckDuplicateIndexes(max_decks=2)
+    for deck_id in ("d1", "d2"):
+        indexes.end_load(deck_id, indexes.begin_load(deck_id), build_duplicate_index([(f"{deck_id}-c", *CARD)]))
+    indexes.get("d1")
+    indexes.end_load("d3", indexes.begin_load("d3"), build_duplicate_index([]))
+
+    assert indexes.get("d2") is None
+    assert indexes.get("d1") is not None
+    assert indexes.stats() == {"decks": 2, "flashcards": 1}
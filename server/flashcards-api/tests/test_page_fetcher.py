@@ -0,0 +1,80 @@
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+
+from app.services.content_cache import ContentCache
+from app.services.page_fetcher import PageFetcher
+from app.services.search_service import SearchService
+
+URL = "https://example.com/cells"
+
+def fetcher_for(handler) -> PageFetcher:
+    fetcher = PageFetcher()
+    fetcher._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return fetcher
+
+def revalidating_origin(requests):
+    def handler(request):
+        requests.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, text="<p>Cells</p>", headers={"ETag": '"v1"'})
+    return handler
+
+def test_not_modified_is_returned_not_treated_as_an_error():
+    async def scenario():
+        fetcher = fetcher_for(revalidating_origin([]))
+        try:
+            return await fetcher.fetch(URL, headers={"If-None-Match": '"v1"'})
+        finally:
+            await fetcher.close()
+
+    page = asyncio.run(scenario())
+    assert page is not None
+    assert page.status_code == 304
+    assert page.content == b""
+
+def test_client_and_server_errors_return_none():
+    async def scenario(status):
+        fetcher = fetcher_for(lambda request: httpx.Response(status))
+        try:
+            return await fetcher.fetch(URL)
+        finally:
+            await fetcher.close()
+
+    assert asyncio.run(scenario(404)) is None
+    assert asyncio.run(scenario(503)) is None
+
+def test_stale_cache_entry_is_revalidated_with_304():
+    requests = []
+    cache = ContentCache(ttl_seconds=60)
+    entry = cache.put(URL, "Cells are the unit of life", etag='"v1"')
+    entry.fetched_at -= 3600
+
+    async def scenario():
+        service = SimpleNamespace(content_cache=cache, page_fetcher=fetcher_for(revalidating_origin(requests)))
+        try:
+            return await SearchService._fetch_page(service, URL)
+        finally:
+            await service.page_fetcher.close()
+
+    text, page = asyncio.run(scenario())
+    assert (text, page) == ("Cells are the unit of life", None)
+    assert requests[0].headers["If-None-Match"] == '"v1"'
+    assert cache.stats()["revalidated"] == 1
+    assert cache.get(URL).is_fresh(cache.ttl_seconds)
+
+def test_body_is_cut_off_at_max_bytes():
+    async def scenario(max_bytes):
+        fetcher = fetcher_for(lambda request: httpx.Response(200, content=b"x" * 10000))
+        fetcher.max_bytes = max_bytes
+        try:
+            return await fetcher.fetch(URL)
+        finally:
+            await fetcher.close()
+
+    page = asyncio.run(scenario(4096))
+    assert (len(page.content), page.truncated) == (4096, True)
+    page = asyncio.run(scenario(20000))
+    assert (len(page.content), page.truncated) == (10000, False)
@@ -0,0 +1,60 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.db.pagination import InvalidCursor, decode_cursor, encode_cursor, next_cursor, rank_offset
+
+from .conftest import CardRow
+
+def add_cards(db, count, same_time=False):
+    start = datetime(2024, 1, 1)
+    db.add_all(
+        CardRow(
+            id=uuid.uuid4(), user_id="u1", front=f"Q{i}", back=f"A{i}",
+            created_at=start if same_time else start + timedelta(minutes=i),
+        )
+        for i in range(count)
+    )
+    db.commit()
+
+def all_pages(db, repository, limit):
+    ids, cursor = [], None
+    while True:
+        page = repository.get_multi(db, limit=limit, cursor=cursor)
+        ids.extend(card.id for card in page)
+        cursor = next_cursor(page, limit, cursor)
+        if cursor is None:
+            return ids
+
+@pytest.mark.parametrize("same_time", [False, True])
+def test_keyset_pages_cover_every_row_once_newest_first(db, card_repository, same_time):
+    add_cards(db, 23, same_time=same_time)
+    expected = [
+        card.id for card in db.query(CardRow).order_by(CardRow.created_at.desc(), CardRow.id.desc())
+    ]
+
+    assert all_pages(db, card_repository, limit=5) == expected
+
+def test_short_page_has_no_next_cursor(db, card_repository):
+    add_cards(db, 3)
+    page = card_repository.get_multi(db, limit=5)
+
+    assert len(page) == 3
+    assert next_cursor(page, 5) is None
+
+def test_ranked_cursor_continues_at_next_position():
+    first = next_cursor(["a", "b"], 2, ranked=True)
+    assert rank_offset(first) == 2
+    assert rank_offset(next_cursor(["c", "d"], 2, first, ranked=True)) == 4
+
+def test_cursor_round_trip_and_invalid_cursors(db, card_repository):
+    assert decode_cursor(encode_cursor({"o": 3})) == {"o": 3}
+    assert decode_cursor(None) == {}
+
+    with pytest.raises(InvalidCursor):
+        decode_cursor("not base64 json!")
+    with pytest.raises(InvalidCursor):
+        rank_offset(encode_cursor({"o": -1}))
+    with pytest.raises(InvalidCursor):
+        card_repository.get_multi(db, cursor=encode_cursor({"t": "2024-01-01T00:00:00", "i": "not-a-uuid"}))
@@ -0,0 +1,52 @@
+from app.services.passage_selector import bm25_scores, select_passages, split_passages
+
+def count_words(text):
+    return len(text.split())
+
+def test_split_passages_overlaps_and_keeps_the_tail():
+    text = " ".join(f"w{i}" for i in range(10))
+
+    assert split_passages(text, 4, overlap=1) == ["w0 w1 w2 w3", "w3 w4 w5 w6", "w6 w7 w8 w9"]
+    assert split_passages("   ", 4) == []
+
+def test_bm25_ranks_passages_with_the_query_terms_first():
+    scores = bm25_scores("mitochondria ATP", ["the cell wall", "mitochondria make ATP", "ATP is energy"])
+
+    assert scores[0] == 0
+    assert scores[1] > scores[2] > 0
+
+def test_relevant_passages_are_packed_into_the_budget_in_page_order():
+    pages = [
+        "cats purr softly . mitochondria make ATP here",
+        "dogs bark loudly . ATP powers the cell now",
+    ]
+
+    # 4-word passages: "cats purr softly .", "mitochondria make ATP here", "dogs bark loudly .", "ATP powers the cell", "now"
+    content = select_passages("mitochondria ATP", pages, token_budget=8, count_tokens=count_words, words_per_passage=4)
+
+    assert content == "mitochondria make ATP here\n\nATP powers the cell"
+
+def test_budget_cutoff_skips_passages_that_do_not_fit_and_keeps_smaller_ones():
+    pages = ["ATP ATP ATP one two three four five", "ATP six"]
+
+    content = select_passages("ATP", pages, token_budget=4, count_tokens=count_words, words_per_passage=4)
+
+    # The best passage (4 words) fills the budget; "two three four five" never matches
+    assert content == "ATP ATP ATP one"
+    content = select_passages("ATP", pages, token_budget=6, count_tokens=count_words, words_per_passage=4)
+    assert content == "ATP ATP ATP one\n\nATP six"
+    content = select_passages("ATP", pages, token_budget=3, count_tokens=count_words, words_per_passage=4)
+    assert content == "ATP six"
+
+def test_zero_matches_take_the_top_of_each_page_in_turn():
+    pages = ["a1 a1 a2 a2 a3 a3", "b1 b1 b2 b2", "c1 c1"]
+
+    content = select_passages("mitochondria", pages, token_budget=6, count_tokens=count_words, words_per_passage=2)
+
+    # Every page's first passage fits before any page's second one
+    assert content == "a1 a1\n\nb1 b1\n\nc1 c1"
+    content = select_passages("mitochondria", pages, token_budget=10, count_tokens=count_words, words_per_passage=2)
+    assert content == "a1 a1\n\na2 a2\n\nb1 b1\n\nb2 b2\n\nc1 c1"
+
+def test_no_text_gives_no_content():
+    assert select_passages("ATP", ["", "  "], token_budget=100, count_tokens=count_words) == ""
@@ -0,0 +1,119 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import result_cache
+from app.services.result_cache import GenerationCache
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controls the cache's clock only; the event loop keeps the real one."""
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(result_cache, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    return clock
+
+class Generator:
+    """A generation run that blocks until released, counting how often it was started."""
+
+    def __init__(self, results):
+        self.results = list(results)
+        self.calls = 0
+        self.release = None
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        return self.results.pop(0)
+
+def test_concurrent_misses_share_one_generation(clock):
+    cache = GenerationCache()
+    generate = Generator([[{"front": "ATP"}]])
+
+    async def scenario():
+        generate.release = asyncio.Event()
+        callers = [
+            asyncio.ensure_future(cache.get_or_generate(query, 1, generate))
+            for query in ("Cell energy", "cell  energy", "CELL ENERGY ")
+        ]
+        await asyncio.sleep(0)
+        generate.release.set()
+        return await asyncio.gather(*callers)
+
+    results = asyncio.run(scenario())
+
+    assert generate.calls == 1
+    assert results == [[{"front": "ATP"}]] * 3
+    assert cache.stats()["misses"] == 1 and cache.stats()["coalesced"] == 2
+
+def test_a_cancelled_caller_does_not_cancel_the_shared_generation(clock):
+    cache = GenerationCache()
+    generate = Generator([[{"front": "ATP"}]])
+
+    async def scenario():
+        generate.release = asyncio.Event()
+        first = asyncio.ensure_future(cache.get_or_generate("atp", 1, generate))
+        second = asyncio.ensure_future(cache.get_or_generate("atp", 1, generate))
+        await asyncio.sleep(0)
+        first.cancel()
+        generate.release.set()
+        return await second
+
+    assert asyncio.run(scenario()) == [{"front": "ATP"}]
+    assert generate.calls == 1
+
+def test_stale_entry_is_served_while_one_refresh_runs(clock):
+    cache = GenerationCache(ttl_seconds=60, stale_seconds=30)
+    generate = Generator([[{"front": "old"}], [{"front": "new"}]])
+
+    async def scenario():
+        generate.release = asyncio.Event()
+        generate.release.set()
+        await cache.get_or_generate("atp", 1, generate)
+
+        clock.now += 70
+        generate.release.clear()
+        stale = [await cache.get_or_generate("atp", 1, generate) for _ in range(2)]
+        refreshing = cache.stats()["inflight"]
+        generate.release.set()
+        while cache.stats()["inflight"]:
+            await asyncio.sleep(0)
+        return stale, refreshing, await cache.get_or_generate("atp", 1, generate)
+
+    stale, refreshing, refreshed = asyncio.run(scenario())
+
+    assert stale == [[{"front": "old"}]] * 2
+    assert refreshing == 1
+    assert refreshed == [{"front": "new"}]
+    assert generate.calls == 2
+    stats = cache.stats()
+    assert (stats["stale_hits"], stats["refreshes"], stats["hits"]) == (2, 1, 1)
+
+def test_expired_entry_is_regenerated_before_returning(clock):
+    cache = GenerationCache(ttl_seconds=60, stale_seconds=30)
+    generate = Generator([[{"front": "old"}], [{"front": "new"}]])
+
+    async def scenario():
+        generate.release = asyncio.Event()
+        generate.release.set()
+        await cache.get_or_generate("atp", 1, generate)
+        clock.now += 100
+        return await cache.get_or_generate("atp", 1, generate)
+
+    assert asyncio.run(scenario()) == [{"front": "new"}]
+    assert cache.stats()["misses"] == 2
+
+def test_empty_results_are_not_stored(clock):
+    cache = GenerationCache()
+    generate = Generator([[], [{"front": "ATP"}]])
+
+    async def scenario():
+        generate.release = asyncio.Event()
+        generate.release.set()
+        return [await cache.get_or_generate("atp", 1, generate) for _ in range(2)]
+
+    assert asyncio.run(scenario()) == [[], [{"front": "ATP"}]]
+    assert generate.calls == 2
+    cache.store("atp", 2, [])
+    assert cache.peek("atp", 2) is None
+    assert cache.stats()["entries"] == 1
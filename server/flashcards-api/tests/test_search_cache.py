@@ -0,0 +1,87 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.config import settings
+from app.db.repositories.decks import deck_repository
+from app.db.repositories.flashcards import flashcard_repository
+from app.services.search_cache import SearchResultCache, search_result_cache
+
+def cached(cache, user_id, query, response, includes_decks=False):
+    key = cache.make_key(user_id, query)
+    _, token = cache.get(key)
+    cache.store(key, response, token, includes_decks)
+    return key
+
+def test_hit_after_store_and_normalized_key():
+    cache = SearchResultCache()
+    cached(cache, "u1", "Photosynthesis", ["r"])
+
+    assert cache.get(cache.make_key("u1", "  photosynthesis "))[0] == ["r"]
+    assert cache.stats()["hits"] == 1
+
+def test_user_write_drops_only_that_users_entries():
+    cache = SearchResultCache()
+    mine = cached(cache, "u1", "atoms", ["mine"])
+    theirs = cached(cache, "u2", "atoms", ["theirs"])
+
+    cache.invalidate_user("u1")
+
+    assert cache.get(mine)[0] is None
+    assert cache.get(theirs)[0] == ["theirs"]
+
+def test_public_deck_write_drops_everyones_deck_results():
+    cache = SearchResultCache()
+    with_decks = cached(cache, "u2", "atoms", ["decks"], includes_decks=True)
+    cards_only = cached(cache, "u2", "cells", ["cards"])
+
+    cache.invalidate_deck("u1", is_public=True)
+
+    assert cache.get(with_decks)[0] is None
+    assert cache.get(cards_only)[0] == ["cards"]
+
+def test_result_computed_before_a_write_is_not_stored():
+    cache = SearchResultCache()
+    key = cache.make_key("u1", "atoms")
+    _, token = cache.get(key)
+
+    cache.invalidate_user("u1")
+    cache.store(key, ["stale"], token, includes_decks=False)
+
+    assert cache.get(key)[0] is None
+    assert cache.stats()["stale_skips"] == 1
+
+def test_lru_eviction_and_ttl(monkeypatch):
+    cache = SearchResultCache(ttl_seconds=10, max_entries=2)
+    first = cached(cache, "u1", "a", 1)
+    cached(cache, "u1", "b", 2)
+    cached(cache, "u1", "c", 3)
+
+    assert cache.get(first)[0] is None
+    assert cache.stats()["evictions"] == 1
+
+    key = cache.make_key("u1", "c")
+    monkeypatch.setattr("app.services.search_cache.time.monotonic", lambda: float("inf"))
+    assert cache.get(key)[0] is None
+    assert cache.stats()["expired"] == 1
+
+@pytest.fixture
+def cache_only(monkeypatch):
+    monkeypatch.setattr(settings, "SEARCH_CACHE_ENABLED", True)
+    monkeypatch.setattr(settings, "SEARCH_BACKEND", "ilike")
+    monkeypatch.setattr(settings, "SUGGEST_INDEX_ENABLED", False)
+    monkeypatch.setattr(settings, "FUZZY_SEARCH_ENABLED", False)
+    search_result_cache.clear()
+    yield search_result_cache
+    search_result_cache.clear()
+
+def test_repository_writes_invalidate_the_search_cache(cache_only):
+    card_key = cached(cache_only, "u1", "atoms", ["cards"])
+    deck_key = cached(cache_only, "u2", "atoms", ["decks"], includes_decks=True)
+
+    flashcard_repository._after_write(SimpleNamespace(id="c1", user_id="u1", deck_id="d1", front="Q", back="A"))
+    assert cache_only.get(card_key)[0] is None
+    assert cache_only.get(deck_key)[0] == ["decks"]
+
+    deck_repository._after_delete(SimpleNamespace(id="d1", user_id="u1", is_public=True, name="N", description=None))
+    assert cache_only.get(deck_key)[0] is None
@@ -0,0 +1,59 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.config import settings
+from app.services import search_fanout
+from app.services.search_fanout import in_worker_session, run_sub_searches
+
+def test_a_slow_sub_search_times_out_while_the_others_return():
+    async def fast():
+        return ["card"]
+
+    async def slow():
+        await asyncio.sleep(10)
+
+    async def broken():
+        raise RuntimeError("index unavailable")
+
+    outcomes = asyncio.run(run_sub_searches({"flashcards": fast, "decks": slow, "users": broken}, timeout=0.05))
+
+    assert (outcomes["flashcards"].status, outcomes["flashcards"].value) == ("ok", ["card"])
+    assert (outcomes["decks"].status, outcomes["decks"].detail) == ("timeout", "exceeded 0.05s")
+    assert 50 <= outcomes["decks"].elapsed_ms < 1000
+    assert (outcomes["users"].status, outcomes["users"].detail) == ("error", "index unavailable")
+
+@pytest.fixture
+def one_worker_thread(monkeypatch):
+    monkeypatch.setattr(settings, "SEARCH_WORKER_THREADS", 1)
+    # The searches below take no session
+    monkeypatch.setattr(search_fanout, "_run_in_session", lambda search: search(None))
+    search_fanout.close_worker_pool()
+    yield
+    search_fanout.close_worker_pool(wait=True)
+
+def test_timed_out_worker_searches_hold_at_most_the_pool_threads(one_worker_thread):
+    release = threading.Event()
+    running = []
+
+    def stuck(db):
+        running.append(threading.current_thread().name)
+        release.wait(5)
+        return "late"
+
+    async def scenario():
+        first = await run_sub_searches({"users": lambda: in_worker_session(stuck)}, timeout=0.05)
+        # The stuck query still holds the only thread, so this one never starts
+        second = await run_sub_searches({"users": lambda: in_worker_session(stuck)}, timeout=0.05)
+        started_while_stuck = len(running)
+        release.set()
+        third = await run_sub_searches({"users": lambda: in_worker_session(lambda db: "ok")}, timeout=5)
+        return first, second, started_while_stuck, third
+
+    first, second, started_while_stuck, third = asyncio.run(scenario())
+
+    assert first["users"].status == second["users"].status == "timeout"
+    assert started_while_stuck == 1
+    assert (third["users"].status, third["users"].value) == ("ok", "ok")
+    assert running[0].startswith("search-worker")
@@ -0,0 +1,83 @@
+from app.services.search_index import InvertedIndex, SearchIndex
+
+def test_bm25_ranks_more_relevant_document_first():
+    index = InvertedIndex()
+    index.add("a", "photosynthesis happens in the chloroplast")
+    index.add("b", "photosynthesis photosynthesis converts light into chemical energy")
+    index.add("c", "mitochondria produce ATP")
+
+    hits = index.search("photosynthesis", limit=10)
+
+    assert [doc_id for doc_id, _ in hits] == ["b", "a"]
+    assert hits[0][1] > hits[1][1] > 0
+
+def test_rare_terms_weigh_more_than_common_ones():
+    index = InvertedIndex()
+    for i in range(5):
+        index.add(f"common{i}", "cell biology")
+    index.add("rare", "cell enzyme")
+
+    assert index.search("cell enzyme", limit=1)[0][0] == "rare"
+
+def test_replacing_and_removing_documents_updates_postings():
+    index = InvertedIndex()
+    index.add("a", "gravity pulls")
+    index.add("a", "velocity changes")
+
+    assert index.search("gravity") == []
+    assert [doc_id for doc_id, _ in index.search("velocity")] == ["a"]
+
+    index.remove("a")
+    assert len(index) == 0
+    assert index.postings == {}
+    assert index.total_length == 0
+
+def test_flashcards_are_searched_per_user():
+    index = SearchIndex()
+    index.index_flashcard("c1", "u1", "What is an atom?", "The smallest unit")
+    index.index_flashcard("c2", "u2", "What is an atom made of?", "Protons")
+
+    assert index.search_flashcards("atom", user_id="u1") == ["c1"]
+    assert sorted(index.search_flashcards("atom")) == ["c1", "c2"]
+
+def test_decks_include_own_and_public_only():
+    index = SearchIndex()
+    index.index_deck("mine", "u1", False, "Chemistry")
+    index.index_deck("public", "u2", True, "Chemistry basics")
+    index.index_deck("private", "u2", False, "Chemistry secrets")
+
+    assert sorted(index.search_decks("chemistry", user_id="u1")) == ["mine", "public"]
+
+def test_snapshot_load_then_catch_up(tmp_path):
+    path = str(tmp_path / "search_index.pickle")
+    index = SearchIndex()
+    index.index_flashcard("kept", "u1", "enzyme kinetics")
+    index.index_flashcard("deleted", "u1", "enzyme inhibitors")
+    index.index_flashcard("edited", "u1", "protein folding")
+    index.index_deck("deck", "u1", False, "Biochemistry")
+    index.save(path)
+
+    restored = SearchIndex()
+    assert restored.load(path)
+    assert restored.snapshot_at == index.snapshot_at
+
+    # Since the snapshot: one card deleted, one edited, one created, the deck removed
+    restored.catch_up(
+        flashcard_ids=["kept", "edited", "new"],
+        deck_ids=[],
+        changed_flashcards=[("edited", "u1", ("enzyme structure",)), ("new", "u1", ("enzyme assays",))],
+        changed_decks=[],
+    )
+
+    assert sorted(restored.search_flashcards("enzyme", user_id="u1")) == ["edited", "kept", "new"]
+    assert restored.search_flashcards("protein", user_id="u1") == []
+    assert restored.search_decks("biochemistry", user_id="u1") == []
+    assert restored.stats()["flashcards"] == 3
+
+def test_load_rejects_missing_or_corrupt_snapshot(tmp_path):
+    index = SearchIndex()
+    assert not index.load(str(tmp_path / "missing.pickle"))
+
+    corrupt = tmp_path / "corrupt.pickle"
+    corrupt.write_bytes(b"not a pickle")
+    assert not index.load(str(corrupt))
@@ -0,0 +1,108 @@
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import deps
+from app.api.routes import search
+from app.services.near_duplicates import deck_duplicate_indexes
+
+class FakeDeckRepository:
+    def __init__(self):
+        self.created = []
+
+    async def get_by_name(self, *, name, user_id):
+        return next((deck for deck in self.created if deck.name == name), None)
+
+    async def create(self, *, obj_in, user_id):
+        now = datetime.utcnow()
+        deck = SimpleNamespace(
+            id=uuid.uuid4(), user_id=user_id, created_at=now, updated_at=now, **obj_in.dict()
+        )
+        self.created.append(deck)
+        return deck
+
+class FakeFlashcardRepository:
+    def __init__(self, existing=()):
+        self.existing = list(existing)
+        self.objs_in = []
+
+    async def get_by_deck(self, *, deck_id, limit=100, cursor=None):
+        return self.existing[:limit]
+
+    async def bulk_create(self, *, objs_in, user_id):
+        self.objs_in.extend(objs_in)
+        now = datetime.utcnow()
+        return [
+            SimpleNamespace(id=uuid.uuid4(), user_id=user_id, created_at=now, updated_at=now, **obj_in.dict())
+            for obj_in in objs_in
+        ]
+
+@pytest.fixture
+def repositories():
+    return FakeFlashcardRepository(), FakeDeckRepository()
+
+@pytest.fixture
+def client(repositories):
+    flashcards, decks = repositories
+    app = FastAPI()
+    app.include_router(search.router)
+    app.dependency_overrides[deps.get_flashcard_repository] = lambda: flashcards
+    app.dependency_overrides[deps.get_deck_repository] = lambda: decks
+    app.dependency_overrides[deps.get_current_active_user] = lambda: SimpleNamespace(id=uuid.uuid4(), is_active=True)
+    return TestClient(app)
+
+def test_save_generated_flashcards_creates_deck_and_cards(client, repositories):
+    flashcards, decks = repositories
+    response = client.post(
+        "/api/v1/search/save-generated-flashcards",
+        json={
+            "deck_name": "Cells",
+            "query": "cell biology",
+            "flashcards": [
+                {"question": "What do mitochondria produce?", "answer": "ATP"},
+                {"question": "Where does photosynthesis happen?", "answer": "In the chloroplast"},
+            ],
+        },
+    )
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["count"] == 2
+    assert body["deck"]["name"] == "Cells"
+    assert [card["front"] for card in body["flashcards"]] == [
+        "What do mitochondria produce?",
+        "Where does photosynthesis happen?",
+    ]
+    assert [card["back"] for card in body["flashcards"]] == ["ATP", "In the chloroplast"]
+    assert all(obj_in.deck_id == decks.created[0].id for obj_in in flashcards.objs_in)
+
+def test_save_generated_flashcards_skips_near_duplicates(client, repositories):
+    card = {"question": "What do mitochondria produce in the cell?", "answer": "ATP through respiration"}
+    response = client.post(
+        "/api/v1/search/save-generated-flashcards",
+        json={"deck_name": "Cells", "query": "cells", "flashcards": [card, dict(card)]},
+    )
+
+    assert response.status_code == 200, response.text
+    assert response.json()["count"] == 1
+    assert response.json()["duplicates"] == [card]
+
+def test_save_generated_flashcards_checks_existing_deck_cards(client, repositories):
+    flashcards, decks = repositories
+    card = {"question": "What do mitochondria produce in the cell?", "answer": "ATP through respiration"}
+    save = {"deck_name": "Cells", "query": "cells", "flashcards": [card]}
+    assert client.post("/api/v1/search/save-generated-flashcards", json=save).json()["count"] == 1
+
+    # A deck that is not cached is indexed from the cards the repository returns
+    deck_id = decks.created[0].id
+    flashcards.existing = [
+        SimpleNamespace(id=uuid.uuid4(), front=card["question"], back=card["answer"], deck_id=deck_id)
+    ]
+    deck_duplicate_indexes.clear()
+    response = client.post("/api/v1/search/save-generated-flashcards", json=save)
+    assert response.json()["count"] == 0
+    assert response.json()["duplicates"] == [card]
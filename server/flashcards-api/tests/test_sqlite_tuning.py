@@ -0,0 +1,20 @@
+import pytest
+
+from app.db.sqlite_tuning import can_open_read_only, read_only_url, sqlite_file
+
+@pytest.mark.parametrize("url", ["sqlite://", "sqlite:///:memory:", "sqlite:///file::memory:?cache=shared"])
+def test_in_memory_databases_have_no_read_only_pool(url):
+    assert sqlite_file(url) is None
+    assert not can_open_read_only(url)
+    with pytest.raises(ValueError):
+        read_only_url(url)
+
+def test_read_only_pool_needs_an_existing_file(tmp_path):
+    path = tmp_path / "flashcards.db"
+    url = f"sqlite:///{path}"
+
+    assert sqlite_file(url) == str(path)
+    assert not can_open_read_only(url)
+    path.touch()
+    assert can_open_read_only(url)
+    assert read_only_url(url) == f"sqlite:///file:{path}?mode=ro&uri=true"
@@ -0,0 +1,33 @@
+from app.services.stream_parser import JSONArrayStreamParser
+
+def feed_all(parser, chunks):
+    items = []
+    for chunk in chunks:
+        items.extend(parser.feed(chunk))
+    return items
+
+def test_yields_each_element_as_soon_as_it_closes():
+    parser = JSONArrayStreamParser()
+
+    assert parser.feed('Here are your cards: [{"question": "Q1", ') == []
+    assert parser.feed('"answer": "A1"}, {"question"') == [{"question": "Q1", "answer": "A1"}]
+    assert parser.feed(': "Q2", "answer": "A2"}]') == [{"question": "Q2", "answer": "A2"}]
+    assert parser.done
+
+def test_brackets_and_escapes_inside_strings_are_text():
+    text = '[{"question": "What does [x] mean?", "answer": "A \\"quoted\\" } brace"}]'
+    items = feed_all(JSONArrayStreamParser(), [text[i:i + 3] for i in range(0, len(text), 3)])
+
+    assert items == [{"question": "What does [x] mean?", "answer": 'A "quoted" } brace'}]
+
+def test_nested_values_are_one_element():
+    items = feed_all(JSONArrayStreamParser(), ['[{"tags": ["a", "b"], "meta": {"k": 1}}, ["x"]]'])
+
+    assert items == [{"tags": ["a", "b"], "meta": {"k": 1}}, ["x"]]
+
+def test_malformed_elements_are_skipped_and_text_after_the_array_ignored():
+    parser = JSONArrayStreamParser()
+    items = feed_all(parser, ['[{"question": "Q1",}, {"question": "Q2"}] trailing [{"question": "Q3"}]'])
+
+    assert items == [{"question": "Q2"}]
+    assert parser.done
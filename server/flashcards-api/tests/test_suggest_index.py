@@ -0,0 +1,117 @@
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import deps
+from app.api.routes import search
+from app.config import settings
+from app.db.repositories import flashcards as flashcards_module
+from app.db.repositories.flashcards import FlashcardRepository
+from app.services.suggest_index import SuggestIndex
+
+from .conftest import CardRow
+
+def texts(suggestions):
+    return [suggestion["text"] for suggestion in suggestions]
+
+def test_prefix_matches_any_word_and_ranks_matches_at_the_start_first():
+    index = SuggestIndex()
+    index.index_flashcard("1", "me", "What do mitochondria produce?")
+    index.index_flashcard("2", "me", "Mitochondria and ATP synthesis")
+    index.index_flashcard("3", "me", "Mitosis")
+    index.index_deck("4", "me", False, "Cell biology")
+
+    assert texts(index.suggest("mito", user_id="me")) == [
+        "Mitosis", "Mitochondria and ATP synthesis", "What do mitochondria produce?",
+    ]
+    assert texts(index.suggest("MITOCHONDRIA  pro", user_id="me")) == ["What do mitochondria produce?"]
+    assert index.suggest("chondria", user_id="me") == []
+    assert index.suggest("   ", user_id="me") == []
+    assert index.suggest("biol", user_id="me") == [{"type": "deck", "id": "4", "text": "Cell biology"}]
+
+def test_identical_texts_are_suggested_once_and_do_not_crowd_out_others():
+    index = SuggestIndex()
+    for i in range(5):
+        index.index_flashcard(f"same-{i}", "me", "Define osmosis")
+    for i in range(5):
+        index.index_flashcard(f"other-{i}", "me", f"Osmosis example {i}")
+
+    suggestions = index.suggest("osmo", user_id="me", limit=3)
+
+    assert texts(suggestions) == ["Osmosis example 0", "Osmosis example 1", "Osmosis example 2"]
+    assert texts(index.suggest("define", user_id="me")) == ["Define osmosis"]
+
+def test_users_see_their_own_texts_and_public_decks_only():
+    index = SuggestIndex()
+    index.index_flashcard("mine", "me", "Enzyme kinetics")
+    index.index_flashcard("theirs", "someone-else", "Enzyme inhibitors")
+    index.index_deck("private", "someone-else", False, "Enzyme deck")
+    index.index_deck("public", "someone-else", True, "Enzymes for everyone")
+
+    assert texts(index.suggest("enzyme", user_id="me")) == ["Enzyme kinetics", "Enzymes for everyone"]
+    assert texts(index.suggest("enzyme")) == ["Enzymes for everyone"]
+
+    # Making the deck private moves it back to its owner's scope
+    index.index_deck("public", "someone-else", False, "Enzymes for everyone")
+    assert texts(index.suggest("enzyme", user_id="me")) == ["Enzyme kinetics"]
+    assert "Enzymes for everyone" in texts(index.suggest("enzyme", user_id="someone-else"))
+
+def test_build_matches_incremental_adds():
+    decks = [("d1", "me", False, "Genetics"), ("d2", "you", True, "General chemistry")]
+    cards = [("c1", "me", "Gene expression"), ("c2", "you", "Generators")]
+    built, added = SuggestIndex(), SuggestIndex()
+    built.build(decks, cards)
+    for deck in decks:
+        added.index_deck(*deck)
+    for card in cards:
+        added.index_flashcard(*card)
+
+    assert built.scopes == added.scopes
+    assert built.suggest("gen", user_id="me") == added.suggest("gen", user_id="me")
+
+@pytest.fixture
+def index(monkeypatch):
+    index = SuggestIndex()
+    monkeypatch.setattr(flashcards_module, "suggest_index", index)
+    monkeypatch.setattr(search, "suggest_index", index)
+    # Keep the other write hooks off the shared indexes
+    monkeypatch.setattr(settings, "FUZZY_SEARCH_ENABLED", False)
+    monkeypatch.setattr(settings, "SEARCH_CACHE_ENABLED", False)
+    return index
+
+def test_flashcard_writes_keep_suggestions_current(db, index):
+    repository = FlashcardRepository(CardRow)
+    user_id = str(uuid.uuid4())
+
+    card = repository.create(
+        db, obj_in={"front": "Photosynthesis inputs", "back": "CO2", "deck_id": str(uuid.uuid4())}, user_id=user_id
+    )
+    assert texts(index.suggest("photo", user_id=user_id)) == ["Photosynthesis inputs"]
+
+    repository.update(db, db_obj=card, obj_in={"front": "Chlorophyll colour"})
+    assert index.suggest("photo", user_id=user_id) == []
+    assert texts(index.suggest("chloro", user_id=user_id)) == ["Chlorophyll colour"]
+
+    repository.remove(db, id=card.id)
+    assert index.suggest("chloro", user_id=user_id) == []
+    assert len(index) == 0
+
+def test_suggest_route_scopes_to_the_current_user(index, monkeypatch):
+    user_id = uuid.uuid4()
+    index.index_flashcard("mine", user_id, "Krebs cycle steps")
+    index.index_flashcard("theirs", uuid.uuid4(), "Krebs cycle enzymes")
+    app = FastAPI()
+    app.include_router(search.router)
+    app.dependency_overrides[deps.get_current_active_user] = lambda: SimpleNamespace(id=user_id, is_active=True)
+    client = TestClient(app)
+
+    response = client.get(f"{settings.API_V1_STR}/search/suggest", params={"q": "krebs"})
+
+    assert response.status_code == 200, response.text
+    assert response.json() == {"suggestions": [{"type": "flashcard", "id": "mine", "text": "Krebs cycle steps"}]}
+
+    monkeypatch.setattr(settings, "SUGGEST_INDEX_ENABLED", False)
+    assert client.get(f"{settings.API_V1_STR}/search/suggest", params={"q": "krebs"}).status_code == 404